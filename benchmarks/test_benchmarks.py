@@ -8,13 +8,16 @@ Run locally with:
     pytest benchmarks/test_benchmarks.py --benchmark-json=benchmark_results.json
 """
 
+import pickle
 import subprocess
 import sys
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 import vmecpp
+from vmecpp.cpp import _vmecpp  # type: ignore
 
 REPO_ROOT = Path(__file__).parent.parent
 TEST_DATA_DIR = REPO_ROOT / "src" / "vmecpp" / "cpp" / "vmecpp" / "test_data"
@@ -140,6 +143,162 @@ def test_bench_fixed_boundary_cma_6x8(benchmark, cma_input):
     assert result.wout.volume == pytest.approx(0.5014, rel=1e-3)
 
 
+def test_bench_fixed_boundary_cma_16_threads(benchmark, cma_input):
+    """Benchmark CMA equilibrium (stellarator, ntor=6, mpol=5) on 16 threads.
+
+    The 35 Fourier modes make only 5 blocks of 8 for the mode-parallel radial
+    solves, fewer than there are threads.
+    """
+    result = benchmark.pedantic(
+        vmecpp.run,
+        args=(cma_input,),
+        kwargs={"max_threads": 16, "verbose": False},
+        rounds=3,
+        warmup_rounds=0,
+    )
+    assert result.wout.volume == pytest.approx(0.5014, rel=1e-3)
+
+
+@pytest.fixture(scope="module")
+def solovev_restart():
+    """Converged Solov'ev equilibrium as hot-restart point, with a fixed ns."""
+    vmec_input = vmecpp.VmecInput.from_file(TEST_DATA_DIR / "solovev.json")
+    vmec_input.ns_array = vmec_input.ns_array[-1:]
+    vmec_input.ftol_array = vmec_input.ftol_array[-1:]
+    vmec_input.niter_array = vmec_input.niter_array[-1:]
+    output = vmecpp.run(vmec_input, max_threads=1, verbose=False)
+    return vmec_input, output
+
+
+@pytest.mark.parametrize("pool_enabled", [True, False])
+def test_bench_hot_restart_back_to_back(benchmark, solovev_restart, pool_enabled):
+    """Benchmark many back-to-back small hot-restarted solves.
+
+    This is the access pattern of an optimization loop. Runs after the first
+    one recycle the per-thread buffers of their predecessor if the workspace
+    pool is enabled.
+    """
+    vmec_input, output = solovev_restart
+
+    def run_many():
+        for _ in range(20):
+            result = vmecpp.run(
+                vmec_input, max_threads=1, verbose=False, restart_from=output
+            )
+        return result
+
+    _vmecpp.set_workspace_pool_enabled(pool_enabled)
+    try:
+        result = benchmark.pedantic(run_many, rounds=3, warmup_rounds=1)
+    finally:
+        _vmecpp.set_workspace_pool_enabled(True)
+    assert result.wout.volume == pytest.approx(output.wout.volume, rel=1e-6)
+
+
+@pytest.fixture(scope="module")
+def cma_restart(cma_input):
+    """Converged CMA equilibrium as hot-restart point, with a fixed ns."""
+    vmec_input = cma_input.model_copy(deep=True)
+    vmec_input.ns_array = vmec_input.ns_array[-1:]
+    vmec_input.ftol_array = vmec_input.ftol_array[-1:]
+    vmec_input.niter_array = vmec_input.niter_array[-1:]
+    output = vmecpp.run(vmec_input, max_threads=1, verbose=False)
+    return vmec_input, output
+
+
+@pytest.mark.parametrize("cache_enabled", [True, False])
+def test_bench_hot_restart_startup(benchmark, cma_restart, cache_enabled):
+    """Benchmark the startup latency of small hot-restarted 3D solves.
+
+    A hot restart from the converged state of the same input only takes a few
+    iterations, so the run time is dominated by the setup of the solver. Runs
+    after the first one share the Fourier basis tables of their predecessor if
+    the Fourier basis cache is enabled.
+    """
+    vmec_input, output = cma_restart
+
+    def run_many():
+        for _ in range(20):
+            result = vmecpp.run(
+                vmec_input, max_threads=1, verbose=False, restart_from=output
+            )
+        return result
+
+    _vmecpp.set_fourier_basis_cache_enabled(cache_enabled)
+    try:
+        result = benchmark.pedantic(run_many, rounds=3, warmup_rounds=1)
+    finally:
+        _vmecpp.set_fourier_basis_cache_enabled(True)
+    assert result.wout.volume == pytest.approx(output.wout.volume, rel=1e-6)
+
+
+@pytest.mark.parametrize(
+    "solver",
+    [
+        _vmecpp.RadialTridiagonalSolver.MODE_PARALLEL,
+        _vmecpp.RadialTridiagonalSolver.PARTITIONED,
+    ],
+    ids=["mode_parallel", "partitioned"],
+)
+def test_bench_radial_tridiagonal_solver(benchmark, cma_input, solver):
+    """Benchmark the CMA equilibrium per solver of the R/Z preconditioner."""
+    _vmecpp.set_radial_tridiagonal_solver(solver)
+    try:
+        result = benchmark.pedantic(
+            vmecpp.run,
+            args=(cma_input,),
+            kwargs={"max_threads": 4, "verbose": False},
+            rounds=3,
+            warmup_rounds=0,
+        )
+    finally:
+        _vmecpp.set_radial_tridiagonal_solver(
+            _vmecpp.RadialTridiagonalSolver.MODE_PARALLEL
+        )
+    assert result.wout.volume == pytest.approx(0.5014, rel=1e-3)
+
+
+# Single-resolution test_data cases for comparing iteration styles by the number
+# of force evaluations they need: (name, ns, ftol, niter).
+_ITERATION_STYLE_CASES = [
+    ("solovev", 15, 1.0e-12, 3000),
+    ("cth_like_fixed_bdy", 25, 1.0e-10, 3000),
+    ("cma", 15, 1.0e-10, 8000),
+]
+
+
+@pytest.mark.parametrize("style", ["vmec_8_52", "anderson"])
+@pytest.mark.parametrize(
+    ("name", "ns", "ftol", "niter"),
+    _ITERATION_STYLE_CASES,
+    ids=[case[0] for case in _ITERATION_STYLE_CASES],
+)
+def test_bench_iteration_style(benchmark, name, ns, ftol, niter, style):
+    """Benchmark the single-resolution solve of the Python iteration per style.
+
+    Besides the timing, the number of force evaluations is recorded as
+    ``force_eval_count`` in the benchmark's extra info, which is the
+    machine-independent measure of the efficiency of an iteration style.
+    """
+    vmec_input = vmecpp.VmecInput.from_file(TEST_DATA_DIR / f"{name}.json")
+    vmec_input.ns_array = np.array([ns])
+    vmec_input.ftol_array = np.array([ftol])
+    vmec_input.niter_array = np.array([niter])
+    cpp_indata = vmec_input._to_cpp_vmecindata()
+
+    def solve():
+        model = _vmecpp.VmecModel.create(cpp_indata, ns)
+        model.reset_force_eval_count()
+        result = vmecpp.solve_equilibrium(model, style=style)
+        return model, result
+
+    model, result = benchmark.pedantic(solve, rounds=3, warmup_rounds=1)
+    benchmark.extra_info["force_eval_count"] = model.force_eval_count
+    benchmark.extra_info["num_iterations"] = result.num_iterations
+    benchmark.extra_info["restarts"] = result.restarts
+    assert result.converged
+
+
 # ---------------------------------------------------------------------------
 # Free-boundary benchmarks
 # ---------------------------------------------------------------------------
@@ -155,6 +314,147 @@ def test_bench_response_table_from_coils(benchmark, makegrid_params):
     )
 
 
+def test_bench_response_table_many_circuits(benchmark, makegrid_params):
+    """Benchmark a response table for 60 circuits, which are all evaluated in one
+    pass over the stellarator-symmetric half-period of the grid."""
+    num_circuits, num_points = 60, 64
+    theta = np.linspace(0.0, 2.0 * np.pi, num_points, endpoint=False)
+    points_per_coil = []
+    for i in range(num_circuits):
+        phi = 2.0 * np.pi * (i + 0.5) / num_circuits
+        r = 0.75 + 0.35 * np.cos(theta)
+        points_per_coil.append(
+            np.column_stack([r * np.cos(phi), r * np.sin(phi), 0.35 * np.sin(theta)])
+        )
+    magnetic_configuration = _vmecpp.MagneticConfiguration.from_arrays(
+        points_per_coil,
+        np.full(num_circuits, 1.0e5),
+        list(range(1, num_circuits + 1)),
+    )
+    params = makegrid_params.model_copy(
+        update={
+            "number_of_r_grid_points": 31,
+            "number_of_z_grid_points": 30,
+            "number_of_phi_grid_points": 36,
+        }
+    )
+
+    response_table = benchmark.pedantic(
+        vmecpp.MagneticFieldResponseTable.from_magnetic_configuration,
+        args=(magnetic_configuration, params),
+        rounds=3,
+        warmup_rounds=1,
+    )
+    assert response_table.b_r.shape == (num_circuits, 36 * 30 * 31)
+
+
+def _write_coils_file(path, points_per_coil, currents, nfp):
+    """Write fully expanded coils in the MAKEGRID format, like SIMSOPT's
+    coils_to_makegrid."""
+    lines = [f"periods {nfp}", "begin filament", "mirror NIL"]
+    for i, (points, current) in enumerate(zip(points_per_coil, currents, strict=True)):
+        lines.extend(
+            f"{x:23.15E} {y:23.15E} {z:23.15E} {current:23.15E}" for x, y, z in points
+        )
+        x, y, z = points[0]
+        lines.append(f"{x:23.15E} {y:23.15E} {z:23.15E} {0.0:23.15E} 1 coil{i}")
+    lines.append("end")
+    path.write_text("\n".join(lines) + "\n")
+
+
+@pytest.mark.parametrize("source", ["coils_file", "arrays"])
+def test_bench_magnetic_configuration_ingestion(benchmark, tmp_path, source):
+    """Benchmark building a 100-coil MagneticConfiguration from in-memory arrays
+    versus the write-and-parse coils file round trip."""
+    nfp, num_base_coils, num_points = 5, 10, 200
+    theta = np.linspace(0.0, 2.0 * np.pi, num_points, endpoint=False)
+    base_points = []
+    for i in range(num_base_coils):
+        phi = (i + 0.5) * np.pi / (nfp * num_base_coils)
+        r = 1.0 + 0.3 * np.cos(theta)
+        base_points.append(
+            np.column_stack([r * np.cos(phi), r * np.sin(phi), 0.3 * np.sin(theta)])
+        )
+    base_currents = np.full(num_base_coils, 1.0e5)
+
+    def from_arrays():
+        return _vmecpp.MagneticConfiguration.from_arrays(
+            base_points,
+            base_currents,
+            [1] * num_base_coils,
+            nfp=nfp,
+            stellsym=True,
+        )
+
+    def from_coils_file():
+        # Expand the coils the way SIMSOPT's coils_via_symmetries does.
+        points_per_coil, currents = [], []
+        for k in range(nfp):
+            angle = 2.0 * np.pi * k / nfp
+            rotation = np.array(
+                [
+                    [np.cos(angle), -np.sin(angle), 0.0],
+                    [np.sin(angle), np.cos(angle), 0.0],
+                    [0.0, 0.0, 1.0],
+                ]
+            )
+            for flip in [1.0, -1.0]:
+                for points, current in zip(base_points, base_currents, strict=True):
+                    flipped = points * np.array([1.0, flip, flip])
+                    points_per_coil.append(flipped @ rotation.T)
+                    currents.append(flip * current)
+        coils_file = tmp_path / "coils.bench"
+        _write_coils_file(coils_file, points_per_coil, currents, nfp)
+        return _vmecpp.MagneticConfiguration.from_file(coils_file)
+
+    magnetic_configuration = benchmark.pedantic(
+        from_arrays if source == "arrays" else from_coils_file,
+        rounds=5,
+        warmup_rounds=1,
+    )
+    assert magnetic_configuration.num_serial_circuits == 1
+
+
+@pytest.mark.parametrize("num_points", [10**5, 10**6, 10**7])
+def test_bench_coils_magnetic_field(benchmark, num_points):
+    """Benchmark vmecpp.coils.magnetic_field() on a single 32-segment coil."""
+    phi = np.linspace(0.0, 2.0 * np.pi, 33)
+    coil = np.column_stack([1.5 * np.cos(phi), 1.5 * np.sin(phi), np.zeros_like(phi)])
+    magnetic_configuration = _vmecpp.MagneticConfiguration.from_arrays(
+        [coil], np.array([1.0e6]), [1]
+    )
+    rng = np.random.default_rng(42)
+    points = rng.uniform(-1.0, 1.0, size=(num_points, 3))
+
+    b_field = benchmark.pedantic(
+        vmecpp.coils.magnetic_field,
+        args=(magnetic_configuration, points),
+        rounds=3,
+        warmup_rounds=1,
+    )
+    assert b_field.shape == (num_points, 3)
+
+
+def test_bench_coils_magnetic_field_adjoint(benchmark):
+    """Benchmark the gradient of the squared normal field on the LCFS of the cth_like
+    free-boundary equilibrium with respect to all vertices of its coils, which takes
+    a single adjoint evaluation instead of one field evaluation per coordinate."""
+    wout = vmecpp.VmecWOut.from_wout_file(TEST_DATA_DIR / "wout_cth_like_free_bdy.nc")
+    magnetic_configuration = _vmecpp.MagneticConfiguration.from_file(
+        TEST_DATA_DIR / "coils.cth_like"
+    )
+    _, _, area_elements = vmecpp.coils.lcfs_surface(wout)
+    b_n = vmecpp.coils.lcfs_normal_field(magnetic_configuration, wout)
+
+    gradients = benchmark.pedantic(
+        vmecpp.coils.lcfs_normal_field_adjoint,
+        args=(magnetic_configuration, wout, b_n * area_elements),
+        rounds=3,
+        warmup_rounds=1,
+    )
+    assert len(gradients) > 0
+
+
 def test_bench_free_boundary(benchmark, free_boundary_input, response_table):
     """Benchmark free-boundary solve with pre-computed response table."""
     result = benchmark.pedantic(
@@ -165,3 +465,37 @@ def test_bench_free_boundary(benchmark, free_boundary_input, response_table):
         warmup_rounds=1,
     )
     assert result.wout.volume == pytest.approx(0.3075, rel=1e-3)
+
+
+@pytest.mark.parametrize("storage", ["in_memory", "shared_memory"])
+def test_bench_response_table_dispatch(benchmark, tmp_path, response_table, storage):
+    """Benchmark sending a response table to a worker process, i.e. the pickling round
+    trip of every task dispatched by multiprocessing or concurrent.futures."""
+    if storage == "shared_memory":
+        response_table = response_table.to_shared_memory(tmp_path / "response.npy")
+
+    def dispatch():
+        return pickle.loads(pickle.dumps(response_table))
+
+    result = benchmark.pedantic(dispatch, rounds=3, warmup_rounds=1)
+    assert result.b_r.shape == response_table.b_r.shape
+
+
+@pytest.fixture(scope="module")
+def cma_wout(cma_input):
+    return vmecpp.run(cma_input, verbose=False).wout
+
+
+def test_bench_to_flux_coordinates(benchmark, cma_wout):
+    rng = np.random.default_rng(seed=0)
+    n_points = 1_000_000
+    s = rng.uniform(0.0, 1.0, size=n_points)
+    theta = rng.uniform(0.0, 2.0 * np.pi, size=n_points)
+    phi = rng.uniform(0.0, 2.0 * np.pi, size=n_points)
+    position = cma_wout.evaluate(s, theta, phi, ["r", "z"])
+
+    s_found, _, inside = benchmark(
+        cma_wout.to_flux_coordinates, position["r"], phi, position["z"]
+    )
+    assert np.all(inside)
+    np.testing.assert_allclose(s_found, s, atol=1e-6)
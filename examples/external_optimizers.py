@@ -81,10 +81,14 @@ def make_model(input_path: Path = DEFAULT_INPUT, ns: int = 11):
 def residual(model):
     """Return F(x) = raw internal-basis force; F(x) = 0 at equilibrium."""
 
+    # zero-copy views of the model's state and force storage
+    state = model.state_view
+    forces = model.force_view
+
     def F(x):
-        model.set_state(np.ascontiguousarray(x, dtype=float))
+        state[:] = x
         model.evaluate(2, 2, False)
-        return np.asarray(model.get_forces(), dtype=float)
+        return forces.copy()
 
     return F
 
@@ -154,10 +158,9 @@ def solve_preconditioned_descent(
         if np.linalg.norm(F(x)) < tol:
             break
         it += 1
-        model.set_state(np.ascontiguousarray(x))
+        model.state_view[:] = x
         model.evaluate(2, 2, True)  # preconditioned search direction
-        fprec = np.asarray(model.get_forces(), float)
-        v = momentum * v + delt * fprec
+        v = momentum * v + delt * model.force_view
         x = x + delt * v
     return _finish(model, "preconditioned descent", x, it, t0)
 
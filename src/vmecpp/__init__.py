@@ -12,21 +12,31 @@ import sys
 import tempfile
 import types
 import typing
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from pathlib import Path
 
 import jaxtyping as jt
 import netCDF4
 import numpy as np
+import numpy.typing as npt
 import pydantic
 
-from vmecpp import _util
-from vmecpp._continuation import _run_fourier_continuation, interpolate_solution
+from vmecpp import _util, coils
+from vmecpp._boozer import BoozerOutput, boozer_transform
+from vmecpp._compact_wout import CompactVmecWOut
+from vmecpp._continuation import (
+    ContinuationPath,
+    _run_fourier_continuation,
+    continuation_path,
+    interpolate_solution,
+)
+from vmecpp._equilibrium_cache import EquilibriumCache
 from vmecpp._free_boundary import (
     MagneticFieldResponseTable,
     MakegridParameters,
 )
 from vmecpp._iteration import (
+    IterationRecord,
     IterationResult,
     IterationState,
     RestartReason,
@@ -149,6 +159,15 @@ class IterationStyle(str, enum.Enum):
     PARVMEC = "parvmec"
     """The PARVMEC / VMEC2000 9.0 control."""
 
+    ANDERSON = "anderson"
+    """The VMEC 8.52 control with Anderson-mixed (nonlinear GMRES) time steps.
+
+    Not uniformly faster than ``VMEC_8_52``: it saves force evaluations on the
+    Solov'ev and CTH-like test cases, but needs more on CMA (1713 instead of 1267 to
+    ftol=1e-10 at ns=25). Compare both styles on the configurations at hand before
+    switching.
+    """
+
 
 class OutputMode(enum.Enum):
     """Controls the output format of iteration logging.."""
@@ -409,8 +428,8 @@ class VmecInput(BaseModelWithNumpy):
         pydantic.BeforeValidator(_validate_iteration_style),
         pydantic.Field(),
     ] = IterationStyle.VMEC_8_52
-    """Time-step / restart control scheme for the equilibrium iteration (``"vmec_8_52"``
-    or ``"parvmec"``)."""
+    """Time-step / restart control scheme for the equilibrium iteration
+    (``"vmec_8_52"``, ``"parvmec"`` or ``"anderson"``)."""
 
     nstep: int = 10
     """Printout interval at which convergence progress is logged."""
@@ -831,6 +850,25 @@ class VmecWOut(BaseModelWithNumpy):
     TODO(jurasic) homogenize the two so this list can disappear.
     """
 
+    EVALUATE_QUANTITIES: typing.ClassVar[tuple[str, ...]] = (
+        "r",
+        "z",
+        "lambda",
+        "dr_ds",
+        "dr_dtheta",
+        "dr_dzeta",
+        "dz_ds",
+        "dz_dtheta",
+        "dz_dzeta",
+        "modb",
+        "bsupu",
+        "bsupv",
+        "sqrtg",
+        "curru",
+        "currv",
+    )
+    """Quantities that can be computed by ``evaluate``."""
+
     input_extension: typing.Annotated[str, pydantic.Field(max_length=100)] = ""
     """File extension of the input file."""
 
@@ -852,6 +890,7 @@ class VmecWOut(BaseModelWithNumpy):
             9: "miscellaneous error, can happen in mgrid_mod",
             10: "vacuum VMEC and ITOR mismatch",
             11: "ftolv termination condition satisfied",
+            12: "stopped early, the run was predicted not to converge",
         }.get(self.ier_flag, "unknown error")
 
     nfp: int
@@ -1398,6 +1437,138 @@ class VmecWOut(BaseModelWithNumpy):
             if reason != 1  # skip the "no restart" reason
         ]
 
+    def evaluate(
+        self,
+        s: npt.ArrayLike,
+        theta: npt.ArrayLike,
+        zeta: npt.ArrayLike,
+        quantities: typing.Sequence[str] = ("r", "z", "modb"),
+        max_threads: int | None = None,
+    ) -> dict[str, np.ndarray]:
+        r"""Evaluate real-space quantities at arbitrary points in flux coordinates.
+
+        The Fourier series are summed in C++ over all points in parallel. The Fourier
+        coefficients are interpolated radially with natural cubic splines through the
+        full- or half-grid surfaces they are stored on.
+
+        Args:
+            s: Normalized toroidal flux in ``[0, 1]``.
+            theta: VMEC poloidal angle.
+            zeta: Geometric toroidal angle over the full torus, i.e. the cylindrical
+                angle :math:`\phi`.
+            quantities: Names of the quantities to compute, see
+                ``EVALUATE_QUANTITIES``: ``r`` and ``z`` (cylindrical position),
+                ``lambda``, the derivatives ``dr_ds``, ``dr_dtheta``, ``dr_dzeta``,
+                ``dz_ds``, ``dz_dtheta``, ``dz_dzeta``, the field strength ``modb``,
+                the contravariant field components ``bsupu`` and ``bsupv``, the
+                Jacobian ``sqrtg`` and the contravariant current density components
+                ``curru`` and ``currv``.
+            max_threads: Maximum number of threads to use; all available threads
+                if ``None``.
+
+        Returns:
+            A dictionary from quantity name to an array with the broadcast shape of
+            ``s``, ``theta`` and ``zeta``.
+
+        Example:
+            >>> s = np.linspace(0.0, 1.0, 20)[:, None, None]
+            >>> theta = np.linspace(0.0, 2.0 * np.pi, 64)[None, :, None]
+            >>> zeta = np.linspace(0.0, 2.0 * np.pi, 128)[None, None, :]
+            >>> fields = wout.evaluate(s, theta, zeta, ["r", "z", "modb"])
+            >>> fields["modb"].shape
+            (20, 64, 128)
+        """
+        unknown = [q for q in quantities if q not in VmecWOut.EVALUATE_QUANTITIES]
+        if unknown:
+            msg = (
+                f"Unknown quantities {unknown}: supported are "
+                f"{list(VmecWOut.EVALUATE_QUANTITIES)}."
+            )
+            raise ValueError(msg)
+        s_b, theta_b, zeta_b = np.broadcast_arrays(
+            np.asarray(s, dtype=float),
+            np.asarray(theta, dtype=float),
+            np.asarray(zeta, dtype=float),
+        )
+        if not np.all((s_b >= 0.0) & (s_b <= 1.0)):
+            msg = "The normalized toroidal flux s must be in [0, 1]."
+            raise ValueError(msg)
+
+        values = _vmecpp.evaluate_wout(
+            self._to_cpp_wout(),
+            np.ravel(s_b),
+            np.ravel(theta_b),
+            np.ravel(zeta_b),
+            list(quantities),
+            max_threads,
+        )
+        return {name: value.reshape(s_b.shape) for name, value in values.items()}
+
+    def to_flux_coordinates(
+        self,
+        r: npt.ArrayLike,
+        phi: npt.ArrayLike,
+        z: npt.ArrayLike,
+        tolerance: float = 1e-10,
+        max_iterations: int = 50,
+        max_threads: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Locate points given in cylindrical coordinates in VMEC flux coordinates.
+
+        This is the inverse of ``evaluate(s, theta, phi, ["r", "z"])``. An initial
+        guess for each point is taken from a lookup table of the magnetic axis and the
+        plasma boundary on a set of toroidal planes and refined by Newton's method at
+        the exact toroidal angle. The points are processed in C++ in parallel.
+
+        Args:
+            r: Cylindrical radius.
+            phi: Cylindrical (geometric toroidal) angle.
+            z: Vertical position.
+            tolerance: Convergence criterion on the distance between the mapped point
+                and the target point, relative to the major radius.
+            max_iterations: Maximum number of Newton iterations per point.
+            max_threads: Maximum number of threads to use; all available threads
+                if ``None``.
+
+        Returns:
+            ``(s, theta, inside)`` with the broadcast shape of ``r``, ``phi`` and
+            ``z``: the normalized toroidal flux, the VMEC poloidal angle in
+            ``[0, 2 pi)`` and whether the point lies inside of the plasma boundary.
+            Points slightly outside of the plasma get an ``s > 1`` from a linear
+            continuation of the flux surface geometry. Where Newton's method did
+            not converge, e.g. far away from the plasma, ``s`` and ``theta`` are
+            NaN and ``inside`` is False.
+        """
+        r_b, phi_b, z_b = np.broadcast_arrays(
+            np.asarray(r, dtype=float),
+            np.asarray(phi, dtype=float),
+            np.asarray(z, dtype=float),
+        )
+        s, theta, inside = _vmecpp.wout_to_flux_coordinates(
+            self._to_cpp_wout(),
+            np.ravel(r_b),
+            np.ravel(phi_b),
+            np.ravel(z_b),
+            tolerance,
+            max_iterations,
+            max_threads,
+        )
+        shape = r_b.shape
+        return (
+            s.reshape(shape),
+            theta.reshape(shape),
+            inside.astype(bool).reshape(shape),
+        )
+
+    def compact(self, dtype: npt.DTypeLike = np.float64) -> CompactVmecWOut:
+        """Return a compact in-memory representation of this wout.
+
+        Derivable and all-zero Fourier coefficient arrays are omitted and recomputed
+        on access, the other ones are stored with the given ``dtype`` (float32 or
+        float64). See :class:`vmecpp.CompactVmecWOut` for the memory footprint.
+        """
+        return CompactVmecWOut(self, dtype)
+
     def save(self, out_path: str | Path) -> None:
         """Save contents in NetCDF3 format, e.g. ``wout.nc``.
 
@@ -2283,6 +2454,100 @@ class JxBOut(BaseModelWithNumpy):
         return jxbout
 
 
+class Timings(BaseModelWithNumpy):
+    """Wall-clock time spent in the individual stages of a VMEC++ run.
+
+    Only produced when profiling is requested via `vmecpp.run(..., profile=True)`.
+    """
+
+    model_config = pydantic.ConfigDict(extra="forbid")
+
+    stages: list[str]
+    """Names of the timed stages, in the order they are executed."""
+
+    seconds: jt.Float[np.ndarray, "n_stages"]
+    """Wall-clock seconds spent in each stage.
+
+    For stages that run on all threads concurrently, the time of the slowest thread is
+    used, so that the entries are comparable to `total_seconds`.
+    """
+
+    thread_seconds: jt.Float[np.ndarray, "n_stages"]
+    """Seconds spent in each stage, summed over all threads."""
+
+    calls: jt.Int[np.ndarray, "n_stages"]
+    """Number of times each stage was entered, summed over all threads."""
+
+    total_seconds: float
+    """Total wall-clock duration of the run."""
+
+    @staticmethod
+    def _from_cpp_timings(cpp_timings: _vmecpp.TimingReport) -> Timings:
+        return Timings(
+            stages=list(cpp_timings.stages),
+            seconds=np.asarray(cpp_timings.seconds, dtype=float),
+            thread_seconds=np.asarray(cpp_timings.thread_seconds, dtype=float),
+            calls=np.asarray(cpp_timings.calls, dtype=np.int64),
+            total_seconds=cpp_timings.total_seconds,
+        )
+
+    def __add__(self, other: Timings) -> Timings:
+        if self.stages != other.stages:
+            msg = "Cannot add Timings with different stages."
+            raise ValueError(msg)
+        return Timings(
+            stages=list(self.stages),
+            seconds=self.seconds + other.seconds,
+            thread_seconds=self.thread_seconds + other.thread_seconds,
+            calls=self.calls + other.calls,
+            total_seconds=self.total_seconds + other.total_seconds,
+        )
+
+    def table(self) -> str:
+        """Format the timings as a human-readable table, slowest stage first."""
+        width = max(len("stage"), *(len(stage) for stage in self.stages))
+        total = self.total_seconds if self.total_seconds > 0.0 else 1.0
+        lines = [f"{'stage':<{width}}  {'seconds':>10}  {'share':>6}  {'calls':>8}"]
+        for i in np.argsort(-self.seconds, kind="stable"):
+            if self.calls[i] == 0:
+                continue
+            lines.append(
+                f"{self.stages[i]:<{width}}  {self.seconds[i]:>10.4f}  "
+                f"{self.seconds[i] / total:>6.1%}  {self.calls[i]:>8d}"
+            )
+        lines.append(f"{'total':<{width}}  {self.total_seconds:>10.4f}")
+        return "\n".join(lines)
+
+
+class EarlyStopCriteria(pydantic.BaseModel):
+    """Criteria for giving up on runs that are not going to converge, see
+    `vmecpp.run(..., early_stop=...)`.
+
+    They are evaluated separately for each multigrid step. Setting a criterion to
+    zero disables it.
+    """
+
+    model_config = pydantic.ConfigDict(extra="forbid")
+
+    stagnation_window: pydantic.NonNegativeInt = 500
+    """Give up if the force residuals did not decrease by at least a factor
+    `stagnation_factor` within this many iterations."""
+
+    stagnation_factor: float = pydantic.Field(default=0.5, gt=0.0, le=1.0)
+    """Minimum relative improvement of the residuals within `stagnation_window`."""
+
+    max_restarts: pydantic.NonNegativeInt = 40
+    """Give up after this many restarts of the time evolution (bad Jacobian, bad
+    progress), i.e. the entries of `VmecWOut.restart_reasons` within one multigrid
+    step."""
+
+    min_time_step_fraction: pydantic.NonNegativeFloat = 0.05
+    """Give up if the time step drops below this fraction of `VmecInput.delt`."""
+
+    def _to_cpp_early_stop_criteria(self) -> _vmecpp.EarlyStopCriteria:
+        return _vmecpp.EarlyStopCriteria(**self.model_dump())
+
+
 class VmecOutput(BaseModelWithNumpy):
     """Container for the full output of a VMEC run."""
 
@@ -2329,6 +2594,12 @@ class VmecOutput(BaseModelWithNumpy):
     wout: VmecWOut
     """Python equivalent of VMEC's "wout" file."""
 
+    timings: Timings | None = None
+    """Time spent in the individual solver stages.
+
+    Only present if the run was performed with `profile=True`.
+    """
+
 
 _progress_tip_shown = False
 
@@ -2342,13 +2613,31 @@ def _print_progress_tip_once() -> None:
         )
 
 
+def _wrap_iteration_callback(
+    callback: Callable[[list[IterationRecord]], bool | None],
+) -> Callable[[list[_vmecpp.IterationRecord]], bool | None]:
+    def cpp_callback(cpp_records: list[_vmecpp.IterationRecord]) -> bool | None:
+        return callback(
+            [IterationRecord._from_cpp_iteration_record(r) for r in cpp_records]
+        )
+
+    return cpp_callback
+
+
 def run(
     input: VmecInput,
     magnetic_field: MagneticFieldResponseTable | None = None,
     *,
     max_threads: int | None = None,
     verbose: bool | int | OutputMode = OutputMode.PROGRESS,
-    restart_from: VmecOutput | None = None,
+    restart_from: VmecOutput | EquilibriumCache | None = None,
+    profile: bool = False,
+    iteration_callback: Callable[[list[IterationRecord]], bool | None] | None = None,
+    iteration_callback_stride: int = 1,
+    early_stop: bool | EarlyStopCriteria = False,
+    save_state_to: str | Path | None = None,
+    save_state_every: int = 100,
+    resume_from: str | Path | None = None,
 ) -> VmecOutput:
     """Run VMEC++ using the provided input. This is the main entrypoint for both fixed-
     and free-boundary calculations.
@@ -2356,7 +2645,9 @@ def run(
     Args:
         input: a VmecInput instance, corresponding to the contents of a classic VMEC input file
         magnetic_field: if present, VMEC++ will pass the magnetic field object in memory instead of reading
-            it from an mgrid file (only relevant in free-boundary runs).
+            it from an mgrid file (only relevant in free-boundary runs). Its fields are read in
+            place, so processes that run in parallel can share one copy of them, see
+            `MagneticFieldResponseTable.to_shared_memory`.
         max_threads: maximum number of threads that VMEC++ should spawn. The actual number might still
             be lower that this in case there are too few flux surfaces to keep these many threads
             busy. If None, a number of threads equal to the number of logical cores is used.
@@ -2370,6 +2661,39 @@ def run(
             convergence when running VMEC++ on a configuration that is very similar to the `restart_from` equilibrium.
             If `input.mpol`/`input.ntor` is a sequence (see below), this is used to hot-restart
             only the first continuation step; later steps always hot-restart from the previous one.
+            If `restart_from` is an `EquilibriumCache`, VMEC++ hot-restarts from the cached
+            equilibrium nearest to `input` (or starts from scratch if there is none), and the
+            converged output is added to the cache.
+        profile: if True, VMEC++ measures the wall-clock time spent in each stage of the solver
+            (geometry, forces, preconditioner, free-boundary update, ...) and reports it in
+            `VmecOutput.timings`. The timers are cheap but not free, so this is off by default.
+        iteration_callback: if present, receives the convergence data of the running solver
+            (residuals, time step, restart reason, MHD energy) as a list of `IterationRecord`s.
+            The records are buffered by the C++ solver and delivered in batches every `nstep`
+            iterations and at the end of each multigrid step, so the GIL is not reacquired on
+            every iteration. If the callback returns True, the run stops early: `run` then
+            raises a RuntimeError, or returns the unconverged output if
+            `input.return_outputs_even_if_not_converged` is set. Exceptions raised by the
+            callback also stop the run and are propagated.
+        iteration_callback_stride: record only every `iteration_callback_stride`-th iteration.
+        early_stop: if True or an `EarlyStopCriteria` instance, VMEC++ gives up on runs that are
+            predicted not to converge (stagnating residuals, repeated restarts, collapsing time
+            step) instead of exhausting `niter_array`. `True` uses the default `EarlyStopCriteria`.
+            Such runs raise a RuntimeError, or, if `input.return_outputs_even_if_not_converged`
+            is set, return their output with `wout.ier_flag == 12`.
+        save_state_to: if present, VMEC++ periodically writes a snapshot of the running solver
+            (state vector, time step control, convergence history, multigrid position) to this
+            HDF5 file, overwriting the previous snapshot. A run that was stopped or crashed can be
+            continued from this file with `resume_from`.
+        save_state_every: minimum number of iterations between two snapshots. Snapshots are only
+            taken at iterations after which the solver refreshes its preconditioner (and, in
+            free-boundary runs, the full NESTOR solution), so the actual spacing is rounded up
+            to the next such iteration.
+        resume_from: if present, VMEC++ continues the run from the snapshot in this file,
+            written by a previous run with `save_state_to` and the same `input`. The resumed
+            run follows the same iterations as an uninterrupted run would have; only the
+            Anderson acceleration history (`input.iteration_style`) starts over. `restart_from`
+            is ignored when resuming.
 
     If `input.mpol` and/or `input.ntor` is a sequence rather than a plain int, `run` performs
     continuation in Fourier resolution: each entry pairs with the corresponding `input.ns_array`
@@ -2387,13 +2711,42 @@ def run(
     """
     input = VmecInput.model_validate(input)
 
+    if isinstance(restart_from, EquilibriumCache):
+        cache = restart_from
+        output = run(
+            input,
+            magnetic_field,
+            max_threads=max_threads,
+            verbose=verbose,
+            restart_from=cache.nearest(input),
+            profile=profile,
+            iteration_callback=iteration_callback,
+            iteration_callback_stride=iteration_callback_stride,
+            early_stop=early_stop,
+            save_state_to=save_state_to,
+            save_state_every=save_state_every,
+            resume_from=resume_from,
+        )
+        cache.add(output)
+        return output
+
     if not isinstance(input.mpol, int) or not isinstance(input.ntor, int):
+        if save_state_to is not None or resume_from is not None:
+            msg = (
+                "save_state_to and resume_from are not supported for continuation "
+                "in Fourier resolution."
+            )
+            raise ValueError(msg)
         return _run_fourier_continuation(
             input,
             magnetic_field,
             max_threads=max_threads,
             verbose=verbose,
             restart_from=restart_from,
+            profile=profile,
+            iteration_callback=iteration_callback,
+            iteration_callback_stride=iteration_callback_stride,
+            early_stop=early_stop,
         )
 
     cpp_indata = input._to_cpp_vmecindata()
@@ -2413,6 +2766,28 @@ def run(
         )
         raise RuntimeError(msg)
 
+    if iteration_callback_stride < 1:
+        msg = "iteration_callback_stride must be >= 1."
+        raise ValueError(msg)
+
+    if save_state_every < 1:
+        msg = "save_state_every must be >= 1."
+        raise ValueError(msg)
+
+    cpp_iteration_callback = (
+        None
+        if iteration_callback is None
+        else _wrap_iteration_callback(iteration_callback)
+    )
+
+    if early_stop is True:
+        early_stop = EarlyStopCriteria()
+    cpp_early_stop = (
+        early_stop._to_cpp_early_stop_criteria()
+        if isinstance(early_stop, EarlyStopCriteria)
+        else _vmecpp.EarlyStopCriteria()
+    )
+
     _verbose = OutputMode(verbose)
 
     if _verbose == OutputMode.PROGRESS:
@@ -2430,6 +2805,13 @@ def run(
             initial_state=initial_state,
             max_threads=max_threads,
             verbose=_verbose.value,
+            profile=profile,
+            iteration_callback=cpp_iteration_callback,
+            iteration_callback_stride=iteration_callback_stride,
+            early_stop=cpp_early_stop,
+            save_state_to=save_state_to,
+            save_state_every=save_state_every,
+            resume_from=resume_from,
         )
     else:
         # magnetic_response_table takes precedence anyway, but let's be explicit, to ensure
@@ -2437,12 +2819,26 @@ def run(
         cpp_indata.mgrid_file = "NONE"
         cpp_output_quantities = _vmecpp.run(
             cpp_indata,
-            magnetic_response_table=magnetic_field._to_cpp_magnetic_field_response_table(),
+            magnetic_response_table=magnetic_field._to_cpp_magnetic_field_response_table_view(),
             initial_state=initial_state,
             max_threads=max_threads,
             verbose=_verbose.value,
+            profile=profile,
+            iteration_callback=cpp_iteration_callback,
+            iteration_callback_stride=iteration_callback_stride,
+            early_stop=cpp_early_stop,
+            save_state_to=save_state_to,
+            save_state_every=save_state_every,
+            resume_from=resume_from,
         )
 
+    return _output_from_cpp(input, cpp_output_quantities)
+
+
+def _output_from_cpp(
+    input: VmecInput, cpp_output_quantities: _vmecpp.OutputQuantities
+) -> VmecOutput:
+    """Convert the output quantities of a C++ run of `input` to a VmecOutput."""
     cpp_wout = cpp_output_quantities.wout
     wout = VmecWOut._from_cpp_wout(cpp_wout)
     jxbout = JxBOut._from_cpp_jxbout(cpp_output_quantities.jxbout)
@@ -2467,6 +2863,11 @@ def run(
             cpp_output_quantities.threed1_shafranov_integrals
         )
     )
+    timings = (
+        None
+        if cpp_output_quantities.timings is None
+        else Timings._from_cpp_timings(cpp_output_quantities.timings)
+    )
     return VmecOutput(
         input=input,
         wout=wout,
@@ -2478,9 +2879,111 @@ def run(
         threed1_axis=threed1_axis,
         threed1_betas=threed1_betas,
         threed1_shafranov_integrals=threed1_shafranov_integrals,
+        timings=timings,
     )
 
 
+def run_extcur_batch(
+    input: VmecInput,
+    magnetic_field: MagneticFieldResponseTable,
+    extcur: npt.ArrayLike,
+    *,
+    max_threads: int | None = None,
+    max_concurrent_runs: int | None = None,
+    verbose: bool | int | OutputMode = OutputMode.SILENT,
+    restart_from: VmecOutput | None = None,
+) -> list[VmecOutput]:
+    """Run a free-boundary VMEC++ calculation for each of several sets of coil currents.
+
+    All runs share one in-memory copy of `magnetic_field`: the per-circuit vacuum fields
+    are combined with the currents of each run only at the plasma boundary, so a scan
+    over coil currents does not copy or re-sum the full mgrid grid for every run.
+
+    Args:
+        input: a free-boundary VmecInput; its `extcur` is replaced by the rows of `extcur`.
+        magnetic_field: the per-circuit vacuum fields, shared by all runs.
+        extcur: [num_runs, nextcur] coil currents, one row per run.
+        max_threads: total number of threads used by the batch. If None, a number of
+            threads equal to the number of logical cores is used.
+        max_concurrent_runs: number of runs executed at the same time; the threads are
+            split evenly among them. If None, each run gets a single thread.
+        verbose: output format of the individual runs, see `run`.
+        restart_from: if present, every run is hot-restarted from this equilibrium.
+
+    Returns:
+        The outputs of the runs, in the order of the rows of `extcur`.
+
+    Raises:
+        RuntimeError: if any of the runs fails; the message lists the failed rows.
+    """
+    input = VmecInput.model_validate(input)
+    if not input.lfreeb:
+        msg = "run_extcur_batch requires a free-boundary input (lfreeb = True)."
+        raise ValueError(msg)
+    if not isinstance(input.mpol, int) or not isinstance(input.ntor, int):
+        msg = "run_extcur_batch does not support continuation in Fourier resolution."
+        raise ValueError(msg)
+
+    extcur = np.atleast_2d(np.asarray(extcur, dtype=np.float64))
+    nextcur = magnetic_field.b_r.shape[0]
+    if extcur.ndim != 2 or extcur.shape[1] != nextcur:
+        msg = (
+            f"extcur must have shape [num_runs, {nextcur}] to match the number of "
+            f"circuits in magnetic_field, got {extcur.shape}."
+        )
+        raise ValueError(msg)
+    if max_threads is not None and max_threads <= 0:
+        msg = (
+            "The number of threads must be >=1. To automatically use all "
+            "available threads, pass max_threads=None"
+        )
+        raise RuntimeError(msg)
+    if max_concurrent_runs is not None and max_concurrent_runs <= 0:
+        msg = "max_concurrent_runs must be >= 1."
+        raise ValueError(msg)
+
+    cpp_indata = input._to_cpp_vmecindata()
+    cpp_indata.mgrid_file = "NONE"
+    initial_state = (
+        None
+        if restart_from is None
+        else _vmecpp.HotRestartState(
+            wout=restart_from.wout._to_cpp_wout(),
+            indata=restart_from.input._to_cpp_vmecindata(),
+        )
+    )
+    _verbose = OutputMode(verbose)
+    if _verbose == OutputMode.PROGRESS:
+        # the progress bars of concurrent runs would overwrite each other
+        _verbose = OutputMode.PROGRESS_NON_TTY
+
+    cpp_results = _vmecpp.run_extcur_batch(
+        cpp_indata,
+        magnetic_response_table=magnetic_field._to_cpp_magnetic_field_response_table_view(),
+        extcur_batch=extcur,
+        initial_state=initial_state,
+        max_threads=max_threads,
+        max_concurrent_runs=max_concurrent_runs,
+        verbose=_verbose.value,
+    )
+
+    errors = [
+        f"run {i}: {result}"
+        for i, result in enumerate(cpp_results)
+        if isinstance(result, str)
+    ]
+    if errors:
+        msg = "\n".join(["Some runs of the coil current batch failed:", *errors])
+        raise RuntimeError(msg)
+
+    return [
+        _output_from_cpp(
+            input.model_copy(update={"extcur": extcur[i].copy()}), cpp_result
+        )
+        for i, cpp_result in enumerate(cpp_results)
+    ]
+
+
 def is_vmec2000_input(input_file: Path) -> bool:
     """Returns true if the input file looks like a Fortran VMEC/VMEC2000 INDATA file."""
     # we peek at the first few non-blank, non-comment lines in the file:
@@ -2642,13 +3145,20 @@ populate_raw_profile = set_profile
 # items in the generated documentation.
 __all__ = [  # noqa: RUF022
     "run",
+    "run_extcur_batch",
     "interpolate_solution",
+    "continuation_path",
+    "ContinuationPath",
+    "EquilibriumCache",
     "VmecInput",
     "VmecOutput",
     "VmecWOut",
+    "CompactVmecWOut",
     "JxBOut",
     "Mercier",
     "Threed1Volumetrics",
+    "Timings",
+    "EarlyStopCriteria",
     "MakegridParameters",
     "MagneticFieldResponseTable",
     "FreeBoundaryMethod",
@@ -2659,4 +3169,8 @@ __all__ = [  # noqa: RUF022
     "solve_multigrid",
     "IterationResult",
     "IterationState",
+    "IterationRecord",
+    "boozer_transform",
+    "BoozerOutput",
+    "coils",
 ]
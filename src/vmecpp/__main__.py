@@ -64,6 +64,11 @@ def parse_arguments(argv: list[str] | None = None) -> argparse.Namespace:
         help="Show the legacy table output instead of animated progress bars.",
         action="store_true",
     )
+    p.add_argument(
+        "--profile",
+        help="Print the time spent in each stage of the solver after the run.",
+        action="store_true",
+    )
     args = p.parse_args(argv)
     args.command = "run"
     return args
@@ -92,7 +97,12 @@ def main() -> None:
         vmecpp._progress_tip_shown = True
 
     vmec_input = vmecpp.VmecInput.from_file(args.input_file)
-    output = vmecpp.run(vmec_input, max_threads=args.max_threads, verbose=verbose)
+    output = vmecpp.run(
+        vmec_input,
+        max_threads=args.max_threads,
+        verbose=verbose,
+        profile=args.profile,
+    )
 
     configuration_name = vmecpp._util.get_vmec_configuration_name(args.input_file)
     wout_file = Path(f"wout_{configuration_name}.nc")
@@ -100,6 +110,9 @@ def main() -> None:
 
     print(f"\nOutput written to {wout_file}")  # noqa: T201
 
+    if output.timings is not None:
+        print(f"\n{output.timings.table()}")  # noqa: T201
+
 
 if __name__ == "__main__":
     main()
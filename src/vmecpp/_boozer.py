@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH <info@proximafusion.com>
+#
+# SPDX-License-Identifier: MIT
+"""In-memory transformation of VMEC++ equilibria to Boozer coordinates.
+
+This computes the same spectra as the external ``booz_xform`` code, directly from
+the Nyquist spectra ``bmnc``, ``bsubumnc``, ``bsubvmnc`` and the ``lmns`` spectrum of
+a :class:`vmecpp.VmecWOut`, without writing a wout file to disk.
+"""
+
+from __future__ import annotations
+
+import typing
+from collections.abc import Sequence
+
+import jaxtyping as jt
+import numpy as np
+import pydantic
+
+from vmecpp._pydantic_numpy import BaseModelWithNumpy
+from vmecpp.cpp import _vmecpp  # type: ignore
+
+if typing.TYPE_CHECKING:
+    from vmecpp import VmecOutput, VmecWOut
+
+
+class BoozerOutput(BaseModelWithNumpy):
+    """Fourier spectra of an equilibrium in Boozer coordinates.
+
+    The conventions follow ``booz_xform``: the Fourier kernel is ``m * theta_B - n
+    * zeta_B`` with ``xn_b`` including the number of field periods, and the 2D arrays
+    are given on the half-grid surfaces ``compute_surfs``.
+    """
+
+    model_config = pydantic.ConfigDict(extra="forbid")
+
+    mboz: int
+    """Number of poloidal Boozer modes, ``m = 0, ..., mboz - 1``."""
+
+    nboz: int
+    """Maximum toroidal Boozer mode number per field period."""
+
+    nfp: int
+    """Number of toroidal field periods."""
+
+    xm_b: jt.Int[np.ndarray, "mn_boz"]
+    """Poloidal mode numbers."""
+
+    xn_b: jt.Int[np.ndarray, "mn_boz"]
+    """Toroidal mode numbers, multiplied by ``nfp``."""
+
+    compute_surfs: jt.Int[np.ndarray, "n_surfaces"]
+    """Half-grid indices ``j = 0, ..., ns - 2`` of the transformed surfaces."""
+
+    s_b: jt.Float[np.ndarray, "n_surfaces"]
+    """Normalized toroidal flux ``s = (j + 1/2) / (ns - 1)`` of the surfaces."""
+
+    iota_b: jt.Float[np.ndarray, "n_surfaces"]
+    r"""Rotational transform :math:`\iota`."""
+
+    bvco_b: jt.Float[np.ndarray, "n_surfaces"]
+    """Boozer toroidal covariant field component ``G``."""
+
+    buco_b: jt.Float[np.ndarray, "n_surfaces"]
+    """Boozer poloidal covariant field component ``I``."""
+
+    bmnc_b: jt.Float[np.ndarray, "mn_boz n_surfaces"]
+    """Fourier coefficients (cos) of the magnetic field strength ``|B|``."""
+
+    rmnc_b: jt.Float[np.ndarray, "mn_boz n_surfaces"]
+    """Fourier coefficients (cos) of the cylindrical ``R``."""
+
+    zmns_b: jt.Float[np.ndarray, "mn_boz n_surfaces"]
+    """Fourier coefficients (sin) of the cylindrical ``Z``."""
+
+    numns_b: jt.Float[np.ndarray, "mn_boz n_surfaces"]
+    r"""Fourier coefficients (sin) of :math:`\nu = \zeta_B - \zeta`."""
+
+    gmnc_b: jt.Float[np.ndarray, "mn_boz n_surfaces"]
+    r"""Fourier coefficients (cos) of the Boozer Jacobian
+    :math:`(G + \iota I) / B^2`."""
+
+    @staticmethod
+    def _from_cpp_boozer_spectra(cpp_obj: _vmecpp.BoozerSpectra) -> BoozerOutput:
+        return BoozerOutput(
+            **{attr: getattr(cpp_obj, attr) for attr in BoozerOutput.model_fields}
+        )
+
+
+def boozer_transform(
+    output: VmecOutput | VmecWOut,
+    mboz: int,
+    nboz: int,
+    surfaces: Sequence[int] | None = None,
+    max_threads: int | None = None,
+) -> BoozerOutput:
+    """Transform a VMEC++ equilibrium to Boozer coordinates.
+
+    Args:
+        output: The result of :func:`vmecpp.run`, or its ``wout``.
+        mboz: Number of poloidal Boozer modes ``m = 0, ..., mboz - 1``.
+        nboz: Maximum toroidal Boozer mode number per field period.
+        surfaces: Half-grid indices ``j = 0, ..., ns - 2`` of the surfaces to
+            transform, as ``compute_surfs`` in ``booz_xform``. All surfaces if
+            ``None``.
+        max_threads: Maximum number of threads, over which the surfaces are
+            distributed; all available threads if ``None``.
+
+    Only stellarator-symmetric equilibria are supported.
+
+    Example:
+        >>> output = vmecpp.run(vmecpp.VmecInput.from_file("w7x.json"))
+        >>> booz = vmecpp.boozer_transform(output, mboz=32, nboz=32)
+        >>> booz.bmnc_b.shape == (booz.xm_b.size, output.wout.ns - 1)
+        True
+    """
+    wout = getattr(output, "wout", output)
+    if wout.lasym:
+        msg = (
+            "The Boozer transform of non-stellarator-symmetric equilibria is not "
+            "supported."
+        )
+        raise NotImplementedError(msg)
+    surface_list = [] if surfaces is None else [int(j) for j in surfaces]
+    invalid = [j for j in surface_list if not 0 <= j <= wout.ns - 2]
+    if invalid:
+        msg = (
+            f"Surface indices {invalid} are outside of the half grid "
+            f"[0, {wout.ns - 2}]."
+        )
+        raise ValueError(msg)
+    cpp_spectra = _vmecpp.boozer_transform(
+        wout._to_cpp_wout(), mboz, nboz, surface_list, max_threads
+    )
+    return BoozerOutput._from_cpp_boozer_spectra(cpp_spectra)
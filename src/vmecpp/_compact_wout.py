@@ -0,0 +1,306 @@
+# SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH <info@proximafusion.com>
+#
+# SPDX-License-Identifier: MIT
+"""A compact in-memory representation of :class:`vmecpp.VmecWOut`.
+
+The memory of a ``VmecWOut`` is dominated by its two-dimensional Fourier coefficient
+arrays of shape ``(mnmax, ns)`` and ``(mnmax_nyq, ns)``, several of which are
+redundant: ``lmns`` is the half-grid interpolation of ``lmns_full``, the current
+densities ``currumnc``/``currvmnc`` follow from the covariant magnetic field
+components, ``fsqt`` is the sum of the force residual traces, and the non-
+stellarator-symmetric arrays of a stellarator-symmetric equilibrium read from a wout
+file are all zero. :class:`CompactVmecWOut` omits these
+arrays and recomputes them when they are accessed, and optionally stores the
+remaining Fourier coefficient arrays in single precision, which is useful to keep
+many outputs in memory at once, e.g. as the training set of a surrogate model::
+
+    compact_wouts = [
+        vmecpp.run(vmec_input).wout.compact(np.float32) for vmec_input in inputs
+    ]
+    rmnc = compact_wouts[0].rmnc  # float64, cast on access
+    wout = compact_wouts[0].to_wout()  # full VmecWOut
+
+Memory footprint of the Fourier coefficient arrays of stellarator-symmetric outputs
+with ``ns=51``:
+
+=======================  =====  =========  =======  ===============  ===============
+input (mpol, ntor)       mnmax  mnmax_nyq  full     compact float64  compact float32
+=======================  =====  =========  =======  ===============  ===============
+solovev.json (6, 0)      6      10         0.05 MB  0.04 MB          0.02 MB
+cma.json (5, 6)          59     145        0.63 MB  0.49 MB          0.30 MB
+w7x.json (12, 12)        288    574        2.58 MB  1.99 MB          1.23 MB
+=======================  =====  =========  =======  ===============  ===============
+
+i.e. ``8 * ns * (4 * mnmax + 9 * mnmax_nyq)`` bytes for the full output, ``8 * ns *
+(3 * mnmax + 7 * mnmax_nyq)`` bytes in compact float64 and ``4 * ns * (3 * mnmax + 9
+* mnmax_nyq)`` bytes in compact float32, where the current densities are kept because
+the radial finite differences of single-precision magnetic field components do not
+reproduce them to single precision. The non-stellarator-symmetric arrays of ``lasym``
+outputs add the same again. ``CompactVmecWOut.nbytes`` reports the footprint of all
+arrays of an instance.
+"""
+
+from __future__ import annotations
+
+import typing
+
+import numpy as np
+import numpy.typing as npt
+
+if typing.TYPE_CHECKING:
+    from vmecpp import VmecWOut
+
+# Same value as MU_0 in vmecpp/common/util/util.h.
+_MU_0 = 4.0e-7 * np.pi
+
+
+def _radial_grid(ns: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return ``sqrt(s)`` on the full- and half-grid and the ``sm``/``sp`` half-grid
+    interpolation weights for odd-m quantities, as computed in RadialProfiles."""
+    sqrt_s_full = np.sqrt(np.arange(ns) / (ns - 1.0))
+    # avoid round-off errors
+    sqrt_s_full[-1] = 1.0
+    sqrt_s_half = np.sqrt((np.arange(ns - 1) + 0.5) / (ns - 1.0))
+    sm = sqrt_s_half / sqrt_s_full[1:]
+    sp = np.empty(ns - 1)
+    sp[1:] = sqrt_s_half[1:] / sqrt_s_full[1:-1]
+    # cannot divide by sqrt_s_full[0]==0, so extrapolate as constant from next point
+    sp[0] = sm[0]
+    return sqrt_s_full, sqrt_s_half, sm, sp
+
+
+def _lambda_on_half_grid(lambda_full: np.ndarray, xm: np.ndarray) -> np.ndarray:
+    """Interpolate full-grid lambda coefficients onto the half-grid, like
+    ComputeWOutFileContents does for ``lmns`` and ``lmnc``."""
+    ns = lambda_full.shape[1]
+    _, _, sm, sp = _radial_grid(ns)
+    outside = lambda_full[:, 1:]
+    inside = lambda_full[:, :-1].copy()
+    # lambda has no contribution from the axis for m <= 1
+    inside[xm <= 1, 0] = outside[xm <= 1, 0]
+    odd_m = (xm % 2 == 1)[:, np.newaxis]
+    lambda_half = np.zeros_like(lambda_full)
+    lambda_half[:, 1:] = np.where(
+        odd_m, (sm * outside + sp * inside) / 2.0, (outside + inside) / 2.0
+    )
+    return lambda_half
+
+
+def _current_densities(
+    bsubs: np.ndarray,
+    bsubu: np.ndarray,
+    bsubv: np.ndarray,
+    xm_nyq: np.ndarray,
+    xn_nyq: np.ndarray,
+    sign: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the Fourier coefficients of ``sqrt(g) J^theta`` and ``sqrt(g)
+    J^zeta`` from the covariant magnetic field components, like the
+    Compute_Currents port in ComputeWOutFileContents.
+
+    ``sign`` is -1 for the stellarator-symmetric (cos) and +1 for the non-
+    stellarator-symmetric (sin) coefficients.
+    """
+    ns = bsubs.shape[1]
+    ohs = ns - 1.0
+    sqrt_s_full, sqrt_s_half, _, _ = _radial_grid(ns)
+    sqrt_s_half_inner = sqrt_s_half[:-1]
+    sqrt_s_half_outer = sqrt_s_half[1:]
+    sqrt_s_full_interior = sqrt_s_full[1:-1]
+
+    # interior full-grid points j_f = 1 .. ns-2 between the half-grid points
+    # bsub*[:, j_f] and bsub*[:, j_f+1]
+    bs_inner, bs_outer = bsubs[:, 1:-1], bsubs[:, 2:]
+    bu_inner, bu_outer = bsubu[:, 1:-1], bsubu[:, 2:]
+    bv_inner, bv_outer = bsubv[:, 1:-1], bsubv[:, 2:]
+
+    # odd m: regularized derivatives
+    bu0 = bu_inner / sqrt_s_half_inner
+    bu1 = bu_outer / sqrt_s_half_outer
+    bv0 = bv_inner / sqrt_s_half_inner
+    bv1 = bv_outer / sqrt_s_half_outer
+    t1_odd = (
+        0.5
+        * (sqrt_s_half_outer * bs_outer + sqrt_s_half_inner * bs_inner)
+        / sqrt_s_full_interior
+    )
+    t2_odd = (
+        ohs * (bu1 - bu0) * sqrt_s_full_interior
+        + 0.25 * (bu0 + bu1) / sqrt_s_full_interior
+    )
+    t3_odd = (
+        ohs * (bv1 - bv0) * sqrt_s_full_interior
+        + 0.25 * (bv0 + bv1) / sqrt_s_full_interior
+    )
+
+    # even m: simple finite differences
+    t1_even = 0.5 * (bs_outer + bs_inner)
+    t2_even = ohs * (bu_outer - bu_inner)
+    t3_even = ohs * (bv_outer - bv_inner)
+
+    odd_m = (xm_nyq % 2 == 1)[:, np.newaxis]
+    t1 = np.where(odd_m, t1_odd, t1_even)
+    t2 = np.where(odd_m, t2_odd, t2_even)
+    t3 = np.where(odd_m, t3_odd, t3_even)
+
+    m = xm_nyq[:, np.newaxis].astype(np.float64)
+    n_nfp = xn_nyq[:, np.newaxis].astype(np.float64)
+    curru = np.zeros_like(bsubs)
+    currv = np.zeros_like(bsubs)
+    curru[:, 1:-1] = sign * n_nfp * t1 - t3
+    currv[:, 1:-1] = sign * m * t1 + t2
+
+    # axis: extrapolate for m <= 1, zero for m > 1
+    low_m = xm_nyq <= 1
+    for curr in (curru, currv):
+        curr[low_m, 0] = 2.0 * curr[low_m, 1] - curr[low_m, 2]
+        # edge: linear extrapolation
+        curr[:, -1] = 2.0 * curr[:, -2] - curr[:, -3]
+
+    return curru / _MU_0, currv / _MU_0
+
+
+def _derive(name: str, fields: typing.Mapping[str, typing.Any]) -> np.ndarray:
+    """Recompute the omitted array ``name`` from the arrays in ``fields``."""
+    if name == "fsqt":
+        return (
+            fields["force_residual_r"]
+            + fields["force_residual_z"]
+            + fields["force_residual_lambda"]
+        )
+    if name in ("lmns", "lmnc"):
+        return _lambda_on_half_grid(fields[f"{name}_full"], fields["xm"])
+    if name in ("currumnc", "currvmnc"):
+        keys = ("bsubsmns", "bsubumnc", "bsubvmnc")
+        sign = -1.0
+    else:  # currumns, currvmns
+        keys = ("bsubsmnc", "bsubumns", "bsubvmns")
+        sign = 1.0
+    curru, currv = _current_densities(
+        *(fields[key] for key in keys), fields["xm_nyq"], fields["xn_nyq"], sign
+    )
+    return curru if name.startswith("curru") else currv
+
+
+# Arrays that can be omitted, together with the arrays they are derived from, none
+# of which can be omitted itself.
+_DERIVABLE: dict[str, tuple[str, ...]] = {
+    "fsqt": ("force_residual_r", "force_residual_z", "force_residual_lambda"),
+    "lmns": ("lmns_full", "xm"),
+    "lmnc": ("lmnc_full", "xm"),
+    "currumnc": ("bsubsmns", "bsubumnc", "bsubvmnc", "xm_nyq", "xn_nyq"),
+    "currvmnc": ("bsubsmns", "bsubumnc", "bsubvmnc", "xm_nyq", "xn_nyq"),
+    "currumns": ("bsubsmnc", "bsubumns", "bsubvmns", "xm_nyq", "xn_nyq"),
+    "currvmns": ("bsubsmnc", "bsubumns", "bsubvmns", "xm_nyq", "xn_nyq"),
+}
+
+
+def _is_fourier_array(value: typing.Any) -> bool:
+    return (
+        isinstance(value, np.ndarray)
+        and value.ndim == 2
+        and np.issubdtype(value.dtype, np.floating)
+    )
+
+
+class CompactVmecWOut:
+    """A :class:`vmecpp.VmecWOut` that omits derivable and all-zero Fourier
+    coefficient arrays and optionally stores the others in reduced precision.
+
+    Create it with :meth:`vmecpp.VmecWOut.compact` and convert it back with
+    :meth:`to_wout`. All ``VmecWOut`` fields can be read as attributes; the
+    Fourier coefficient arrays are returned as float64, omitted ones are recomputed
+    on every access.
+
+    An array is only omitted if recomputing it from the stored arrays reproduces it
+    to the precision of ``dtype``, so wout files from other VMEC versions that
+    compute it differently keep their own values.
+    """
+
+    def __init__(self, wout: VmecWOut, dtype: npt.DTypeLike = np.float64) -> None:
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float32, np.float64):
+            msg = f"dtype must be float32 or float64, got {dtype}."
+            raise ValueError(msg)
+
+        # For the precision check of omitted arrays.
+        self._rtol = 10.0 * np.finfo(dtype).eps
+
+        self._dtype = dtype
+        self._fields: dict[str, typing.Any] = {}
+        self._zero_shapes: dict[str, tuple[int, ...]] = {}
+        self._derived: list[str] = []
+
+        values = {name: getattr(wout, name) for name in type(wout).model_fields}
+        values.update(wout.model_extra or {})
+        for name, value in values.items():
+            if not _is_fourier_array(value):
+                self._fields[name] = value
+            elif value.size > 0 and not np.any(value):
+                self._zero_shapes[name] = value.shape
+            else:
+                self._fields[name] = value.astype(dtype)
+
+        for name, sources in _DERIVABLE.items():
+            if not all(
+                self._fields.get(field) is not None for field in (name, *sources)
+            ):
+                continue
+            value = values[name]
+            derived = _derive(name, self)
+            atol = self._rtol * np.abs(value).max(initial=0.0)
+            if derived.shape == value.shape and np.allclose(
+                derived, value, rtol=self._rtol, atol=atol
+            ):
+                del self._fields[name]
+                self._derived.append(name)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """The dtype in which the Fourier coefficient arrays are stored."""
+        return self._dtype
+
+    @property
+    def derived_fields(self) -> list[str]:
+        """Names of the arrays that are not stored, but recomputed on access."""
+        return list(self._derived)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the arrays of this object in bytes."""
+        return sum(
+            value.nbytes
+            for value in self._fields.values()
+            if isinstance(value, np.ndarray)
+        )
+
+    def __getitem__(self, name: str) -> typing.Any:
+        if name in self._fields:
+            value = self._fields[name]
+            if _is_fourier_array(value):
+                return value.astype(np.float64)
+            return value
+        if name in self._zero_shapes:
+            return np.zeros(self._zero_shapes[name])
+        if name in self._derived:
+            return _derive(name, self)
+        raise KeyError(name)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        # Only called for names that are not regular attributes. Private names are
+        # never fields, which also avoids a recursion while unpickling, before
+        # _fields is set.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            msg = f"'{type(self).__name__}' object has no attribute '{name}'"
+            raise AttributeError(msg) from None
+
+    def to_wout(self) -> VmecWOut:
+        """Return the full :class:`vmecpp.VmecWOut`, with all arrays in float64."""
+        from vmecpp import VmecWOut  # noqa: PLC0415  (avoids a circular import)
+
+        names = [*self._fields, *self._zero_shapes, *self._derived]
+        return VmecWOut(**{name: self[name] for name in names})
@@ -22,17 +22,26 @@ zero) or truncated (modes the target drops are discarded). VMEC++ recomputes eve
 derived quantity from this geometry on restart, so only the geometry (``rmnc``,
 ``zmns``, ``lmns_full`` and their non-symmetric partners, plus the axis) needs to be
 physically meaningful; all other arrays are carried over at consistent shapes only.
+
+:func:`continuation_path` is the analogous driver for continuation in a physics
+parameter (pressure scale, a boundary coefficient, coil currents) at fixed
+resolution: each step starts from a polynomial extrapolation of the previous solutions
+along the parameter instead of from the previous solution as-is.
 """
 
 from __future__ import annotations
 
 import typing
+from dataclasses import dataclass, field
 
 import numpy as np
 
 if typing.TYPE_CHECKING:
-    from vmecpp import OutputMode, VmecInput, VmecOutput
+    from collections.abc import Callable, Sequence
+
+    from vmecpp import EarlyStopCriteria, OutputMode, VmecInput, VmecOutput
     from vmecpp._free_boundary import MagneticFieldResponseTable
+    from vmecpp._iteration import IterationRecord
 
 # State-vector geometry arrays, shape [mn_mode, n_surfaces]. These are the only
 # quantities VMEC++ reads back when hot-restarting, so they must be interpolated.
@@ -301,6 +310,10 @@ def _run_fourier_continuation(
     max_threads: int | None,
     verbose: bool | int | OutputMode,
     restart_from: VmecOutput | None,
+    profile: bool = False,
+    iteration_callback: Callable[[list[IterationRecord]], bool | None] | None = None,
+    iteration_callback_stride: int = 1,
+    early_stop: bool | EarlyStopCriteria = False,
 ) -> VmecOutput:
     """Solves an equilibrium by continuation in Fourier resolution.
 
@@ -315,12 +328,14 @@ def _run_fourier_continuation(
     Args:
         input: the target configuration. Its boundary is the final-resolution
             boundary; each step truncates or zero-pads it to that step's resolution.
-        magnetic_field, max_threads, verbose, restart_from: forwarded to
+        magnetic_field, max_threads, verbose, restart_from, profile,
+        iteration_callback, iteration_callback_stride, early_stop: forwarded to
             :func:`vmecpp.run` for every step (``restart_from`` only seeds the first).
 
     Returns:
         The converged :class:`VmecOutput` at the final resolution, with ``input`` set
-        to the original (full-schedule) ``input`` argument.
+        to the original (full-schedule) ``input`` argument. If ``profile`` is set,
+        ``timings`` holds the stage timings summed over all steps.
     """
     import vmecpp  # noqa: PLC0415  (lazy import avoids a circular import)
 
@@ -347,6 +362,7 @@ def _run_fourier_continuation(
     niter_schedule = [int(x) for x in input.niter_array]
 
     output = restart_from
+    timings = None
     for i in range(n_steps):
         step_input = _step_input(
             input,
@@ -363,7 +379,219 @@ def _run_fourier_continuation(
             max_threads=max_threads,
             verbose=verbose,
             restart_from=guess,
+            profile=profile,
+            iteration_callback=iteration_callback,
+            iteration_callback_stride=iteration_callback_stride,
+            early_stop=early_stop,
         )
+        if output.timings is not None:
+            timings = output.timings if timings is None else timings + output.timings
 
     assert output is not None  # n_steps >= 1, so the loop always assigns output
-    return output.model_copy(update={"input": input})
+    return output.model_copy(update={"input": input, "timings": timings})
+
+
+@dataclass
+class ContinuationPath:
+    """Outcome of :func:`continuation_path`."""
+
+    values: list[float]
+    """The parameter values, in the order they were solved."""
+
+    outputs: list[VmecOutput]
+    """The converged equilibrium for each entry of ``values``."""
+
+    iterations: list[int]
+    """Number of iterations (force evaluations) each step took to converge."""
+
+    predictor_orders: list[int]
+    """Polynomial order of the initial guess of each step: -1 for the first step
+    (``restart_from`` or a cold start), 0 for a plain hot restart from the previous
+    step, 1 for a linear and 2 for a quadratic extrapolation."""
+
+    hot_restart_iterations: list[int | None] = field(default_factory=list)
+    """Number of iterations a plain hot restart from the previous step took instead,
+    for the steps that used an extrapolated guess. Only filled with
+    ``compare_to_hot_restart=True``; None for the other steps."""
+
+    @property
+    def iterations_saved(self) -> int:
+        """Iterations saved by the extrapolated guesses compared to plain hot
+        restarts, summed over the steps that were compared."""
+        return sum(
+            baseline - iterations
+            for baseline, iterations in zip(
+                self.hot_restart_iterations, self.iterations, strict=True
+            )
+            if baseline is not None
+        )
+
+
+def _with_parameter(
+    base_input: VmecInput,
+    parameter: str | tuple[str, int | tuple[int, ...]] | Callable,
+    value: float,
+) -> VmecInput:
+    """Return a copy of ``base_input`` with ``parameter`` set to ``value``."""
+    import vmecpp  # noqa: PLC0415  (lazy import avoids a circular import)
+
+    step = base_input.model_copy(deep=True)
+    if callable(parameter):
+        return vmecpp.VmecInput.model_validate(parameter(step, value))
+    if isinstance(parameter, str):
+        setattr(step, parameter, value)
+        return step
+    name, index = parameter
+    values = np.array(getattr(step, name), dtype=float)
+    values[index] = value
+    setattr(step, name, values)
+    return step
+
+
+def _lagrange_weights(nodes: Sequence[float], x: float) -> np.ndarray:
+    """Weights of the Lagrange polynomial through ``nodes``, evaluated at ``x``."""
+    weights = np.ones(len(nodes))
+    for i, x_i in enumerate(nodes):
+        for j, x_j in enumerate(nodes):
+            if i != j:
+                weights[i] *= (x - x_j) / (x_i - x_j)
+    return weights
+
+
+def _extrapolate_solution(
+    outputs: Sequence[VmecOutput],
+    nodes: Sequence[float],
+    value: float,
+    target_input: VmecInput,
+) -> VmecOutput:
+    """Extrapolate the state geometry of ``outputs`` at ``nodes`` to ``value``.
+
+    All ``outputs`` must share the resolution of ``target_input``. As in
+    :func:`interpolate_solution`, only the state geometry and the axis are
+    extrapolated; all other arrays are those of the last output.
+    """
+    weights = _lagrange_weights(nodes, value)
+    wout = outputs[-1].wout.model_copy(deep=True)
+    for name in _STATE_GEOMETRY_FIELDS + _WOUT_AXIS_FIELDS:
+        if getattr(wout, name) is None:
+            continue
+        extrapolated = sum(
+            w * np.asarray(getattr(o.wout, name), dtype=float)
+            for w, o in zip(weights, outputs, strict=True)
+        )
+        setattr(wout, name, extrapolated)
+    return outputs[-1].model_copy(update={"wout": wout, "input": target_input})
+
+
+def continuation_path(
+    input: VmecInput,
+    parameter: str | tuple[str, int | tuple[int, ...]] | Callable,
+    values: Sequence[float],
+    magnetic_field: MagneticFieldResponseTable | None = None,
+    *,
+    order: int = 2,
+    max_threads: int | None = None,
+    verbose: bool | int | OutputMode = False,
+    restart_from: VmecOutput | None = None,
+    compare_to_hot_restart: bool = False,
+) -> ContinuationPath:
+    """Solve a sequence of equilibria along a parameter with a predictor-corrector
+    scheme.
+
+    The first value is solved like :func:`vmecpp.run` would (with the full
+    ``ns_array`` schedule, or hot-restarted from ``restart_from``). Every later value
+    is solved at the final ``ns_array`` resolution only, starting from the polynomial
+    through the last ``order + 1`` solutions along the parameter, evaluated at the new
+    value (the predictor); VMEC++ then converges from there (the corrector). If the
+    run from the extrapolated guess fails, the step is repeated as a plain hot restart
+    from the previous solution.
+
+    Args:
+        input: the configuration at the start of the path. Must have a single Fourier
+            resolution (plain int ``mpol`` and ``ntor``).
+        parameter: what to vary. Either the name of a scalar ``VmecInput`` field
+            (e.g. ``"pres_scale"``, ``"curtor"``, ``"phiedge"``), a ``(name, index)``
+            pair for an element of an array field (e.g. ``("rbc", (1, input.ntor))``
+            or ``("extcur", 0)``), or a callable ``(input, value) -> input`` that
+            returns a copy of ``input`` updated for ``value``.
+        values: the parameter values to solve for, in order.
+        order: maximum order of the extrapolation: 0 is a plain hot restart from the
+            previous step, 1 is linear and 2 quadratic extrapolation. The first steps
+            use lower orders until enough previous solutions are available.
+        magnetic_field, max_threads, verbose: forwarded to :func:`vmecpp.run`.
+        restart_from: if present, the first step is hot-restarted from it.
+        compare_to_hot_restart: if True, every step that starts from an extrapolated
+            guess is also solved as a plain hot restart from the previous step, to
+            measure the iterations saved (see ``ContinuationPath.iterations_saved``).
+            This roughly doubles the cost and is meant for tuning only.
+
+    Returns:
+        A :class:`ContinuationPath` with the converged outputs and iteration counts.
+    """
+    import vmecpp  # noqa: PLC0415  (lazy import avoids a circular import)
+
+    if not isinstance(input.mpol, int) or not isinstance(input.ntor, int):
+        msg = "continuation_path requires a single Fourier resolution (int mpol/ntor)."
+        raise ValueError(msg)
+    if order < 0:
+        msg = "order must be >= 0."
+        raise ValueError(msg)
+    values = [float(v) for v in values]
+    if len(set(values)) != len(values):
+        msg = "The parameter values of a continuation path must be distinct."
+        raise ValueError(msg)
+
+    def _run(step_input: VmecInput, guess: VmecOutput | None) -> VmecOutput:
+        return vmecpp.run(
+            step_input,
+            magnetic_field,
+            max_threads=max_threads,
+            verbose=verbose,
+            restart_from=guess,
+        )
+
+    path = ContinuationPath(values=[], outputs=[], iterations=[], predictor_orders=[])
+    for value in values:
+        step_input = _with_parameter(input, parameter, value)
+        if not path.outputs:
+            output = _run(step_input, restart_from)
+            path_order = -1
+            baseline = None
+        else:
+            # hot restarts begin at ns_array[0], so only solve the final resolution
+            step_input = _step_input(
+                step_input,
+                int(input.ns_array[-1]),
+                input.mpol,
+                input.ntor,
+                float(input.ftol_array[-1]),
+                int(input.niter_array[-1]),
+            )
+            path_order = min(order, len(path.outputs) - 1)
+            previous = path.outputs[-1].model_copy(update={"input": step_input})
+            if path_order == 0:
+                guess = previous
+            else:
+                guess = _extrapolate_solution(
+                    path.outputs[-(path_order + 1) :],
+                    path.values[-(path_order + 1) :],
+                    value,
+                    step_input,
+                )
+            try:
+                output = _run(step_input, guess)
+            except RuntimeError:
+                if path_order == 0:
+                    raise
+                path_order = 0
+                output = _run(step_input, previous)
+            baseline = None
+            if compare_to_hot_restart and path_order > 0:
+                baseline = int(_run(step_input, previous).wout.niter)
+
+        path.values.append(value)
+        path.outputs.append(output)
+        path.iterations.append(int(output.wout.niter))
+        path.predictor_orders.append(path_order)
+        path.hot_restart_iterations.append(baseline)
+    return path
@@ -0,0 +1,380 @@
+# SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH <info@proximafusion.com>
+#
+# SPDX-License-Identifier: MIT
+"""A store of converged equilibria to pick hot-restart guesses from.
+
+Hot-restarting from a nearby equilibrium (``vmecpp.run(input, restart_from=...)``)
+cuts the number of iterations dramatically (see ``examples/hot_restart_scaling.py``),
+but in parameter scans and optimizer populations the best equilibrium to restart from
+has to be picked by hand. :class:`EquilibriumCache` does that automatically: it keeps
+the converged outputs of previous runs and, for a new input, returns the one whose
+boundary and profiles are closest, remapped to the resolution of the new input with
+:func:`vmecpp.interpolate_solution` if needed.
+
+Passing a cache as ``restart_from`` to :func:`vmecpp.run` hot-restarts from its
+nearest entry (or cold-starts if there is none yet) and adds the converged result to
+the cache, so a campaign only has to create the cache once::
+
+    cache = vmecpp.EquilibriumCache("equilibria/")
+    for vmec_input in inputs:
+        output = vmecpp.run(vmec_input, restart_from=cache)
+
+With a ``directory``, entries are also written to disk, so that they survive the
+process and are shared between processes that use the same directory.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import hashlib
+import os
+import tempfile
+import typing
+from pathlib import Path
+
+import numpy as np
+
+if typing.TYPE_CHECKING:
+    from vmecpp import VmecInput, VmecOutput
+
+# Suffixes of the two files that make up an on-disk entry. The (small) input is read
+# eagerly to compute the features, the (large) output only once it is needed.
+_INPUT_SUFFIX = ".input.json"
+_OUTPUT_SUFFIX = ".output.json"
+
+# Feature groups compared by the nearest-neighbour search, see _features.
+_BOUNDARY_GROUP = "boundary"
+_PROFILE_GROUPS = ("pressure", "iota", "current", "phiedge", "extcur")
+
+
+def _is_converged(output: VmecOutput) -> bool:
+    wout = output.wout
+    return wout.ier_flag == 0 and max(wout.fsqr, wout.fsqz, wout.fsql) <= wout.ftolv
+
+
+def _boundary_resolution(vmec_input: VmecInput) -> tuple[int, int]:
+    """Return the ``(mpol, ntor)`` of the boundary arrays of ``vmec_input``."""
+    rbc = np.asarray(vmec_input.rbc)
+    return rbc.shape[0], (rbc.shape[1] - 1) // 2
+
+
+def _features(vmec_input: VmecInput) -> dict[str, np.ndarray]:
+    """Return the feature vectors of ``vmec_input``, grouped by physical meaning.
+
+    The boundary group holds the R/Z boundary Fourier coefficients as 2D arrays, so that
+    inputs of different resolution can be brought to a common shape. The profile groups
+    hold the coefficients of the pressure (scaled by ``pres_scale``), iota and current
+    profiles, including their spline knots, and the boundary toroidal flux and coil
+    currents.
+    """
+    rbc = np.asarray(vmec_input.rbc, dtype=float)
+    boundary = [
+        np.zeros_like(rbc) if value is None else np.asarray(value, dtype=float)
+        for value in (rbc, vmec_input.zbs, vmec_input.rbs, vmec_input.zbc)
+    ]
+    return {
+        _BOUNDARY_GROUP: np.stack(boundary),
+        "pressure": vmec_input.pres_scale
+        * np.concatenate([vmec_input.am, vmec_input.am_aux_f]),
+        "iota": np.concatenate([vmec_input.ai, vmec_input.ai_aux_f]),
+        "current": np.concatenate(
+            [[vmec_input.curtor], vmec_input.ac, vmec_input.ac_aux_f]
+        ),
+        "phiedge": np.asarray([vmec_input.phiedge]),
+        "extcur": np.asarray(vmec_input.extcur if vmec_input.lfreeb else []),
+    }
+
+
+def _pad_boundary(boundary: np.ndarray, mpol: int, ntor: int) -> np.ndarray:
+    """Zero-pad ``[num_arrays, mpol, 2 * ntor + 1]`` boundary arrays, flattened."""
+    from vmecpp import VmecInput  # noqa: PLC0415  (avoids a circular import)
+
+    return np.concatenate(
+        [VmecInput.resize_2d_coeff(b, mpol, ntor).ravel() for b in boundary]
+    )
+
+
+def _pad_profile(values: np.ndarray, length: int) -> np.ndarray:
+    return np.pad(values, (0, length - len(values)))
+
+
+class _Entry:
+    """A cached equilibrium: its input and, once loaded, its output."""
+
+    def __init__(self, vmec_input: VmecInput, output: VmecOutput | None = None):
+        self.input = vmec_input
+        self.output = output
+        self.features = _features(vmec_input)
+        # compatibility key: entries can only be used for inputs that agree on these
+        self.kind = (vmec_input.nfp, vmec_input.lasym, vmec_input.lfreeb)
+
+
+class EquilibriumCache:
+    """Nearest-neighbour store of converged equilibria for hot restarts.
+
+    Entries are compared through a feature vector made of the plasma boundary
+    (``rbc``, ``zbs`` and, for asymmetric inputs, ``rbs``, ``zbc``) and of the
+    profile parameters (pressure, iota and current profile coefficients, ``curtor``,
+    ``phiedge`` and, in free-boundary runs, ``extcur``). Each of these groups
+    contributes its difference relative to the norm of the two compared vectors, so
+    the distance does not depend on the units or on the size of the device; the
+    profile groups are weighted by ``profile_weight``. Only entries with the same
+    ``nfp``, ``lasym`` and ``lfreeb`` as the query are considered.
+
+    Args:
+        directory: if present, entries are also stored in (and loaded from) this
+            directory, one pair of JSON files per entry. Several caches, also in
+            different processes, can share the same directory.
+        max_entries: maximum number of entries; the least recently used ones are
+            evicted, also from ``directory``. None means no limit.
+        interpolate: if True, entries of a different resolution than the query are
+            remapped with :func:`vmecpp.interpolate_solution`. If False, only entries
+            with the query's ``ns_array[0]``, ``mpol`` and ``ntor`` are considered.
+        profile_weight: weight of the profile groups relative to the boundary in the
+            distance.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        *,
+        max_entries: int | None = 100,
+        interpolate: bool = True,
+        profile_weight: float = 1.0,
+    ):
+        if max_entries is not None and max_entries < 1:
+            msg = "max_entries must be >= 1, or None for no limit."
+            raise ValueError(msg)
+        if profile_weight < 0.0:
+            msg = "profile_weight must be >= 0."
+            raise ValueError(msg)
+
+        self.directory = None if directory is None else Path(directory)
+        self.max_entries = max_entries
+        self.interpolate = interpolate
+        self.profile_weight = profile_weight
+
+        # least recently used first
+        self._entries: collections.OrderedDict[str, _Entry] = collections.OrderedDict()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._sync_with_directory()
+
+    def __len__(self) -> int:
+        self._sync_with_directory()
+        return len(self._entries)
+
+    def add(self, output: VmecOutput) -> bool:
+        """Add the equilibrium in ``output`` to the cache.
+
+        Outputs that did not converge are not added. An entry with the same input
+        replaces the existing one.
+
+        Returns:
+            True if the output was added.
+        """
+        if not _is_converged(output):
+            return False
+
+        key = hashlib.sha256(output.input.to_json().encode()).hexdigest()[:32]
+        self._sync_with_directory()
+        self._entries[key] = _Entry(output.input, output)
+        self._entries.move_to_end(key)
+        if self.directory is not None:
+            # the output goes first: the input file marks a complete entry
+            self._write(key + _OUTPUT_SUFFIX, output.model_dump_json())
+            self._write(key + _INPUT_SUFFIX, output.input.to_json())
+        self._evict()
+        return True
+
+    def nearest(self, input: VmecInput) -> VmecOutput | None:
+        """Return the cached equilibrium closest to ``input``, ready to be passed as
+        ``restart_from`` to :func:`vmecpp.run` together with ``input``.
+
+        If the entry has a different resolution than ``input`` (``ns_array[0]``,
+        ``mpol``, ``ntor``), it is interpolated to that resolution. For inputs with
+        continuation in Fourier resolution (sequence-valued ``mpol``/``ntor``), the
+        entry is returned as is, since every continuation step interpolates its
+        starting point anyway.
+
+        Returns:
+            None if the cache holds no compatible entry.
+        """
+        from vmecpp import _continuation  # noqa: PLC0415  (avoids a circular import)
+
+        self._sync_with_directory()
+        single_resolution = _is_single_resolution(input)
+        target = (int(input.ns_array[0]), *_final_resolution(input)[1:])
+
+        kind = (input.nfp, input.lasym, input.lfreeb)
+        candidates = [
+            key
+            for key, entry in self._entries.items()
+            if entry.kind == kind
+            and (
+                self.interpolate
+                or not single_resolution
+                or _final_resolution(entry.input) == target
+            )
+        ]
+        if not candidates:
+            return None
+
+        distances = self._distances(input, [self._entries[k] for k in candidates])
+        key = candidates[int(np.argmin(distances))]
+        output = self._load_output(key)
+        if output is None:
+            # removed from the directory by another process in the meantime
+            return self.nearest(input)
+        self._touch(key)
+
+        if not single_resolution:
+            return output
+        if _is_single_resolution(output.input) and (
+            _final_resolution(output.input) == target
+        ):
+            return output
+        step_input = _continuation._step_input(
+            input,
+            ns=target[0],
+            mpol=input.mpol,
+            ntor=input.ntor,
+            ftol=float(input.ftol_array[0]),
+            niter=int(input.niter_array[0]),
+        )
+        return _continuation.interpolate_solution(output, step_input)
+
+    def clear(self) -> None:
+        """Remove all entries, also from ``directory``."""
+        self._sync_with_directory()
+        for key in list(self._entries):
+            self._remove(key)
+
+    def _distances(self, query: VmecInput, entries: list[_Entry]) -> np.ndarray:
+        """Distance of ``query`` to each of ``entries``, vectorized over entries."""
+        query_features = _features(query)
+        mpol, ntor = _boundary_resolution(query)
+        for entry in entries:
+            entry_mpol, entry_ntor = _boundary_resolution(entry.input)
+            mpol, ntor = max(mpol, entry_mpol), max(ntor, entry_ntor)
+
+        squared = np.zeros(len(entries))
+        for group in (_BOUNDARY_GROUP, *_PROFILE_GROUPS):
+            if group == _BOUNDARY_GROUP:
+                a = _pad_boundary(query_features[group], mpol, ntor)
+                b = np.stack(
+                    [_pad_boundary(e.features[group], mpol, ntor) for e in entries]
+                )
+                weight = 1.0
+            else:
+                length = max(
+                    len(query_features[group]),
+                    *(len(e.features[group]) for e in entries),
+                )
+                a = _pad_profile(query_features[group], length)
+                b = np.stack([_pad_profile(e.features[group], length) for e in entries])
+                weight = self.profile_weight
+            scale = np.maximum(np.linalg.norm(a), np.linalg.norm(b, axis=1))
+            difference = np.linalg.norm(b - a, axis=1)
+            relative = np.divide(
+                difference, scale, out=np.zeros_like(difference), where=scale > 0.0
+            )
+            squared += weight * relative**2
+        return np.sqrt(squared)
+
+    def _sync_with_directory(self) -> None:
+        """Pick up entries added and drop entries removed by other caches."""
+        if self.directory is None:
+            return
+        on_disk = {
+            path.name[: -len(_INPUT_SUFFIX)]: path
+            for path in self.directory.glob("*" + _INPUT_SUFFIX)
+        }
+        for key in [k for k in self._entries if k not in on_disk]:
+            del self._entries[key]
+
+        from vmecpp import VmecInput  # noqa: PLC0415  (avoids a circular import)
+
+        new_keys = sorted(
+            (k for k in on_disk if k not in self._entries),
+            key=lambda k: _mtime(on_disk[k]),
+        )
+        for key in new_keys:
+            try:
+                vmec_input = VmecInput.model_validate_json(on_disk[key].read_text())
+            except FileNotFoundError:
+                continue
+            self._entries[key] = _Entry(vmec_input)
+        self._evict()
+
+    def _load_output(self, key: str) -> VmecOutput | None:
+        entry = self._entries[key]
+        if entry.output is None:
+            from vmecpp import VmecOutput  # noqa: PLC0415  (avoids a circular import)
+
+            assert self.directory is not None
+            try:
+                text = (self.directory / (key + _OUTPUT_SUFFIX)).read_text()
+            except FileNotFoundError:
+                del self._entries[key]
+                return None
+            entry.output = VmecOutput.model_validate_json(text)
+        return entry.output
+
+    def _touch(self, key: str) -> None:
+        """Mark the entry as most recently used."""
+        self._entries.move_to_end(key)
+        if self.directory is not None:
+            # the modification time orders the entries of other caches
+            with_input = self.directory / (key + _INPUT_SUFFIX)
+            with contextlib.suppress(OSError):
+                os.utime(with_input)
+
+    def _evict(self) -> None:
+        if self.max_entries is None:
+            return
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        del self._entries[key]
+        if self.directory is not None:
+            # the input goes first: the entry disappears for other caches at once
+            for suffix in (_INPUT_SUFFIX, _OUTPUT_SUFFIX):
+                (self.directory / (key + suffix)).unlink(missing_ok=True)
+
+    def _write(self, name: str, text: str) -> None:
+        """Write ``text`` to ``directory/name`` atomically."""
+        assert self.directory is not None
+        tmp_fd, tmp_name = tempfile.mkstemp(
+            dir=self.directory, prefix=name + ".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(tmp_fd, "w") as f:
+                f.write(text)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        Path(tmp_name).replace(self.directory / name)
+
+
+def _is_single_resolution(vmec_input: VmecInput) -> bool:
+    return isinstance(vmec_input.mpol, int) and isinstance(vmec_input.ntor, int)
+
+
+def _final_resolution(vmec_input: VmecInput) -> tuple[int, int, int]:
+    """Return ``(ns, mpol, ntor)`` of the last step of ``vmec_input``, i.e. the
+    resolution of its solution."""
+    return (
+        int(vmec_input.ns_array[-1]),
+        int(np.atleast_1d(vmec_input.mpol)[-1]),
+        int(np.atleast_1d(vmec_input.ntor)[-1]),
+    )
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
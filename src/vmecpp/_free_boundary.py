@@ -3,6 +3,8 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+import typing
+from collections.abc import Sequence
 from pathlib import Path
 
 import jaxtyping as jt
@@ -64,6 +66,25 @@ class MakegridParameters(BaseModelWithNumpy):
         )
 
 
+def _magnetic_configuration_from_simsopt_coils(
+    coils: Sequence[typing.Any],
+    *,
+    nfp: int,
+    stellsym: bool,
+    circuit_ids: Sequence[int] | None,
+) -> _vmecpp.MagneticConfiguration:
+    """The coils of all field periods, from the SIMSOPT ``Coil`` objects of one."""
+    if circuit_ids is None:
+        circuit_ids = range(1, len(coils) + 1)
+    return _vmecpp.MagneticConfiguration.from_arrays(
+        [np.asarray(coil.curve.gamma()) for coil in coils],
+        np.array([coil.current.get_value() for coil in coils], dtype=float),
+        list(circuit_ids),
+        nfp=nfp,
+        stellsym=stellsym,
+    )
+
+
 class MagneticFieldResponseTable(BaseModelWithNumpy):
     """
     Pydantic model mirroring the C++ makegrid::MagneticFieldResponseTable struct.
@@ -87,6 +108,57 @@ class MagneticFieldResponseTable(BaseModelWithNumpy):
     b_z: jt.Float[np.ndarray, "num_coils num_mgrid_cells"]
     """Cylindrical Z components of magnetic field per circuit."""
 
+    _shared_memory_path: Path | None = pydantic.PrivateAttr(default=None)
+
+    def __reduce_ex__(self, protocol: typing.SupportsIndex):
+        # A table in shared memory is pickled as a handle to the file that backs its
+        # fields, so that dispatching it to a worker process does not copy them.
+        if self._shared_memory_path is None:
+            return super().__reduce_ex__(protocol)
+        return (
+            MagneticFieldResponseTable.from_shared_memory,
+            (self._shared_memory_path, self.parameters),
+        )
+
+    @property
+    def shared_memory_path(self) -> Path | None:
+        """The file that backs the fields, if the table is in shared memory."""
+        return self._shared_memory_path
+
+    def to_shared_memory(self, path: str | Path) -> MagneticFieldResponseTable:
+        """Copy the fields into the file ``path`` and return a table that memory-maps
+        them from there.
+
+        On Linux, a path in ``/dev/shm`` keeps the fields in a POSIX shared-memory
+        segment. The returned table is pickled as a handle to ``path``, so worker
+        processes of ``multiprocessing`` or ``concurrent.futures`` map the same
+        physical memory instead of receiving a copy, and ``vmecpp.run`` reads the
+        fields in place. The fields of the returned table are read-only.
+
+        The caller owns the file and should delete it when all workers are done.
+        """
+        fields = np.lib.format.open_memmap(
+            path, mode="w+", dtype=np.float64, shape=(3, *self.b_r.shape)
+        )
+        fields[0] = self.b_r
+        fields[1] = self.b_p
+        fields[2] = self.b_z
+        fields.flush()
+        del fields
+        return MagneticFieldResponseTable.from_shared_memory(path, self.parameters)
+
+    @staticmethod
+    def from_shared_memory(
+        path: str | Path, parameters: MakegridParameters
+    ) -> MagneticFieldResponseTable:
+        """Memory-map the fields that ``to_shared_memory`` wrote to ``path``."""
+        fields = np.load(path, mmap_mode="r")
+        magnetic_field_response_table = MagneticFieldResponseTable(
+            parameters=parameters, b_r=fields[0], b_p=fields[1], b_z=fields[2]
+        )
+        magnetic_field_response_table._shared_memory_path = Path(path)
+        return magnetic_field_response_table
+
     @staticmethod
     def _from_cpp_magnetic_field_response_table(
         cpp_obj: _vmecpp.MagneticFieldResponseTable,
@@ -108,6 +180,17 @@ class MagneticFieldResponseTable(BaseModelWithNumpy):
         makegrid_parameters: MakegridParameters,
     ) -> MagneticFieldResponseTable:
         magnetic_configuration = _vmecpp.MagneticConfiguration.from_file(coils_path)
+        return MagneticFieldResponseTable.from_magnetic_configuration(
+            magnetic_configuration, makegrid_parameters
+        )
+
+    @staticmethod
+    def from_magnetic_configuration(
+        magnetic_configuration: _vmecpp.MagneticConfiguration,
+        makegrid_parameters: MakegridParameters,
+    ) -> MagneticFieldResponseTable:
+        """Compute the response table of a coil set that is already in memory, e.g.
+        from ``_vmecpp.MagneticConfiguration.from_arrays``."""
         cpp_response_table = _vmecpp.compute_magnetic_field_response_table(
             makegrid_parameters._to_cpp_makegrid_parameters(),
             magnetic_configuration,
@@ -116,6 +199,40 @@ class MagneticFieldResponseTable(BaseModelWithNumpy):
             cpp_response_table
         )
 
+    @staticmethod
+    def from_simsopt_coils(
+        coils: Sequence[typing.Any],
+        makegrid_parameters: MakegridParameters,
+        *,
+        stellsym: bool = False,
+        circuit_ids: Sequence[int] | None = None,
+    ) -> MagneticFieldResponseTable:
+        """Compute the response table of SIMSOPT ``Coil`` objects, without writing and
+        parsing a coils file.
+
+        Args:
+            coils: The base coils of one field period (of one half-period if
+                ``stellsym``), as passed to SIMSOPT's ``coils_via_symmetries``. They
+                are repeated in all ``makegrid_parameters.number_of_field_periods``
+                field periods, and mirrored with reversed current if ``stellsym``.
+            makegrid_parameters: The grid to evaluate the field on.
+            stellsym: Whether to add the stellarator-symmetric copies of the coils.
+            circuit_ids: The serial circuit of each base coil, which also contains its
+                symmetric copies. Defaults to one circuit per base coil.
+
+        The result is the same as for ``from_coils_file`` on the file written by
+        SIMSOPT's ``coils_to_makegrid`` for the same coils and circuits.
+        """
+        magnetic_configuration = _magnetic_configuration_from_simsopt_coils(
+            coils,
+            nfp=makegrid_parameters.number_of_field_periods,
+            stellsym=stellsym,
+            circuit_ids=circuit_ids,
+        )
+        return MagneticFieldResponseTable.from_magnetic_configuration(
+            magnetic_configuration, makegrid_parameters
+        )
+
     def _to_cpp_magnetic_field_response_table(
         self,
     ) -> _vmecpp.MagneticFieldResponseTable:
@@ -139,6 +256,19 @@ class MagneticFieldResponseTable(BaseModelWithNumpy):
             self.b_z,
         )
 
+    def _to_cpp_magnetic_field_response_table_view(
+        self,
+    ) -> _vmecpp.MagneticFieldResponseTableView:
+        """Create a C++ view of the fields, which references the memory of the arrays
+        (e.g. in shared memory) instead of copying it, if they are C-contiguous
+        float64 arrays."""
+        return _vmecpp.MagneticFieldResponseTableView(
+            self.parameters._to_cpp_makegrid_parameters(),
+            np.ascontiguousarray(self.b_r, dtype=np.float64),
+            np.ascontiguousarray(self.b_p, dtype=np.float64),
+            np.ascontiguousarray(self.b_z, dtype=np.float64),
+        )
+
 
 __all__ = [
     "MagneticFieldResponseTable",
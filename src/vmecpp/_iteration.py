@@ -29,6 +29,14 @@ residual is handled:
   slow-progress safeguard so the permissiveness cannot stall short of force
   balance. Built to converge for the equilibria each of the other two handles.
 
+Orthogonal to the restart control, ``"anderson"`` uses the VMEC 8.52 control but
+replaces the damped second-order Richardson ("velocity") step by an Anderson-mixed
+(nonlinear GMRES) step along the preconditioned forces. The step itself is the
+native ``Vmec::AndersonTimeStep`` (``VmecModel.anderson_time_step``), so both
+loops share one mixer; its history is cleared at every preconditioner update and
+by ``VmecModel.restore_backup``. It needs fewer force evaluations than the
+velocity step on the Solov'ev and CTH-like cases, but more on the CMA case.
+
 Owning this loop in Python is the foundation for developing further iteration
 schemes (like ``"robust"``) without touching the C++ core.
 """
@@ -64,12 +72,15 @@ _NDAMP = 10
 # FlowControl::kPreconditionerUpdateInterval.
 _PRECOND_INTERVAL = 25
 
-# Iteration styles. "vmec_8_52" and "parvmec" are vmecpp::IterationStyle values
-# (exposed as VmecModel.iteration_style); "robust" is a Python-only common-ground
-# scheme (see solve_equilibrium) that runs on the same forward model.
+# Iteration styles. "vmec_8_52", "parvmec" and "anderson" are
+# vmecpp::IterationStyle values (exposed as VmecModel.iteration_style); "robust" is
+# a Python-only common-ground scheme (see solve_equilibrium) that runs on the same
+# forward model.
 _VMEC_8_52 = "vmec_8_52"
 _PARVMEC = "parvmec"
 _ROBUST = "robust"
+_ANDERSON = "anderson"
+_CPP_ITERATION_STYLES = (_VMEC_8_52, _PARVMEC, _ANDERSON)
 
 # Residual-growth tolerance before reverting the geometry: VMEC 8.52 reverts at
 # 100x the running minimum (TimeStepControl in Vmec::SolveEquilibriumLoop),
@@ -149,6 +160,58 @@ class IterationState:
     """Total MHD energy W of the current geometry."""
 
 
+@dataclass(frozen=True)
+class IterationRecord:
+    """Convergence data of one force iteration of :func:`vmecpp.run`, passed in
+    batches to its ``iteration_callback``.
+
+    Unlike :class:`IterationState`, these are recorded by the multi-threaded C++
+    solver itself, so they only carry what the C++ iteration loop already tracks
+    for its residual traces.
+    """
+
+    ns: int
+    """Number of flux surfaces of the current multigrid step."""
+    iteration: int
+    """Iteration counter, as printed in the iteration log (iter2)."""
+
+    fsqr: float
+    fsqz: float
+    fsql: float
+
+    fsqr1: float
+    fsqz1: float
+    fsql1: float
+
+    time_step: float
+    """Time step used in this iteration."""
+    mhd_energy: float
+    """Total MHD energy W of the current geometry."""
+    delbsq: float
+    """Mismatch in |B|^2 at the LCFS (free-boundary only, zero otherwise)."""
+    restart_reason: int
+    """:class:`RestartReason` of this iteration (1 if there was no restart)."""
+
+    @staticmethod
+    def _from_cpp_iteration_record(
+        cpp_record: _vmecpp.IterationRecord,
+    ) -> IterationRecord:
+        return IterationRecord(
+            ns=cpp_record.ns,
+            iteration=cpp_record.iteration,
+            fsqr=cpp_record.fsqr,
+            fsqz=cpp_record.fsqz,
+            fsql=cpp_record.fsql,
+            fsqr1=cpp_record.fsqr1,
+            fsqz1=cpp_record.fsqz1,
+            fsql1=cpp_record.fsql1,
+            time_step=cpp_record.time_step,
+            mhd_energy=cpp_record.mhd_energy,
+            delbsq=cpp_record.delbsq,
+            restart_reason=cpp_record.restart_reason,
+        )
+
+
 @dataclass
 class IterationResult:
     """Outcome of :func:`solve_equilibrium`."""
@@ -183,7 +246,8 @@ def solve_equilibrium(
     invariant residuals, advances the geometry with the Garabedian time step
     (damping from the preconditioned-residual history), and applies the time-step
     / restart control of the selected ``style``. ``style`` is one of
-    ``"vmec_8_52"``, ``"parvmec"``, ``"robust"``; when ``None`` it defaults to
+    ``"vmec_8_52"``, ``"parvmec"``, ``"robust"``, ``"anderson"``; when ``None``
+    it defaults to
     ``model.iteration_style``. ``model`` must already be initialized at a single
     radial resolution via ``VmecModel.create``.
 
@@ -196,6 +260,7 @@ def solve_equilibrium(
     style = style if style is not None else model.iteration_style
     parvmec = style == _PARVMEC
     robust = style == _ROBUST
+    anderson = style == _ANDERSON
 
     ftolv = model.ftolv
     niterv = model.niterv
@@ -311,7 +376,10 @@ def solve_equilibrium(
                     otav += float(_v)
                 otav /= _NDAMP
                 dtau = delt0r * otav / 2.0
-                model.perform_time_step(1.0 / (1.0 + dtau), 1.0 - dtau, delt0r)
+                if anderson:
+                    model.anderson_time_step(iter1, iter2, delt0r)
+                else:
+                    model.perform_time_step(1.0 / (1.0 + dtau), 1.0 - dtau, delt0r)
 
             saved_backup = False
             restarted = False
@@ -553,7 +621,7 @@ def solve_multigrid(
     and ``results`` is the per-stage list of :class:`IterationResult`.
     """
     cpp_indata = vmec_input._to_cpp_vmecindata()
-    if iteration_style in (_VMEC_8_52, _PARVMEC):
+    if iteration_style in _CPP_ITERATION_STYLES:
         cpp_indata.iteration_style = getattr(
             _vmecpp.IterationStyle, iteration_style.upper()
         )
@@ -614,8 +682,8 @@ def iterate(
     """Create a single-resolution :class:`VmecModel` for ``vmec_input`` and run the
     Python force-balance iteration on it.
 
-    ``iteration_style`` is one of ``"vmec_8_52"``, ``"parvmec"``, ``"robust"`` and
-    overrides the input's own setting; when ``None`` the input's
+    ``iteration_style`` is one of ``"vmec_8_52"``, ``"parvmec"``, ``"robust"``,
+    ``"anderson"`` and overrides the input's own setting; when ``None`` the input's
     ``iteration_style`` is used (default ``"vmec_8_52"``). Returns
     ``(model, IterationResult)``; ``model`` holds the converged geometry (inspect
     it with ``get_state()`` / the residual properties). ``ns`` defaults to the
@@ -628,10 +696,10 @@ def iterate(
     if ns is None:
         ns = int(np.asarray(vmec_input.ns_array)[-1])
     cpp_indata = vmec_input._to_cpp_vmecindata()
-    # vmec_8_52 and parvmec are C++ IterationStyle values; "robust" is a
-    # Python-only common-ground scheme on the (style-agnostic) forward model, so
-    # only the former two set the enum -- the style is always passed to the loop.
-    if iteration_style in (_VMEC_8_52, _PARVMEC):
+    # vmec_8_52, parvmec and anderson are C++ IterationStyle values; "robust" is
+    # a Python-only common-ground scheme on the (style-agnostic) forward model, so
+    # only the former set the enum -- the style is always passed to the loop.
+    if iteration_style in _CPP_ITERATION_STYLES:
         cpp_indata.iteration_style = getattr(
             _vmecpp.IterationStyle, iteration_style.upper()
         )
@@ -0,0 +1,510 @@
+# SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH <info@proximafusion.com>
+#
+# SPDX-License-Identifier: MIT
+"""Vacuum magnetic field of coils, evaluated with the Biot-Savart law.
+
+The coils are given as a ``MagneticConfiguration``, e.g. from
+``_vmecpp.MagneticConfiguration.from_file`` for a MAKEGRID coils file, from
+``_vmecpp.MagneticConfiguration.from_arrays`` or from SIMSOPT coils with
+:func:`from_simsopt_coils`, or as the path to a coils file. The
+evaluation points are distributed over OpenMP threads, with the GIL released.
+
+The ``*_adjoint`` functions give the derivatives of an objective of the field with
+respect to the vertices of the coils, e.g., for coil optimization, at the cost of
+about one field evaluation. Besides the field evaluated directly with the
+Biot-Savart law, this covers the field that the free-boundary solver interpolates on
+the plasma boundary from a ``MagneticFieldResponseTable``, see
+:func:`lcfs_interpolated_field`. The response of the free-boundary equilibrium
+itself to the coils is not covered: it would need the vacuum field on the plasma
+boundary to a higher accuracy than the half-grid quantities in the ``wout`` give it.
+"""
+
+from __future__ import annotations
+
+import typing
+from collections.abc import Sequence
+from pathlib import Path
+
+import jaxtyping as jt
+import numpy as np
+
+from vmecpp._free_boundary import (
+    MagneticFieldResponseTable,
+    _magnetic_configuration_from_simsopt_coils,
+)
+from vmecpp.cpp import _vmecpp  # type: ignore
+
+if typing.TYPE_CHECKING:
+    from vmecpp import VmecInput, VmecWOut
+    from vmecpp._free_boundary import MakegridParameters
+
+
+def _as_magnetic_configuration(
+    magnetic_configuration: _vmecpp.MagneticConfiguration | str | Path,
+) -> _vmecpp.MagneticConfiguration:
+    if isinstance(magnetic_configuration, (str, Path)):
+        return _vmecpp.MagneticConfiguration.from_file(magnetic_configuration)
+    return magnetic_configuration
+
+
+def _as_points(points: np.ndarray) -> np.ndarray:
+    points = np.ascontiguousarray(points, dtype=float)
+    if points.ndim != 2 or points.shape[1] != 3:
+        msg = f"points must have shape (num_points, 3), but have shape {points.shape}"
+        raise ValueError(msg)
+    return points
+
+
+def from_simsopt_coils(
+    coils: Sequence[typing.Any],
+    *,
+    nfp: int = 1,
+    stellsym: bool = False,
+    circuit_ids: Sequence[int] | None = None,
+) -> _vmecpp.MagneticConfiguration:
+    """``MagneticConfiguration`` of SIMSOPT ``Coil`` objects, without writing and
+    parsing a coils file.
+
+    Args:
+        coils: The base coils of one field period (of one half-period if
+            ``stellsym``), as passed to SIMSOPT's ``coils_via_symmetries``. They are
+            repeated in all ``nfp`` field periods, and mirrored with reversed current
+            if ``stellsym``. With the defaults, ``coils`` is the complete coil set.
+        nfp: The number of field periods.
+        stellsym: Whether to add the stellarator-symmetric copies of the coils.
+        circuit_ids: The serial circuit of each base coil, which also contains its
+            symmetric copies. Defaults to one circuit per base coil.
+    """
+    return _magnetic_configuration_from_simsopt_coils(
+        coils, nfp=nfp, stellsym=stellsym, circuit_ids=circuit_ids
+    )
+
+
+def magnetic_field(
+    magnetic_configuration: _vmecpp.MagneticConfiguration | str | Path,
+    points: jt.Float[np.ndarray, "num_points 3"],
+    *,
+    max_threads: int | None = None,
+) -> jt.Float[np.ndarray, "num_points 3"]:
+    """Cartesian magnetic field in Tesla at the Cartesian ``points``.
+
+    Args:
+        magnetic_configuration: The coils, with their currents in Ampere.
+        points: The evaluation points in meters, one ``(x, y, z)`` per row.
+        max_threads: Number of OpenMP threads; all available threads if not given.
+    """
+    return _vmecpp.magnetic_field(
+        _as_magnetic_configuration(magnetic_configuration),
+        _as_points(points),
+        max_threads=max_threads,
+    )
+
+
+def magnetic_field_adjoint(
+    magnetic_configuration: _vmecpp.MagneticConfiguration | str | Path,
+    points: jt.Float[np.ndarray, "num_points 3"],
+    cotangents: jt.Float[np.ndarray, "num_points 3"],
+    *,
+    max_threads: int | None = None,
+) -> list[jt.Float[np.ndarray, "num_vertices 3"]]:
+    """Gradient of ``sum_i cotangents[i] . B(points[i])`` with respect to the vertices
+    of the polygon filaments, i.e., the adjoint of :func:`magnetic_field`.
+
+    Given the derivatives of a scalar objective with respect to the magnetic field at
+    the ``points``, this yields its derivatives with respect to the coil geometry at
+    the cost of about one evaluation of the field, instead of one evaluation per
+    vertex coordinate for finite differences. The derivatives are computed
+    analytically from the Biot-Savart law for straight segments.
+
+    Args:
+        magnetic_configuration: The coils, with their currents in Ampere.
+        points: The evaluation points in meters, one ``(x, y, z)`` per row.
+        cotangents: The derivatives of the objective with respect to the Cartesian
+            magnetic field at each of the ``points``.
+        max_threads: Number of OpenMP threads; all available threads if not given.
+
+    Returns:
+        One ``(num_vertices, 3)`` array per polygon filament, in the order in which
+        they appear in the ``MagneticConfiguration``. A closed polygon repeats its
+        first vertex at the end, so the derivative with respect to that point is the
+        sum of the first and the last row.
+    """
+    return _vmecpp.magnetic_field_adjoint(
+        _as_magnetic_configuration(magnetic_configuration),
+        _as_points(points),
+        _as_points(cotangents),
+        max_threads=max_threads,
+    )
+
+
+def vector_potential(
+    magnetic_configuration: _vmecpp.MagneticConfiguration | str | Path,
+    points: jt.Float[np.ndarray, "num_points 3"],
+    *,
+    max_threads: int | None = None,
+) -> jt.Float[np.ndarray, "num_points 3"]:
+    """Cartesian magnetic vector potential in Tesla * meter at the Cartesian
+    ``points``.
+
+    Args:
+        magnetic_configuration: The coils, with their currents in Ampere.
+        points: The evaluation points in meters, one ``(x, y, z)`` per row.
+        max_threads: Number of OpenMP threads; all available threads if not given.
+    """
+    return _vmecpp.vector_potential(
+        _as_magnetic_configuration(magnetic_configuration),
+        _as_points(points),
+        max_threads=max_threads,
+    )
+
+
+def enclosed_toroidal_flux(
+    magnetic_configuration: _vmecpp.MagneticConfiguration | str | Path,
+    vmec_input: VmecInput,
+    *,
+    phi: float = 0.0,
+    num_theta: int = 256,
+    max_threads: int | None = None,
+) -> float:
+    """Toroidal flux of the vacuum field through the plasma boundary of
+    ``vmec_input``, e.g. to set ``vmec_input.phiedge`` for a free-boundary run.
+
+    The flux through the cross-section of the boundary at the toroidal angle ``phi``
+    is the line integral of the vector potential along the boundary curve, which is
+    evaluated with the trapezoidal rule on ``num_theta`` poloidal points and hence
+    converges exponentially. The flux is counted positive along the cylindrical
+    toroidal direction, independent of the orientation of the poloidal angle.
+    """
+    mpol, two_ntor_plus_one = vmec_input.rbc.shape
+    m = np.arange(mpol)[:, np.newaxis, np.newaxis]
+    n = np.arange(two_ntor_plus_one)[:, np.newaxis] - (two_ntor_plus_one - 1) // 2
+    theta = np.linspace(0.0, 2.0 * np.pi, num_theta, endpoint=False)
+    kernel = m * theta - n * vmec_input.nfp * phi
+    cos_kernel = np.cos(kernel)
+    sin_kernel = np.sin(kernel)
+
+    def evaluate(cos_coefficients, sin_coefficients):
+        """Values and poloidal derivatives of a Fourier series along the curve."""
+        c = cos_coefficients[..., np.newaxis]
+        s = sin_coefficients[..., np.newaxis]
+        values = c * cos_kernel + s * sin_kernel
+        derivatives = m * (s * cos_kernel - c * sin_kernel)
+        return values.sum(axis=(0, 1)), derivatives.sum(axis=(0, 1))
+
+    zeros = np.zeros_like(vmec_input.rbc)
+    rbs = vmec_input.rbs if vmec_input.lasym and vmec_input.rbs is not None else zeros
+    zbc = vmec_input.zbc if vmec_input.lasym and vmec_input.zbc is not None else zeros
+    r, dr_dtheta = evaluate(vmec_input.rbc, rbs)
+    z, dz_dtheta = evaluate(zbc, vmec_input.zbs)
+
+    cos_phi = np.cos(phi)
+    sin_phi = np.sin(phi)
+    points = np.column_stack([r * cos_phi, r * sin_phi, z])
+    tangents = np.column_stack([dr_dtheta * cos_phi, dr_dtheta * sin_phi, dz_dtheta])
+    potential = vector_potential(
+        magnetic_configuration, points, max_threads=max_threads
+    )
+    line_integral = np.sum(potential * tangents) * 2.0 * np.pi / num_theta
+
+    # Stokes' theorem relates the line integral to the flux through the surface in
+    # the direction of e_R x e_Z = -e_phi if the curve runs counter-clockwise in the
+    # (R, Z) plane, i.e. if it encloses a positive area.
+    signed_area = 0.5 * np.sum(r * dz_dtheta - z * dr_dtheta)
+    return float(-np.sign(signed_area) * line_integral)
+
+
+def lcfs_surface(
+    wout: VmecWOut, *, num_theta: int = 64, num_phi: int = 32
+) -> tuple[
+    jt.Float[np.ndarray, "num_points 3"],
+    jt.Float[np.ndarray, "num_points 3"],
+    jt.Float[np.ndarray, " num_points"],
+]:
+    """Points, outward unit normals and area elements on the last closed flux surface
+    of ``wout``, e.g., of a free-boundary equilibrium.
+
+    The surface is sampled on ``num_theta`` poloidal points and ``num_phi`` toroidal
+    points per field period around the whole torus, with the poloidal angle running
+    fastest, so that perturbations of the coils that break the symmetry of the
+    equilibrium are resolved as well. The area elements are those of the trapezoidal
+    rule, which converges exponentially for integrals over the surface.
+    """
+    theta = np.linspace(0.0, 2.0 * np.pi, num_theta, endpoint=False)
+    phi = np.linspace(0.0, 2.0 * np.pi, wout.nfp * num_phi, endpoint=False)
+    phi_grid, theta_grid = (
+        grid.ravel() for grid in np.meshgrid(phi, theta, indexing="ij")
+    )
+    kernel = np.outer(theta_grid, wout.xm) - np.outer(phi_grid, wout.xn)
+    cos_kernel = np.cos(kernel)
+    sin_kernel = np.sin(kernel)
+
+    def evaluate(cos_coefficients, sin_coefficients):
+        """Values and derivatives with respect to theta and phi of a Fourier series
+        on the grid."""
+        values = cos_kernel @ cos_coefficients + sin_kernel @ sin_coefficients
+        d_theta = cos_kernel @ (wout.xm * sin_coefficients) - sin_kernel @ (
+            wout.xm * cos_coefficients
+        )
+        d_phi = sin_kernel @ (wout.xn * cos_coefficients) - cos_kernel @ (
+            wout.xn * sin_coefficients
+        )
+        return values, d_theta, d_phi
+
+    zeros = np.zeros_like(wout.rmnc[:, -1])
+    rmns = wout.rmns[:, -1] if wout.lasym and wout.rmns is not None else zeros
+    zmnc = wout.zmnc[:, -1] if wout.lasym and wout.zmnc is not None else zeros
+    r, dr_dtheta, dr_dphi = evaluate(wout.rmnc[:, -1], rmns)
+    z, dz_dtheta, dz_dphi = evaluate(zmnc, wout.zmns[:, -1])
+
+    cos_phi = np.cos(phi_grid)
+    sin_phi = np.sin(phi_grid)
+    points = np.column_stack([r * cos_phi, r * sin_phi, z])
+    d_theta = np.column_stack([dr_dtheta * cos_phi, dr_dtheta * sin_phi, dz_dtheta])
+    d_phi = np.column_stack(
+        [
+            dr_dphi * cos_phi - r * sin_phi,
+            dr_dphi * sin_phi + r * cos_phi,
+            dz_dphi,
+        ]
+    )
+
+    # d_phi x d_theta points outwards if the poloidal angle runs counter-clockwise
+    # in the (R, Z) plane, i.e., if the cross-section has a positive signed area.
+    signed_area = np.sum(r * dz_dtheta - z * dr_dtheta)
+    normals = np.sign(signed_area) * np.cross(d_phi, d_theta)
+    norms = np.linalg.norm(normals, axis=1)
+    area_elements = norms * (2.0 * np.pi / num_theta) * (2.0 * np.pi / phi.size)
+    return points, normals / norms[:, np.newaxis], area_elements
+
+
+def lcfs_normal_field(
+    magnetic_configuration: _vmecpp.MagneticConfiguration | str | Path,
+    wout: VmecWOut,
+    *,
+    num_theta: int = 64,
+    num_phi: int = 32,
+    max_threads: int | None = None,
+) -> jt.Float[np.ndarray, " num_points"]:
+    """Normal component of the vacuum magnetic field in Tesla on the last closed flux
+    surface of ``wout``, at the points of :func:`lcfs_surface`."""
+    points, normals, _ = lcfs_surface(wout, num_theta=num_theta, num_phi=num_phi)
+    b_field = magnetic_field(magnetic_configuration, points, max_threads=max_threads)
+    return np.sum(b_field * normals, axis=1)
+
+
+def lcfs_normal_field_adjoint(
+    magnetic_configuration: _vmecpp.MagneticConfiguration | str | Path,
+    wout: VmecWOut,
+    weights: jt.Float[np.ndarray, " num_points"],
+    *,
+    num_theta: int = 64,
+    num_phi: int = 32,
+    max_threads: int | None = None,
+) -> list[jt.Float[np.ndarray, "num_vertices 3"]]:
+    """Gradient of ``sum_i weights[i] * lcfs_normal_field(...)[i]`` with respect to
+    the vertices of the polygon filaments, see :func:`magnetic_field_adjoint`.
+
+    For an objective ``f`` of the normal field on the surface, ``weights`` are the
+    derivatives of ``f`` with respect to ``lcfs_normal_field``; e.g., for the
+    squared normal field ``0.5 * sum(b_n**2 * area_elements)``, they are
+    ``b_n * area_elements`` with the area elements from :func:`lcfs_surface`. The
+    derivatives of several objectives, like the Fourier harmonics of the normal
+    field error, need one call each instead of one normal field evaluation per
+    vertex coordinate.
+    """
+    points, normals, _ = lcfs_surface(wout, num_theta=num_theta, num_phi=num_phi)
+    cotangents = np.asarray(weights, dtype=float)[:, np.newaxis] * normals
+    return magnetic_field_adjoint(
+        magnetic_configuration, points, cotangents, max_threads=max_threads
+    )
+
+
+def magnetic_field_response_table_adjoint(
+    magnetic_configuration: _vmecpp.MagneticConfiguration | str | Path,
+    cotangents: MagneticFieldResponseTable,
+    *,
+    max_threads: int | None = None,
+) -> list[jt.Float[np.ndarray, "num_vertices 3"]]:
+    """Gradient of the sum over all circuits and grid points of ``cotangents`` times
+    the fields of ``MagneticFieldResponseTable.from_magnetic_configuration(
+    magnetic_configuration, cotangents.parameters)`` with respect to the vertices of
+    the polygon filaments, i.e., the adjoint of computing the response table.
+
+    The normalization by currents and the mirroring for stellarator symmetry of the
+    table are taken into account. Only the grid points with a non-zero cotangent are
+    evaluated, so that the cost is proportional to their number. The result has the
+    layout of :func:`magnetic_field_adjoint`.
+    """
+    return _vmecpp.magnetic_field_response_table_adjoint(
+        _as_magnetic_configuration(magnetic_configuration),
+        cotangents._to_cpp_magnetic_field_response_table_view(),
+        max_threads=max_threads,
+    )
+
+
+def _lcfs_interpolation_stencil(
+    makegrid_parameters: MakegridParameters, wout: VmecWOut, num_theta: int
+) -> tuple[
+    jt.Int[np.ndarray, "num_points 4"],
+    jt.Float[np.ndarray, "num_points 4"],
+    jt.Float[np.ndarray, " num_points"],
+]:
+    """Grid points and weights of the bilinear interpolation in R and Z with which the
+    free-boundary solver gets the field at the points of :func:`lcfs_surface` from a
+    response table, cropping the points to the grid, and the toroidal angles of the
+    points."""
+    if makegrid_parameters.number_of_field_periods != wout.nfp:
+        msg = (
+            f"the grid has {makegrid_parameters.number_of_field_periods} field "
+            f"periods, but the equilibrium has {wout.nfp}"
+        )
+        raise ValueError(msg)
+    num_phi = makegrid_parameters.number_of_phi_grid_points
+    num_r = makegrid_parameters.number_of_r_grid_points
+    num_z = makegrid_parameters.number_of_z_grid_points
+    min_r = makegrid_parameters.r_grid_minimum
+    max_r = makegrid_parameters.r_grid_maximum
+    min_z = makegrid_parameters.z_grid_minimum
+    max_z = makegrid_parameters.z_grid_maximum
+    delta_r = (max_r - min_r) / (num_r - 1.0)
+    delta_z = (max_z - min_z) / (num_z - 1.0)
+
+    points, _, _ = lcfs_surface(wout, num_theta=num_theta, num_phi=num_phi)
+    r = np.clip(np.hypot(points[:, 0], points[:, 1]), min_r, max_r)
+    z = np.clip(points[:, 2], min_z, max_z)
+    index_r = np.floor((r - min_r) / delta_r).astype(int)
+    index_z = np.floor((z - min_z) / delta_z).astype(int)
+    index_r1 = np.minimum(num_r - 1, index_r + 1)
+    index_z1 = np.minimum(num_z - 1, index_z + 1)
+    p = (r - (min_r + index_r * delta_r)) / delta_r
+    q = (z - (min_z + index_z * delta_z)) / delta_z
+
+    # the points of each toroidal plane of the surface lie on a plane of the grid
+    toroidal_index = np.arange(points.shape[0]) // num_theta
+    plane = (toroidal_index % num_phi)[:, np.newaxis]
+    indices = (
+        plane * num_z + np.column_stack([index_z, index_z1, index_z, index_z1])
+    ) * num_r + np.column_stack([index_r, index_r, index_r1, index_r1])
+    weights = np.column_stack([(1 - p) * (1 - q), (1 - p) * q, p * (1 - q), p * q])
+    phi = 2.0 * np.pi * toroidal_index / (wout.nfp * num_phi)
+    return indices, weights, phi
+
+
+def lcfs_interpolated_field(
+    response_table: MagneticFieldResponseTable,
+    wout: VmecWOut,
+    *,
+    extcur: jt.Float[np.ndarray, " num_circuits"] | None = None,
+    num_theta: int = 64,
+) -> jt.Float[np.ndarray, "num_points 3"]:
+    """Cartesian vacuum magnetic field in Tesla on the last closed flux surface of
+    ``wout``, interpolated from ``response_table`` in the same way as by the
+    free-boundary solver.
+
+    The field is evaluated at the points of :func:`lcfs_surface` with ``num_phi``
+    set to the number of toroidal planes of the table, which lie on these planes.
+
+    Args:
+        response_table: The field of each circuit on the grid.
+        wout: The equilibrium, e.g., of a free-boundary run with ``response_table``.
+        extcur: The currents by which the field of each circuit is multiplied;
+            ``wout.extcur`` if not given.
+        num_theta: Number of poloidal points on the surface.
+    """
+    indices, weights, phi = _lcfs_interpolation_stencil(
+        response_table.parameters, wout, num_theta
+    )
+    extcur = np.asarray(wout.extcur if extcur is None else extcur, dtype=float)
+    b_r, b_p, b_z = (
+        extcur @ np.sum(table[:, indices] * weights, axis=-1)
+        for table in (response_table.b_r, response_table.b_p, response_table.b_z)
+    )
+    cos_phi = np.cos(phi)
+    sin_phi = np.sin(phi)
+    return np.column_stack(
+        [b_r * cos_phi - b_p * sin_phi, b_r * sin_phi + b_p * cos_phi, b_z]
+    )
+
+
+def lcfs_interpolated_field_adjoint(
+    magnetic_configuration: _vmecpp.MagneticConfiguration | str | Path,
+    makegrid_parameters: MakegridParameters,
+    wout: VmecWOut,
+    cotangents: jt.Float[np.ndarray, "num_points 3"],
+    *,
+    extcur: jt.Float[np.ndarray, " num_circuits"] | None = None,
+    num_theta: int = 64,
+    max_threads: int | None = None,
+) -> list[jt.Float[np.ndarray, "num_vertices 3"]]:
+    """Gradient of the sum of ``cotangents`` times :func:`lcfs_interpolated_field`
+    with respect to the vertices of the polygon filaments, for the response table of
+    ``magnetic_configuration`` on the grid of ``makegrid_parameters``.
+
+    This includes the interpolation error of the grid, so that it matches finite
+    differences of free-boundary inputs that recompute the response table for
+    perturbed coils. Only the corners of the grid cells that the surface passes
+    through are evaluated, see :func:`magnetic_field_response_table_adjoint`.
+    """
+    indices, weights, phi = _lcfs_interpolation_stencil(
+        makegrid_parameters, wout, num_theta
+    )
+    cotangents = _as_points(cotangents)
+    if cotangents.shape[0] != indices.shape[0]:
+        msg = (
+            f"need one cotangent per point on the surface, {indices.shape[0]}, but "
+            f"got {cotangents.shape[0]}"
+        )
+        raise ValueError(msg)
+    magnetic_configuration = _as_magnetic_configuration(magnetic_configuration)
+    extcur = np.asarray(wout.extcur if extcur is None else extcur, dtype=float)
+    num_circuits = magnetic_configuration.num_serial_circuits
+    if extcur.shape != (num_circuits,):
+        msg = f"extcur must have shape ({num_circuits},), but has {extcur.shape}"
+        raise ValueError(msg)
+
+    # transpose of the interpolation and of the conversion to Cartesian components
+    cos_phi = np.cos(phi)
+    sin_phi = np.sin(phi)
+    cylindrical_cotangents = (
+        cotangents[:, 0] * cos_phi + cotangents[:, 1] * sin_phi,
+        cotangents[:, 1] * cos_phi - cotangents[:, 0] * sin_phi,
+        cotangents[:, 2],
+    )
+    num_grid_points = (
+        makegrid_parameters.number_of_phi_grid_points
+        * makegrid_parameters.number_of_z_grid_points
+        * makegrid_parameters.number_of_r_grid_points
+    )
+    grid_cotangents = []
+    for cylindrical_cotangent in cylindrical_cotangents:
+        grid_cotangent = np.zeros(num_grid_points)
+        np.add.at(
+            grid_cotangent, indices, weights * cylindrical_cotangent[:, np.newaxis]
+        )
+        grid_cotangents.append(np.outer(extcur, grid_cotangent))
+
+    return magnetic_field_response_table_adjoint(
+        magnetic_configuration,
+        MagneticFieldResponseTable(
+            parameters=makegrid_parameters,
+            b_r=grid_cotangents[0],
+            b_p=grid_cotangents[1],
+            b_z=grid_cotangents[2],
+        ),
+        max_threads=max_threads,
+    )
+
+
+__all__ = [
+    "enclosed_toroidal_flux",
+    "from_simsopt_coils",
+    "lcfs_interpolated_field",
+    "lcfs_interpolated_field_adjoint",
+    "lcfs_normal_field",
+    "lcfs_normal_field_adjoint",
+    "lcfs_surface",
+    "magnetic_field",
+    "magnetic_field_adjoint",
+    "magnetic_field_response_table_adjoint",
+    "vector_potential",
+]
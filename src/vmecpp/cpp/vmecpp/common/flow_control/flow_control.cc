@@ -50,7 +50,9 @@ int get_max_threads(std::optional<int> max_threads) {
 
 FlowControl::FlowControl(bool lfreeb, double delt, int num_grids,
                          std::optional<int> max_threads)
-    : lfreeb(lfreeb), max_threads_(get_max_threads(max_threads)) {
+    : lfreeb(lfreeb),
+      radial_tridiagonal_solver(GetRadialTridiagonalSolver()),
+      max_threads_(get_max_threads(max_threads)) {
   fsq = 1.0;
 
   // INITIALIZE PARAMETERS
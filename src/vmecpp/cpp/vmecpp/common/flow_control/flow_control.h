@@ -10,6 +10,8 @@
 #include <optional>
 #include <vector>
 
+#include "vmecpp/common/util/util.h"
+
 namespace vmecpp {
 
 // enumerates values of `restart_reason`
@@ -116,6 +118,10 @@ class FlowControl {
   Eigen::Vector3d fResInvar;
   Eigen::Vector3d fResPrecd;
 
+  // algorithm for the radial tri-diagonal systems of the R/Z preconditioner,
+  // fixed for the whole run (see SetRadialTridiagonalSolver)
+  const RadialTridiagonalSolver radial_tridiagonal_solver;
+
  private:
   const int max_threads_;
 };
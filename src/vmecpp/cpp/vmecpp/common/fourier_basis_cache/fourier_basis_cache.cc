@@ -0,0 +1,107 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/common/fourier_basis_cache/fourier_basis_cache.h"
+
+#include <utility>
+
+namespace vmecpp {
+
+FourierBasisTables::FourierBasisTables(const Sizes& sizes)
+    : s(sizes), fast_poloidal(&s), fast_toroidal(&s) {}
+
+bool FourierBasisTables::Matches(const Sizes& sizes) const {
+  return s.lasym == sizes.lasym && s.nfp == sizes.nfp && s.mpol == sizes.mpol &&
+         s.ntor == sizes.ntor && s.mpolGeometry == sizes.mpolGeometry &&
+         s.ntorGeometry == sizes.ntorGeometry && s.ntheta == sizes.ntheta &&
+         s.nZeta == sizes.nZeta;
+}
+
+FourierBasisCache& FourierBasisCache::Global() {
+  // intentionally leaked to avoid destruction-order issues at process exit
+  static FourierBasisCache* const cache = new FourierBasisCache();
+  return *cache;
+}
+
+std::shared_ptr<const FourierBasisTables> FourierBasisCache::Acquire(
+    const Sizes& sizes) {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    // search most recently used tables first
+    for (auto it = entries_.rbegin(); it != entries_.rend(); ++it) {
+      if ((*it)->Matches(sizes)) {
+        std::shared_ptr<const FourierBasisTables> tables = std::move(*it);
+        entries_.erase(std::next(it).base());
+        entries_.push_back(tables);
+        ++num_hits_;
+        return tables;
+      }
+    }
+    ++num_misses_;
+  }
+
+  // the tables are built outside of the lock
+  auto tables = std::make_shared<const FourierBasisTables>(sizes);
+
+  std::shared_ptr<const FourierBasisTables> evicted;
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    if (enabled_) {
+      // another thread might have cached the same resolution in the meantime:
+      // keep only one copy, so that later runs share the same tables
+      for (auto it = entries_.rbegin(); it != entries_.rend(); ++it) {
+        if ((*it)->Matches(sizes)) {
+          return *it;
+        }
+      }
+      entries_.push_back(tables);
+      if (static_cast<int>(entries_.size()) > kMaxEntries) {
+        // released outside of the lock
+        evicted = std::move(entries_.front());
+        entries_.pop_front();
+      }
+    }
+  }
+  return tables;
+}
+
+void FourierBasisCache::Clear() {
+  std::deque<std::shared_ptr<const FourierBasisTables>> to_release;
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    to_release.swap(entries_);
+  }
+}
+
+void FourierBasisCache::SetEnabled(bool enabled) {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    enabled_ = enabled;
+  }
+  if (!enabled) {
+    Clear();
+  }
+}
+
+bool FourierBasisCache::IsEnabled() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return enabled_;
+}
+
+int FourierBasisCache::NumEntries() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return static_cast<int>(entries_.size());
+}
+
+int64_t FourierBasisCache::NumHits() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return num_hits_;
+}
+
+int64_t FourierBasisCache::NumMisses() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return num_misses_;
+}
+
+}  // namespace vmecpp
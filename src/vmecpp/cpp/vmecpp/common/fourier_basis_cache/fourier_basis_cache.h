@@ -0,0 +1,90 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#ifndef VMECPP_COMMON_FOURIER_BASIS_CACHE_FOURIER_BASIS_CACHE_H_
+#define VMECPP_COMMON_FOURIER_BASIS_CACHE_FOURIER_BASIS_CACHE_H_
+
+#include <cstdint>
+#include <deque>
+#include <memory>
+#include <mutex>
+
+#include "vmecpp/common/fourier_basis_fast_poloidal/fourier_basis_fast_poloidal.h"
+#include "vmecpp/common/fourier_basis_fast_toroidal/fourier_basis_fast_toroidal.h"
+#include "vmecpp/common/sizes/sizes.h"
+
+namespace vmecpp {
+
+// The mode lists and the cos/sin tables for one spectral resolution, in both
+// memory layouts. They only depend on the Sizes and are never modified after
+// construction, so a single instance can be shared by any number of runs
+// and threads.
+//
+// FourierBasisTables owns the Sizes object the two bases were built from,
+// since the bases keep a reference to it. It must not be moved, as that would
+// invalidate these references.
+struct FourierBasisTables {
+  explicit FourierBasisTables(const Sizes& sizes);
+
+  FourierBasisTables(const FourierBasisTables&) = delete;
+  FourierBasisTables& operator=(const FourierBasisTables&) = delete;
+  FourierBasisTables(FourierBasisTables&&) = delete;
+  FourierBasisTables& operator=(FourierBasisTables&&) = delete;
+
+  // Returns true if these tables were built for the given resolution.
+  bool Matches(const Sizes& sizes) const;
+
+  const Sizes s;
+  // used by the VMEC++ core solver
+  const FourierBasisFastPoloidal fast_poloidal;
+  // used by Nestor / the free-boundary code
+  const FourierBasisFastToroidal fast_toroidal;
+};
+
+// A process-wide cache of FourierBasisTables.
+//
+// Every Vmec instance (and every free-boundary vacuum solver thread) needs the
+// Fourier basis tables for its resolution, and e.g. the runs of an
+// optimization loop all use the same one. Instead of rebuilding the tables for
+// each of them, they share the tables via reference-counted handles from this
+// cache. The cache keeps the tables of the kMaxEntries most recently used
+// resolutions alive; tables evicted from the cache live on until their last
+// user is done with them. All methods are thread-safe.
+class FourierBasisCache {
+ public:
+  static constexpr int kMaxEntries = 16;
+
+  // The cache shared by all Vmec instances in this process.
+  static FourierBasisCache& Global();
+
+  // Returns the tables for the given resolution: cached ones if available,
+  // otherwise newly built ones.
+  std::shared_ptr<const FourierBasisTables> Acquire(const Sizes& sizes);
+
+  // Drop all cached tables. Tables that are still in use are not affected.
+  void Clear();
+
+  // If disabled, Acquire always builds new tables and does not cache them.
+  // Disabling the cache also clears it.
+  void SetEnabled(bool enabled);
+  bool IsEnabled() const;
+
+  int NumEntries() const;
+
+  // Number of Acquire calls served from the cache/by building new tables.
+  int64_t NumHits() const;
+  int64_t NumMisses() const;
+
+ private:
+  mutable std::mutex mutex_;
+  bool enabled_ = true;
+  // least recently used tables at the front
+  std::deque<std::shared_ptr<const FourierBasisTables>> entries_;
+  int64_t num_hits_ = 0;
+  int64_t num_misses_ = 0;
+};
+
+}  // namespace vmecpp
+
+#endif  // VMECPP_COMMON_FOURIER_BASIS_CACHE_FOURIER_BASIS_CACHE_H_
@@ -0,0 +1,143 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/common/fourier_basis_cache/fourier_basis_cache.h"
+
+#include <memory>
+#include <thread>
+#include <vector>
+
+#include "gtest/gtest.h"
+
+namespace vmecpp {
+
+namespace {
+// Small 3D configuration; the actual values do not matter here.
+Sizes MakeSizes(int mpol = 4, int ntor = 2) {
+  return Sizes(/*lasym=*/false, /*nfp=*/5, mpol, ntor, /*ntheta=*/16,
+               /*nzeta=*/12);
+}
+}  // namespace
+
+TEST(TestFourierBasisCache, TablesMatchFreshlyBuiltBases) {
+  const Sizes s = MakeSizes();
+  const FourierBasisTables tables(s);
+  const FourierBasisFastPoloidal fast_poloidal(&s);
+  const FourierBasisFastToroidal fast_toroidal(&s);
+
+  EXPECT_TRUE(tables.Matches(s));
+  EXPECT_EQ(tables.s.mnmax, s.mnmax);
+  EXPECT_EQ(tables.fast_poloidal.xm, fast_poloidal.xm);
+  EXPECT_EQ(tables.fast_poloidal.xn, fast_poloidal.xn);
+  EXPECT_EQ(tables.fast_poloidal.cosmu, fast_poloidal.cosmu);
+  EXPECT_EQ(tables.fast_poloidal.sinnv, fast_poloidal.sinnv);
+  EXPECT_EQ(tables.fast_toroidal.cosmu, fast_toroidal.cosmu);
+  EXPECT_EQ(tables.fast_toroidal.sinnv, fast_toroidal.sinnv);
+}
+
+TEST(TestFourierBasisCache, SharesTablesForSameResolution) {
+  FourierBasisCache cache;
+
+  const std::shared_ptr<const FourierBasisTables> tables =
+      cache.Acquire(MakeSizes());
+  EXPECT_EQ(cache.NumMisses(), 1);
+  EXPECT_EQ(cache.NumHits(), 0);
+  EXPECT_EQ(cache.NumEntries(), 1);
+
+  // an equal, but distinct Sizes object
+  EXPECT_EQ(cache.Acquire(MakeSizes()), tables);
+  EXPECT_EQ(cache.NumHits(), 1);
+  EXPECT_EQ(cache.NumEntries(), 1);
+}
+
+TEST(TestFourierBasisCache, DoesNotShareTablesForDifferentResolution) {
+  FourierBasisCache cache;
+
+  const std::shared_ptr<const FourierBasisTables> tables =
+      cache.Acquire(MakeSizes());
+
+  // different spectral resolution, grid, field periods and symmetry
+  EXPECT_NE(cache.Acquire(MakeSizes(/*mpol=*/5)), tables);
+  EXPECT_NE(cache.Acquire(MakeSizes(/*mpol=*/4, /*ntor=*/3)), tables);
+  EXPECT_NE(cache.Acquire(Sizes(false, 5, 4, 2, /*ntheta=*/18, 12)), tables);
+  EXPECT_NE(cache.Acquire(Sizes(false, 5, 4, 2, 16, /*nzeta=*/14)), tables);
+  EXPECT_NE(cache.Acquire(Sizes(false, /*nfp=*/3, 4, 2, 16, 12)), tables);
+  EXPECT_NE(cache.Acquire(Sizes(/*lasym=*/true, 5, 4, 2, 16, 12)), tables);
+  EXPECT_EQ(cache.NumHits(), 0);
+  EXPECT_EQ(cache.NumMisses(), 7);
+  EXPECT_EQ(cache.NumEntries(), 7);
+}
+
+TEST(TestFourierBasisCache, EvictsLeastRecentlyUsedTables) {
+  FourierBasisCache cache;
+
+  const std::shared_ptr<const FourierBasisTables> first =
+      cache.Acquire(MakeSizes(/*mpol=*/2));
+  for (int i = 1; i < FourierBasisCache::kMaxEntries; ++i) {
+    cache.Acquire(MakeSizes(/*mpol=*/2 + i));
+  }
+  EXPECT_EQ(cache.NumEntries(), FourierBasisCache::kMaxEntries);
+
+  // using the oldest entry again makes the second-oldest one the next victim
+  EXPECT_EQ(cache.Acquire(MakeSizes(/*mpol=*/2)), first);
+  cache.Acquire(MakeSizes(/*mpol=*/2 + FourierBasisCache::kMaxEntries));
+  EXPECT_EQ(cache.NumEntries(), FourierBasisCache::kMaxEntries);
+  EXPECT_EQ(cache.Acquire(MakeSizes(/*mpol=*/2)), first);
+  EXPECT_EQ(cache.NumHits(), 2);
+
+  cache.Acquire(MakeSizes(/*mpol=*/3));
+  EXPECT_EQ(cache.NumMisses(), FourierBasisCache::kMaxEntries + 2);
+}
+
+TEST(TestFourierBasisCache, TablesOutliveTheCache) {
+  std::shared_ptr<const FourierBasisTables> tables;
+  {
+    FourierBasisCache cache;
+    tables = cache.Acquire(MakeSizes());
+    cache.Clear();
+    EXPECT_EQ(cache.NumEntries(), 0);
+  }
+  EXPECT_TRUE(tables->Matches(MakeSizes()));
+}
+
+TEST(TestFourierBasisCache, DisabledCacheAlwaysBuildsNewTables) {
+  FourierBasisCache cache;
+  cache.Acquire(MakeSizes());
+  EXPECT_EQ(cache.NumEntries(), 1);
+
+  cache.SetEnabled(false);
+  EXPECT_FALSE(cache.IsEnabled());
+  EXPECT_EQ(cache.NumEntries(), 0);
+
+  const std::shared_ptr<const FourierBasisTables> tables =
+      cache.Acquire(MakeSizes());
+  EXPECT_NE(cache.Acquire(MakeSizes()), tables);
+  EXPECT_EQ(cache.NumEntries(), 0);
+
+  cache.SetEnabled(true);
+  EXPECT_TRUE(cache.IsEnabled());
+}
+
+TEST(TestFourierBasisCache, ConcurrentAcquireSharesOneCopy) {
+  FourierBasisCache cache;
+  constexpr int kNumThreads = 8;
+
+  std::vector<std::shared_ptr<const FourierBasisTables>> tables(kNumThreads);
+  std::vector<std::thread> threads;
+  for (int i = 0; i < kNumThreads; ++i) {
+    threads.emplace_back(
+        [&cache, &tables, i] { tables[i] = cache.Acquire(MakeSizes()); });
+  }
+  for (std::thread& thread : threads) {
+    thread.join();
+  }
+
+  EXPECT_EQ(cache.NumEntries(), 1);
+  EXPECT_EQ(cache.NumHits() + cache.NumMisses(), kNumThreads);
+  for (int i = 0; i < kNumThreads; ++i) {
+    EXPECT_EQ(tables[i], tables[0]);
+  }
+}
+
+}  // namespace vmecpp
@@ -7,6 +7,7 @@
 #include <Eigen/Dense>
 #include <algorithm>
 #include <cctype>
+#include <cmath>
 #include <cstring>
 #include <fstream>
 #include <iostream>
@@ -210,6 +211,94 @@ absl::StatusOr<MagneticConfiguration> ImportMagneticConfigurationFromCoilsFile(
   return ImportMagneticConfigurationFromMakegrid(*maybe_coils_file_content);
 }
 
+absl::StatusOr<MagneticConfiguration> ImportMagneticConfigurationFromPolygons(
+    const std::vector<Eigen::MatrixX3d>& points_per_coil,
+    const Eigen::VectorXd& currents, const std::vector<int>& circuit_ids,
+    int num_field_periods, bool stellarator_symmetric) {
+  const int num_base_coils = static_cast<int>(points_per_coil.size());
+  if (currents.size() != num_base_coils ||
+      static_cast<int>(circuit_ids.size()) != num_base_coils) {
+    std::stringstream error_message;
+    error_message << "expected one current and one circuit ID per coil ("
+                  << num_base_coils << "), but got " << currents.size()
+                  << " currents and " << circuit_ids.size() << " circuit IDs";
+    return absl::InvalidArgumentError(error_message.str());
+  }
+  if (num_field_periods < 1) {
+    std::stringstream error_message;
+    error_message << "number of field periods must be positive, but got "
+                  << num_field_periods;
+    return absl::InvalidArgumentError(error_message.str());
+  }
+  for (int i = 0; i < num_base_coils; ++i) {
+    if (points_per_coil[i].rows() < 2) {
+      std::stringstream error_message;
+      error_message << "coil " << i << " has too few points ("
+                    << points_per_coil[i].rows() << "); need at least 2";
+      return absl::InvalidArgumentError(error_message.str());
+    }
+  }
+
+  MagneticConfiguration magnetic_configuration;
+  magnetic_configuration.set_num_field_periods(num_field_periods);
+
+  // SerialCircuits in order of first appearance of their ID
+  std::vector<int> unique_circuit_ids;
+  std::vector<SerialCircuit*> serial_circuits;
+  std::vector<SerialCircuit*> circuit_of_coil(num_base_coils);
+  for (int i = 0; i < num_base_coils; ++i) {
+    const auto it = absl::c_find(unique_circuit_ids, circuit_ids[i]);
+    if (it == unique_circuit_ids.end()) {
+      SerialCircuit* serial_circuit =
+          magnetic_configuration.add_serial_circuits();
+      serial_circuit->set_current(1.0);
+      unique_circuit_ids.push_back(circuit_ids[i]);
+      serial_circuits.push_back(serial_circuit);
+      circuit_of_coil[i] = serial_circuit;
+    } else {
+      circuit_of_coil[i] = serial_circuits[it - unique_circuit_ids.begin()];
+    }
+  }
+
+  // same order of the symmetry copies as in SIMSOPT's coils_via_symmetries
+  const int num_flips = stellarator_symmetric ? 2 : 1;
+  for (int k = 0; k < num_field_periods; ++k) {
+    const double phi = 2.0 * M_PI * k / num_field_periods;
+    const double cos_phi = std::cos(phi);
+    const double sin_phi = std::sin(phi);
+    for (int flip = 0; flip < num_flips; ++flip) {
+      const double sign = (flip == 0) ? 1.0 : -1.0;
+      for (int i = 0; i < num_base_coils; ++i) {
+        const Eigen::MatrixX3d& points = points_per_coil[i];
+
+        Coil* coil = circuit_of_coil[i]->add_coils();
+        coil->set_num_windings(sign * currents[i]);
+        PolygonFilament* polygon_filament =
+            coil->add_current_carriers()->mutable_polygon_filament();
+
+        auto add_vertex = [&](int index) {
+          // stellarator symmetry first, then the rotation into field period k
+          const double x = points(index, 0);
+          const double y = sign * points(index, 1);
+          Vector3d* vertex = polygon_filament->add_vertices();
+          vertex->set_x(cos_phi * x - sin_phi * y);
+          vertex->set_y(sin_phi * x + cos_phi * y);
+          vertex->set_z(sign * points(index, 2));
+        };
+        const int num_points = static_cast<int>(points.rows());
+        for (int index = 0; index < num_points; ++index) {
+          add_vertex(index);
+        }
+        if (points.row(num_points - 1) != points.row(0)) {
+          add_vertex(0);
+        }
+      }  // i
+    }  // flip
+  }  // k
+
+  return magnetic_configuration;
+}  // ImportMagneticConfigurationFromPolygons
+
 absl::StatusOr<Eigen::VectorXd> GetCircuitCurrents(
     const MagneticConfiguration& magnetic_configuration) {
   absl::Status status =
@@ -8,6 +8,7 @@
 #include <Eigen/Dense>
 #include <filesystem>
 #include <string>
+#include <vector>
 
 #include "absl/status/statusor.h"
 #include "vmecpp/common/magnetic_configuration_definition/magnetic_configuration.h"
@@ -26,6 +27,26 @@ absl::StatusOr<MagneticConfiguration> ImportMagneticConfigurationFromMakegrid(
 absl::StatusOr<MagneticConfiguration> ImportMagneticConfigurationFromCoilsFile(
     const std::filesystem::path& mgrid_coils_file);
 
+// Build a MagneticConfiguration of PolygonFilaments directly from in-memory
+// coil geometry, i.e., without writing and parsing a "coils-dot" file. The
+// result is the same as importing the coils file that SIMSOPT's
+// coils_to_makegrid writes for the same coils:
+//   * points_per_coil[i] are the [num_points, 3] Cartesian vertices of coil i.
+//     The polygon is closed by repeating its first vertex, if needed.
+//   * currents[i] is the current in coil i. As in a coils file, it becomes the
+//     number of windings of the coil in a circuit of unit current.
+//   * Coils with the same circuit_ids[i] are connected in series. The
+//     SerialCircuits are ordered by the first appearance of their ID.
+//   * The coils are the base coils of one field period (of one half-period if
+//     stellarator_symmetric). They are repeated in all num_field_periods field
+//     periods and, if stellarator_symmetric, mirrored as
+//     (x, y, z) -> (x, -y, -z) with reversed current. All copies of a coil are
+//     part of its circuit.
+absl::StatusOr<MagneticConfiguration> ImportMagneticConfigurationFromPolygons(
+    const std::vector<Eigen::MatrixX3d>& points_per_coil,
+    const Eigen::VectorXd& currents, const std::vector<int>& circuit_ids,
+    int num_field_periods, bool stellarator_symmetric);
+
 // Get the currents in the SerialCircuits in the given MagneticConfiguration.
 // Checks that the given MagneticConfiguration is fully populated.
 absl::StatusOr<Eigen::VectorXd> GetCircuitCurrents(
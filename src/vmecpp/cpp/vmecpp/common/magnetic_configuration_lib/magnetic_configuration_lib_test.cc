@@ -699,6 +699,149 @@ end)";
       4.5 / 4.0);
 }  // CheckNumWindingsToCircuitCurrents
 
+TEST(TestMagneticConfigurationLib,
+     ImportFromPolygonsMatchesImportFromMakegrid) {
+  static constexpr double kTolerance = 1.0e-15;
+
+  // one coil, repeated in two field periods and mirrored by stellarator
+  // symmetry, written out in the order of SIMSOPT's coils_to_makegrid
+  std::string makegrid_coils = R"(periods 2
+mirror NIL
+begin filament
+1.0 0.0 0.0 3.0
+2.0 1.0 0.5 3.0
+1.0 2.0 1.0 3.0
+1.0 0.0 0.0 0.0 7 coil_1
+1.0 -0.0 -0.0 -3.0
+2.0 -1.0 -0.5 -3.0
+1.0 -2.0 -1.0 -3.0
+1.0 -0.0 -0.0 0.0 7 coil_1_flipped
+-1.0 0.0 0.0 3.0
+-2.0 -1.0 0.5 3.0
+-1.0 -2.0 1.0 3.0
+-1.0 0.0 0.0 0.0 7 coil_1_rotated
+-1.0 0.0 -0.0 -3.0
+-2.0 1.0 -0.5 -3.0
+-1.0 2.0 -1.0 -3.0
+-1.0 0.0 -0.0 0.0 7 coil_1_rotated_flipped
+end)";
+  absl::StatusOr<MagneticConfiguration> expected =
+      ImportMagneticConfigurationFromMakegrid(makegrid_coils);
+  ASSERT_TRUE(expected.ok()) << expected.status().message();
+
+  Eigen::MatrixX3d points(3, 3);
+  points << 1.0, 0.0, 0.0,  //
+      2.0, 1.0, 0.5,        //
+      1.0, 2.0, 1.0;
+  Eigen::VectorXd currents(1);
+  currents << 3.0;
+  absl::StatusOr<MagneticConfiguration> magnetic_configuration =
+      ImportMagneticConfigurationFromPolygons(
+          {points}, currents, /*circuit_ids=*/{7}, /*num_field_periods=*/2,
+          /*stellarator_symmetric=*/true);
+  ASSERT_TRUE(magnetic_configuration.ok())
+      << magnetic_configuration.status().message();
+  ASSERT_TRUE(
+      IsMagneticConfigurationFullyPopulated(*magnetic_configuration).ok());
+
+  EXPECT_EQ(magnetic_configuration->num_field_periods(), 2);
+  ASSERT_EQ(magnetic_configuration->serial_circuits_size(), 1);
+  const SerialCircuit &serial_circuit =
+      magnetic_configuration->serial_circuits(0);
+  const SerialCircuit &expected_serial_circuit = expected->serial_circuits(0);
+  EXPECT_EQ(serial_circuit.current(), expected_serial_circuit.current());
+  ASSERT_EQ(serial_circuit.coils_size(), 4);
+  for (int idx_coil = 0; idx_coil < 4; ++idx_coil) {
+    const Coil &coil = serial_circuit.coils(idx_coil);
+    const Coil &expected_coil = expected_serial_circuit.coils(idx_coil);
+    EXPECT_EQ(coil.num_windings(), expected_coil.num_windings());
+    ASSERT_EQ(coil.current_carriers_size(), 1);
+    const PolygonFilament &polygon_filament =
+        coil.current_carriers(0).polygon_filament();
+    const PolygonFilament &expected_polygon_filament =
+        expected_coil.current_carriers(0).polygon_filament();
+    ASSERT_EQ(polygon_filament.vertices_size(),
+              expected_polygon_filament.vertices_size());
+    for (int i = 0; i < polygon_filament.vertices_size(); ++i) {
+      const Vector3d &vertex = polygon_filament.vertices(i);
+      const Vector3d &expected_vertex = expected_polygon_filament.vertices(i);
+      EXPECT_TRUE(IsCloseRelAbs(expected_vertex.x(), vertex.x(), kTolerance))
+          << "coil " << idx_coil << " vertex " << i;
+      EXPECT_TRUE(IsCloseRelAbs(expected_vertex.y(), vertex.y(), kTolerance))
+          << "coil " << idx_coil << " vertex " << i;
+      EXPECT_TRUE(IsCloseRelAbs(expected_vertex.z(), vertex.z(), kTolerance))
+          << "coil " << idx_coil << " vertex " << i;
+    }  // i
+  }  // idx_coil
+}  // ImportFromPolygonsMatchesImportFromMakegrid
+
+TEST(TestMagneticConfigurationLib, ImportFromPolygonsGroupsCircuits) {
+  // an already closed polygon, and an open one
+  Eigen::MatrixX3d closed_points(3, 3);
+  closed_points << 1.0, 0.0, 0.0,  //
+      0.0, 1.0, 0.0,               //
+      1.0, 0.0, 0.0;
+  Eigen::MatrixX3d open_points(2, 3);
+  open_points << 2.0, 0.0, 0.0,  //
+      0.0, 2.0, 0.0;
+  Eigen::VectorXd currents(3);
+  currents << 1.0, 2.0, 3.0;
+
+  absl::StatusOr<MagneticConfiguration> magnetic_configuration =
+      ImportMagneticConfigurationFromPolygons(
+          {closed_points, open_points, open_points}, currents,
+          /*circuit_ids=*/{5, 2, 5}, /*num_field_periods=*/3,
+          /*stellarator_symmetric=*/false);
+  ASSERT_TRUE(magnetic_configuration.ok())
+      << magnetic_configuration.status().message();
+
+  // circuits in order of first appearance of their ID, with the copies of
+  // their coils in all field periods
+  ASSERT_EQ(magnetic_configuration->serial_circuits_size(), 2);
+  const SerialCircuit &circuit_5 = magnetic_configuration->serial_circuits(0);
+  const SerialCircuit &circuit_2 = magnetic_configuration->serial_circuits(1);
+  EXPECT_EQ(circuit_5.current(), 1.0);
+  EXPECT_EQ(circuit_2.current(), 1.0);
+  ASSERT_EQ(circuit_5.coils_size(), 6);
+  ASSERT_EQ(circuit_2.coils_size(), 3);
+  EXPECT_EQ(circuit_5.coils(0).num_windings(), 1.0);
+  EXPECT_EQ(circuit_5.coils(1).num_windings(), 3.0);
+  EXPECT_EQ(circuit_2.coils(0).num_windings(), 2.0);
+
+  // the closed polygon is taken as is, the open one gets closed
+  EXPECT_EQ(
+      circuit_5.coils(0).current_carriers(0).polygon_filament().vertices_size(),
+      3);
+  EXPECT_EQ(
+      circuit_2.coils(0).current_carriers(0).polygon_filament().vertices_size(),
+      3);
+}  // ImportFromPolygonsGroupsCircuits
+
+TEST(TestMagneticConfigurationLib, ImportFromPolygonsRejectsInvalidInput) {
+  Eigen::MatrixX3d points(2, 3);
+  points << 1.0, 0.0, 0.0,  //
+      0.0, 1.0, 0.0;
+  Eigen::VectorXd currents(1);
+  currents << 1.0;
+
+  // one current per coil
+  EXPECT_FALSE(ImportMagneticConfigurationFromPolygons(
+                   {points, points}, currents, {1, 1}, 1, false)
+                   .ok());
+  // one circuit ID per coil
+  EXPECT_FALSE(
+      ImportMagneticConfigurationFromPolygons({points}, currents, {}, 1, false)
+          .ok());
+  // positive number of field periods
+  EXPECT_FALSE(
+      ImportMagneticConfigurationFromPolygons({points}, currents, {1}, 0, false)
+          .ok());
+  // at least two points per coil
+  EXPECT_FALSE(ImportMagneticConfigurationFromPolygons({Eigen::MatrixX3d(1, 3)},
+                                                       currents, {1}, 1, false)
+                   .ok());
+}  // ImportFromPolygonsRejectsInvalidInput
+
 // -------------------
 
 // The two integer parameters are interpreted as bitfields that control
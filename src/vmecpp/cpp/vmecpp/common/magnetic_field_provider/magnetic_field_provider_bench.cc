@@ -0,0 +1,139 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+
+// Microbenchmark for the Biot-Savart evaluation of a MagneticConfiguration at
+// many points, comparing
+//
+//   Serial:   the std::vector<std::vector<double>> interface, which converts
+//             the evaluation positions for every current carrier
+//   Parallel: the Eigen interface, which distributes blocks of evaluation
+//             positions over OpenMP threads
+//
+// The coil set is a single 32-segment polygon, so that 10^7 evaluation points
+// stay affordable; the cost scales linearly with the number of segments.
+//
+// Arguments: number of evaluation points, number of threads.
+
+#include <cmath>
+#include <vector>
+
+#include "absl/log/check.h"
+#include "benchmark/benchmark.h"
+#include "vmecpp/common/magnetic_configuration_definition/magnetic_configuration.h"
+#include "vmecpp/common/magnetic_field_provider/magnetic_field_provider_lib.h"
+
+namespace magnetics {
+namespace {
+
+constexpr int kNumberOfVertices = 33;
+
+MagneticConfiguration MakeCircularCoil() {
+  MagneticConfiguration magnetic_configuration;
+  SerialCircuit* serial_circuit = magnetic_configuration.add_serial_circuits();
+  serial_circuit->set_current(1.0e6);
+  PolygonFilament* polygon_filament = serial_circuit->add_coils()
+                                          ->add_current_carriers()
+                                          ->mutable_polygon_filament();
+  for (int i = 0; i < kNumberOfVertices; ++i) {
+    const double phi = 2.0 * M_PI * i / (kNumberOfVertices - 1);
+    composed_types::Vector3d* vertex = polygon_filament->add_vertices();
+    vertex->set_x(1.5 * std::cos(phi));
+    vertex->set_y(1.5 * std::sin(phi));
+    vertex->set_z(0.0);
+  }
+  return magnetic_configuration;
+}
+
+// Points on a torus inside of the coil.
+RowMatrixX3d MakeEvaluationPositions(int number_evaluation_positions) {
+  RowMatrixX3d evaluation_positions(number_evaluation_positions, 3);
+  for (int i = 0; i < number_evaluation_positions; ++i) {
+    const double phi = 0.61803398875 * i;
+    const double theta = 0.1 * i;
+    const double r = 1.0 + 0.3 * std::cos(theta);
+    evaluation_positions(i, 0) = r * std::cos(phi);
+    evaluation_positions(i, 1) = r * std::sin(phi);
+    evaluation_positions(i, 2) = 0.3 * std::sin(theta);
+  }
+  return evaluation_positions;
+}
+
+void BM_MagneticFieldSerial(benchmark::State& state) {
+  const int number_evaluation_positions = static_cast<int>(state.range(0));
+  const MagneticConfiguration magnetic_configuration = MakeCircularCoil();
+  const RowMatrixX3d positions =
+      MakeEvaluationPositions(number_evaluation_positions);
+  std::vector<std::vector<double>> evaluation_positions(
+      number_evaluation_positions);
+  for (int i = 0; i < number_evaluation_positions; ++i) {
+    evaluation_positions[i] = {positions(i, 0), positions(i, 1),
+                               positions(i, 2)};
+  }
+
+  for (auto _ : state) {
+    std::vector<std::vector<double>> magnetic_field(
+        number_evaluation_positions, std::vector<double>(3, 0.0));
+    CHECK_OK(MagneticField(magnetic_configuration, evaluation_positions,
+                           magnetic_field));
+    benchmark::DoNotOptimize(magnetic_field.data());
+  }
+  state.SetItemsProcessed(state.iterations() * number_evaluation_positions);
+}
+
+void BM_MagneticFieldParallel(benchmark::State& state) {
+  const int number_evaluation_positions = static_cast<int>(state.range(0));
+  const int threads = static_cast<int>(state.range(1));
+  const MagneticConfiguration magnetic_configuration = MakeCircularCoil();
+  const RowMatrixX3d evaluation_positions =
+      MakeEvaluationPositions(number_evaluation_positions);
+
+  for (auto _ : state) {
+    absl::StatusOr<RowMatrixX3d> magnetic_field =
+        MagneticField(magnetic_configuration, evaluation_positions, threads);
+    CHECK_OK(magnetic_field);
+    benchmark::DoNotOptimize(magnetic_field->data());
+  }
+  state.SetItemsProcessed(state.iterations() * number_evaluation_positions);
+}
+
+void BM_VectorPotentialParallel(benchmark::State& state) {
+  const int number_evaluation_positions = static_cast<int>(state.range(0));
+  const int threads = static_cast<int>(state.range(1));
+  const MagneticConfiguration magnetic_configuration = MakeCircularCoil();
+  const RowMatrixX3d evaluation_positions =
+      MakeEvaluationPositions(number_evaluation_positions);
+
+  for (auto _ : state) {
+    absl::StatusOr<RowMatrixX3d> vector_potential =
+        VectorPotential(magnetic_configuration, evaluation_positions, threads);
+    CHECK_OK(vector_potential);
+    benchmark::DoNotOptimize(vector_potential->data());
+  }
+  state.SetItemsProcessed(state.iterations() * number_evaluation_positions);
+}
+
+BENCHMARK(BM_MagneticFieldSerial)
+    ->ArgName("points")
+    ->Arg(100'000)
+    ->Arg(1'000'000)
+    ->Unit(benchmark::kMillisecond);
+
+void ParallelArguments(benchmark::internal::Benchmark* benchmark) {
+  benchmark->ArgNames({"points", "threads"});
+  for (const int points : {100'000, 1'000'000, 10'000'000}) {
+    for (const int threads : {1, 2, 4, 8}) {
+      benchmark->Args({points, threads});
+    }
+  }
+  benchmark->UseRealTime()->Unit(benchmark::kMillisecond);
+}
+
+BENCHMARK(BM_MagneticFieldParallel)->Apply(ParallelArguments);
+BENCHMARK(BM_VectorPotentialParallel)->Apply(ParallelArguments);
+
+}  // namespace
+}  // namespace magnetics
+
+BENCHMARK_MAIN();
@@ -5,13 +5,21 @@
 #include "vmecpp/common/magnetic_field_provider/magnetic_field_provider_lib.h"
 
 #include <algorithm>  // max
+#include <iterator>
+#include <optional>
 #include <sstream>
+#include <utility>
 #include <vector>
 
+#ifdef _OPENMP
+#include <omp.h>
+#endif  // _OPENMP
+
 #include "abscab/abscab.hh"
 #include "absl/log/check.h"
 #include "absl/log/log.h"
 #include "absl/status/status.h"
+#include "absl/strings/str_cat.h"
 #include "vmecpp/common/composed_types_definition/composed_types.h"
 #include "vmecpp/common/composed_types_lib/composed_types_lib.h"
 #include "vmecpp/common/magnetic_configuration_lib/magnetic_configuration_lib.h"
@@ -23,6 +31,237 @@ using composed_types::FourierCoefficient1D;
 using composed_types::Normalize;
 using composed_types::Vector3d;
 
+absl::StatusOr<std::vector<std::vector<EffectiveCurrentCarrier>>>
+CollectEffectiveCurrentCarriersByCircuit(
+    const MagneticConfiguration& magnetic_configuration,
+    bool for_vector_potential) {
+  absl::Status status =
+      IsMagneticConfigurationFullyPopulated(magnetic_configuration);
+  if (!status.ok()) {
+    return status;
+  }
+
+  std::vector<std::vector<EffectiveCurrentCarrier>> effective_current_carriers(
+      magnetic_configuration.serial_circuits_size());
+  for (int circuit_index = 0;
+       circuit_index < magnetic_configuration.serial_circuits_size();
+       ++circuit_index) {
+    const SerialCircuit& serial_circuit =
+        magnetic_configuration.serial_circuits(circuit_index);
+    if (!serial_circuit.has_current() || serial_circuit.current() == 0.0) {
+      // skip contributions with assumed zero current
+      continue;
+    }
+
+    for (const Coil& coil : serial_circuit.coils()) {
+      double current = serial_circuit.current();
+      if (coil.has_num_windings()) {
+        current *= coil.num_windings();
+      }
+
+      for (const CurrentCarrier& current_carrier : coil.current_carriers()) {
+        EffectiveCurrentCarrier effective = {&current_carrier, current, {}};
+        switch (current_carrier.type_case()) {
+          case CurrentCarrier::TypeCase::kInfiniteStraightFilament:
+            if (for_vector_potential) {
+              return absl::InvalidArgumentError(
+                  "Cannot compute the magnetic vector potential of an infinite "
+                  "straight filament.");
+            }
+            break;
+          case CurrentCarrier::TypeCase::kCircularFilament: {
+            const CircularFilament& circular_filament =
+                current_carrier.circular_filament();
+            const Vector3d& center = circular_filament.center();
+            const Vector3d& normal = circular_filament.normal();
+            effective.geometry = {center.x(), center.y(), center.z(),
+                                  normal.x(), normal.y(), normal.z()};
+            break;
+          }
+          case CurrentCarrier::TypeCase::kPolygonFilament: {
+            const PolygonFilament& polygon_filament =
+                current_carrier.polygon_filament();
+            effective.geometry.resize(polygon_filament.vertices_size() * 3);
+            for (int i = 0; i < polygon_filament.vertices_size(); ++i) {
+              const Vector3d& vertex = polygon_filament.vertices(i);
+              effective.geometry[i * 3 + 0] = vertex.x();
+              effective.geometry[i * 3 + 1] = vertex.y();
+              effective.geometry[i * 3 + 2] = vertex.z();
+            }
+            break;
+          }
+          case CurrentCarrier::TypeCase::kTypeNotSet:
+            // consider as empty CurrentCarrier -> ignore
+            continue;
+          default:
+            return absl::InvalidArgumentError(absl::StrCat(
+                "current carrier type ", current_carrier.type_case(),
+                " not implemented yet."));
+        }
+        effective_current_carriers[circuit_index].push_back(
+            std::move(effective));
+      }  // CurrentCarrier
+    }  // Coil
+  }  // SerialCircuit
+
+  return effective_current_carriers;
+}  // CollectEffectiveCurrentCarriersByCircuit
+
+void AddEffectiveCurrentCarrierContributions(
+    const std::vector<EffectiveCurrentCarrier>& effective_current_carriers,
+    bool vector_potential, int number_evaluation_positions,
+    const double* evaluation_positions, double* m_result) {
+  for (const EffectiveCurrentCarrier& effective : effective_current_carriers) {
+    const CurrentCarrier& current_carrier = *effective.current_carrier;
+    switch (current_carrier.type_case()) {
+      case CurrentCarrier::TypeCase::kInfiniteStraightFilament: {
+        // rare in practice, so simply go through the std::vector interface
+        std::vector<std::vector<double>> positions(number_evaluation_positions);
+        std::vector<std::vector<double>> magnetic_field(
+            number_evaluation_positions, std::vector<double>(3, 0.0));
+        for (int i = 0; i < number_evaluation_positions; ++i) {
+          positions[i].assign(evaluation_positions + i * 3,
+                              evaluation_positions + i * 3 + 3);
+        }
+        CHECK_OK(MagneticField(current_carrier.infinite_straight_filament(),
+                               effective.current, positions, magnetic_field,
+                               false));
+        for (int i = 0; i < number_evaluation_positions; ++i) {
+          m_result[i * 3 + 0] += magnetic_field[i][0];
+          m_result[i * 3 + 1] += magnetic_field[i][1];
+          m_result[i * 3 + 2] += magnetic_field[i][2];
+        }
+        break;
+      }
+      case CurrentCarrier::TypeCase::kCircularFilament: {
+        const double* center = effective.geometry.data();
+        const double* normal = effective.geometry.data() + 3;
+        const double radius = current_carrier.circular_filament().radius();
+        if (vector_potential) {
+          // same sign convention as the std::vector overload (see there)
+          abscab::vectorPotentialCircularFilament(
+              center, normal, radius, -effective.current,
+              number_evaluation_positions, evaluation_positions, m_result);
+        } else {
+          abscab::magneticFieldCircularFilament(
+              center, normal, radius, effective.current,
+              number_evaluation_positions, evaluation_positions, m_result);
+        }
+        break;
+      }
+      case CurrentCarrier::TypeCase::kPolygonFilament: {
+        const int number_vertices =
+            static_cast<int>(effective.geometry.size() / 3);
+        if (vector_potential) {
+          abscab::vectorPotentialPolygonFilament(
+              number_vertices, effective.geometry.data(), effective.current,
+              number_evaluation_positions, evaluation_positions, m_result);
+        } else {
+          abscab::magneticFieldPolygonFilament(
+              number_vertices, effective.geometry.data(), effective.current,
+              number_evaluation_positions, evaluation_positions, m_result);
+        }
+        break;
+      }
+      default:
+        // filtered out in CollectEffectiveCurrentCarriersByCircuit
+        LOG(FATAL) << "unexpected current carrier type "
+                   << current_carrier.type_case();
+    }
+  }  // EffectiveCurrentCarrier
+}  // AddEffectiveCurrentCarrierContributions
+
+namespace {
+
+// Number of evaluation positions handed to ABSCAB at once by the parallel
+// MagneticField and VectorPotential overloads. A thread evaluates all current
+// carriers on one block before moving on to the next one, so that the block of
+// positions and results stays in cache.
+constexpr int kEvaluationBlockSize = 256;
+
+// Common implementation of the parallel MagneticField and VectorPotential
+// overloads for a MagneticConfiguration.
+absl::StatusOr<RowMatrixX3d> EvaluateInParallel(
+    const MagneticConfiguration& magnetic_configuration,
+    const Eigen::Ref<const RowMatrixX3d>& evaluation_positions,
+    std::optional<int> max_threads, bool vector_potential) {
+  int num_threads = 1;
+#ifdef _OPENMP
+  num_threads = max_threads.value_or(omp_get_max_threads());
+#endif  // _OPENMP
+  if (num_threads < 1) {
+    return absl::InvalidArgumentError(
+        absl::StrCat("max_threads must be positive, but is ", num_threads));
+  }
+
+  absl::StatusOr<std::vector<std::vector<EffectiveCurrentCarrier>>>
+      effective_current_carriers_by_circuit =
+          CollectEffectiveCurrentCarriersByCircuit(magnetic_configuration,
+                                                   vector_potential);
+  if (!effective_current_carriers_by_circuit.ok()) {
+    return effective_current_carriers_by_circuit.status();
+  }
+  // The net field does not need the split into circuits.
+  std::vector<EffectiveCurrentCarrier> effective_current_carriers;
+  for (std::vector<EffectiveCurrentCarrier>& circuit_current_carriers :
+       *effective_current_carriers_by_circuit) {
+    std::move(circuit_current_carriers.begin(), circuit_current_carriers.end(),
+              std::back_inserter(effective_current_carriers));
+  }
+
+  const int number_evaluation_positions =
+      static_cast<int>(evaluation_positions.rows());
+  const int number_blocks =
+      (number_evaluation_positions + kEvaluationBlockSize - 1) /
+      kEvaluationBlockSize;
+
+  // target storage needs to be initialized to zero,
+  // as abscab methods only add and do not initialize
+  RowMatrixX3d result = RowMatrixX3d::Zero(number_evaluation_positions, 3);
+
+  // The input might not be contiguous in memory, e.g., if it is a view into a
+  // larger matrix, so copy each block into contiguous storage for ABSCAB.
+  const bool contiguous = evaluation_positions.outerStride() == 3 &&
+                          evaluation_positions.innerStride() == 1;
+
+#ifdef _OPENMP
+#pragma omp parallel num_threads(num_threads)
+#endif  // _OPENMP
+  {
+    std::vector<double> block_positions;
+    if (!contiguous) {
+      block_positions.resize(kEvaluationBlockSize * 3);
+    }
+
+#ifdef _OPENMP
+#pragma omp for schedule(dynamic)
+#endif  // _OPENMP
+    for (int block = 0; block < number_blocks; ++block) {
+      const int first = block * kEvaluationBlockSize;
+      const int size =
+          std::min(kEvaluationBlockSize, number_evaluation_positions - first);
+      const double* positions = nullptr;
+      if (contiguous) {
+        positions = evaluation_positions.row(first).data();
+      } else {
+        for (int i = 0; i < size; ++i) {
+          for (int k = 0; k < 3; ++k) {
+            block_positions[i * 3 + k] = evaluation_positions(first + i, k);
+          }
+        }
+        positions = block_positions.data();
+      }
+      AddEffectiveCurrentCarrierContributions(effective_current_carriers,
+                                              vector_potential, size, positions,
+                                              result.row(first).data());
+    }
+  }  // omp parallel
+
+  return result;
+}
+
+}  // namespace
+
 absl::Status MagneticField(
     const InfiniteStraightFilament& infinite_straight_filament, double current,
     const std::vector<std::vector<double>>& evaluation_positions,
@@ -333,6 +572,205 @@ absl::Status MagneticField(
   return absl::OkStatus();
 }  // MagneticField for MagneticConfiguration
 
+absl::StatusOr<RowMatrixX3d> MagneticField(
+    const MagneticConfiguration& magnetic_configuration,
+    const Eigen::Ref<const RowMatrixX3d>& evaluation_positions,
+    std::optional<int> max_threads) {
+  return EvaluateInParallel(magnetic_configuration, evaluation_positions,
+                            max_threads, /*vector_potential=*/false);
+}  // parallel MagneticField for MagneticConfiguration
+
+absl::StatusOr<std::vector<RowMatrixX3d>> MagneticFieldAdjoint(
+    const MagneticConfiguration& magnetic_configuration,
+    const Eigen::Ref<const RowMatrixX3d>& evaluation_positions,
+    const Eigen::Ref<const RowMatrixX3d>& cotangents,
+    std::optional<int> max_threads) {
+  if (cotangents.rows() != evaluation_positions.rows()) {
+    return absl::InvalidArgumentError(
+        absl::StrCat("number of cotangents (", cotangents.rows(),
+                     ") must match number of evaluation positions (",
+                     evaluation_positions.rows(), ")"));
+  }
+
+  // all SerialCircuits see the same evaluation positions and cotangents
+  const int number_of_serial_circuits =
+      magnetic_configuration.serial_circuits_size();
+  const std::vector<Eigen::Ref<const RowMatrixX3d>>
+      evaluation_positions_by_circuit(number_of_serial_circuits,
+                                      evaluation_positions);
+  const std::vector<Eigen::Ref<const RowMatrixX3d>> cotangents_by_circuit(
+      number_of_serial_circuits, cotangents);
+  return MagneticFieldAdjointByCircuit(magnetic_configuration,
+                                       evaluation_positions_by_circuit,
+                                       cotangents_by_circuit, max_threads);
+}  // MagneticFieldAdjoint
+
+absl::StatusOr<std::vector<RowMatrixX3d>> MagneticFieldAdjointByCircuit(
+    const MagneticConfiguration& magnetic_configuration,
+    const std::vector<Eigen::Ref<const RowMatrixX3d>>&
+        evaluation_positions_by_circuit,
+    const std::vector<Eigen::Ref<const RowMatrixX3d>>& cotangents_by_circuit,
+    std::optional<int> max_threads) {
+  int num_threads = 1;
+#ifdef _OPENMP
+  num_threads = max_threads.value_or(omp_get_max_threads());
+#endif  // _OPENMP
+  if (num_threads < 1) {
+    return absl::InvalidArgumentError(
+        absl::StrCat("max_threads must be positive, but is ", num_threads));
+  }
+  const int number_of_serial_circuits =
+      magnetic_configuration.serial_circuits_size();
+  if (static_cast<int>(evaluation_positions_by_circuit.size()) !=
+          number_of_serial_circuits ||
+      static_cast<int>(cotangents_by_circuit.size()) !=
+          number_of_serial_circuits) {
+    return absl::InvalidArgumentError(absl::StrCat(
+        "need evaluation positions and cotangents for each of the ",
+        number_of_serial_circuits, " serial circuits, but got ",
+        evaluation_positions_by_circuit.size(), " and ",
+        cotangents_by_circuit.size()));
+  }
+  for (int circuit_index = 0; circuit_index < number_of_serial_circuits;
+       ++circuit_index) {
+    if (cotangents_by_circuit[circuit_index].rows() !=
+        evaluation_positions_by_circuit[circuit_index].rows()) {
+      return absl::InvalidArgumentError(absl::StrCat(
+          "number of cotangents (", cotangents_by_circuit[circuit_index].rows(),
+          ") must match number of evaluation positions (",
+          evaluation_positions_by_circuit[circuit_index].rows(),
+          ") of serial circuit ", circuit_index));
+    }
+  }
+
+  absl::Status status =
+      IsMagneticConfigurationFullyPopulated(magnetic_configuration);
+  if (!status.ok()) {
+    return status;
+  }
+
+  // Collect all PolygonFilaments with the current they carry, i.e., the
+  // circuit current times the number of windings of their coil, and all of
+  // their segments that carry a current.
+  std::vector<const PolygonFilament*> polygon_filaments;
+  std::vector<double> currents;
+  std::vector<int> circuit_indices;
+  std::vector<std::pair<int, int>> segments;  // (polygon, first vertex)
+  for (int circuit_index = 0; circuit_index < number_of_serial_circuits;
+       ++circuit_index) {
+    const SerialCircuit& serial_circuit =
+        magnetic_configuration.serial_circuits(circuit_index);
+    for (const Coil& coil : serial_circuit.coils()) {
+      double current =
+          serial_circuit.has_current() ? serial_circuit.current() : 0.0;
+      if (coil.has_num_windings()) {
+        current *= coil.num_windings();
+      }
+
+      for (const CurrentCarrier& current_carrier : coil.current_carriers()) {
+        if (current_carrier.type_case() !=
+            CurrentCarrier::TypeCase::kPolygonFilament) {
+          continue;
+        }
+        const int polygon_index = static_cast<int>(polygon_filaments.size());
+        const PolygonFilament& polygon_filament =
+            current_carrier.polygon_filament();
+        polygon_filaments.push_back(&polygon_filament);
+        currents.push_back(current);
+        circuit_indices.push_back(circuit_index);
+        if (current == 0.0) {
+          continue;
+        }
+        for (int i = 0; i < polygon_filament.vertices_size() - 1; ++i) {
+          segments.emplace_back(polygon_index, i);
+        }
+      }  // CurrentCarrier
+    }  // Coil
+  }  // SerialCircuit
+
+  const int number_segments = static_cast<int>(segments.size());
+
+  // gradient with respect to the start and end point of each segment
+  Eigen::Matrix<double, Eigen::Dynamic, 6, Eigen::RowMajor> segment_gradients(
+      number_segments, 6);
+
+  // Each segment is handled by one thread, which sums up the contributions
+  // from all evaluation positions, so that no two threads write to the same
+  // vertex and the result does not depend on the number of threads.
+#ifdef _OPENMP
+#pragma omp parallel for schedule(dynamic) num_threads(num_threads)
+#endif  // _OPENMP
+  for (int segment_index = 0; segment_index < number_segments;
+       ++segment_index) {
+    const auto [polygon_index, vertex_index] = segments[segment_index];
+    const PolygonFilament& polygon_filament = *polygon_filaments[polygon_index];
+    const Eigen::Ref<const RowMatrixX3d>& evaluation_positions =
+        evaluation_positions_by_circuit[circuit_indices[polygon_index]];
+    const Eigen::Ref<const RowMatrixX3d>& cotangents =
+        cotangents_by_circuit[circuit_indices[polygon_index]];
+    const Vector3d& start = polygon_filament.vertices(vertex_index);
+    const Vector3d& end = polygon_filament.vertices(vertex_index + 1);
+    const Eigen::Vector3d a(start.x(), start.y(), start.z());
+    const Eigen::Vector3d b(end.x(), end.y(), end.z());
+
+    Eigen::Vector3d gradient_a = Eigen::Vector3d::Zero();
+    Eigen::Vector3d gradient_b = Eigen::Vector3d::Zero();
+    for (int i = 0; i < evaluation_positions.rows(); ++i) {
+      const Eigen::Vector3d x = evaluation_positions.row(i).transpose();
+      const Eigen::Vector3d g = cotangents.row(i).transpose();
+
+      // B = mu_0 I / (4 pi) * F * (r_i x r_f) with
+      // F = (|r_i| + |r_f|) / (|r_i| |r_f| (|r_i| |r_f| + r_i . r_f))
+      const Eigen::Vector3d r_i = x - a;
+      const Eigen::Vector3d r_f = x - b;
+      const double l_i = r_i.norm();
+      const double l_f = r_f.norm();
+      const double l_sum = l_i + l_f;
+      const double l_product = l_i * l_f;
+      const double q = l_product + r_i.dot(r_f);
+      const double f = l_sum / (l_product * q);
+
+      const Eigen::Vector3d d_f_d_r_i =
+          f *
+          ((1.0 / (l_i * l_sum) - 1.0 / (l_i * l_i) - l_f / (l_i * q)) * r_i -
+           r_f / q);
+      const Eigen::Vector3d d_f_d_r_f =
+          f *
+          ((1.0 / (l_f * l_sum) - 1.0 / (l_f * l_f) - l_i / (l_f * q)) * r_f -
+           r_i / q);
+
+      // d r_i / d a = d r_f / d b = -1
+      const double g_dot_cross = g.dot(r_i.cross(r_f));
+      gradient_a -= g_dot_cross * d_f_d_r_i + f * r_f.cross(g);
+      gradient_b -= g_dot_cross * d_f_d_r_f + f * g.cross(r_i);
+    }  // i
+
+    // 1.0e-7 == mu0/4 pi
+    const double scale = 1.0e-7 * currents[polygon_index];
+    segment_gradients.row(segment_index).head<3>() =
+        scale * gradient_a.transpose();
+    segment_gradients.row(segment_index).tail<3>() =
+        scale * gradient_b.transpose();
+  }  // segment_index
+
+  std::vector<RowMatrixX3d> gradients(polygon_filaments.size());
+  for (std::size_t polygon_index = 0; polygon_index < polygon_filaments.size();
+       ++polygon_index) {
+    gradients[polygon_index] = RowMatrixX3d::Zero(
+        polygon_filaments[polygon_index]->vertices_size(), 3);
+  }
+  for (int segment_index = 0; segment_index < number_segments;
+       ++segment_index) {
+    const auto [polygon_index, vertex_index] = segments[segment_index];
+    gradients[polygon_index].row(vertex_index) +=
+        segment_gradients.row(segment_index).head<3>();
+    gradients[polygon_index].row(vertex_index + 1) +=
+        segment_gradients.row(segment_index).tail<3>();
+  }
+
+  return gradients;
+}  // MagneticFieldAdjointByCircuit
+
 // ----------------
 
 // The magnetic vector potential diverges for an infinite straight filament,
@@ -545,6 +983,14 @@ absl::Status VectorPotential(
   return absl::OkStatus();
 }  // VectorPotential for MagneticConfiguration
 
+absl::StatusOr<RowMatrixX3d> VectorPotential(
+    const MagneticConfiguration& magnetic_configuration,
+    const Eigen::Ref<const RowMatrixX3d>& evaluation_positions,
+    std::optional<int> max_threads) {
+  return EvaluateInParallel(magnetic_configuration, evaluation_positions,
+                            max_threads, /*vector_potential=*/true);
+}  // parallel VectorPotential for MagneticConfiguration
+
 absl::StatusOr<double> LinkingCurrent(
     const MagneticConfiguration& magnetic_configuration,
     const CurveRZFourier& axis_coefficients) {
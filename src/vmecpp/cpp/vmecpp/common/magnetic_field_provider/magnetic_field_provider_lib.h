@@ -5,6 +5,8 @@
 #ifndef VMECPP_COMMON_MAGNETIC_FIELD_PROVIDER_MAGNETIC_FIELD_PROVIDER_LIB_H_
 #define VMECPP_COMMON_MAGNETIC_FIELD_PROVIDER_MAGNETIC_FIELD_PROVIDER_LIB_H_
 
+#include <Eigen/Dense>
+#include <optional>
 #include <vector>
 
 #include "absl/status/status.h"
@@ -14,6 +16,10 @@
 
 namespace magnetics {
 
+// Cartesian vectors, one per row: (x, y, z). The row-major layout is the
+// array-of-structs order (x0, y0, z0, x1, y1, z1, ...) that ABSCAB works on.
+using RowMatrixX3d = Eigen::Matrix<double, Eigen::Dynamic, 3, Eigen::RowMajor>;
+
 // Compute the magnetic field due to a given InfiniteStraightFilament and a
 // given current at given set of evaluation locations. A fatal error occurs if
 // the direction vector of the InfiniteStraightFilament has zero length or if
@@ -58,6 +64,85 @@ absl::Status MagneticField(
     std::vector<std::vector<double> > &m_magnetic_field,
     bool check_current_carrier = true);
 
+// Compute the net magnetic field due to a given MagneticConfiguration at the
+// evaluation positions given as rows of `evaluation_positions`. Returns the
+// Cartesian magnetic field components in the same layout. The evaluation
+// positions are split into blocks that are distributed over up to
+// `max_threads` OpenMP threads (all available threads if not specified); each
+// thread evaluates all current carriers on its block.
+absl::StatusOr<RowMatrixX3d> MagneticField(
+    const MagneticConfiguration &magnetic_configuration,
+    const Eigen::Ref<const RowMatrixX3d> &evaluation_positions,
+    std::optional<int> max_threads = std::nullopt);
+
+// Compute the sensitivity of the magnetic field due to a given
+// MagneticConfiguration with respect to the vertices of its PolygonFilaments,
+// contracted with the given `cotangents`: the gradient of
+//   sum_i cotangents.row(i) . B(evaluation_positions.row(i))
+// with respect to each vertex. This is the adjoint (vector-Jacobian product) of
+// the Biot-Savart law, which yields the gradient of a scalar objective of the
+// magnetic field, given its derivatives with respect to the field, for all
+// vertices at the cost of about one evaluation of the magnetic field.
+// The derivatives are computed analytically from the Hanson-Hirshman formula
+// for the magnetic field of a straight segment, see Eqn. (8) in Hanson &
+// Hirshman (2002) [Physics of Plasmas 9, 4410]. The result has one entry per
+// PolygonFilament, in the order of serial circuits, coils and current
+// carriers, with one row per vertex; other types of current carriers are
+// skipped. Note that a closed polygon stores its first vertex again at the
+// end, so that the sensitivity to moving that point is the sum of both rows.
+// The evaluation positions must not be located on any of the filaments.
+absl::StatusOr<std::vector<RowMatrixX3d> > MagneticFieldAdjoint(
+    const MagneticConfiguration &magnetic_configuration,
+    const Eigen::Ref<const RowMatrixX3d> &evaluation_positions,
+    const Eigen::Ref<const RowMatrixX3d> &cotangents,
+    std::optional<int> max_threads = std::nullopt);
+
+// Same as MagneticFieldAdjoint, but with separate evaluation positions and
+// cotangents for each SerialCircuit, i.e., the gradient of
+//   sum_c sum_i cotangents_by_circuit[c].row(i)
+//       . B_c(evaluation_positions_by_circuit[c].row(i))
+// where B_c is the magnetic field of the c-th SerialCircuit alone. This is the
+// adjoint of a field that is kept apart by circuit, like a
+// makegrid::MagneticFieldResponseTable.
+absl::StatusOr<std::vector<RowMatrixX3d> > MagneticFieldAdjointByCircuit(
+    const MagneticConfiguration &magnetic_configuration,
+    const std::vector<Eigen::Ref<const RowMatrixX3d> >
+        &evaluation_positions_by_circuit,
+    const std::vector<Eigen::Ref<const RowMatrixX3d> > &cotangents_by_circuit,
+    std::optional<int> max_threads = std::nullopt);
+
+// A current carrier of a MagneticConfiguration together with the current it
+// carries, i.e., the circuit current times the number of windings of its coil.
+// The geometry of circular and polygon filaments is stored in the flat layout
+// needed by ABSCAB: (center, normal) or the vertices in array-of-structs order.
+// `current_carrier` points into the MagneticConfiguration it was collected
+// from, which therefore needs to outlive it.
+struct EffectiveCurrentCarrier {
+  const CurrentCarrier *current_carrier;
+  double current;
+  std::vector<double> geometry;
+};
+
+// Collect the current carriers with non-zero current of each SerialCircuit of
+// the given MagneticConfiguration, with their geometry converted for ABSCAB
+// once up front instead of once per block of evaluation positions. The result
+// has one (possibly empty) entry per SerialCircuit. If `for_vector_potential`,
+// an InfiniteStraightFilament is an error, since its magnetic vector potential
+// diverges.
+absl::StatusOr<std::vector<std::vector<EffectiveCurrentCarrier> > >
+CollectEffectiveCurrentCarriersByCircuit(
+    const MagneticConfiguration &magnetic_configuration,
+    bool for_vector_potential);
+
+// Add the magnetic field (or, if `vector_potential`, the magnetic vector
+// potential) of all `effective_current_carriers` at
+// `number_evaluation_positions` positions, given and accumulated in
+// array-of-structs order (x0, y0, z0, x1, y1, z1, ...).
+void AddEffectiveCurrentCarrierContributions(
+    const std::vector<EffectiveCurrentCarrier> &effective_current_carriers,
+    bool vector_potential, int number_evaluation_positions,
+    const double *evaluation_positions, double *m_result);
+
 // ----------------
 
 // The magnetic vector potential diverges for an infinite straight filament,
@@ -96,6 +181,16 @@ absl::Status VectorPotential(
     std::vector<std::vector<double> > &m_vector_potential,
     bool check_current_carrier = true);
 
+// Compute the net magnetic vector potential due to a given
+// MagneticConfiguration at the evaluation positions given as rows of
+// `evaluation_positions`, in parallel like the corresponding MagneticField
+// overload. An InfiniteStraightFilament in the MagneticConfiguration is an
+// error, since its magnetic vector potential diverges.
+absl::StatusOr<RowMatrixX3d> VectorPotential(
+    const MagneticConfiguration &magnetic_configuration,
+    const Eigen::Ref<const RowMatrixX3d> &evaluation_positions,
+    std::optional<int> max_threads = std::nullopt);
+
 // Compute the linking current between a given magnetic configuration
 // and a given closed curve, e.g., the magnetic axis.
 // The number of sampling points along the axis is chosen
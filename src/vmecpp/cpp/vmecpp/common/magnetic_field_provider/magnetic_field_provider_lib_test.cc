@@ -19,6 +19,7 @@
 #include "vmecpp/common/composed_types_lib/composed_types_lib.h"
 #include "vmecpp/common/magnetic_configuration_definition/magnetic_configuration.h"
 #include "vmecpp/common/magnetic_configuration_lib/magnetic_configuration_lib.h"
+#include "vmecpp/common/util/util.h"
 
 namespace magnetics {
 
@@ -2392,4 +2393,239 @@ TEST(TestVectorPotential, CheckMultipleCoilsWithWindings) {
   }
 }  // VectorPotential: CheckMultipleCoilsWithWindings
 
+// A MagneticConfiguration with all types of current carriers, distributed over
+// two serial circuits, one of them with a coil with several windings.
+MagneticConfiguration MakeMixedMagneticConfiguration(
+    bool with_infinite_straight_filament) {
+  MagneticConfiguration magnetic_configuration;
+
+  SerialCircuit *serial_circuit_1 =
+      magnetic_configuration.add_serial_circuits();
+  serial_circuit_1->set_current(42.0);
+  Coil *coil_1 = serial_circuit_1->add_coils();
+  coil_1->set_num_windings(13);
+  PolygonFilament *polygon =
+      coil_1->add_current_carriers()->mutable_polygon_filament();
+  CHECK_OK(PolygonCirclePopulate(*polygon, 1.23, 127, 0.45));
+  CircularFilament *circle =
+      coil_1->add_current_carriers()->mutable_circular_filament();
+  circle->mutable_center()->set_x(0.1);
+  circle->mutable_center()->set_y(0.2);
+  circle->mutable_center()->set_z(-0.3);
+  circle->mutable_normal()->set_x(0.0);
+  circle->mutable_normal()->set_y(0.1);
+  circle->mutable_normal()->set_z(1.0);
+  circle->set_radius(2.71);
+
+  SerialCircuit *serial_circuit_2 =
+      magnetic_configuration.add_serial_circuits();
+  serial_circuit_2->set_current(-17.0);
+  Coil *coil_2 = serial_circuit_2->add_coils();
+  if (with_infinite_straight_filament) {
+    InfiniteStraightFilament *filament =
+        coil_2->add_current_carriers()->mutable_infinite_straight_filament();
+    filament->mutable_origin()->set_x(0.0);
+    filament->mutable_origin()->set_y(0.0);
+    filament->mutable_origin()->set_z(0.0);
+    filament->mutable_direction()->set_x(0.0);
+    filament->mutable_direction()->set_y(0.0);
+    filament->mutable_direction()->set_z(1.0);
+  }
+  PolygonFilament *polygon_2 =
+      coil_2->add_current_carriers()->mutable_polygon_filament();
+  CHECK_OK(PolygonCirclePopulate(*polygon_2, 0.5, 33, -0.2));
+
+  // a circuit without current does not contribute
+  SerialCircuit *serial_circuit_3 =
+      magnetic_configuration.add_serial_circuits();
+  serial_circuit_3->set_current(0.0);
+  PolygonFilament *polygon_3 = serial_circuit_3->add_coils()
+                                   ->add_current_carriers()
+                                   ->mutable_polygon_filament();
+  CHECK_OK(PolygonCirclePopulate(*polygon_3, 0.7, 17, 0.0));
+
+  return magnetic_configuration;
+}  // MakeMixedMagneticConfiguration
+
+// The parallel overloads for many evaluation positions at once must give the
+// same result as the std::vector overloads, for any number of threads and
+// also for evaluation positions that are not contiguous in memory.
+class ParallelMagneticConfigurationTest
+    : public TestWithParam<std::tuple<bool, int> > {};
+
+TEST_P(ParallelMagneticConfigurationTest, CheckAgainstSerialEvaluation) {
+  static constexpr double kTolerance = 1.0e-14;
+
+  // not a multiple of the block size, to check the last, partial block
+  static constexpr int kNumberEvaluationPositions = 1000;
+
+  const auto [vector_potential, num_threads] = GetParam();
+
+  const MagneticConfiguration magnetic_configuration =
+      MakeMixedMagneticConfiguration(
+          /*with_infinite_straight_filament=*/!vector_potential);
+
+  // evaluation positions in the first three columns; the fourth column makes
+  // the rows non-contiguous
+  Eigen::Matrix<double, Eigen::Dynamic, 4, Eigen::RowMajor> storage(
+      kNumberEvaluationPositions, 4);
+  std::vector<std::vector<double> > evaluation_positions(
+      kNumberEvaluationPositions);
+  for (int i = 0; i < kNumberEvaluationPositions; ++i) {
+    const double phi = 0.1 * i;
+    const double r = 0.3 + 3.0 * i / kNumberEvaluationPositions;
+    evaluation_positions[i] = {r * cos(phi), r * sin(phi), 0.01 * i - 5.0};
+    for (int k = 0; k < 3; ++k) {
+      storage(i, k) = evaluation_positions[i][k];
+    }
+    storage(i, 3) = 1.0e300;
+  }
+  const RowMatrixX3d contiguous_positions = storage.leftCols(3);
+
+  std::vector<std::vector<double> > expected(kNumberEvaluationPositions,
+                                             std::vector<double>(3, 0.0));
+  absl::StatusOr<RowMatrixX3d> contiguous_result;
+  absl::StatusOr<RowMatrixX3d> strided_result;
+  if (vector_potential) {
+    ASSERT_TRUE(
+        VectorPotential(magnetic_configuration, evaluation_positions, expected)
+            .ok());
+    contiguous_result = VectorPotential(magnetic_configuration,
+                                        contiguous_positions, num_threads);
+    strided_result = VectorPotential(magnetic_configuration,
+                                     storage.leftCols(3), num_threads);
+  } else {
+    ASSERT_TRUE(
+        MagneticField(magnetic_configuration, evaluation_positions, expected)
+            .ok());
+    contiguous_result = MagneticField(magnetic_configuration,
+                                      contiguous_positions, num_threads);
+    strided_result =
+        MagneticField(magnetic_configuration, storage.leftCols(3), num_threads);
+  }
+  ASSERT_TRUE(contiguous_result.ok()) << contiguous_result.status();
+  ASSERT_TRUE(strided_result.ok()) << strided_result.status();
+  ASSERT_EQ(contiguous_result->rows(), kNumberEvaluationPositions);
+  ASSERT_EQ(strided_result->rows(), kNumberEvaluationPositions);
+
+  for (int i = 0; i < kNumberEvaluationPositions; ++i) {
+    for (int k = 0; k < 3; ++k) {
+      EXPECT_TRUE(
+          IsCloseRelAbs(expected[i][k], (*contiguous_result)(i, k), kTolerance))
+          << "i=" << i << " k=" << k;
+      EXPECT_EQ((*contiguous_result)(i, k), (*strided_result)(i, k));
+    }
+  }
+}  // CheckAgainstSerialEvaluation
+
+INSTANTIATE_TEST_SUITE_P(TestMagneticFieldProvider,
+                         ParallelMagneticConfigurationTest,
+                         Combine(Bool(), Values(1, 3)));
+
+TEST(TestVectorPotential, CheckParallelRejectsInfiniteStraightFilament) {
+  const MagneticConfiguration magnetic_configuration =
+      MakeMixedMagneticConfiguration(/*with_infinite_straight_filament=*/true);
+  const RowMatrixX3d evaluation_positions = RowMatrixX3d::Ones(4, 3);
+
+  EXPECT_TRUE(MagneticField(magnetic_configuration, evaluation_positions).ok());
+  EXPECT_FALSE(
+      VectorPotential(magnetic_configuration, evaluation_positions).ok());
+  EXPECT_FALSE(
+      MagneticField(magnetic_configuration, evaluation_positions, 0).ok());
+}  // CheckParallelRejectsInfiniteStraightFilament
+
+// The adjoint of the Biot-Savart law must agree with finite differences of
+// the contracted magnetic field with respect to the vertices of the polygons.
+TEST(TestMagneticField, CheckAdjointAgainstFiniteDifferences) {
+  static constexpr double kTolerance = 1.0e-6;
+  static constexpr double kStep = 1.0e-6;
+  static constexpr int kNumberEvaluationPositions = 300;
+
+  const MagneticConfiguration magnetic_configuration =
+      MakeMixedMagneticConfiguration(/*with_infinite_straight_filament=*/true);
+
+  RowMatrixX3d evaluation_positions(kNumberEvaluationPositions, 3);
+  RowMatrixX3d cotangents(kNumberEvaluationPositions, 3);
+  for (int i = 0; i < kNumberEvaluationPositions; ++i) {
+    const double phi = 0.1 * i;
+    const double r = 0.3 + 3.0 * i / kNumberEvaluationPositions;
+    evaluation_positions.row(i) << r * cos(phi), r * sin(phi), 0.01 * i - 1.5;
+    cotangents.row(i) << cos(0.3 * i), sin(0.7 * i), 0.5;
+  }
+
+  // contracted magnetic field: sum_i cotangents_i . B(x_i)
+  const auto objective = [&](const MagneticConfiguration &configuration) {
+    absl::StatusOr<RowMatrixX3d> magnetic_field =
+        MagneticField(configuration, evaluation_positions);
+    CHECK_OK(magnetic_field);
+    return magnetic_field->cwiseProduct(cotangents).sum();
+  };
+
+  absl::StatusOr<std::vector<RowMatrixX3d> > gradients = MagneticFieldAdjoint(
+      magnetic_configuration, evaluation_positions, cotangents);
+  ASSERT_TRUE(gradients.ok()) << gradients.status();
+
+  // one entry per PolygonFilament, with one row per vertex
+  ASSERT_EQ(gradients->size(), 3);
+  EXPECT_EQ((*gradients)[0].rows(), 127);
+  EXPECT_EQ((*gradients)[1].rows(), 33);
+  EXPECT_EQ((*gradients)[2].rows(), 17);
+  // no current in the third circuit
+  EXPECT_TRUE((*gradients)[2].isZero());
+
+  // (serial circuit, coil, current carrier) of the PolygonFilaments
+  const std::vector<std::tuple<int, int, int> > polygon_locations = {{0, 0, 0},
+                                                                     {1, 0, 1}};
+  for (int polygon_index = 0; polygon_index < 2; ++polygon_index) {
+    const auto [circuit_index, coil_index, carrier_index] =
+        polygon_locations[polygon_index];
+    for (const int vertex_index : {0, 5, 32}) {
+      for (int k = 0; k < 3; ++k) {
+        double objective_difference = 0.0;
+        for (const double sign : {1.0, -1.0}) {
+          MagneticConfiguration perturbed = magnetic_configuration;
+          Vector3d *vertex = perturbed.mutable_serial_circuits(circuit_index)
+                                 ->mutable_coils(coil_index)
+                                 ->mutable_current_carriers(carrier_index)
+                                 ->mutable_polygon_filament()
+                                 ->mutable_vertices(vertex_index);
+          if (k == 0) {
+            vertex->set_x(vertex->x() + sign * kStep);
+          } else if (k == 1) {
+            vertex->set_y(vertex->y() + sign * kStep);
+          } else {
+            vertex->set_z(vertex->z() + sign * kStep);
+          }
+          objective_difference += sign * objective(perturbed);
+        }
+        const double finite_difference = objective_difference / (2.0 * kStep);
+        EXPECT_TRUE(IsCloseRelAbs(finite_difference,
+                                  (*gradients)[polygon_index](vertex_index, k),
+                                  kTolerance))
+            << "polygon=" << polygon_index << " vertex=" << vertex_index
+            << " k=" << k;
+      }  // k
+    }  // vertex_index
+  }  // polygon_index
+
+  // independent of the number of threads
+  absl::StatusOr<std::vector<RowMatrixX3d> > gradients_3_threads =
+      MagneticFieldAdjoint(magnetic_configuration, evaluation_positions,
+                           cotangents, 3);
+  ASSERT_TRUE(gradients_3_threads.ok()) << gradients_3_threads.status();
+  for (std::size_t polygon_index = 0; polygon_index < gradients->size();
+       ++polygon_index) {
+    EXPECT_EQ((*gradients)[polygon_index],
+              (*gradients_3_threads)[polygon_index]);
+  }
+
+  EXPECT_FALSE(MagneticFieldAdjoint(magnetic_configuration,
+                                    evaluation_positions,
+                                    cotangents.topRows(10))
+                   .ok());
+  EXPECT_FALSE(MagneticFieldAdjoint(magnetic_configuration,
+                                    evaluation_positions, cotangents, 0)
+                   .ok());
+}  // CheckAdjointAgainstFiniteDifferences
+
 }  // namespace magnetics
@@ -4,8 +4,10 @@
 // SPDX-License-Identifier: MIT
 #include "vmecpp/common/makegrid_lib/makegrid_lib.h"
 
+#include <algorithm>
 #include <optional>
 #include <string>
+#include <utility>
 #include <vector>
 
 #include "absl/log/check.h"
@@ -27,16 +29,14 @@ using json_io::JsonReadBool;
 using json_io::JsonReadDouble;
 using json_io::JsonReadInt;
 
+using magnetics::AddEffectiveCurrentCarrierContributions;
+using magnetics::CollectEffectiveCurrentCarriersByCircuit;
+using magnetics::EffectiveCurrentCarrier;
 using magnetics::GetCircuitCurrents;
-using magnetics::MagneticField;
+using magnetics::MagneticFieldAdjointByCircuit;
 using magnetics::NumWindingsToCircuitCurrents;
+using magnetics::RowMatrixX3d;
 using magnetics::SetCircuitCurrents;
-using magnetics::VectorPotential;
-
-// TODO(jons): implement stellarator-symmetric grid and follow-up flip-mirroring
-// of magnetic quantities NOTE: For now, everything here is computed as
-// non-stellarator-symmetric,
-//       so there is a factor of ~2 speedup around the corner.
 
 absl::Status IsValidMakegridParameters(
     const MakegridParameters& makegrid_parameters) {
@@ -279,7 +279,13 @@ absl::StatusOr<MakegridParameters> ImportMakegridParametersFromFile(
   return ImportMakegridParametersFromJson(makegrid_params_json);
 }  // ImportMakegridParametersFromFile
 
-absl::StatusOr<RowMatrix3Xd> MakeCylindricalGrid(
+namespace {
+
+// Number of toroidal planes of the grid at which the magnetic field actually
+// needs to be evaluated: all of them, or, if stellarator symmetry is assumed,
+// only those in the first half-period 0 <= phi <= pi / nfp. The remaining
+// planes are obtained by mirroring.
+absl::StatusOr<int> NumberOfEvaluatedPhiPlanes(
     const MakegridParameters& makegrid_parameters) {
   absl::Status makegrid_parameters_status =
       IsValidMakegridParameters(makegrid_parameters);
@@ -287,6 +293,30 @@ absl::StatusOr<RowMatrix3Xd> MakeCylindricalGrid(
     return makegrid_parameters_status;
   }
 
+  const int num_phi = makegrid_parameters.number_of_phi_grid_points;
+  if (!makegrid_parameters.assume_stellarator_symmetry) {
+    return num_phi;
+  }
+  if (num_phi % 2 != 0) {
+    return absl::InvalidArgumentError(absl::StrCat(
+        "number of toroidal grid points has to be even for being able to "
+        "make use to stellarator symmetry in makegrid, but was num_phi=",
+        num_phi));
+  }
+  return num_phi / 2 + 1;
+}  // NumberOfEvaluatedPhiPlanes
+
+}  // namespace
+
+absl::StatusOr<RowMatrix3Xd> MakeCylindricalGrid(
+    const MakegridParameters& makegrid_parameters) {
+  absl::StatusOr<int> maybe_num_phi_effective =
+      NumberOfEvaluatedPhiPlanes(makegrid_parameters);
+  if (!maybe_num_phi_effective.ok()) {
+    return maybe_num_phi_effective.status();
+  }
+  const int num_phi_effective = *maybe_num_phi_effective;
+
   // shorthand variables for grid dimensions
   const int num_field_periods = makegrid_parameters.number_of_field_periods;
   const int num_phi = makegrid_parameters.number_of_phi_grid_points;
@@ -304,17 +334,6 @@ absl::StatusOr<RowMatrix3Xd> MakeCylindricalGrid(
   const double delta_z = (max_z - min_z) / (num_z - 1.0);
   const double delta_phi = 2.0 * M_PI / (num_field_periods * num_phi);
 
-  int num_phi_effective = num_phi;
-  if (makegrid_parameters.assume_stellarator_symmetry) {
-    if (num_phi % 2 != 0) {
-      return absl::InvalidArgumentError(absl::StrCat(
-          "number of toroidal grid points has to be even for being able to "
-          "make use to stellarator symmetry in makegrid, but was num_phi=",
-          num_phi));
-    }
-    num_phi_effective = num_phi / 2 + 1;
-  }
-
   const int total_number_of_grid_points = num_phi_effective * num_z * num_r;
 
   RowMatrix3Xd cylindrical_grid{
@@ -345,86 +364,62 @@ absl::StatusOr<RowMatrix3Xd> MakeCylindricalGrid(
   return cylindrical_grid;
 }  // MakeCylindricalGrid
 
-// Convert the cartesian magnetic field response to cylindrical coordinates
-// using the precomputed sin and cos terms
-template <typename Derived3>
-void CartesianToCylindricalField(
-    const Eigen::VectorXd& cos_phi, const Eigen::VectorXd& sin_phi,
-    const Eigen::DenseBase<Derived3>& magnetic_field, int num_z, int num_r,
-    int number_of_evaluation_points, Eigen::Ref<Eigen::RowVectorXd> m_b_r,
-    Eigen::Ref<Eigen::RowVectorXd> m_b_p,
-    Eigen::Ref<Eigen::RowVectorXd> m_b_z) {
-  const Eigen::Index num_phi = cos_phi.size();
-  const Eigen::Index total_number_of_grid_points = m_b_r.size();
-  // Sanity checks for dimensions
-  CHECK_EQ(cos_phi.size(), sin_phi.size());
-  CHECK_EQ(m_b_p.size(), m_b_r.size());
-  CHECK_EQ(m_b_z.size(), m_b_r.size());
-  CHECK_EQ(num_phi * num_r * num_z, total_number_of_grid_points);
-  // May be less than total_number_of_grid_points due to symmetry
-  CHECK_LE(number_of_evaluation_points, total_number_of_grid_points);
-
-// ABSCAB computes the Cartesian components of the magnetic field,
-// so we need to convert the x and y componets into r and phi
-// (cylindrical) components for comparison against the cylindrical
-// components in the mgrid file.
-#ifdef _OPENMP
-#pragma omp parallel for
-#endif  // _OPENMP
-  for (Eigen::Index linear_index = 0;
-       linear_index < number_of_evaluation_points; ++linear_index) {
-    const double b_x = magnetic_field(0, linear_index);
-    const double b_y = magnetic_field(1, linear_index);
-
-    const Eigen::Index index_phi = linear_index / (num_z * num_r);
-    const double b_r = b_x * cos_phi[index_phi] + b_y * sin_phi[index_phi];
-    const double b_p = b_y * cos_phi[index_phi] - b_x * sin_phi[index_phi];
+namespace {
 
-    m_b_r[linear_index] = b_r;
-    m_b_p[linear_index] = b_p;
-  }  // linear_index
-  //
-  m_b_z.head(number_of_evaluation_points) = magnetic_field.row(2);
+// Number of grid points on which the field of all circuits is evaluated at
+// once in ComputeCylindricalResponse. A thread evaluates all circuits on one
+// block before moving on to the next one, so that the block of positions and
+// Cartesian results stays in cache.
+constexpr int kGridBlockSize = 256;
 
-  // mirror into other stellarator-symmetric part of grid
-  // if making use of stellarator symmetry
-  if (number_of_evaluation_points < total_number_of_grid_points) {
-#ifdef _OPENMP
-#pragma omp parallel for
-#endif  // _OPENMP
-    for (int linear_index = number_of_evaluation_points;
-         linear_index < total_number_of_grid_points; ++linear_index) {
-      const int idx_phi = linear_index / (num_z * num_r);
-      const int idx_z_r = linear_index % (num_z * num_r);
-      const int idx_z = idx_z_r / num_r;
-      const int idx_r = idx_z_r % num_r;
-
-      const int idx_phi_reversed = num_phi - idx_phi;
-      const int idx_z_reversed = num_z - 1 - idx_z;
-
-      const int linear_index_reversed =
-          (idx_phi_reversed * num_z + idx_z_reversed) * num_r + idx_r;
-
-      m_b_r[linear_index] = -m_b_r[linear_index_reversed];
-      m_b_p[linear_index] = m_b_p[linear_index_reversed];
-      m_b_z[linear_index] = m_b_z[linear_index_reversed];
-    }
+// Copy of the given MagneticConfiguration for normalizing by currents: the
+// num_windings are migrated into the circuit currents so that the response
+// table represents the field per unit current-turn, and every circuit then
+// carries unit current. Without the migration the num_windings factor would
+// remain in the result regardless of the normalize_by_currents flag.
+absl::StatusOr<MagneticConfiguration> UnitCurrentConfiguration(
+    const MagneticConfiguration& magnetic_configuration) {
+  MagneticConfiguration migrated_configuration = magnetic_configuration;
+  absl::Status migrate_status =
+      NumWindingsToCircuitCurrents(migrated_configuration);
+  if (!migrate_status.ok()) {
+    return migrate_status;
+  }
+  absl::StatusOr<Eigen::VectorXd> maybe_migrated_currents =
+      GetCircuitCurrents(migrated_configuration);
+  if (!maybe_migrated_currents.ok()) {
+    return maybe_migrated_currents.status();
   }
-}
+  absl::Status set_currents_status =
+      SetCircuitCurrents(Eigen::VectorXd::Ones(maybe_migrated_currents->size()),
+                         migrated_configuration);
+  if (!set_currents_status.ok()) {
+    return set_currents_status;
+  }
+  return migrated_configuration;
+}  // UnitCurrentConfiguration
 
-absl::StatusOr<MagneticFieldResponseTable> ComputeMagneticFieldResponseTable(
+// Compute the magnetic field (or, if `vector_potential`, the magnetic vector
+// potential) of each SerialCircuit in the given MagneticConfiguration on the
+// makegrid grid and store its cylindrical components in the corresponding row
+// of `m_r`, `m_p` and `m_z`.
+//
+// All circuits are handled in a single pass over the grid: the evaluation
+// points are split into blocks that are distributed over OpenMP threads, and
+// each thread evaluates the current carriers of all circuits on its block,
+// converts the results to cylindrical components and writes them directly into
+// the rows of the response table. The grid only spans one field period, and if
+// stellarator symmetry is assumed, only the first half-period is evaluated and
+// the rest is mirrored afterwards.
+absl::Status ComputeCylindricalResponse(
     const MakegridParameters& makegrid_parameters,
-    const MagneticConfiguration& magnetic_configuration) {
-  absl::StatusOr<RowMatrix3Xd> maybe_cylindrical_grid =
-      MakeCylindricalGrid(makegrid_parameters);
-  if (!maybe_cylindrical_grid.ok()) {
-    return maybe_cylindrical_grid.status();
+    const MagneticConfiguration& magnetic_configuration, bool vector_potential,
+    RowMatrixXd& m_r, RowMatrixXd& m_p, RowMatrixXd& m_z) {
+  absl::StatusOr<int> maybe_num_phi_effective =
+      NumberOfEvaluatedPhiPlanes(makegrid_parameters);
+  if (!maybe_num_phi_effective.ok()) {
+    return maybe_num_phi_effective.status();
   }
-  // `MakeCylindricalGrid` only computes the grid points for which to actually
-  // evaluate the magnetic field. If stellarator symmetry is activated, this
-  // might be less grid points that what gets stored in the mgrid file.
-  const int number_of_evaluation_points =
-      static_cast<int>(maybe_cylindrical_grid.value().cols());
 
   // shorthand variables for grid dimensions
   const int num_field_periods = makegrid_parameters.number_of_field_periods;
@@ -432,160 +427,191 @@ absl::StatusOr<MagneticFieldResponseTable> ComputeMagneticFieldResponseTable(
   const int num_z = makegrid_parameters.number_of_z_grid_points;
   const int num_r = makegrid_parameters.number_of_r_grid_points;
 
-  // This is the total number of grid points that is stored in the mgrid file.
+  // grid extents along R and Z
+  const double min_r = makegrid_parameters.r_grid_minimum;
+  const double min_z = makegrid_parameters.z_grid_minimum;
+
+  // dimensions of grid cells in cylindrical coordinates
+  const double delta_r =
+      (makegrid_parameters.r_grid_maximum - min_r) / (num_r - 1.0);
+  const double delta_z =
+      (makegrid_parameters.z_grid_maximum - min_z) / (num_z - 1.0);
+  const double delta_phi = 2.0 * M_PI / (num_field_periods * num_phi);
+
+  // If stellarator symmetry is activated, the field is only evaluated at a
+  // subset of all grid points that get stored in the mgrid file.
+  const int number_of_evaluation_points =
+      *maybe_num_phi_effective * num_z * num_r;
   const int total_number_of_grid_points = num_phi * num_z * num_r;
 
   // precompute toroidal trigonometry tables
-  Eigen::VectorXd cos_phi{Eigen::VectorXd::Zero(num_phi)};
-  Eigen::VectorXd sin_phi{Eigen::VectorXd::Zero(num_phi)};
-  const double delta_phi = 2.0 * M_PI / (num_field_periods * num_phi);
+  std::vector<double> cos_phi(num_phi);
+  std::vector<double> sin_phi(num_phi);
   for (int index_phi = 0; index_phi < num_phi; ++index_phi) {
     const double phi = index_phi * delta_phi;
-    cos_phi(index_phi) = std::cos(phi);
-    sin_phi(index_phi) = std::sin(phi);
+    cos_phi[index_phi] = std::cos(phi);
+    sin_phi[index_phi] = std::sin(phi);
   }
 
-  // When normalizing by currents, migrate num_windings into the circuit current
-  // so that the response table represents field per unit current-turn. Without
-  // this step the num_windings factor would remain in the result regardless of
-  // the normalize_by_currents flag. The copy is only created when needed.
+  // When normalizing by currents, every circuit is evaluated with unit current;
+  // otherwise, with its original current. The copy is only created when
+  // needed.
   std::optional<MagneticConfiguration> migrated_configuration;
   if (makegrid_parameters.normalize_by_currents) {
-    migrated_configuration = magnetic_configuration;
-    absl::Status migrate_status =
-        NumWindingsToCircuitCurrents(*migrated_configuration);
-    if (!migrate_status.ok()) {
-      return migrate_status;
+    absl::StatusOr<MagneticConfiguration> maybe_migrated_configuration =
+        UnitCurrentConfiguration(magnetic_configuration);
+    if (!maybe_migrated_configuration.ok()) {
+      return maybe_migrated_configuration.status();
     }
+    migrated_configuration = *std::move(maybe_migrated_configuration);
   }
   const MagneticConfiguration& effective_configuration =
       migrated_configuration.has_value() ? *migrated_configuration
                                          : magnetic_configuration;
 
-  // Make a backup of the full vector of original circuit currents,
-  // but only after num_windings has potentially been migrated into circuit
-  // currents.
-  absl::StatusOr<Eigen::VectorXd> maybe_original_currents =
-      GetCircuitCurrents(effective_configuration);
-  if (!maybe_original_currents.ok()) {
-    return maybe_original_currents.status();
+  // The contributions of the individual SerialCircuits are kept apart. A
+  // SerialCircuit without current has no current carriers here and thus gets
+  // an all-zero row in the response table.
+  absl::StatusOr<std::vector<std::vector<EffectiveCurrentCarrier>>>
+      maybe_current_carriers_by_circuit =
+          CollectEffectiveCurrentCarriersByCircuit(effective_configuration,
+                                                   vector_potential);
+  if (!maybe_current_carriers_by_circuit.ok()) {
+    return maybe_current_carriers_by_circuit.status();
   }
-  const Eigen::VectorXd& original_currents = *maybe_original_currents;
-
+  const std::vector<std::vector<EffectiveCurrentCarrier>>&
+      current_carriers_by_circuit = *maybe_current_carriers_by_circuit;
   const int number_of_serial_circuits =
-      effective_configuration.serial_circuits_size();
-
-  MagneticFieldResponseTable response_table_b;
-  response_table_b.parameters = makegrid_parameters;
+      static_cast<int>(current_carriers_by_circuit.size());
 
   // fully allocate result tables
-  response_table_b.b_r.resize(number_of_serial_circuits,
-                              total_number_of_grid_points);
-  response_table_b.b_p.resize(number_of_serial_circuits,
-                              total_number_of_grid_points);
-  response_table_b.b_z.resize(number_of_serial_circuits,
-                              total_number_of_grid_points);
-
-  std::vector<absl::Status> status(number_of_serial_circuits);
-
-  // Now compute the magnetic field for each SerialCircuit individually in the
-  // MagneticConfiguration. This is conveniently done by setting the currents to
-  // all zeros and only restore the current for the SerialCircuit under
-  // consideration to its original value. This has no (significant) performance
-  // penalty, since the magnetic field contributions are skipped anyway if the
-  // current of a given SerialCircuit is identically zero.
-  for (int circuit_index = 0; circuit_index < number_of_serial_circuits;
-       ++circuit_index) {
-    // make second internal copy for being able to set inidividually only one
-    // circuit current to != 0
-    MagneticConfiguration m_magnetic_configuration = effective_configuration;
-
-    Eigen::VectorXd currents_for_circuit;
-    currents_for_circuit.setZero(number_of_serial_circuits);
-    if (makegrid_parameters.normalize_by_currents) {
-      currents_for_circuit[circuit_index] = 1.0;
-    } else {
-      currents_for_circuit[circuit_index] = original_currents[circuit_index];
-    }
+  m_r.resize(number_of_serial_circuits, total_number_of_grid_points);
+  m_p.resize(number_of_serial_circuits, total_number_of_grid_points);
+  m_z.resize(number_of_serial_circuits, total_number_of_grid_points);
 
-    absl::Status set_currents_status =
-        SetCircuitCurrents(currents_for_circuit, m_magnetic_configuration);
-    if (!set_currents_status.ok()) {
-      status[circuit_index] = set_currents_status;
-      continue;
-    }
+  const int number_of_blocks =
+      (number_of_evaluation_points + kGridBlockSize - 1) / kGridBlockSize;
 
-    // Evaluation result B (n, 3) in cartesian coordinates
-    // TODO(jurasic) Remove after Eigen refactor
-    std::vector<std::vector<double>> magnetic_field_stl(
-        number_of_evaluation_points);
-    for (int i = 0; i < number_of_evaluation_points; ++i) {
-      magnetic_field_stl[i].resize(3, 0.0);
-    }
+#ifdef _OPENMP
+#pragma omp parallel
+#endif  // _OPENMP
+  {
+    std::vector<double> positions(kGridBlockSize * 3);
+    std::vector<double> cartesian(kGridBlockSize * 3);
 
-    // TODO(jurasic) Remove after Eigen refactor
-    std::vector<std::vector<double>> cylindrical_grid_stl{
-        static_cast<std::size_t>(maybe_cylindrical_grid.value().cols())};
-    CHECK_EQ(static_cast<std::size_t>(number_of_evaluation_points),
-             cylindrical_grid_stl.size());
-    for (int i = 0; i < number_of_evaluation_points; ++i) {
-      cylindrical_grid_stl[i].resize(3);
-      for (int j = 0; j < 3; ++j) {
-        cylindrical_grid_stl[i][j] = maybe_cylindrical_grid.value()(j, i);
-      }
-    }
-    CHECK_EQ(magnetic_field_stl.size(), cylindrical_grid_stl.size());
-
-    // We parallelize over linear index of evaluation locations, since that
-    // allows us to use more CPUs and parallelize also for configurations with
-    // low number of circuits. It is much more common in practice to have few
-    // independent circuits and many evaluation locations, rather than many
-    // independent circuits but few evaluation locations. This is done inside of
-    // ABSCAB, which is used within this call to `MagneticField`.
-    absl::Status magnetic_field_status =
-        MagneticField(m_magnetic_configuration, cylindrical_grid_stl,
-                      /*m_magnetic_field=*/magnetic_field_stl);
-    if (!magnetic_field_status.ok()) {
-      status[circuit_index] = magnetic_field_status;
-      continue;
-    }
-    RowMatrix3Xd magnetic_field =
-        RowMatrix3Xd::Zero(3, number_of_evaluation_points);
-    magnetic_field = vmecpp::ToEigenMatrix(magnetic_field_stl).transpose();
-    CartesianToCylindricalField(cos_phi, sin_phi, magnetic_field, num_z, num_r,
-                                number_of_evaluation_points,
-                                response_table_b.b_r.row(circuit_index),
-                                response_table_b.b_p.row(circuit_index),
-                                response_table_b.b_z.row(circuit_index));
-
-    LOG(INFO) << absl::StrFormat("B %2d/%2d: done", circuit_index + 1,
-                                 number_of_serial_circuits);
-  }  // circuit_index
+#ifdef _OPENMP
+#pragma omp for schedule(dynamic)
+#endif  // _OPENMP
+    for (int block = 0; block < number_of_blocks; ++block) {
+      const int first = block * kGridBlockSize;
+      const int size =
+          std::min(kGridBlockSize, number_of_evaluation_points - first);
+
+      for (int i = 0; i < size; ++i) {
+        const int linear_index = first + i;
+        const int index_phi = linear_index / (num_z * num_r);
+        const int index_z = (linear_index / num_r) % num_z;
+        const int index_r = linear_index % num_r;
+        const double r = min_r + index_r * delta_r;
+        positions[i * 3 + 0] = r * cos_phi[index_phi];
+        positions[i * 3 + 1] = r * sin_phi[index_phi];
+        positions[i * 3 + 2] = min_z + index_z * delta_z;
+      }  // i
+
+      for (int circuit_index = 0; circuit_index < number_of_serial_circuits;
+           ++circuit_index) {
+        // target storage needs to be initialized to zero,
+        // as abscab methods only add and do not initialize
+        std::fill_n(cartesian.begin(), size * 3, 0.0);
+        AddEffectiveCurrentCarrierContributions(
+            current_carriers_by_circuit[circuit_index], vector_potential, size,
+            positions.data(), cartesian.data());
+
+        // ABSCAB computes Cartesian components, so we need to convert the x
+        // and y components into r and phi (cylindrical) components as stored
+        // in the mgrid file.
+        double* row_r = m_r.row(circuit_index).data() + first;
+        double* row_p = m_p.row(circuit_index).data() + first;
+        double* row_z = m_z.row(circuit_index).data() + first;
+        for (int i = 0; i < size; ++i) {
+          const int index_phi = (first + i) / (num_z * num_r);
+          const double v_x = cartesian[i * 3 + 0];
+          const double v_y = cartesian[i * 3 + 1];
+          row_r[i] = v_x * cos_phi[index_phi] + v_y * sin_phi[index_phi];
+          row_p[i] = v_y * cos_phi[index_phi] - v_x * sin_phi[index_phi];
+          row_z[i] = cartesian[i * 3 + 2];
+        }  // i
+      }  // circuit_index
+    }  // block
+  }  // omp parallel
 
-  for (int circuit_index = 0; circuit_index < number_of_serial_circuits;
-       ++circuit_index) {
-    if (!status[circuit_index].ok()) {
-      return status[circuit_index];
-    }
+  // mirror into other stellarator-symmetric part of grid
+  // if making use of stellarator symmetry
+  if (number_of_evaluation_points < total_number_of_grid_points) {
+#ifdef _OPENMP
+#pragma omp parallel for collapse(2)
+#endif  // _OPENMP
+    for (int circuit_index = 0; circuit_index < number_of_serial_circuits;
+         ++circuit_index) {
+      for (int linear_index = number_of_evaluation_points;
+           linear_index < total_number_of_grid_points; ++linear_index) {
+        const int idx_phi = linear_index / (num_z * num_r);
+        const int idx_z_r = linear_index % (num_z * num_r);
+        const int idx_z = idx_z_r / num_r;
+        const int idx_r = idx_z_r % num_r;
+
+        const int idx_phi_reversed = num_phi - idx_phi;
+        const int idx_z_reversed = num_z - 1 - idx_z;
+
+        const int linear_index_reversed =
+            (idx_phi_reversed * num_z + idx_z_reversed) * num_r + idx_r;
+
+        m_r(circuit_index, linear_index) =
+            -m_r(circuit_index, linear_index_reversed);
+        m_p(circuit_index, linear_index) =
+            m_p(circuit_index, linear_index_reversed);
+        m_z(circuit_index, linear_index) =
+            m_z(circuit_index, linear_index_reversed);
+      }  // linear_index
+    }  // circuit_index
   }
 
-  return response_table_b;
-}  // ComputeMagneticFieldResponseTable
+  LOG(INFO) << absl::StrFormat("%s: %d circuits done",
+                               vector_potential ? "A" : "B",
+                               number_of_serial_circuits);
 
-absl::StatusOr<MakegridCachedVectorPotential> ComputeVectorPotentialCache(
+  return absl::OkStatus();
+}  // ComputeCylindricalResponse
+
+}  // namespace
+
+absl::StatusOr<MagneticFieldResponseTable> ComputeMagneticFieldResponseTable(
     const MakegridParameters& makegrid_parameters,
     const MagneticConfiguration& magnetic_configuration) {
-  absl::StatusOr<RowMatrix3Xd> maybe_cylindrical_grid =
-      MakeCylindricalGrid(makegrid_parameters);
-  if (!maybe_cylindrical_grid.ok()) {
-    return maybe_cylindrical_grid.status();
+  MagneticFieldResponseTable response_table_b;
+  response_table_b.parameters = makegrid_parameters;
+
+  absl::Status status = ComputeCylindricalResponse(
+      makegrid_parameters, magnetic_configuration,
+      /*vector_potential=*/false, response_table_b.b_r, response_table_b.b_p,
+      response_table_b.b_z);
+  if (!status.ok()) {
+    return status;
   }
 
-  // `MakeCylindricalGrid` only computes the grid points for which to actually
-  // evaluate the magnetic field. If stellarator symmetry is activated, this
-  // might be less grid points that what gets stored in the mgrid file.
-  const int number_of_evaluation_points =
-      static_cast<int>(maybe_cylindrical_grid.value().cols());
+  return response_table_b;
+}  // ComputeMagneticFieldResponseTable
+
+absl::StatusOr<std::vector<RowMatrixX3d>> MagneticFieldResponseTableAdjoint(
+    const MagneticConfiguration& magnetic_configuration,
+    const MagneticFieldResponseTableView& cotangents,
+    std::optional<int> max_threads) {
+  const MakegridParameters& makegrid_parameters = cotangents.parameters;
+  absl::StatusOr<int> maybe_num_phi_effective =
+      NumberOfEvaluatedPhiPlanes(makegrid_parameters);
+  if (!maybe_num_phi_effective.ok()) {
+    return maybe_num_phi_effective.status();
+  }
 
   // shorthand variables for grid dimensions
   const int num_field_periods = makegrid_parameters.number_of_field_periods;
@@ -593,183 +619,135 @@ absl::StatusOr<MakegridCachedVectorPotential> ComputeVectorPotentialCache(
   const int num_z = makegrid_parameters.number_of_z_grid_points;
   const int num_r = makegrid_parameters.number_of_r_grid_points;
 
-  // This is the total number of grid points that is stored in the mgrid file.
-  const int total_number_of_grid_points = num_phi * num_z * num_r;
+  // grid extents along R and Z
+  const double min_r = makegrid_parameters.r_grid_minimum;
+  const double min_z = makegrid_parameters.z_grid_minimum;
 
-  // precompute toroidal trigonometry tables
-  std::vector<double> cos_phi(num_phi);
-  std::vector<double> sin_phi(num_phi);
+  // dimensions of grid cells in cylindrical coordinates
+  const double delta_r =
+      (makegrid_parameters.r_grid_maximum - min_r) / (num_r - 1.0);
+  const double delta_z =
+      (makegrid_parameters.z_grid_maximum - min_z) / (num_z - 1.0);
   const double delta_phi = 2.0 * M_PI / (num_field_periods * num_phi);
-  for (int index_phi = 0; index_phi < num_phi; ++index_phi) {
-    const double phi = index_phi * delta_phi;
-    cos_phi[index_phi] = std::cos(phi);
-    sin_phi[index_phi] = std::sin(phi);
+
+  const int number_of_evaluation_points =
+      *maybe_num_phi_effective * num_z * num_r;
+  const int total_number_of_grid_points = num_phi * num_z * num_r;
+
+  const int number_of_serial_circuits =
+      magnetic_configuration.serial_circuits_size();
+  for (const auto* b : {&cotangents.b_r, &cotangents.b_p, &cotangents.b_z}) {
+    if (b->rows() != number_of_serial_circuits ||
+        b->cols() != total_number_of_grid_points) {
+      return absl::InvalidArgumentError(absl::StrFormat(
+          "cotangents must have shape (%d, %d) like the response table, but "
+          "have shape (%d, %d)",
+          number_of_serial_circuits, total_number_of_grid_points, b->rows(),
+          b->cols()));
+    }
   }
 
-  // When normalizing by currents, migrate num_windings into the circuit current
-  // so that the response table represents vector potential per unit
-  // current-turn. Without this step the num_windings factor would remain in the
-  // result regardless of the normalize_by_currents flag. The copy is only
-  // created when needed.
   std::optional<MagneticConfiguration> migrated_configuration;
   if (makegrid_parameters.normalize_by_currents) {
-    migrated_configuration = magnetic_configuration;
-    absl::Status migrate_status =
-        NumWindingsToCircuitCurrents(*migrated_configuration);
-    if (!migrate_status.ok()) {
-      return migrate_status;
+    absl::StatusOr<MagneticConfiguration> maybe_migrated_configuration =
+        UnitCurrentConfiguration(magnetic_configuration);
+    if (!maybe_migrated_configuration.ok()) {
+      return maybe_migrated_configuration.status();
     }
+    migrated_configuration = *std::move(maybe_migrated_configuration);
   }
   const MagneticConfiguration& effective_configuration =
       migrated_configuration.has_value() ? *migrated_configuration
                                          : magnetic_configuration;
 
-  // Make a backup of the full vector of original circuit currents,
-  // but only after num_windings has potentially been migrated into circuit
-  // currents.
-  absl::StatusOr<Eigen::VectorXd> maybe_original_currents =
-      GetCircuitCurrents(effective_configuration);
-  if (!maybe_original_currents.ok()) {
-    return maybe_original_currents.status();
-  }
-  const Eigen::VectorXd& original_currents = *maybe_original_currents;
-
-  const int number_of_serial_circuits =
-      effective_configuration.serial_circuits_size();
-
-  MakegridCachedVectorPotential response_table_a;
-  response_table_a.parameters = makegrid_parameters;
-
-  // fully allocate result tables
-  response_table_a.a_r.resize(number_of_serial_circuits,
-                              total_number_of_grid_points);
-  response_table_a.a_p.resize(number_of_serial_circuits,
-                              total_number_of_grid_points);
-  response_table_a.a_z.resize(number_of_serial_circuits,
-                              total_number_of_grid_points);
-
-  std::vector<absl::Status> status(number_of_serial_circuits);
-
-  // Now compute the vector potential for each SerialCircuit individually in the
-  // MagneticConfiguration. This is conveniently done by setting the currents to
-  // all zeros and only restore the current for the SerialCircuit under
-  // consideration to its original value. This has no (significant) performance
-  // penalty, since the vector potential contributions are skipped anyway if the
-  // current of a given SerialCircuit is identically zero.
+  // Only the grid points with a non-zero cotangent contribute, e.g., the four
+  // corners of the grid cells that the field is interpolated from. The
+  // cotangents of the mirrored grid points are added to those of the
+  // evaluated points that they are copied from, reversing the sign flip of B_R.
+  std::vector<RowMatrixX3d> positions_by_circuit(number_of_serial_circuits);
+  std::vector<RowMatrixX3d> cartesian_cotangents_by_circuit(
+      number_of_serial_circuits);
   for (int circuit_index = 0; circuit_index < number_of_serial_circuits;
        ++circuit_index) {
-    // make second internal copy for being able to set inidividually only one
-    // circuit current to != 0
-    MagneticConfiguration m_magnetic_configuration = effective_configuration;
-
-    Eigen::VectorXd currents_for_circuit;
-    currents_for_circuit.setZero(number_of_serial_circuits);
-    if (makegrid_parameters.normalize_by_currents) {
-      currents_for_circuit[circuit_index] = 1.0;
-    } else {
-      currents_for_circuit[circuit_index] = original_currents[circuit_index];
-    }
+    Eigen::VectorXd c_r =
+        cotangents.b_r.row(circuit_index).head(number_of_evaluation_points);
+    Eigen::VectorXd c_p =
+        cotangents.b_p.row(circuit_index).head(number_of_evaluation_points);
+    Eigen::VectorXd c_z =
+        cotangents.b_z.row(circuit_index).head(number_of_evaluation_points);
+    for (int linear_index = number_of_evaluation_points;
+         linear_index < total_number_of_grid_points; ++linear_index) {
+      const int idx_phi = linear_index / (num_z * num_r);
+      const int idx_z_r = linear_index % (num_z * num_r);
+      const int idx_z = idx_z_r / num_r;
+      const int idx_r = idx_z_r % num_r;
 
-    absl::Status set_currents_status =
-        SetCircuitCurrents(currents_for_circuit, m_magnetic_configuration);
-    if (!set_currents_status.ok()) {
-      status[circuit_index] = set_currents_status;
-      continue;
-    }
+      const int idx_phi_reversed = num_phi - idx_phi;
+      const int idx_z_reversed = num_z - 1 - idx_z;
 
-    // TODO(jurasic) Remove after Eigen refactor
-    std::vector<std::vector<double>> vector_potential_stl(
-        number_of_evaluation_points);
-    for (int i = 0; i < number_of_evaluation_points; ++i) {
-      vector_potential_stl[i].resize(3, 0.0);
-    }
+      const int linear_index_reversed =
+          (idx_phi_reversed * num_z + idx_z_reversed) * num_r + idx_r;
 
-    // TODO(jurasic) Remove after Eigen refactor
-    std::vector<std::vector<double>> cylindrical_grid_stl{
-        static_cast<std::size_t>(maybe_cylindrical_grid.value().cols())};
-    for (int i = 0; i < number_of_evaluation_points; ++i) {
-      cylindrical_grid_stl[i].resize(3);
-      for (int j = 0; j < 3; ++j) {
-        cylindrical_grid_stl[i][j] = maybe_cylindrical_grid.value()(j, i);
-      }
-    }
+      c_r[linear_index_reversed] -= cotangents.b_r(circuit_index, linear_index);
+      c_p[linear_index_reversed] += cotangents.b_p(circuit_index, linear_index);
+      c_z[linear_index_reversed] += cotangents.b_z(circuit_index, linear_index);
+    }  // linear_index
 
-    // We parallelize over linear index of evaluation locations, since that
-    // allows us to use more CPUs and parallelize also for configurations with
-    // low number of circuits. It is much more common in practice to have few
-    // independent circuits and many evaluation locations, rather than many
-    // independent circuits but few evaluation locations. This is done inside of
-    // ABSCAB, which is used within this call to `VectorPotential`.
-    absl::Status vector_potential_status =
-        VectorPotential(m_magnetic_configuration, cylindrical_grid_stl,
-                        /*m_vector_potential=*/vector_potential_stl);
-    if (!vector_potential_status.ok()) {
-      status[circuit_index] = vector_potential_status;
-      continue;
-    }
-    RowMatrix3Xd vector_potential =
-        RowMatrix3Xd::Zero(3, number_of_evaluation_points);
-    vector_potential = vmecpp::ToEigenMatrix(vector_potential_stl).transpose();
-
-    // ABSCAB computes the Cartesian components of the vector potential,
-    // so we need to convert the x and y componets into r and phi
-    // (cylindrical) components for comparison against the cylindrical
-    // components in the mgrid file.
-#ifdef _OPENMP
-#pragma omp parallel for
-#endif  // _OPENMP
+    std::vector<int> nonzero_indices;
     for (int linear_index = 0; linear_index < number_of_evaluation_points;
          ++linear_index) {
-      const double a_x = vector_potential(0, linear_index);
-      const double a_y = vector_potential(1, linear_index);
-      const double a_z = vector_potential(2, linear_index);
-
-      const size_t index_phi = linear_index / (num_z * num_r);
-      const double a_r = a_x * cos_phi[index_phi] + a_y * sin_phi[index_phi];
-      const double a_p = a_y * cos_phi[index_phi] - a_x * sin_phi[index_phi];
-
-      response_table_a.a_r(circuit_index, linear_index) = a_r;
-      response_table_a.a_p(circuit_index, linear_index) = a_p;
-      response_table_a.a_z(circuit_index, linear_index) = a_z;
+      if (c_r[linear_index] != 0.0 || c_p[linear_index] != 0.0 ||
+          c_z[linear_index] != 0.0) {
+        nonzero_indices.push_back(linear_index);
+      }
     }  // linear_index
 
-    // mirror into other stellarator-symmetric part of grid
-    // if making use of stellarator symmetry
-    if (makegrid_parameters.assume_stellarator_symmetry) {
-#ifdef _OPENMP
-#pragma omp parallel for
-#endif  // _OPENMP
-      for (int linear_index = number_of_evaluation_points;
-           linear_index < total_number_of_grid_points; ++linear_index) {
-        const int idx_phi = linear_index / (num_z * num_r);
-        const int idx_z_r = linear_index % (num_z * num_r);
-        const int idx_z = idx_z_r / num_r;
-        const int idx_r = idx_z_r % num_r;
-
-        const int idx_phi_reversed = num_phi - idx_phi;
-        const int idx_z_reversed = num_z - 1 - idx_z;
+    RowMatrixX3d& positions = positions_by_circuit[circuit_index];
+    RowMatrixX3d& cartesian_cotangents =
+        cartesian_cotangents_by_circuit[circuit_index];
+    positions.resize(static_cast<Eigen::Index>(nonzero_indices.size()), 3);
+    cartesian_cotangents.resize(positions.rows(), 3);
+    for (int i = 0; i < static_cast<int>(nonzero_indices.size()); ++i) {
+      const int linear_index = nonzero_indices[i];
+      const int index_phi = linear_index / (num_z * num_r);
+      const int index_z = (linear_index / num_r) % num_z;
+      const int index_r = linear_index % num_r;
+      const double r = min_r + index_r * delta_r;
+      const double cos_phi = std::cos(index_phi * delta_phi);
+      const double sin_phi = std::sin(index_phi * delta_phi);
+      positions.row(i) << r * cos_phi, r * sin_phi, min_z + index_z * delta_z;
+
+      // transpose of the conversion from Cartesian to cylindrical components
+      cartesian_cotangents.row(i)
+          << c_r[linear_index] * cos_phi - c_p[linear_index] * sin_phi,
+          c_r[linear_index] * sin_phi + c_p[linear_index] * cos_phi,
+          c_z[linear_index];
+    }  // i
+  }  // circuit_index
 
-        const int linear_index_reversed =
-            (idx_phi_reversed * num_z + idx_z_reversed) * num_r + idx_r;
+  const std::vector<Eigen::Ref<const RowMatrixX3d>>
+      evaluation_positions_by_circuit(positions_by_circuit.begin(),
+                                      positions_by_circuit.end());
+  const std::vector<Eigen::Ref<const RowMatrixX3d>> cotangents_by_circuit(
+      cartesian_cotangents_by_circuit.begin(),
+      cartesian_cotangents_by_circuit.end());
+  return MagneticFieldAdjointByCircuit(effective_configuration,
+                                       evaluation_positions_by_circuit,
+                                       cotangents_by_circuit, max_threads);
+}  // MagneticFieldResponseTableAdjoint
 
-        response_table_a.a_r(circuit_index, linear_index) =
-            -response_table_a.a_r(circuit_index, linear_index_reversed);
-        response_table_a.a_p(circuit_index, linear_index) =
-            response_table_a.a_p(circuit_index, linear_index_reversed);
-        response_table_a.a_z(circuit_index, linear_index) =
-            response_table_a.a_z(circuit_index, linear_index_reversed);
-      }
-    }
-
-    LOG(INFO) << absl::StrFormat("A %2d/%2d: done", circuit_index + 1,
-                                 number_of_serial_circuits);
-  }  // circuit_index
+absl::StatusOr<MakegridCachedVectorPotential> ComputeVectorPotentialCache(
+    const MakegridParameters& makegrid_parameters,
+    const MagneticConfiguration& magnetic_configuration) {
+  MakegridCachedVectorPotential response_table_a;
+  response_table_a.parameters = makegrid_parameters;
 
-  for (int circuit_index = 0; circuit_index < number_of_serial_circuits;
-       ++circuit_index) {
-    if (!status[circuit_index].ok()) {
-      return status[circuit_index];
-    }
+  absl::Status status = ComputeCylindricalResponse(
+      makegrid_parameters, magnetic_configuration,
+      /*vector_potential=*/true, response_table_a.a_r, response_table_a.a_p,
+      response_table_a.a_z);
+  if (!status.ok()) {
+    return status;
   }
 
   return response_table_a;
@@ -7,10 +7,13 @@
 
 #include <Eigen/Dense>
 #include <filesystem>
+#include <optional>
 #include <string>
+#include <vector>
 
 #include "absl/status/statusor.h"
 #include "vmecpp/common/magnetic_configuration_lib/magnetic_configuration_lib.h"
+#include "vmecpp/common/magnetic_field_provider/magnetic_field_provider_lib.h"
 #include "vmecpp/common/util/util.h"
 
 namespace makegrid {
@@ -77,6 +80,39 @@ struct MagneticFieldResponseTable {
   RowMatrixXd b_z;
 };  // MagneticFieldResponseTable
 
+// Read-only view of the per-circuit fields of a response table, the memory of
+// which is owned elsewhere: by a MagneticFieldResponseTable, or e.g. by a
+// memory-mapped file that several processes share. The viewed memory must
+// outlive the view and every object the view is passed to.
+struct MagneticFieldResponseTableView {
+  // Implicit, so that a MagneticFieldResponseTable can be passed wherever only
+  // a view of it is needed.
+  MagneticFieldResponseTableView(  // NOLINT(google-explicit-constructor)
+      const MagneticFieldResponseTable& response_table)
+      : parameters(response_table.parameters),
+        b_r(response_table.b_r.data(), response_table.b_r.rows(),
+            response_table.b_r.cols()),
+        b_p(response_table.b_p.data(), response_table.b_p.rows(),
+            response_table.b_p.cols()),
+        b_z(response_table.b_z.data(), response_table.b_z.rows(),
+            response_table.b_z.cols()) {}
+
+  MagneticFieldResponseTableView(const MakegridParameters& parameters,
+                                 Eigen::Map<const RowMatrixXd> b_r,
+                                 Eigen::Map<const RowMatrixXd> b_p,
+                                 Eigen::Map<const RowMatrixXd> b_z)
+      : parameters(parameters), b_r(b_r), b_p(b_p), b_z(b_z) {}
+
+  // the makegrid parameters used to construct the viewed fields
+  MakegridParameters parameters;
+
+  // cylindrical R, phi and Z components of the magnetic field, with the same
+  // layout as in MagneticFieldResponseTable
+  Eigen::Map<const RowMatrixXd> b_r;
+  Eigen::Map<const RowMatrixXd> b_p;
+  Eigen::Map<const RowMatrixXd> b_z;
+};  // MagneticFieldResponseTableView
+
 struct MakegridCachedVectorPotential {
   // the makegrid parameters used to construct this object
   MakegridParameters parameters;
@@ -126,6 +162,24 @@ absl::StatusOr<MagneticFieldResponseTable> ComputeMagneticFieldResponseTable(
     const MakegridParameters& makegrid_parameters,
     const MagneticConfiguration& magnetic_configuration);
 
+// Compute the sensitivity of the response table of the given
+// MagneticConfiguration with respect to the vertices of its PolygonFilaments,
+// contracted with `cotangents` that have the layout of the response table: the
+// gradient of
+//   sum_c cotangents.b_r.row(c) . b_r.row(c) + (same for b_p and b_z)
+// with respect to each vertex, where b_r, b_p and b_z are the fields that
+// ComputeMagneticFieldResponseTable(cotangents.parameters,
+// magnetic_configuration) returns. This is its adjoint, which takes the
+// normalization by currents and the mirroring for stellarator symmetry into
+// account; see magnetics::MagneticFieldAdjoint for the layout of the result.
+// Only the grid points with a non-zero cotangent are evaluated, so that the
+// cost is proportional to their number, not to the size of the grid.
+absl::StatusOr<std::vector<magnetics::RowMatrixX3d>>
+MagneticFieldResponseTableAdjoint(
+    const MagneticConfiguration& magnetic_configuration,
+    const MagneticFieldResponseTableView& cotangents,
+    std::optional<int> max_threads = std::nullopt);
+
 // Compute the (normalized) vector potential components on the given grid
 // and store it (overwriting) in the provided cache.
 absl::StatusOr<MakegridCachedVectorPotential> ComputeVectorPotentialCache(
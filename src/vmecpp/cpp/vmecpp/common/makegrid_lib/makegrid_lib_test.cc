@@ -9,6 +9,7 @@
 #include <string>
 #include <vector>
 
+#include "absl/log/check.h"
 #include "absl/log/log.h"
 #include "absl/status/statusor.h"
 #include "absl/strings/str_format.h"
@@ -17,6 +18,7 @@
 #include "util/netcdf_io/netcdf_io.h"
 #include "util/testing/numerical_comparison_lib.h"
 #include "vmecpp/common/composed_types_lib/composed_types_lib.h"
+#include "vmecpp/common/magnetic_field_provider/magnetic_field_provider_lib.h"
 #define ASSERT_OK(quantity) ASSERT_TRUE((quantity).ok()) << (quantity).status();
 
 namespace makegrid {
@@ -35,7 +37,12 @@ using netcdf_io::NetcdfReadBool;
 using netcdf_io::NetcdfReadDouble;
 using netcdf_io::NetcdfReadInt;
 
+using magnetics::GetCircuitCurrents;
 using magnetics::ImportMagneticConfigurationFromCoilsFile;
+using magnetics::MagneticField;
+using magnetics::RowMatrixX3d;
+using magnetics::SetCircuitCurrents;
+using magnetics::VectorPotential;
 
 using magnetics::CircularFilament;
 using magnetics::Coil;
@@ -872,4 +879,219 @@ TEST(TestMakegridLib,
   }  // circuit_index
 }  // CheckNormalizeByCurrentsScalesMagneticFieldResponseTable
 
+// The response table is computed for all circuits in a single pass over the
+// grid. Check that every row agrees with the field of the MagneticConfiguration
+// in which only the corresponding circuit carries current, and that the
+// stellarator-symmetric half-period, mirrored into the full period, agrees
+// with the evaluation on the full period.
+TEST(TestMakegridLib, CheckResponseTablesMatchSeparateCircuitEvaluation) {
+  static constexpr double kEvaluatedTolerance = 1.0e-12;
+  // The coil geometry in the coils file is only stellarator-symmetric up to
+  // the number of digits printed there.
+  static constexpr double kMirroredTolerance = 1.0e-6;
+
+  const MakegridParameters makegrid_parameters =
+      MakegridReferenceTestFixture::MakeParams(
+          /*normalize_by_currents=*/false);
+  MakegridParameters full_period_parameters = makegrid_parameters;
+  full_period_parameters.assume_stellarator_symmetry = false;
+
+  absl::StatusOr<MagneticConfiguration> magnetic_configuration =
+      ImportMagneticConfigurationFromCoilsFile(
+          "vmecpp/common/makegrid_lib/test_data/coils.test_symmetric_even");
+  ASSERT_OK(magnetic_configuration);
+  const int number_of_serial_circuits =
+      magnetic_configuration->serial_circuits_size();
+  ASSERT_GT(number_of_serial_circuits, 1);
+
+  absl::StatusOr<Eigen::VectorXd> original_currents =
+      GetCircuitCurrents(*magnetic_configuration);
+  ASSERT_OK(original_currents);
+
+  absl::StatusOr<RowMatrix3Xd> cylindrical_grid =
+      MakeCylindricalGrid(full_period_parameters);
+  ASSERT_OK(cylindrical_grid);
+  const std::vector<std::vector<double>> evaluation_positions =
+      EigenToStl(cylindrical_grid->transpose());
+  const int number_of_grid_points =
+      static_cast<int>(evaluation_positions.size());
+  const int num_rz = makegrid_parameters.number_of_z_grid_points *
+                     makegrid_parameters.number_of_r_grid_points;
+  const double delta_phi = 2.0 * M_PI /
+                           (makegrid_parameters.number_of_field_periods *
+                            makegrid_parameters.number_of_phi_grid_points);
+
+  for (const MakegridParameters& parameters :
+       {makegrid_parameters, full_period_parameters}) {
+    const int number_of_evaluated_points =
+        parameters.assume_stellarator_symmetry
+            ? (parameters.number_of_phi_grid_points / 2 + 1) * num_rz
+            : number_of_grid_points;
+    absl::StatusOr<MagneticFieldResponseTable> response_table_b =
+        ComputeMagneticFieldResponseTable(parameters, *magnetic_configuration);
+    ASSERT_OK(response_table_b);
+    absl::StatusOr<MakegridCachedVectorPotential> response_table_a =
+        ComputeVectorPotentialCache(parameters, *magnetic_configuration);
+    ASSERT_OK(response_table_a);
+    ASSERT_EQ(response_table_b->b_r.rows(), number_of_serial_circuits);
+    ASSERT_EQ(response_table_b->b_r.cols(), number_of_grid_points);
+    ASSERT_EQ(response_table_a->a_r.rows(), number_of_serial_circuits);
+    ASSERT_EQ(response_table_a->a_r.cols(), number_of_grid_points);
+
+    for (int circuit_index = 0; circuit_index < number_of_serial_circuits;
+         ++circuit_index) {
+      MagneticConfiguration single_circuit_configuration =
+          *magnetic_configuration;
+      Eigen::VectorXd currents =
+          Eigen::VectorXd::Zero(number_of_serial_circuits);
+      currents[circuit_index] = (*original_currents)[circuit_index];
+      ASSERT_TRUE(
+          SetCircuitCurrents(currents, single_circuit_configuration).ok());
+
+      std::vector<std::vector<double>> magnetic_field(
+          number_of_grid_points, std::vector<double>(3, 0.0));
+      ASSERT_TRUE(MagneticField(single_circuit_configuration,
+                                evaluation_positions, magnetic_field)
+                      .ok());
+      std::vector<std::vector<double>> vector_potential(
+          number_of_grid_points, std::vector<double>(3, 0.0));
+      ASSERT_TRUE(VectorPotential(single_circuit_configuration,
+                                  evaluation_positions, vector_potential)
+                      .ok());
+
+      for (int grid_index = 0; grid_index < number_of_grid_points;
+           ++grid_index) {
+        const double kTolerance = grid_index < number_of_evaluated_points
+                                      ? kEvaluatedTolerance
+                                      : kMirroredTolerance;
+        const double phi = (grid_index / num_rz) * delta_phi;
+        const double cos_phi = std::cos(phi);
+        const double sin_phi = std::sin(phi);
+
+        const std::vector<double>& b = magnetic_field[grid_index];
+        EXPECT_TRUE(IsCloseRelAbs(
+            b[0] * cos_phi + b[1] * sin_phi,
+            response_table_b->b_r(circuit_index, grid_index), kTolerance));
+        EXPECT_TRUE(IsCloseRelAbs(
+            b[1] * cos_phi - b[0] * sin_phi,
+            response_table_b->b_p(circuit_index, grid_index), kTolerance));
+        EXPECT_TRUE(IsCloseRelAbs(
+            b[2], response_table_b->b_z(circuit_index, grid_index),
+            kTolerance));
+
+        const std::vector<double>& a = vector_potential[grid_index];
+        EXPECT_TRUE(IsCloseRelAbs(
+            a[0] * cos_phi + a[1] * sin_phi,
+            response_table_a->a_r(circuit_index, grid_index), kTolerance));
+        EXPECT_TRUE(IsCloseRelAbs(
+            a[1] * cos_phi - a[0] * sin_phi,
+            response_table_a->a_p(circuit_index, grid_index), kTolerance));
+        EXPECT_TRUE(IsCloseRelAbs(
+            a[2], response_table_a->a_z(circuit_index, grid_index),
+            kTolerance));
+      }  // grid_index
+    }  // circuit_index
+  }  // parameters
+}  // CheckResponseTablesMatchSeparateCircuitEvaluation
+
+// The adjoint of the response table must agree with finite differences of the
+// contracted response table with respect to the vertices of the polygons, for
+// both normalizations and including the mirrored half of the grid.
+TEST(TestMakegridLib, CheckResponseTableAdjointAgainstFiniteDifferences) {
+  static constexpr double kTolerance = 1.0e-6;
+  static constexpr double kStep = 1.0e-6;
+
+  absl::StatusOr<MagneticConfiguration> magnetic_configuration =
+      ImportMagneticConfigurationFromCoilsFile(
+          "vmecpp/common/makegrid_lib/test_data/coils.test_symmetric_even");
+  ASSERT_OK(magnetic_configuration);
+
+  // the PolygonFilaments in the order of the adjoint
+  std::vector<PolygonFilament*> polygon_filaments;
+  for (int i = 0; i < magnetic_configuration->serial_circuits_size(); ++i) {
+    SerialCircuit* serial_circuit =
+        magnetic_configuration->mutable_serial_circuits(i);
+    for (int j = 0; j < serial_circuit->coils_size(); ++j) {
+      Coil* coil = serial_circuit->mutable_coils(j);
+      for (int k = 0; k < coil->current_carriers_size(); ++k) {
+        CurrentCarrier* current_carrier = coil->mutable_current_carriers(k);
+        if (current_carrier->has_polygon_filament()) {
+          polygon_filaments.push_back(
+              current_carrier->mutable_polygon_filament());
+        }
+      }  // k
+    }  // j
+  }  // i
+  // the other circuit only consists of CircularFilaments
+  ASSERT_EQ(polygon_filaments.size(), 1);
+  PolygonFilament* polygon_filament = polygon_filaments[0];
+  const int number_of_vertices = polygon_filament->vertices_size();
+
+  for (const bool normalize_by_currents : {false, true}) {
+    const MakegridParameters makegrid_parameters =
+        MakegridReferenceTestFixture::MakeParams(normalize_by_currents);
+    absl::StatusOr<MagneticFieldResponseTable> response_table =
+        ComputeMagneticFieldResponseTable(makegrid_parameters,
+                                          *magnetic_configuration);
+    ASSERT_OK(response_table);
+
+    MagneticFieldResponseTable cotangents = *response_table;
+    for (int i = 0; i < cotangents.b_r.rows(); ++i) {
+      for (int j = 0; j < cotangents.b_r.cols(); ++j) {
+        cotangents.b_r(i, j) = std::cos(0.3 * j + i);
+        cotangents.b_p(i, j) = std::sin(0.7 * j - i);
+        cotangents.b_z(i, j) = 0.5 + i;
+      }  // j
+    }  // i
+
+    // contracted response table
+    const auto objective = [&]() {
+      absl::StatusOr<MagneticFieldResponseTable> perturbed_table =
+          ComputeMagneticFieldResponseTable(makegrid_parameters,
+                                            *magnetic_configuration);
+      CHECK_OK(perturbed_table);
+      return perturbed_table->b_r.cwiseProduct(cotangents.b_r).sum() +
+             perturbed_table->b_p.cwiseProduct(cotangents.b_p).sum() +
+             perturbed_table->b_z.cwiseProduct(cotangents.b_z).sum();
+    };
+
+    absl::StatusOr<std::vector<RowMatrixX3d>> gradients =
+        MagneticFieldResponseTableAdjoint(*magnetic_configuration, cotangents);
+    ASSERT_OK(gradients);
+    ASSERT_EQ(gradients->size(), polygon_filaments.size());
+
+    for (const int vertex_index :
+         {0, number_of_vertices / 3, 2 * number_of_vertices / 3}) {
+      Vector3d* vertex = polygon_filament->mutable_vertices(vertex_index);
+      const Vector3d original_vertex = *vertex;
+      for (int k = 0; k < 3; ++k) {
+        double objective_difference = 0.0;
+        for (const double sign : {1.0, -1.0}) {
+          *vertex = original_vertex;
+          if (k == 0) {
+            vertex->set_x(vertex->x() + sign * kStep);
+          } else if (k == 1) {
+            vertex->set_y(vertex->y() + sign * kStep);
+          } else {
+            vertex->set_z(vertex->z() + sign * kStep);
+          }
+          objective_difference += sign * objective();
+        }
+        *vertex = original_vertex;
+        const double finite_difference = objective_difference / (2.0 * kStep);
+        EXPECT_TRUE(IsCloseRelAbs(finite_difference,
+                                  (*gradients)[0](vertex_index, k), kTolerance))
+            << "normalize_by_currents=" << normalize_by_currents
+            << " vertex=" << vertex_index << " k=" << k;
+      }  // k
+    }  // vertex_index
+
+    // the cotangents need the layout of the response table
+    cotangents.b_z.conservativeResize(Eigen::NoChange, 10);
+    EXPECT_FALSE(
+        MagneticFieldResponseTableAdjoint(*magnetic_configuration, cotangents)
+            .ok());
+  }  // normalize_by_currents
+}  // CheckResponseTableAdjointAgainstFiniteDifferences
+
 }  // namespace makegrid
@@ -0,0 +1,387 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+
+// Microbenchmark for the radial tri-diagonal solves of the R/Z preconditioner,
+// comparing the three ways of distributing them over a radial thread team:
+//
+//   Chain:        TridiagonalSolveOpenMP, which passes the Thomas sweeps from
+//                 thread to thread through mutex-guarded handover storage
+//   ModeParallel: gather the full radial systems, then TridiagonalSolveBatched
+//                 on disjoint blocks of the Fourier modes per thread (what
+//                 RadialTridiagonalSolver::kModeParallel does)
+//   Partitioned:  TridiagonalSolvePartitioned on the radial partitions
+//
+// Every iteration starts from the same matrices and right-hand sides, so the
+// copies that the chain needs (it overwrites the matrix) and the gather/scatter
+// of the mode-parallel solver are part of the measured time, as in the solver.
+//
+// Arguments: number of threads, number of flux surfaces.
+//
+// The PerMode/Batched pair compares the single-threaded kernels that solve all
+// Fourier modes of one component.
+
+#include <algorithm>
+#include <mutex>
+#include <random>
+#include <span>
+#include <vector>
+
+#include "benchmark/benchmark.h"
+#include "vmecpp/common/util/util.h"
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif  // _OPENMP
+
+namespace vmecpp {
+namespace {
+
+// mpol = 12, ntor = 12
+constexpr int kMnmax = 12 * 13;
+constexpr int kNumBasis = 2;
+
+// Diagonally dominant R and Z systems with random coefficients, in the global
+// layout [j * mnmax + mn] (and [k][j * mnmax + mn] for the RHS).
+struct Problem {
+  Problem(int ns, int mnmax) : ns(ns), mnmax(mnmax), jMin(mnmax, 1) {
+    std::mt19937 rng(42);
+    std::uniform_real_distribution<> dist(-1., 1.);
+    for (int component = 0; component < 2; ++component) {
+      a[component].resize(ns * mnmax);
+      d[component].resize(ns * mnmax);
+      b[component].resize(ns * mnmax);
+      for (int idx = 0; idx < ns * mnmax; ++idx) {
+        a[component][idx] = 0.3 * dist(rng);
+        d[component][idx] = 1.0 + 0.1 * dist(rng);
+        b[component][idx] = 0.3 * dist(rng);
+      }
+      c[component].resize(kNumBasis);
+      for (int k = 0; k < kNumBasis; ++k) {
+        c[component][k].resize(ns * mnmax);
+        for (int idx = 0; idx < ns * mnmax; ++idx) {
+          c[component][k][idx] = dist(rng);
+        }
+      }
+    }
+    // some modes start at the axis (the m=0 modes for ntor = 12)
+    for (int mn = 0; mn < mnmax; mn += 13) {
+      jMin[mn] = 0;
+    }
+  }
+
+  int ns;
+  int mnmax;
+  std::vector<int> jMin;
+  std::vector<double> a[2];
+  std::vector<double> d[2];
+  std::vector<double> b[2];
+  std::vector<std::vector<double>> c[2];
+};
+
+// Per-thread copy of the rows [nsMinF, nsMaxF) of a Problem.
+struct LocalRows {
+  LocalRows(const Problem& problem, int ncpu, int myid) {
+    // same radial partitioning as RadialPartitioning
+    const int work_per_cpu = problem.ns / ncpu;
+    const int work_remainder = problem.ns % ncpu;
+    nsMinF = myid * work_per_cpu + std::min(myid, work_remainder);
+    nsMaxF = nsMinF + work_per_cpu + (myid < work_remainder ? 1 : 0);
+    offset = nsMinF * problem.mnmax;
+    size = (nsMaxF - nsMinF) * problem.mnmax;
+    for (int component = 0; component < 2; ++component) {
+      a[component].resize(size);
+      d[component].resize(size);
+      b[component].resize(size);
+      c[component].resize(kNumBasis, std::vector<double>(size));
+      for (int k = 0; k < kNumBasis; ++k) {
+        c_spans[component].emplace_back(c[component][k]);
+      }
+    }
+  }
+
+  void CopyMatrix(const Problem& problem) {
+    for (int component = 0; component < 2; ++component) {
+      std::copy_n(problem.a[component].begin() + offset, size,
+                  a[component].begin());
+      std::copy_n(problem.d[component].begin() + offset, size,
+                  d[component].begin());
+      std::copy_n(problem.b[component].begin() + offset, size,
+                  b[component].begin());
+    }
+  }
+
+  void CopyRhs(const Problem& problem) {
+    for (int component = 0; component < 2; ++component) {
+      for (int k = 0; k < kNumBasis; ++k) {
+        std::copy_n(problem.c[component][k].begin() + offset, size,
+                    c[component][k].begin());
+      }
+    }
+  }
+
+  int nsMinF;
+  int nsMaxF;
+  int offset;
+  int size;
+  std::vector<double> a[2];
+  std::vector<double> d[2];
+  std::vector<double> b[2];
+  std::vector<std::vector<double>> c[2];
+  std::vector<std::span<double>> c_spans[2];
+};
+
+// Allocated outside of the measured loop, like the thread-local storage of the
+// solver.
+std::vector<LocalRows> MakeLocalRows(const Problem& problem, int ncpu) {
+  std::vector<LocalRows> local_rows;
+  local_rows.reserve(ncpu);
+  for (int myid = 0; myid < ncpu; ++myid) {
+    local_rows.emplace_back(problem, ncpu, myid);
+  }
+  return local_rows;
+}
+
+int ThreadId() {
+#ifdef _OPENMP
+  return omp_get_thread_num();
+#else
+  return 0;
+#endif  // _OPENMP
+}
+
+void Barrier() {
+#ifdef _OPENMP
+#pragma omp barrier
+#endif  // _OPENMP
+}
+
+void BM_TridiagonalSolveChain(benchmark::State& state) {
+  const int ncpu = static_cast<int>(state.range(0));
+  const Problem problem(static_cast<int>(state.range(1)), kMnmax);
+
+  std::vector<std::mutex> mutices(ncpu);
+  std::vector<LocalRows> local_rows = MakeLocalRows(problem, ncpu);
+  std::vector<double> handover_ar(kMnmax);
+  std::vector<double> handover_az(kMnmax);
+  std::vector<std::vector<double>> handover_cr(kNumBasis,
+                                               std::vector<double>(kMnmax));
+  std::vector<std::vector<double>> handover_cz(kNumBasis,
+                                               std::vector<double>(kMnmax));
+
+  for (auto _ : state) {
+#ifdef _OPENMP
+#pragma omp parallel num_threads(ncpu)
+#endif  // _OPENMP
+    {
+      const int myid = ThreadId();
+      LocalRows& rows = local_rows[myid];
+      rows.CopyMatrix(problem);
+      rows.CopyRhs(problem);
+      Barrier();
+      TridiagonalSolveOpenMP(
+          rows.a[0], rows.d[0], rows.b[0], rows.c_spans[0], rows.a[1],
+          rows.d[1], rows.b[1], rows.c_spans[1], problem.jMin, problem.ns,
+          kMnmax, kNumBasis, mutices, ncpu, myid, rows.nsMinF, rows.nsMaxF,
+          handover_ar, handover_cr, handover_az, handover_cz);
+      benchmark::DoNotOptimize(rows.c[0][0].data());
+    }  // omp parallel
+  }
+}
+
+void BM_TridiagonalSolveModeParallel(benchmark::State& state) {
+  const int ncpu = static_cast<int>(state.range(0));
+  const Problem problem(static_cast<int>(state.range(1)), kMnmax);
+  const int ns = problem.ns;
+  std::vector<LocalRows> local_rows = MakeLocalRows(problem, ncpu);
+
+  // full radial systems, mode-contiguous: [j][mn] and [k * ns + j][mn], as in
+  // HandoverStorage
+  std::vector<double> all_a[2];
+  std::vector<double> all_d[2];
+  std::vector<double> all_b[2];
+  std::vector<double> all_c[2];
+  for (int component = 0; component < 2; ++component) {
+    all_a[component].resize(ns * kMnmax);
+    all_d[component].resize(ns * kMnmax);
+    all_b[component].resize(ns * kMnmax);
+    all_c[component].resize(kNumBasis * ns * kMnmax);
+  }
+
+  for (auto _ : state) {
+#ifdef _OPENMP
+#pragma omp parallel num_threads(ncpu)
+#endif  // _OPENMP
+    {
+      const int myid = ThreadId();
+      LocalRows& rows = local_rows[myid];
+      rows.CopyRhs(problem);
+
+      // gather
+      for (int component = 0; component < 2; ++component) {
+        std::copy_n(problem.a[component].begin() + rows.offset, rows.size,
+                    all_a[component].begin() + rows.offset);
+        std::copy_n(problem.d[component].begin() + rows.offset, rows.size,
+                    all_d[component].begin() + rows.offset);
+        std::copy_n(problem.b[component].begin() + rows.offset, rows.size,
+                    all_b[component].begin() + rows.offset);
+        for (int k = 0; k < kNumBasis; ++k) {
+          std::copy_n(rows.c[component][k].begin(), rows.size,
+                      all_c[component].begin() + k * ns * kMnmax + rows.offset);
+        }
+      }
+      Barrier();
+
+      // solve, in blocks of 8 modes as in IdealMhdModel
+      const int num_blocks = (kMnmax + 7) / 8;
+      const int block_min =
+          myid * (num_blocks / ncpu) + std::min(myid, num_blocks % ncpu);
+      const int block_max =
+          block_min + num_blocks / ncpu + (myid < num_blocks % ncpu ? 1 : 0);
+      const int mnMin = std::min(8 * block_min, kMnmax);
+      const int mnMax = std::min(8 * block_max, kMnmax);
+      if (mnMin < mnMax) {
+        for (int component = 0; component < 2; ++component) {
+          TridiagonalSolveBatched(all_a[component], all_d[component],
+                                  all_b[component], all_c[component], kMnmax,
+                                  ns, mnMin, mnMax, problem.jMin, ns,
+                                  kNumBasis);
+        }
+      }
+      Barrier();
+
+      // scatter
+      for (int component = 0; component < 2; ++component) {
+        for (int k = 0; k < kNumBasis; ++k) {
+          std::copy_n(all_c[component].begin() + k * ns * kMnmax + rows.offset,
+                      rows.size, rows.c[component][k].begin());
+        }
+      }
+      benchmark::DoNotOptimize(rows.c[0][0].data());
+      // the shared gather storage is reused in the next iteration
+      Barrier();
+    }  // omp parallel
+  }
+}
+
+void BM_TridiagonalSolvePartitioned(benchmark::State& state) {
+  const int ncpu = static_cast<int>(state.range(0));
+  const Problem problem(static_cast<int>(state.range(1)), kMnmax);
+
+  std::vector<LocalRows> local_rows = MakeLocalRows(problem, ncpu);
+  std::vector<TridiagonalPartitionWorkspace> workspaces(ncpu);
+  TridiagonalPartitionInterfaces interfaces;
+  interfaces.Resize(ncpu, kMnmax, kNumBasis);
+
+  for (auto _ : state) {
+#ifdef _OPENMP
+#pragma omp parallel num_threads(ncpu)
+#endif  // _OPENMP
+    {
+      const int myid = ThreadId();
+      LocalRows& rows = local_rows[myid];
+      rows.CopyRhs(problem);
+      const std::span<const double> a[2] = {
+          {problem.a[0].data() + rows.offset, static_cast<size_t>(rows.size)},
+          {problem.a[1].data() + rows.offset, static_cast<size_t>(rows.size)}};
+      const std::span<const double> d[2] = {
+          {problem.d[0].data() + rows.offset, static_cast<size_t>(rows.size)},
+          {problem.d[1].data() + rows.offset, static_cast<size_t>(rows.size)}};
+      const std::span<const double> b[2] = {
+          {problem.b[0].data() + rows.offset, static_cast<size_t>(rows.size)},
+          {problem.b[1].data() + rows.offset, static_cast<size_t>(rows.size)}};
+      TridiagonalSolvePartitioned(
+          a[0], d[0], b[0], rows.c_spans[0], a[1], d[1], b[1], rows.c_spans[1],
+          problem.jMin, problem.ns, kMnmax, kNumBasis, ncpu, myid, rows.nsMinF,
+          rows.nsMaxF, workspaces[myid], interfaces);
+      benchmark::DoNotOptimize(rows.c[0][0].data());
+      // the shared interface storage is reused in the next iteration
+      Barrier();
+    }  // omp parallel
+  }
+}
+
+// Single-threaded kernels for all Fourier modes of one component, from the
+// same mode-contiguous data: one TridiagonalSolveSerial call per mode (after a
+// transpose into its per-mode layout, which the batched solver does not need)
+// against a single TridiagonalSolveBatched call. Arguments: mpol, ntor.
+void BM_TridiagonalSolvePerMode(benchmark::State& state) {
+  const int mnmax = static_cast<int>(state.range(0) * (state.range(1) + 1));
+  const int ns = 99;
+  const Problem problem(ns, mnmax);
+  std::vector<double> a(ns);
+  std::vector<double> d(ns);
+  std::vector<double> b(ns);
+  std::vector<double> c(kNumBasis * ns);
+  std::vector<double> solution(kNumBasis * ns * mnmax);
+  for (auto _ : state) {
+    for (int mn = 0; mn < mnmax; ++mn) {
+      for (int j = 0; j < ns; ++j) {
+        a[j] = problem.a[0][j * mnmax + mn];
+        d[j] = problem.d[0][j * mnmax + mn];
+        b[j] = problem.b[0][j * mnmax + mn];
+        for (int k = 0; k < kNumBasis; ++k) {
+          c[k * ns + j] = problem.c[0][k][j * mnmax + mn];
+        }
+      }
+      TridiagonalSolveSerial(a, d, b, c.data(), ns, problem.jMin[mn], ns,
+                             kNumBasis);
+      for (int j = 0; j < ns; ++j) {
+        for (int k = 0; k < kNumBasis; ++k) {
+          solution[(k * ns + j) * mnmax + mn] = c[k * ns + j];
+        }
+      }
+    }  // mn
+    benchmark::DoNotOptimize(solution.data());
+  }
+}
+
+void BM_TridiagonalSolveBatched(benchmark::State& state) {
+  const int mnmax = static_cast<int>(state.range(0) * (state.range(1) + 1));
+  const int ns = 99;
+  const Problem problem(ns, mnmax);
+  std::vector<double> a(ns * mnmax);
+  std::vector<double> d(ns * mnmax);
+  std::vector<double> b(ns * mnmax);
+  std::vector<double> c(kNumBasis * ns * mnmax);
+  for (auto _ : state) {
+    std::copy(problem.a[0].begin(), problem.a[0].end(), a.begin());
+    std::copy(problem.d[0].begin(), problem.d[0].end(), d.begin());
+    std::copy(problem.b[0].begin(), problem.b[0].end(), b.begin());
+    for (int k = 0; k < kNumBasis; ++k) {
+      std::copy(problem.c[0][k].begin(), problem.c[0][k].end(),
+                c.begin() + k * ns * mnmax);
+    }
+    TridiagonalSolveBatched(a, d, b, c, mnmax, ns, 0, mnmax, problem.jMin, ns,
+                            kNumBasis);
+    benchmark::DoNotOptimize(c.data());
+  }
+}
+
+void KernelArguments(benchmark::internal::Benchmark* benchmark) {
+  benchmark->ArgNames({"mpol", "ntor"});
+  benchmark->Args({5, 6})->Args({8, 6})->Args({12, 12})->Args({16, 16});
+}
+
+BENCHMARK(BM_TridiagonalSolvePerMode)->Apply(KernelArguments);
+BENCHMARK(BM_TridiagonalSolveBatched)->Apply(KernelArguments);
+
+void RadialSolverArguments(benchmark::internal::Benchmark* benchmark) {
+  benchmark->ArgNames({"threads", "ns"});
+  for (const int ns : {51, 99}) {
+    for (const int threads : {1, 2, 4, 8}) {
+      benchmark->Args({threads, ns});
+    }
+  }
+  benchmark->UseRealTime();
+}
+
+BENCHMARK(BM_TridiagonalSolveChain)->Apply(RadialSolverArguments);
+BENCHMARK(BM_TridiagonalSolveModeParallel)->Apply(RadialSolverArguments);
+BENCHMARK(BM_TridiagonalSolvePartitioned)->Apply(RadialSolverArguments);
+
+}  // namespace
+}  // namespace vmecpp
+
+BENCHMARK_MAIN();
@@ -5,6 +5,7 @@
 #include "vmecpp/common/util/util.h"
 
 #include <algorithm>
+#include <atomic>
 #include <iostream>
 #include <string>
 #include <vector>
@@ -37,6 +38,9 @@ std::string VmecStatusAsString(const VmecStatus vmec_status) {
              "in the MHD model (e.g. a degenerate flux-surface geometry or "
              "a free-boundary current mismatch) that the solver could not "
              "recover from";
+    case VmecStatus::EARLY_TERMINATION:
+      return "EARLY_TERMINATION: the run was stopped early because it was "
+             "predicted not to converge (see the early-stopping criteria)";
     case VmecStatus::SUCCESSFUL_TERMINATION:
       return "SUCCESSFUL_TERMINATION";
   }
@@ -102,6 +106,90 @@ void TridiagonalSolveSerial(std::span<double> m_a, std::span<double> m_d,
   }  // k
 }
 
+void TridiagonalSolveBatched(std::span<double> m_a, std::span<double> m_d,
+                             std::span<double> m_b, std::span<double> m_c,
+                             int mnmax, int ns, int mn_begin, int mn_end,
+                             std::span<const int> jMin, int jMax, int nRHS) {
+  double* __restrict a = m_a.data();
+  double* __restrict d = m_d.data();
+  double* __restrict b = m_b.data();
+
+  // Identity rows below jMin[mn], see TridiagonalSolveSerial. They decouple
+  // from the rest of the system, since b[jMin] only multiplies zeros, which
+  // lets all modes start the sweep at the smallest jMin.
+  int jStart = jMax;
+  for (int mn = mn_begin; mn < mn_end; ++mn) {
+    jStart = std::min(jStart, jMin[mn]);
+    for (int j = 0; j < jMin[mn]; ++j) {
+      a[j * mnmax + mn] = 0.0;
+      d[j * mnmax + mn] = 1.0;
+      b[j * mnmax + mn] = 0.0;
+      for (int k = 0; k < nRHS; ++k) {
+        m_c[(k * ns + j) * mnmax + mn] = 0.0;
+      }  // k
+    }  // j
+  }  // mn
+  if (jStart >= jMax) {
+    return;
+  }
+
+  // LU decomposition: a holds the upper factor, d the denominators.
+  // Division by zero may produce NaN, this is handled elsewhere.
+  {
+    double* __restrict a_j = a + jStart * mnmax;
+    const double* __restrict d_j = d + jStart * mnmax;
+    for (int mn = mn_begin; mn < mn_end; ++mn) {
+      a_j[mn] /= d_j[mn];
+    }  // mn
+  }
+  for (int j = jStart + 1; j < jMax; ++j) {
+    const double* __restrict a_jm1 = a + (j - 1) * mnmax;
+    const double* __restrict b_j = b + j * mnmax;
+    double* __restrict d_j = d + j * mnmax;
+    for (int mn = mn_begin; mn < mn_end; ++mn) {
+      d_j[mn] -= a_jm1[mn] * b_j[mn];
+    }  // mn
+    if (j < jMax - 1) {
+      double* __restrict a_j = a + j * mnmax;
+      for (int mn = mn_begin; mn < mn_end; ++mn) {
+        a_j[mn] /= d_j[mn];
+      }  // mn
+    }
+  }  // j
+
+  for (int k = 0; k < nRHS; ++k) {
+    double* __restrict c = m_c.data() + k * ns * mnmax;
+
+    // forward sweep
+    {
+      double* __restrict c_j = c + jStart * mnmax;
+      const double* __restrict d_j = d + jStart * mnmax;
+      for (int mn = mn_begin; mn < mn_end; ++mn) {
+        c_j[mn] /= d_j[mn];
+      }  // mn
+    }
+    for (int j = jStart + 1; j < jMax; ++j) {
+      const double* __restrict c_jm1 = c + (j - 1) * mnmax;
+      const double* __restrict b_j = b + j * mnmax;
+      const double* __restrict d_j = d + j * mnmax;
+      double* __restrict c_j = c + j * mnmax;
+      for (int mn = mn_begin; mn < mn_end; ++mn) {
+        c_j[mn] = (c_j[mn] - c_jm1[mn] * b_j[mn]) / d_j[mn];
+      }  // mn
+    }  // j
+
+    // back substitution
+    for (int j = jMax - 2; j >= jStart; --j) {
+      const double* __restrict a_j = a + j * mnmax;
+      const double* __restrict c_jp1 = c + (j + 1) * mnmax;
+      double* __restrict c_j = c + j * mnmax;
+      for (int mn = mn_begin; mn < mn_end; ++mn) {
+        c_j[mn] -= a_j[mn] * c_jp1[mn];
+      }  // mn
+    }  // j
+  }  // k
+}
+
 void TridiagonalSolveOpenMP(
     std::vector<double>& m_ar, std::vector<double>& m_dr,
     std::vector<double>& m_br, std::vector<std::span<double>>& m_cr,
@@ -315,6 +403,333 @@ void TridiagonalSolveOpenMP(
 #endif  // _OPENMP
 }  // TriDiagonalSolveOpenMP
 
+namespace {
+
+// kind of a radial partition in TridiagonalSolvePartitioned, per system
+// no rows in [jMin, jMax)
+constexpr int kPartitionEmpty = 0;
+// last row of the partition is an unknown of the reduced system and there are
+// other rows before it
+constexpr int kPartitionInterface = 1;
+// the partition only has a single row, which is an unknown of the reduced
+// system
+constexpr int kPartitionInterfaceOnly = 2;
+// contains row jMax - 1, which is not coupled to a next partition
+constexpr int kPartitionLast = 3;
+
+std::atomic<RadialTridiagonalSolver> radial_tridiagonal_solver =
+    RadialTridiagonalSolver::kModeParallel;
+
+// Eliminate the rows of one radial partition for one (R or Z) set of systems:
+// every row j that is not the last row of the partition is reduced to
+//   x[j] = c[j] - left[j] * x[nsMinF - 1] - right[j] * x[nsMaxF - 1]
+// and the data the reduced system needs is stored in `m_interfaces`.
+void EliminatePartition(std::span<const double> a, std::span<const double> d,
+                        std::span<const double> b,
+                        std::span<const std::span<double>> m_c,
+                        std::span<const int> jMin, int jMax, int mnmax,
+                        int nRHS, int nsMinF, int nsMaxF, int offset,
+                        std::vector<double>& m_factor,
+                        std::vector<double>& m_left,
+                        std::vector<double>& m_right,
+                        TridiagonalPartitionInterfaces& m_interfaces) {
+  const int last_row = std::min(nsMaxF, jMax);
+
+  // forward sweep of the Thomas algorithm over the rows of the partition,
+  // excluding its last row unless it is the last row of the system
+  for (int j = nsMinF; j < last_row; ++j) {
+    for (int mn = 0; mn < mnmax; ++mn) {
+      const int idx_mn = (j - nsMinF) * mnmax + mn;
+      if (j < jMin[mn]) {
+        // same as the dummy rows of TridiagonalSolveSerial
+        for (int k = 0; k < nRHS; ++k) {
+          m_c[k][idx_mn] = 0.0;
+        }
+        continue;
+      }
+      const int lo = std::max(nsMinF, jMin[mn]);
+      const int end = (last_row == jMax) ? jMax : last_row - 1;
+      if (j >= end) {
+        continue;
+      }
+
+      if (j == lo) {
+        // Division by zero may produce NaN, this is handled elsewhere.
+        const double denominator = d[idx_mn];
+        m_left[idx_mn] = (lo == jMin[mn]) ? 0.0 : b[idx_mn] / denominator;
+        for (int k = 0; k < nRHS; ++k) {
+          m_c[k][idx_mn] /= denominator;
+        }
+        m_factor[idx_mn] = a[idx_mn] / denominator;
+      } else {
+        const int idx_mn_m = idx_mn - mnmax;
+        const double denominator = d[idx_mn] - m_factor[idx_mn_m] * b[idx_mn];
+        m_left[idx_mn] = -b[idx_mn] * m_left[idx_mn_m] / denominator;
+        for (int k = 0; k < nRHS; ++k) {
+          m_c[k][idx_mn] =
+              (m_c[k][idx_mn] - b[idx_mn] * m_c[k][idx_mn_m]) / denominator;
+        }
+        m_factor[idx_mn] = a[idx_mn] / denominator;
+      }
+      // only the row before the last row of the partition couples to it
+      m_right[idx_mn] = (j == end - 1 && end < jMax) ? m_factor[idx_mn] : 0.0;
+    }  // mn
+  }  // j
+
+  // backward sweep
+  for (int j = last_row - 2; j >= nsMinF; --j) {
+    for (int mn = 0; mn < mnmax; ++mn) {
+      const int lo = std::max(nsMinF, jMin[mn]);
+      const int end = (last_row == jMax) ? jMax : last_row - 1;
+      if (j < lo || j >= end - 1) {
+        continue;
+      }
+      const int idx_mn = (j - nsMinF) * mnmax + mn;
+      const int idx_mn_p = idx_mn + mnmax;
+      m_left[idx_mn] -= m_factor[idx_mn] * m_left[idx_mn_p];
+      m_right[idx_mn] -= m_factor[idx_mn] * m_right[idx_mn_p];
+      for (int k = 0; k < nRHS; ++k) {
+        m_c[k][idx_mn] -= m_factor[idx_mn] * m_c[k][idx_mn_p];
+      }
+    }  // mn
+  }  // j
+
+  // publish the rows at the partition boundaries
+  for (int mn = 0; mn < mnmax; ++mn) {
+    const int idx = offset + mn;
+    const int lo = std::max(nsMinF, jMin[mn]);
+    if (lo >= last_row) {
+      m_interfaces.kind[idx] = kPartitionEmpty;
+      continue;
+    }
+    const bool is_first = (lo == jMin[mn]);
+
+    if (last_row == jMax) {
+      m_interfaces.kind[idx] = kPartitionLast;
+    } else {
+      // row r couples to row r - 1 of this partition (or of the previous one,
+      // if r is the only row) and to the first row r + 1 of the next one
+      const int idx_mn = (last_row - 1 - nsMinF) * mnmax + mn;
+      m_interfaces.reduced_upper[idx] = a[idx_mn];
+      if (lo < last_row - 1) {
+        const int idx_mn_m = idx_mn - mnmax;
+        m_interfaces.kind[idx] = kPartitionInterface;
+        m_interfaces.reduced_lower[idx] = -b[idx_mn] * m_left[idx_mn_m];
+        m_interfaces.reduced_diagonal[idx] =
+            d[idx_mn] - b[idx_mn] * m_right[idx_mn_m];
+        for (int k = 0; k < nRHS; ++k) {
+          m_interfaces.reduced_rhs[idx * nRHS + k] =
+              m_c[k][idx_mn] - b[idx_mn] * m_c[k][idx_mn_m];
+        }
+      } else {
+        m_interfaces.kind[idx] = kPartitionInterfaceOnly;
+        m_interfaces.reduced_lower[idx] = is_first ? 0.0 : b[idx_mn];
+        m_interfaces.reduced_diagonal[idx] = d[idx_mn];
+        for (int k = 0; k < nRHS; ++k) {
+          m_interfaces.reduced_rhs[idx * nRHS + k] = m_c[k][idx_mn];
+        }
+        continue;
+      }
+    }
+
+    const int idx_mn_lo = (lo - nsMinF) * mnmax + mn;
+    m_interfaces.first_left[idx] = m_left[idx_mn_lo];
+    m_interfaces.first_right[idx] = m_right[idx_mn_lo];
+    for (int k = 0; k < nRHS; ++k) {
+      m_interfaces.first_rhs[idx * nRHS + k] = m_c[k][idx_mn_lo];
+    }
+  }  // mn
+}
+
+// Solve the reduced system of one (R or Z) system of mode mn, whose unknowns
+// are the last rows of the partitions.
+void SolveReducedSystem(int component, int mn, int mnmax, int nRHS, int ncpu,
+                        TridiagonalPartitionWorkspace& m_workspace,
+                        TridiagonalPartitionInterfaces& m_interfaces) {
+  std::vector<double>& q = m_workspace.reduced_factor;
+  std::vector<double>& rhs = m_workspace.reduced_rhs;
+  auto index = [&](int p) { return (p * 2 + component) * mnmax + mn; };
+  auto is_interface = [&](int p) {
+    const int kind = m_interfaces.kind[index(p)];
+    return kind == kPartitionInterface || kind == kPartitionInterfaceOnly;
+  };
+
+  // forward sweep over the partitions whose last row is an unknown; these are
+  // consecutive and the first one does not couple to a previous one
+  int previous = -1;
+  for (int p = 0; p < ncpu; ++p) {
+    if (!is_interface(p)) {
+      continue;
+    }
+    const int idx = index(p);
+    const int idx_next = index(p + 1);
+    double diagonal = m_interfaces.reduced_diagonal[idx];
+    double upper = m_interfaces.reduced_upper[idx];
+    for (int k = 0; k < nRHS; ++k) {
+      rhs[p * nRHS + k] = m_interfaces.reduced_rhs[idx * nRHS + k];
+    }
+    if (m_interfaces.kind[idx_next] != kPartitionInterfaceOnly) {
+      // eliminate the first row of the next partition
+      diagonal -= upper * m_interfaces.first_left[idx_next];
+      for (int k = 0; k < nRHS; ++k) {
+        rhs[p * nRHS + k] -=
+            upper * m_interfaces.first_rhs[idx_next * nRHS + k];
+      }
+      upper = -upper * m_interfaces.first_right[idx_next];
+    }
+
+    const double lower = (previous < 0) ? 0.0 : m_interfaces.reduced_lower[idx];
+    // Division by zero may produce NaN, this is handled elsewhere.
+    const double denominator =
+        diagonal - (previous < 0 ? 0.0 : lower * q[previous]);
+    q[p] = upper / denominator;
+    for (int k = 0; k < nRHS; ++k) {
+      const double rhs_previous =
+          (previous < 0) ? 0.0 : rhs[previous * nRHS + k];
+      rhs[p * nRHS + k] =
+          (rhs[p * nRHS + k] - lower * rhs_previous) / denominator;
+    }
+    previous = p;
+  }  // p
+
+  // backward sweep
+  int next = -1;
+  for (int p = previous; p >= 0 && is_interface(p); --p) {
+    for (int k = 0; k < nRHS; ++k) {
+      if (next >= 0) {
+        rhs[p * nRHS + k] -= q[p] * rhs[next * nRHS + k];
+      }
+      m_interfaces.solution[index(p) * nRHS + k] = rhs[p * nRHS + k];
+    }
+    next = p;
+  }  // p
+}
+
+// Recover the rows of one radial partition for one (R or Z) set of systems
+// from the solution of the reduced systems.
+void BackSubstitutePartition(std::span<const std::span<double>> m_c,
+                             std::span<const int> jMin, int jMax, int mnmax,
+                             int nRHS, int nsMinF, int nsMaxF, int offset,
+                             int previous_offset,
+                             const std::vector<double>& left,
+                             const std::vector<double>& right,
+                             const TridiagonalPartitionInterfaces& interfaces) {
+  const int last_row = std::min(nsMaxF, jMax);
+  for (int j = nsMinF; j < last_row; ++j) {
+    for (int mn = 0; mn < mnmax; ++mn) {
+      const int idx = offset + mn;
+      const int lo = std::max(nsMinF, jMin[mn]);
+      if (j < lo) {
+        continue;
+      }
+      const int idx_mn = (j - nsMinF) * mnmax + mn;
+      const int kind = interfaces.kind[idx];
+      const bool has_next = (kind != kPartitionLast);
+      if (has_next && j == last_row - 1) {
+        for (int k = 0; k < nRHS; ++k) {
+          m_c[k][idx_mn] = interfaces.solution[idx * nRHS + k];
+        }
+        continue;
+      }
+      const bool has_previous = (lo > jMin[mn]);
+      for (int k = 0; k < nRHS; ++k) {
+        if (has_previous) {
+          m_c[k][idx_mn] -=
+              left[idx_mn] *
+              interfaces.solution[(previous_offset + mn) * nRHS + k];
+        }
+        if (has_next) {
+          m_c[k][idx_mn] -= right[idx_mn] * interfaces.solution[idx * nRHS + k];
+        }
+      }  // k
+    }  // mn
+  }  // j
+}
+
+}  // namespace
+
+void TridiagonalPartitionWorkspace::Resize(int num_local_rows, int mnmax,
+                                           int num_threads, int nRHS) {
+  for (int component = 0; component < 2; ++component) {
+    factor[component].resize(num_local_rows * mnmax);
+    left_spike[component].resize(num_local_rows * mnmax);
+    right_spike[component].resize(num_local_rows * mnmax);
+  }
+  reduced_factor.resize(num_threads);
+  reduced_rhs.resize(num_threads * nRHS);
+}
+
+void TridiagonalPartitionInterfaces::Resize(int num_threads, int mnmax,
+                                            int nRHS) {
+  const int size = num_threads * 2 * mnmax;
+  kind.assign(size, kPartitionEmpty);
+  first_left.assign(size, 0.0);
+  first_right.assign(size, 0.0);
+  first_rhs.assign(size * nRHS, 0.0);
+  reduced_lower.assign(size, 0.0);
+  reduced_diagonal.assign(size, 0.0);
+  reduced_upper.assign(size, 0.0);
+  reduced_rhs.assign(size * nRHS, 0.0);
+  solution.assign(size * nRHS, 0.0);
+}
+
+void TridiagonalSolvePartitioned(
+    std::span<const double> ar, std::span<const double> dr,
+    std::span<const double> br, std::span<const std::span<double>> m_cr,
+    std::span<const double> az, std::span<const double> dz,
+    std::span<const double> bz, std::span<const std::span<double>> m_cz,
+    std::span<const int> jMin, int jMax, int mnmax, int nRHS, int ncpu,
+    int myid, int nsMinF, int nsMaxF,
+    TridiagonalPartitionWorkspace& m_workspace,
+    TridiagonalPartitionInterfaces& m_interfaces) {
+  m_workspace.Resize(nsMaxF - nsMinF, mnmax, ncpu, nRHS);
+
+  const int offset_r = (myid * 2 + 0) * mnmax;
+  const int offset_z = (myid * 2 + 1) * mnmax;
+  EliminatePartition(ar, dr, br, m_cr, jMin, jMax, mnmax, nRHS, nsMinF, nsMaxF,
+                     offset_r, m_workspace.factor[0], m_workspace.left_spike[0],
+                     m_workspace.right_spike[0], m_interfaces);
+  EliminatePartition(az, dz, bz, m_cz, jMin, jMax, mnmax, nRHS, nsMinF, nsMaxF,
+                     offset_z, m_workspace.factor[1], m_workspace.left_spike[1],
+                     m_workspace.right_spike[1], m_interfaces);
+
+#ifdef _OPENMP
+#pragma omp barrier
+#endif  // _OPENMP
+
+  // split the 2 * mnmax reduced systems among threads
+  const int num_systems = 2 * mnmax;
+  const int step = num_systems / ncpu;
+  const int remainder = num_systems % ncpu;
+  const int system_min = myid * step + std::min(myid, remainder);
+  const int system_max = system_min + step + (myid < remainder ? 1 : 0);
+  for (int system = system_min; system < system_max; ++system) {
+    SolveReducedSystem(system / mnmax, system % mnmax, mnmax, nRHS, ncpu,
+                       m_workspace, m_interfaces);
+  }
+
+#ifdef _OPENMP
+#pragma omp barrier
+#endif  // _OPENMP
+
+  BackSubstitutePartition(m_cr, jMin, jMax, mnmax, nRHS, nsMinF, nsMaxF,
+                          offset_r, offset_r - 2 * mnmax,
+                          m_workspace.left_spike[0], m_workspace.right_spike[0],
+                          m_interfaces);
+  BackSubstitutePartition(m_cz, jMin, jMax, mnmax, nRHS, nsMinF, nsMaxF,
+                          offset_z, offset_z - 2 * mnmax,
+                          m_workspace.left_spike[1], m_workspace.right_spike[1],
+                          m_interfaces);
+}  // TridiagonalSolvePartitioned
+
+void SetRadialTridiagonalSolver(RadialTridiagonalSolver solver) {
+  radial_tridiagonal_solver.store(solver);
+}
+
+RadialTridiagonalSolver GetRadialTridiagonalSolver() {
+  return radial_tridiagonal_solver.load();
+}
+
 int vmec_adjust_num_threads(const int max_threads,
                             const int num_surfaces_to_distribute) {
   // Objective: Distribute num_surfaces_to_distribute among max_threads threads.
@@ -155,7 +155,10 @@ enum class VmecStatus : std::uint8_t {
   // that the solver has no retry strategy for.
   UNRECOVERABLE_ERROR = 5,
   // everything went well, VMEC++ converged
-  SUCCESSFUL_TERMINATION = 11
+  SUCCESSFUL_TERMINATION = 11,
+  // The solver gave up on a multigrid step that was predicted not to converge
+  // (see EarlyStopCriteria).
+  EARLY_TERMINATION = 12
 };
 
 enum class VacuumPressureState : std::int8_t {
@@ -208,6 +211,19 @@ void TridiagonalSolveSerial(std::span<double> m_a, std::span<double> m_d,
                             std::span<double> m_b, double *m_c_data,
                             int c_stride, int jMin, int jMax, int nRHS);
 
+// Solve the same systems as TridiagonalSolveSerial for the Fourier modes
+// [mn_begin, mn_end) at once. The coefficients are stored mode-contiguous
+// (structure-of-arrays over mn), so that the Thomas sweeps over j vectorize
+// across the modes. Rows below jMin[mn] are turned into identity rows, as in
+// TridiagonalSolveSerial, so all modes share a single sweep.
+//
+// Layout: a, d, b: [j * mnmax + mn], c: [(k * ns + j) * mnmax + mn]
+// a and d are overwritten with the factorization, c with the solution.
+void TridiagonalSolveBatched(std::span<double> m_a, std::span<double> m_d,
+                             std::span<double> m_b, std::span<double> m_c,
+                             int mnmax, int ns, int mn_begin, int mn_end,
+                             std::span<const int> jMin, int jMax, int nRHS);
+
 // OpenMP-enabled tri-diagonal solver
 //
 // Solve a tri-diagonal system of equations:
@@ -234,6 +250,96 @@ void TridiagonalSolveOpenMP(
     std::vector<double> &m_handover_az,
     std::vector<std::vector<double>> &m_handover_cz);
 
+// Partitioned tri-diagonal solver
+//
+// Solves the same systems as TridiagonalSolveOpenMP, for the R (a,d,b,c)r and
+// Z (a,d,b,c)z components at once, but instead of passing the Thomas sweeps
+// from thread to thread, every thread eliminates the rows of its own radial
+// partition [nsMinF, nsMaxF) concurrently. This expresses each of its rows
+// through the last row of its own and of the previous partition ("spikes").
+// The last rows of all partitions then form a small reduced tri-diagonal
+// system per Fourier mode, which the threads solve for disjoint subsets of the
+// modes, before each thread back-substitutes its own rows. This takes two
+// barriers, independent of the number of threads.
+//
+// Like TridiagonalSolveSerial, rows j < jMin[mn] are set to zero and rows
+// j >= jMax are left untouched. Unlike TridiagonalSolveOpenMP, the matrix is
+// not modified. Layout of all arrays: [(j - nsMinF) * mnmax + mn].
+// Must be called by all `ncpu` threads of the radial team.
+
+// Thread-local work arrays of TridiagonalSolvePartitioned.
+struct TridiagonalPartitionWorkspace {
+  // Resize for `num_local_rows` radial rows of `mnmax` modes, and reduced
+  // systems of up to `num_threads` rows with `nRHS` right-hand sides.
+  void Resize(int num_local_rows, int mnmax, int num_threads, int nRHS);
+
+  // [2][num_local_rows * mnmax] for the R and Z systems: upper factor of the
+  // LU decomposition of the partition and the spikes that couple its rows to
+  // the last row of the previous (left) and of its own (right) partition
+  std::vector<double> factor[2];
+  std::vector<double> left_spike[2];
+  std::vector<double> right_spike[2];
+
+  // [num_threads] and [num_threads * nRHS] for the reduced systems
+  std::vector<double> reduced_factor;
+  std::vector<double> reduced_rhs;
+};
+
+// Storage shared by the threads of a radial team in
+// TridiagonalSolvePartitioned: the rows at the partition boundaries and the
+// solution of the reduced systems. Index of the per-thread data:
+// (thread_id * 2 + component) * mnmax + mn, times nRHS + k for the RHS.
+struct TridiagonalPartitionInterfaces {
+  void Resize(int num_threads, int mnmax, int nRHS);
+
+  // see kPartition* in util.cc
+  std::vector<int> kind;
+
+  // first row of the partition that is not its last row
+  std::vector<double> first_left;
+  std::vector<double> first_right;
+  std::vector<double> first_rhs;
+
+  // row of the reduced system contributed by the last row of the partition,
+  // before elimination of the first row of the next partition
+  std::vector<double> reduced_lower;
+  std::vector<double> reduced_diagonal;
+  std::vector<double> reduced_upper;
+  std::vector<double> reduced_rhs;
+
+  // solution at the last row of the partition
+  std::vector<double> solution;
+};
+
+void TridiagonalSolvePartitioned(
+    std::span<const double> ar, std::span<const double> dr,
+    std::span<const double> br, std::span<const std::span<double>> m_cr,
+    std::span<const double> az, std::span<const double> dz,
+    std::span<const double> bz, std::span<const std::span<double>> m_cz,
+    std::span<const int> jMin, int jMax, int mnmax, int nRHS, int ncpu,
+    int myid, int nsMinF, int nsMaxF,
+    TridiagonalPartitionWorkspace &m_workspace,
+    TridiagonalPartitionInterfaces &m_interfaces);
+
+// Algorithm used for the radial tri-diagonal systems of the R/Z
+// preconditioner (IdealMhdModel::applyRZPreconditioner).
+enum class RadialTridiagonalSolver {
+  // gather the full radial systems in HandoverStorage and solve disjoint
+  // subsets of the Fourier modes per thread with TridiagonalSolveSerial
+  kModeParallel,
+
+  // solve in place on the radial partitions with TridiagonalSolvePartitioned,
+  // which scales with the number of radial threads rather than with the
+  // number of Fourier modes
+  kPartitioned,
+};
+
+// Process-wide choice of the radial tri-diagonal solver. Runs latch the
+// setting when they start (see FlowControl), so changing it does not affect
+// runs in progress. The default is kModeParallel.
+void SetRadialTridiagonalSolver(RadialTridiagonalSolver solver);
+RadialTridiagonalSolver GetRadialTridiagonalSolver();
+
 // ----------------------
 // VMEC-specific
 
@@ -6,6 +6,8 @@
 
 #include <algorithm>  // for std::transform
 #include <random>
+#include <span>
+#include <tuple>
 #include <vector>
 
 #include "absl/strings/str_format.h"
@@ -19,7 +21,9 @@ namespace {
 using testing::IsCloseRelAbs;
 
 using ::testing::Bool;
+using ::testing::Combine;
 using ::testing::TestWithParam;
+using ::testing::Values;
 }  // namespace
 
 class TridiagonalSolverSerialTest : public TestWithParam<bool> {
@@ -329,6 +333,223 @@ TEST(TestUtil, CheckTridiagonalSolveOpenMP) {
   }  // omp parallel
 }  // CheckTridiagonalSolveOpenMP
 
+class TridiagonalSolvePartitionedTest
+    : public TestWithParam<std::tuple<int, bool>> {};
+
+TEST_P(TridiagonalSolvePartitionedTest, MatchesSerialSolver) {
+  const auto [num_threads, include_last_row] = GetParam();
+
+  std::mt19937 rng(42);
+  std::uniform_real_distribution<> dist(-1., 1.);
+
+  static constexpr double kTolerance = 1.0e-12;
+
+  const int num_basis = 2;
+  // 15 threads get two rows each, so that partitions with a single row in
+  // [jMin, jMax) occur at both ends
+  const int ns = 30;
+  const int mnmax = 7;
+  // the last row is only solved for once the vacuum pressure is active
+  const int jMax = include_last_row ? ns : ns - 1;
+
+  // the m=0 modes start at the axis, all others one row further out
+  std::vector<int> jMin(mnmax);
+  for (int mn = 0; mn < mnmax; ++mn) {
+    jMin[mn] = (mn % 3 == 0) ? 0 : 1;
+  }
+
+  // global matrices and RHS: [j * mnmax + mn], [k][j * mnmax + mn]
+  std::vector<double> a[2];
+  std::vector<double> d[2];
+  std::vector<double> b[2];
+  std::vector<std::vector<double>> c[2];
+  for (int component = 0; component < 2; ++component) {
+    a[component].resize(ns * mnmax);
+    d[component].resize(ns * mnmax);
+    b[component].resize(ns * mnmax);
+    c[component].resize(num_basis);
+    for (int idx = 0; idx < ns * mnmax; ++idx) {
+      a[component][idx] = 0.3 * dist(rng);
+      d[component][idx] = 1.0 + 0.1 * dist(rng);
+      b[component][idx] = 0.3 * dist(rng);
+    }
+    for (int k = 0; k < num_basis; ++k) {
+      c[component][k].resize(ns * mnmax);
+      for (int idx = 0; idx < ns * mnmax; ++idx) {
+        c[component][k][idx] = dist(rng);
+      }
+    }
+  }
+
+  // reference: serial solver for every mode
+  std::vector<std::vector<double>> expected[2];
+  for (int component = 0; component < 2; ++component) {
+    expected[component] = c[component];
+    for (int mn = 0; mn < mnmax; ++mn) {
+      std::vector<double> a_mn(ns);
+      std::vector<double> d_mn(ns);
+      std::vector<double> b_mn(ns);
+      std::vector<double> c_mn(num_basis * ns);
+      for (int j = 0; j < ns; ++j) {
+        a_mn[j] = a[component][j * mnmax + mn];
+        d_mn[j] = d[component][j * mnmax + mn];
+        b_mn[j] = b[component][j * mnmax + mn];
+        for (int k = 0; k < num_basis; ++k) {
+          c_mn[k * ns + j] = c[component][k][j * mnmax + mn];
+        }
+      }
+      TridiagonalSolveSerial(a_mn, d_mn, b_mn, c_mn.data(), ns, jMin[mn], jMax,
+                             num_basis);
+      for (int j = 0; j < ns; ++j) {
+        for (int k = 0; k < num_basis; ++k) {
+          expected[component][k][j * mnmax + mn] = c_mn[k * ns + j];
+        }
+      }
+    }  // mn
+  }  // component
+
+  TridiagonalPartitionInterfaces interfaces;
+  interfaces.Resize(num_threads, mnmax, num_basis);
+  std::vector<std::vector<double>> solution[2] = {c[0], c[1]};
+
+#ifdef _OPENMP
+#pragma omp parallel num_threads(num_threads)
+#endif  // _OPENMP
+  {
+#ifdef _OPENMP
+    const int ncpu = omp_get_num_threads();
+    const int myid = omp_get_thread_num();
+#else
+    const int ncpu = 1;
+    const int myid = 0;
+#endif  // _OPENMP
+
+    // same radial partitioning as RadialPartitioning
+    const int work_per_cpu = ns / ncpu;
+    const int work_remainder = ns % ncpu;
+    const int nsMinF = myid * work_per_cpu + std::min(myid, work_remainder);
+    const int nsMaxF = nsMinF + work_per_cpu + (myid < work_remainder ? 1 : 0);
+    const int num_local = (nsMaxF - nsMinF) * mnmax;
+    const int offset = nsMinF * mnmax;
+
+    std::span<const double> local_a[2];
+    std::span<const double> local_d[2];
+    std::span<const double> local_b[2];
+    std::vector<std::span<double>> local_c[2];
+    for (int component = 0; component < 2; ++component) {
+      local_a[component] = {a[component].data() + offset, num_local};
+      local_d[component] = {d[component].data() + offset, num_local};
+      local_b[component] = {b[component].data() + offset, num_local};
+      for (int k = 0; k < num_basis; ++k) {
+        local_c[component].emplace_back(solution[component][k].data() + offset,
+                                        num_local);
+      }
+    }
+
+    TridiagonalPartitionWorkspace workspace;
+    TridiagonalSolvePartitioned(local_a[0], local_d[0], local_b[0], local_c[0],
+                                local_a[1], local_d[1], local_b[1], local_c[1],
+                                jMin, jMax, mnmax, num_basis, ncpu, myid,
+                                nsMinF, nsMaxF, workspace, interfaces);
+  }  // omp parallel
+
+  for (int component = 0; component < 2; ++component) {
+    for (int k = 0; k < num_basis; ++k) {
+      for (int j = 0; j < ns; ++j) {
+        for (int mn = 0; mn < mnmax; ++mn) {
+          const int idx = j * mnmax + mn;
+          EXPECT_TRUE(IsCloseRelAbs(expected[component][k][idx],
+                                    solution[component][k][idx], kTolerance))
+              << absl::StrFormat("component=%d k=%d j=%d mn=%d", component, k,
+                                 j, mn);
+        }  // mn
+      }  // j
+    }  // k
+  }  // component
+}
+
+INSTANTIATE_TEST_SUITE_P(TestUtil, TridiagonalSolvePartitionedTest,
+                         Combine(Values(1, 2, 3, 7, 15), Bool()));
+
+class TridiagonalSolveBatchedTest : public TestWithParam<bool> {};
+
+TEST_P(TridiagonalSolveBatchedTest, MatchesSerialSolver) {
+  const bool include_last_row = GetParam();
+
+  std::mt19937 rng(42);
+  std::uniform_real_distribution<> dist(-1., 1.);
+
+  static constexpr double kTolerance = 1.0e-12;
+
+  const int num_basis = 2;
+  const int ns = 17;
+  const int mnmax = 11;
+  const int jMax = include_last_row ? ns : ns - 1;
+
+  std::vector<int> jMin(mnmax);
+  for (int mn = 0; mn < mnmax; ++mn) {
+    jMin[mn] = (mn % 3 == 0) ? 0 : 1;
+  }
+
+  // mode-contiguous layout: [j * mnmax + mn], [(k * ns + j) * mnmax + mn]
+  std::vector<double> a(ns * mnmax);
+  std::vector<double> d(ns * mnmax);
+  std::vector<double> b(ns * mnmax);
+  std::vector<double> c(num_basis * ns * mnmax);
+  for (int idx = 0; idx < ns * mnmax; ++idx) {
+    a[idx] = 0.3 * dist(rng);
+    d[idx] = 1.0 + 0.1 * dist(rng);
+    b[idx] = 0.3 * dist(rng);
+  }
+  for (double& c_idx : c) {
+    c_idx = dist(rng);
+  }
+
+  // reference: serial solver for every mode
+  std::vector<double> expected = c;
+  for (int mn = 0; mn < mnmax; ++mn) {
+    std::vector<double> a_mn(ns);
+    std::vector<double> d_mn(ns);
+    std::vector<double> b_mn(ns);
+    std::vector<double> c_mn(num_basis * ns);
+    for (int j = 0; j < ns; ++j) {
+      a_mn[j] = a[j * mnmax + mn];
+      d_mn[j] = d[j * mnmax + mn];
+      b_mn[j] = b[j * mnmax + mn];
+      for (int k = 0; k < num_basis; ++k) {
+        c_mn[k * ns + j] = c[(k * ns + j) * mnmax + mn];
+      }
+    }
+    TridiagonalSolveSerial(a_mn, d_mn, b_mn, c_mn.data(), ns, jMin[mn], jMax,
+                           num_basis);
+    for (int j = 0; j < ns; ++j) {
+      for (int k = 0; k < num_basis; ++k) {
+        expected[(k * ns + j) * mnmax + mn] = c_mn[k * ns + j];
+      }
+    }
+  }  // mn
+
+  // solve in two batches of modes, as two threads would
+  const int mn_split = 8;
+  std::vector<double> solution = c;
+  TridiagonalSolveBatched(a, d, b, solution, mnmax, ns, 0, mn_split, jMin, jMax,
+                          num_basis);
+  TridiagonalSolveBatched(a, d, b, solution, mnmax, ns, mn_split, mnmax, jMin,
+                          jMax, num_basis);
+
+  for (int k = 0; k < num_basis; ++k) {
+    for (int j = 0; j < ns; ++j) {
+      for (int mn = 0; mn < mnmax; ++mn) {
+        const int idx = (k * ns + j) * mnmax + mn;
+        EXPECT_TRUE(IsCloseRelAbs(expected[idx], solution[idx], kTolerance))
+            << absl::StrFormat("k=%d j=%d mn=%d", k, j, mn);
+      }  // mn
+    }  // j
+  }  // k
+}
+
+INSTANTIATE_TEST_SUITE_P(TestUtil, TridiagonalSolveBatchedTest, Bool());
+
 // The radial solve is capped at floor(ns / 2) threads (>=2 flux surfaces per
 // thread), while the free-boundary vacuum solve is parallelized over the
 // tangential grid and only capped at nZnT. These tests pin that difference so
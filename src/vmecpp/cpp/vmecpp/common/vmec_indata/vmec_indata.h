@@ -52,7 +52,12 @@ enum class IterationStyle : std::uint8_t {
   VMEC_8_52,
 
   // PARVMEC (~same as hiddenSymmetries/VMEC2000) - version 9.0
-  PARVMEC
+  PARVMEC,
+
+  // VMEC 8.52 restart control, but the time step is an Anderson-mixed
+  // (nonlinear GMRES) step along the preconditioned forces instead of the
+  // second-order Richardson ("velocity") step
+  ANDERSON
 };
 
 int IterationStyleCode(IterationStyle iteration_style);
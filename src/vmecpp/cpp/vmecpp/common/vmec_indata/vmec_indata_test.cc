@@ -206,6 +206,23 @@ TEST(TestVmecINDATA, CheckDeltBounds) {
   EXPECT_FALSE(IsConsistent(indata, /*enable_info_messages=*/false).ok());
 }
 
+TEST(TestVmecINDATA, CheckIterationStyles) {
+  VmecINDATA indata;
+  for (const IterationStyle iteration_style :
+       {IterationStyle::VMEC_8_52, IterationStyle::PARVMEC,
+        IterationStyle::ANDERSON}) {
+    indata.iteration_style = iteration_style;
+    EXPECT_TRUE(IsConsistent(indata, /*enable_info_messages=*/false).ok())
+        << ToString(iteration_style);
+  }
+
+  const absl::StatusOr<IterationStyle> anderson =
+      IterationStyleFromString("anderson");
+  ASSERT_TRUE(anderson.ok());
+  EXPECT_EQ(*anderson, IterationStyle::ANDERSON);
+  EXPECT_EQ(ToString(IterationStyle::ANDERSON), "anderson");
+}
+
 TEST(TestVmecINDATA, ToJson) {
   const absl::StatusOr<std::string> indata_json =
       ReadFile("vmecpp/test_data/cth_like_free_bdy.json");
@@ -21,13 +21,14 @@ class FreeBoundaryBase {
  public:
   virtual ~FreeBoundaryBase() = default;
 
-  FreeBoundaryBase(const Sizes* s, const TangentialPartitioning* tp,
-                   const MGridProvider* mgrid, std::span<double> bSqVacShare,
+  FreeBoundaryBase(const Sizes* s, const FourierBasisFastToroidal* fb,
+                   const TangentialPartitioning* tp, const MGridProvider* mgrid,
+                   std::span<double> bSqVacShare,
                    std::span<double> vacuum_b_r_share,
                    std::span<double> vacuum_b_phi_share,
                    std::span<double> vacuum_b_z_share)
       : s_(*s),
-        fb_(&s_),
+        fb_(*fb),
         tp_(*tp),
         sg_(s, &fb_, tp),
         ef_(s, tp, &sg_, mgrid),
@@ -52,7 +53,9 @@ class FreeBoundaryBase {
 
  protected:
   const Sizes& s_;
-  const FourierBasisFastToroidal fb_;
+  // read-only, shared with all other vacuum solvers of the same resolution
+  // (see FourierBasisCache)
+  const FourierBasisFastToroidal& fb_;
   const TangentialPartitioning& tp_;
 
   SurfaceGeometry sg_;
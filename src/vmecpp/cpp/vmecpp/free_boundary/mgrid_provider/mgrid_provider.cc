@@ -81,6 +81,8 @@ MGridProvider::MGridProvider() {
 
   has_fixed_field_ = false;
 
+  response_table_.reset();
+
   mgrid_mode = "";
 }
 
@@ -248,12 +250,13 @@ absl::Status MGridProvider::LoadFile(const std::filesystem::path& filename,
 
   has_mgrid_loaded_ = true;
   has_fixed_field_ = false;
+  response_table_.reset();
 
   return absl::Status();
 }
 
-absl::Status MGridProvider::LoadFields(
-    const makegrid::MagneticFieldResponseTable& magnetic_response_table,
+absl::Status MGridProvider::SetGridFromResponseTable(
+    const makegrid::MagneticFieldResponseTableView& magnetic_response_table,
     const Eigen::VectorXd& coil_currents) {
   const auto& mgrid_params = magnetic_response_table.parameters;
   if (coil_currents.size() != magnetic_response_table.b_p.rows()) {
@@ -285,6 +288,18 @@ absl::Status MGridProvider::LoadFields(
     mgrid_mode = "R";
   }
 
+  return absl::OkStatus();
+}
+
+absl::Status MGridProvider::LoadFields(
+    const makegrid::MagneticFieldResponseTable& magnetic_response_table,
+    const Eigen::VectorXd& coil_currents) {
+  absl::Status status =
+      SetGridFromResponseTable(magnetic_response_table, coil_currents);
+  if (!status.ok()) {
+    return status;
+  }
+
   // TODO(eguiraud): factor out this part that is duplicated
   const int num_grid_points = numPhi * numZ * numR;
   bR.setZero(num_grid_points);
@@ -303,6 +318,30 @@ absl::Status MGridProvider::LoadFields(
     }  // linear_index
   }  // nextcur
 
+  has_mgrid_loaded_ = true;
+  has_fixed_field_ = false;
+  response_table_.reset();
+
+  return absl::OkStatus();
+}
+
+absl::Status MGridProvider::ReferenceFields(
+    const makegrid::MagneticFieldResponseTableView& magnetic_response_table,
+    const Eigen::VectorXd& coil_currents) {
+  absl::Status status =
+      SetGridFromResponseTable(magnetic_response_table, coil_currents);
+  if (!status.ok()) {
+    return status;
+  }
+
+  // release the memory of a previously loaded total field
+  bR.resize(0);
+  bP.resize(0);
+  bZ.resize(0);
+
+  response_table_.emplace(magnetic_response_table);
+  coil_currents_ = coil_currents;
+
   has_mgrid_loaded_ = true;
   has_fixed_field_ = false;
 
@@ -319,6 +358,7 @@ void MGridProvider::SetFixedMagneticField(const Eigen::VectorXd& fixed_br,
 
   has_mgrid_loaded_ = true;
   has_fixed_field_ = true;
+  response_table_.reset();
 }  // SetFixedMagneticField
 
 // interpolate mgrid file at current flux surface
@@ -395,6 +435,29 @@ void MGridProvider::interpolate(int ztMin, int ztMax, int nZeta,
     int kj_i1 = (k * numZ + jz) * numR + ir1;
     int kj1i1 = (k * numZ + jz1) * numR + ir1;
 
+    if (response_table_.has_value()) {
+      // interpolate each circuit and combine with the coil currents
+      const makegrid::MagneticFieldResponseTableView& table = *response_table_;
+      double b_r = 0.0;
+      double b_p = 0.0;
+      double b_z = 0.0;
+      for (int i = 0; i < nextcur; ++i) {
+        const double* b_r_i = table.b_r.row(i).data();
+        const double* b_p_i = table.b_p.row(i).data();
+        const double* b_z_i = table.b_z.row(i).data();
+        b_r += coil_currents_[i] * (w11 * b_r_i[kj_i_] + w12 * b_r_i[kj1i_] +
+                                    w21 * b_r_i[kj_i1] + w22 * b_r_i[kj1i1]);
+        b_p += coil_currents_[i] * (w11 * b_p_i[kj_i_] + w12 * b_p_i[kj1i_] +
+                                    w21 * b_p_i[kj_i1] + w22 * b_p_i[kj1i1]);
+        b_z += coil_currents_[i] * (w11 * b_z_i[kj_i_] + w12 * b_z_i[kj1i_] +
+                                    w21 * b_z_i[kj_i1] + w22 * b_z_i[kj1i1]);
+      }  // nextcur
+      m_interpBr[kl - ztMin] = b_r;
+      m_interpBp[kl - ztMin] = b_p;
+      m_interpBz[kl - ztMin] = b_z;
+      continue;
+    }
+
     m_interpBr[kl - ztMin] =
         w11 * bR[kj_i_] + w12 * bR[kj1i_] + w21 * bR[kj_i1] + w22 * bR[kj1i1];
     m_interpBp[kl - ztMin] =
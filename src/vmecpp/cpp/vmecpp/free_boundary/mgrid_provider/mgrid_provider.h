@@ -7,6 +7,7 @@
 
 #include <Eigen/Dense>
 #include <filesystem>
+#include <optional>
 
 #include "vmecpp/common/makegrid_lib/makegrid_lib.h"
 #include "vmecpp/common/sizes/sizes.h"
@@ -26,6 +27,16 @@ class MGridProvider {
       const makegrid::MagneticFieldResponseTable& magnetic_response_table,
       const Eigen::VectorXd& coil_currents);
 
+  // Like LoadFields, but instead of summing the circuits over the whole grid,
+  // keep a reference to the per-circuit fields of `magnetic_response_table`
+  // and combine them with `coil_currents` only at the interpolation points.
+  // This avoids a per-run copy of the grid, so that many runs (e.g. a scan
+  // over coil currents) can share one response table in memory.
+  // The memory viewed by `magnetic_response_table` must outlive this object.
+  absl::Status ReferenceFields(
+      const makegrid::MagneticFieldResponseTableView& magnetic_response_table,
+      const Eigen::VectorXd& coil_currents);
+
   void SetFixedMagneticField(const Eigen::VectorXd& fixed_br,
                              const Eigen::VectorXd& fixed_bp,
                              const Eigen::VectorXd& fixed_bz);
@@ -37,6 +48,8 @@ class MGridProvider {
 
   // mgrid internals below
 
+  // total field on the grid; empty if the fields are referenced, see
+  // ReferenceFields
   Eigen::VectorXd bR;
   Eigen::VectorXd bP;
   Eigen::VectorXd bZ;
@@ -65,6 +78,16 @@ class MGridProvider {
   bool has_mgrid_loaded_;
   bool has_fixed_field_;
 
+  // set by ReferenceFields: per-circuit fields and their currents
+  std::optional<makegrid::MagneticFieldResponseTableView> response_table_;
+  Eigen::VectorXd coil_currents_;
+
+  // Set the grid parameters from `magnetic_response_table`; returns an error
+  // if the number of circuits does not match coil_currents.size().
+  absl::Status SetGridFromResponseTable(
+      const makegrid::MagneticFieldResponseTableView& magnetic_response_table,
+      const Eigen::VectorXd& coil_currents);
+
   Eigen::VectorXd fixed_br_;
   Eigen::VectorXd fixed_bp_;
   Eigen::VectorXd fixed_bz_;
@@ -8,13 +8,14 @@
 
 namespace vmecpp {
 
-Nestor::Nestor(const Sizes* s, const TangentialPartitioning* tp,
-               const MGridProvider* mgrid, std::span<double> matrixShare,
-               std::span<double> bvecShare, std::span<double> bSqVacShare,
-               std::span<int> iPiv, std::span<double> vacuum_b_r_share,
+Nestor::Nestor(const Sizes* s, const FourierBasisFastToroidal* fb,
+               const TangentialPartitioning* tp, const MGridProvider* mgrid,
+               std::span<double> matrixShare, std::span<double> bvecShare,
+               std::span<double> bSqVacShare, std::span<int> iPiv,
+               std::span<double> vacuum_b_r_share,
                std::span<double> vacuum_b_phi_share,
                std::span<double> vacuum_b_z_share)
-    : FreeBoundaryBase(s, tp, mgrid, bSqVacShare, vacuum_b_r_share,
+    : FreeBoundaryBase(s, fb, tp, mgrid, bSqVacShare, vacuum_b_r_share,
                        vacuum_b_phi_share, vacuum_b_z_share),
       nf(s_.ntor),
       mf(s_.mpol + 1),
@@ -23,10 +23,11 @@ namespace vmecpp {
 
 class Nestor : public FreeBoundaryBase {
  public:
-  Nestor(const Sizes* s, const TangentialPartitioning* tp,
-         const MGridProvider* mgrid, std::span<double> matrixShare,
-         std::span<double> bvecShare, std::span<double> bSqVacShare,
-         std::span<int> iPiv, std::span<double> vacuum_b_r_share,
+  Nestor(const Sizes* s, const FourierBasisFastToroidal* fb,
+         const TangentialPartitioning* tp, const MGridProvider* mgrid,
+         std::span<double> matrixShare, std::span<double> bvecShare,
+         std::span<double> bSqVacShare, std::span<int> iPiv,
+         std::span<double> vacuum_b_r_share,
          std::span<double> vacuum_b_phi_share,
          std::span<double> vacuum_b_z_share);
 
@@ -6,12 +6,13 @@
 
 namespace vmecpp {
 
-OnlyCoils::OnlyCoils(const Sizes* s, const TangentialPartitioning* tp,
+OnlyCoils::OnlyCoils(const Sizes* s, const FourierBasisFastToroidal* fb,
+                     const TangentialPartitioning* tp,
                      const MGridProvider* mgrid, std::span<double> bSqVacShare,
                      std::span<double> vacuum_b_r_share,
                      std::span<double> vacuum_b_phi_share,
                      std::span<double> vacuum_b_z_share)
-    : FreeBoundaryBase(s, tp, mgrid, bSqVacShare, vacuum_b_r_share,
+    : FreeBoundaryBase(s, fb, tp, mgrid, bSqVacShare, vacuum_b_r_share,
                        vacuum_b_phi_share, vacuum_b_z_share) {}  // OnlyCoils
 
 bool OnlyCoils::update(
@@ -17,9 +17,9 @@ namespace vmecpp {
 
 class OnlyCoils : public FreeBoundaryBase {
  public:
-  OnlyCoils(const Sizes* s, const TangentialPartitioning* tp,
-            const MGridProvider* mgrid, std::span<double> bSqVacShare,
-            std::span<double> vacuum_b_r_share,
+  OnlyCoils(const Sizes* s, const FourierBasisFastToroidal* fb,
+            const TangentialPartitioning* tp, const MGridProvider* mgrid,
+            std::span<double> bSqVacShare, std::span<double> vacuum_b_r_share,
             std::span<double> vacuum_b_phi_share,
             std::span<double> vacuum_b_z_share);
 
@@ -0,0 +1,84 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/anderson_mixing/anderson_mixing.h"
+
+#include <algorithm>
+
+#include "absl/log/check.h"
+
+namespace vmecpp {
+
+AndersonMixing::AndersonMixing(int history_length)
+    : history_length_(history_length),
+      history_size_(0),
+      next_column_(0),
+      have_previous_(false) {
+  CHECK_GT(history_length, 0) << "Anderson history length must be positive";
+}
+
+void AndersonMixing::Reset() {
+  history_size_ = 0;
+  next_column_ = 0;
+  have_previous_ = false;
+}
+
+void AndersonMixing::Update(const Eigen::VectorXd& x,
+                            const Eigen::VectorXd& f) {
+  CHECK_EQ(x.size(), f.size());
+  if (have_previous_ && previous_x_.size() != x.size()) {
+    // size of the state vector changed, e.g. at a new multigrid step
+    Reset();
+  }
+
+  if (have_previous_) {
+    if (delta_x_.rows() != x.size()) {
+      delta_x_.resize(x.size(), history_length_);
+      delta_f_.resize(x.size(), history_length_);
+    }
+    delta_x_.col(next_column_) = x - previous_x_;
+    delta_f_.col(next_column_) = f - previous_f_;
+    next_column_ = (next_column_ + 1) % history_length_;
+    history_size_ = std::min(history_size_ + 1, history_length_);
+  }
+
+  previous_x_ = x;
+  previous_f_ = f;
+  have_previous_ = true;
+}
+
+void AndersonMixing::AccumulateNormalEquations(Eigen::MatrixXd& m_gram,
+                                               Eigen::VectorXd& m_rhs) const {
+  CHECK_EQ(m_gram.rows(), history_size_);
+  CHECK_EQ(m_rhs.size(), history_size_);
+  if (history_size_ == 0) {
+    return;
+  }
+  const auto delta_f = delta_f_.leftCols(history_size_);
+  m_gram.noalias() += delta_f.transpose() * delta_f;
+  m_rhs.noalias() += delta_f.transpose() * previous_f_;
+}
+
+Eigen::VectorXd AndersonMixing::SolveNormalEquations(
+    const Eigen::MatrixXd& gram, const Eigen::VectorXd& rhs) {
+  if (rhs.size() == 0) {
+    return Eigen::VectorXd();
+  }
+  Eigen::MatrixXd regularized = gram;
+  const double regularization = 1.0e-12 * gram.trace() / gram.rows();
+  regularized.diagonal().array() += regularization;
+  return regularized.ldlt().solve(rhs);
+}
+
+void AndersonMixing::MixForces(const Eigen::VectorXd& gamma, double beta,
+                               Eigen::VectorXd& m_f) const {
+  CHECK_EQ(gamma.size(), history_size_);
+  if (history_size_ == 0) {
+    return;
+  }
+  m_f.noalias() -= delta_x_.leftCols(history_size_) * (gamma / beta);
+  m_f.noalias() -= delta_f_.leftCols(history_size_) * gamma;
+}
+
+}  // namespace vmecpp
@@ -0,0 +1,81 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#ifndef VMECPP_VMEC_ANDERSON_MIXING_ANDERSON_MIXING_H_
+#define VMECPP_VMEC_ANDERSON_MIXING_ANDERSON_MIXING_H_
+
+#include <Eigen/Dense>
+
+namespace vmecpp {
+
+// Anderson acceleration (equivalently: nonlinear GMRES) of the fixed-point
+// iteration x <- x + beta * f(x), where f is the preconditioned force.
+//
+// Given the differences dX, dF of the last few iterates and forces, the mixed
+// step is
+//   x_new = x + beta * f - (dX + beta * dF) * gamma,
+// where gamma minimizes |f - dF * gamma|. The least-squares problem is solved
+// via its normal equations, which allows to distribute the state over threads:
+// each thread holds an AndersonMixing instance for its slice of the state
+// vector, the normal equations are summed over all slices and solved once,
+// and each thread then mixes its own slice.
+class AndersonMixing {
+ public:
+  // The preconditioned force changes whenever VMEC++ updates its
+  // preconditioner (every kPreconditionerUpdateInterval = 25 iterations), and
+  // the history is cleared then. Until then, all differences are kept.
+  static constexpr int kDefaultHistoryLength = 24;
+
+  explicit AndersonMixing(int history_length = kDefaultHistoryLength);
+
+  // Forget all previous iterates, e.g. after a restart of the time evolution.
+  void Reset();
+
+  // Number of differences currently stored; the same on all slices.
+  int history_size() const { return history_size_; }
+
+  // Record the current iterate `x` and force `f` of this slice.
+  // The difference to the previously recorded iterate is added to the history,
+  // dropping the oldest entry if the history is full.
+  void Update(const Eigen::VectorXd& x, const Eigen::VectorXd& f);
+
+  // Add the contribution of this slice to the normal equations
+  // dF^T dF * gamma = dF^T f of the most recent Update().
+  // `m_gram` and `m_rhs` must be of size history_size().
+  void AccumulateNormalEquations(Eigen::MatrixXd& m_gram,
+                                 Eigen::VectorXd& m_rhs) const;
+
+  // Solve the (summed) normal equations for the mixing coefficients gamma.
+  // A small Tikhonov regularization keeps this well-defined if the history
+  // has become (nearly) linearly dependent.
+  static Eigen::VectorXd SolveNormalEquations(const Eigen::MatrixXd& gram,
+                                              const Eigen::VectorXd& rhs);
+
+  // Replace the force `m_f` of the most recent Update() by the mixed force
+  //   f - (dX / beta + dF) * gamma,
+  // so that a plain step x + beta * f with the mixed force is the Anderson
+  // step.
+  void MixForces(const Eigen::VectorXd& gamma, double beta,
+                 Eigen::VectorXd& m_f) const;
+
+ private:
+  int history_length_;
+  int history_size_;
+
+  // column to be overwritten by the next difference
+  int next_column_;
+
+  // differences of iterates and forces, one column per history entry;
+  // the column order is irrelevant for the least-squares problem
+  Eigen::MatrixXd delta_x_;
+  Eigen::MatrixXd delta_f_;
+
+  bool have_previous_;
+  Eigen::VectorXd previous_x_;
+  Eigen::VectorXd previous_f_;
+};
+
+}  // namespace vmecpp
+
+#endif  // VMECPP_VMEC_ANDERSON_MIXING_ANDERSON_MIXING_H_
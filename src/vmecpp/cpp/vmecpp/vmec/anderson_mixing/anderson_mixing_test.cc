@@ -0,0 +1,146 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/anderson_mixing/anderson_mixing.h"
+
+#include "gtest/gtest.h"
+
+namespace vmecpp {
+namespace {
+
+// A linear "force" f(x) = b - A x with an ill-conditioned SPD matrix A.
+class LinearProblem {
+ public:
+  explicit LinearProblem(int size) : a_(size, size), b_(size) {
+    a_.setZero();
+    for (int i = 0; i < size; ++i) {
+      a_(i, i) = 1.0 / (1.0 + i * i);
+      b_[i] = 1.0 + 0.1 * i;
+    }
+    for (int i = 0; i + 1 < size; ++i) {
+      a_(i, i + 1) = a_(i + 1, i) = 0.1 * a_(i + 1, i + 1);
+    }
+  }
+
+  Eigen::VectorXd Force(const Eigen::VectorXd& x) const { return b_ - a_ * x; }
+
+ private:
+  Eigen::MatrixXd a_;
+  Eigen::VectorXd b_;
+};
+
+// number of steps x <- x + beta * f (optionally Anderson-mixed) until |f| < tol
+int StepsToConverge(const LinearProblem& problem, int size, bool mix) {
+  const double beta = 1.0;
+  const double tolerance = 1.0e-10;
+  AndersonMixing mixing;
+  Eigen::VectorXd x = Eigen::VectorXd::Zero(size);
+  for (int step = 0; step < 100000; ++step) {
+    Eigen::VectorXd f = problem.Force(x);
+    if (f.norm() < tolerance) {
+      return step;
+    }
+    if (mix) {
+      mixing.Update(x, f);
+      Eigen::MatrixXd gram =
+          Eigen::MatrixXd::Zero(mixing.history_size(), mixing.history_size());
+      Eigen::VectorXd rhs = Eigen::VectorXd::Zero(mixing.history_size());
+      mixing.AccumulateNormalEquations(gram, rhs);
+      mixing.MixForces(AndersonMixing::SolveNormalEquations(gram, rhs), beta,
+                       f);
+    }
+    x += beta * f;
+  }
+  return -1;
+}
+
+TEST(TestAndersonMixing, AcceleratesRichardsonIteration) {
+  const int size = 8;
+  const LinearProblem problem(size);
+
+  const int plain_steps = StepsToConverge(problem, size, /*mix=*/false);
+  const int mixed_steps = StepsToConverge(problem, size, /*mix=*/true);
+
+  ASSERT_GT(plain_steps, 0);
+  ASSERT_GT(mixed_steps, 0);
+  EXPECT_LT(10 * mixed_steps, plain_steps);
+}  // AcceleratesRichardsonIteration
+
+TEST(TestAndersonMixing, FirstStepIsPlainStep) {
+  AndersonMixing mixing;
+  const Eigen::VectorXd x = Eigen::VectorXd::Constant(3, 1.0);
+  Eigen::VectorXd f = Eigen::VectorXd::LinSpaced(3, 1.0, 3.0);
+  const Eigen::VectorXd f_original = f;
+
+  mixing.Update(x, f);
+  EXPECT_EQ(mixing.history_size(), 0);
+
+  Eigen::MatrixXd gram(0, 0);
+  Eigen::VectorXd rhs(0);
+  mixing.AccumulateNormalEquations(gram, rhs);
+  mixing.MixForces(AndersonMixing::SolveNormalEquations(gram, rhs), 0.5, f);
+  EXPECT_EQ(f, f_original);
+}  // FirstStepIsPlainStep
+
+TEST(TestAndersonMixing, HistoryIsBoundedAndReset) {
+  AndersonMixing mixing(/*history_length=*/2);
+  for (int i = 0; i < 5; ++i) {
+    mixing.Update(Eigen::VectorXd::Constant(4, i), Eigen::VectorXd::Random(4));
+  }
+  EXPECT_EQ(mixing.history_size(), 2);
+
+  mixing.Reset();
+  EXPECT_EQ(mixing.history_size(), 0);
+  mixing.Update(Eigen::VectorXd::Zero(4), Eigen::VectorXd::Zero(4));
+  EXPECT_EQ(mixing.history_size(), 0);
+}  // HistoryIsBoundedAndReset
+
+// Splitting the state vector into slices, as done for the OpenMP threads in
+// Vmec, must give the same mixed force as a single slice.
+TEST(TestAndersonMixing, SlicedStateMatchesFullState) {
+  const int size = 10;
+  const int split = 4;
+  AndersonMixing full;
+  AndersonMixing lower;
+  AndersonMixing upper;
+
+  Eigen::VectorXd f;
+  Eigen::VectorXd f_lower;
+  Eigen::VectorXd f_upper;
+  for (int i = 0; i < 4; ++i) {
+    const Eigen::VectorXd x = Eigen::VectorXd::Random(size);
+    f = Eigen::VectorXd::Random(size);
+    f_lower = f.head(split);
+    f_upper = f.tail(size - split);
+    full.Update(x, f);
+    lower.Update(x.head(split), f_lower);
+    upper.Update(x.tail(size - split), f_upper);
+  }
+  const int history_size = full.history_size();
+  ASSERT_EQ(history_size, 3);
+
+  Eigen::MatrixXd gram = Eigen::MatrixXd::Zero(history_size, history_size);
+  Eigen::VectorXd rhs = Eigen::VectorXd::Zero(history_size);
+  full.AccumulateNormalEquations(gram, rhs);
+  const Eigen::VectorXd gamma = AndersonMixing::SolveNormalEquations(gram, rhs);
+
+  Eigen::MatrixXd sliced_gram =
+      Eigen::MatrixXd::Zero(history_size, history_size);
+  Eigen::VectorXd sliced_rhs = Eigen::VectorXd::Zero(history_size);
+  lower.AccumulateNormalEquations(sliced_gram, sliced_rhs);
+  upper.AccumulateNormalEquations(sliced_gram, sliced_rhs);
+  const Eigen::VectorXd sliced_gamma =
+      AndersonMixing::SolveNormalEquations(sliced_gram, sliced_rhs);
+
+  full.MixForces(gamma, 0.3, f);
+  lower.MixForces(sliced_gamma, 0.3, f_lower);
+  upper.MixForces(sliced_gamma, 0.3, f_upper);
+  for (int i = 0; i < size; ++i) {
+    const double sliced = i < split ? f_lower[i] : f_upper[i - split];
+    EXPECT_NEAR(f[i], sliced, 1.0e-12);
+  }
+}  // SlicedStateMatchesFullState
+
+}  // namespace
+}  // namespace vmecpp
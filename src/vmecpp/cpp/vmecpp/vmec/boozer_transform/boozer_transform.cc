@@ -0,0 +1,372 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/boozer_transform/boozer_transform.h"
+
+#include <algorithm>
+#include <cmath>
+#include <string>
+
+#include "absl/status/status.h"
+#include "absl/strings/str_cat.h"
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif  // _OPENMP
+
+namespace vmecpp {
+
+namespace {
+
+// cos/sin tables of m * x_i for m = 0, ..., max_m (columns) at the angles x_i
+// (rows).
+void PoloidalTables(const Eigen::VectorXd& x, int max_m, Eigen::MatrixXd& m_cos,
+                    Eigen::MatrixXd& m_sin) {
+  m_cos.resize(x.size(), max_m + 1);
+  m_sin.resize(x.size(), max_m + 1);
+  for (Eigen::Index i = 0; i < x.size(); ++i) {
+    const double cos_x = std::cos(x[i]);
+    const double sin_x = std::sin(x[i]);
+    m_cos(i, 0) = 1.0;
+    m_sin(i, 0) = 0.0;
+    for (int m = 1; m <= max_m; ++m) {
+      m_cos(i, m) = m_cos(i, m - 1) * cos_x - m_sin(i, m - 1) * sin_x;
+      m_sin(i, m) = m_sin(i, m - 1) * cos_x + m_cos(i, m - 1) * sin_x;
+    }
+  }
+}
+
+// cos/sin tables of n * nfp * x_i for n = -max_n, ..., max_n (columns
+// n + max_n) at the angles x_i (rows).
+void ToroidalTables(const Eigen::VectorXd& x, int max_n, int nfp,
+                    Eigen::MatrixXd& m_cos, Eigen::MatrixXd& m_sin) {
+  m_cos.resize(x.size(), 2 * max_n + 1);
+  m_sin.resize(x.size(), 2 * max_n + 1);
+  for (Eigen::Index i = 0; i < x.size(); ++i) {
+    const double cos_x = std::cos(nfp * x[i]);
+    const double sin_x = std::sin(nfp * x[i]);
+    m_cos(i, max_n) = 1.0;
+    m_sin(i, max_n) = 0.0;
+    for (int n = 1; n <= max_n; ++n) {
+      const double cos_n =
+          m_cos(i, max_n + n - 1) * cos_x - m_sin(i, max_n + n - 1) * sin_x;
+      const double sin_n =
+          m_sin(i, max_n + n - 1) * cos_x + m_cos(i, max_n + n - 1) * sin_x;
+      m_cos(i, max_n + n) = cos_n;
+      m_sin(i, max_n + n) = sin_n;
+      m_cos(i, max_n - n) = cos_n;
+      m_sin(i, max_n - n) = -sin_n;
+    }
+  }
+}
+
+// Tables and grid shared by all surfaces.
+struct SurfaceGrid {
+  int num_theta;
+  int num_zeta;
+  int max_m;
+  int max_n;
+  int nfp;
+
+  // on the uniform grid, (theta or zeta) x (mode number)
+  Eigen::MatrixXd cos_mu;
+  Eigen::MatrixXd sin_mu;
+  Eigen::MatrixXd cos_nv;
+  Eigen::MatrixXd sin_nv;
+
+  // angles of the grid points, theta-major
+  Eigen::VectorXd theta;
+  Eigen::VectorXd zeta;
+};
+
+// The coefficients of one surface arranged as a dense (m, n + max_n) matrix.
+Eigen::MatrixXd ToDense(const RowMatrixXd& coefficients, int j,
+                        const Eigen::VectorXi& xm, const Eigen::VectorXi& xn,
+                        const SurfaceGrid& grid, double (*scale)(int, int)) {
+  Eigen::MatrixXd dense =
+      Eigen::MatrixXd::Zero(grid.max_m + 1, 2 * grid.max_n + 1);
+  for (Eigen::Index mn = 0; mn < xm.size(); ++mn) {
+    const int m = xm[mn];
+    const int n = xn[mn] / grid.nfp;
+    dense(m, n + grid.max_n) += scale(m, xn[mn]) * coefficients(mn, j);
+  }
+  return dense;
+}
+
+double Unscaled(int /*m*/, int /*xn*/) { return 1.0; }
+
+// Synthesize sum_mn C_mn cos(m theta - n nfp zeta) on the uniform grid, as a
+// (num_theta x num_zeta) matrix.
+Eigen::MatrixXd SynthesizeCos(const Eigen::MatrixXd& dense,
+                              const SurfaceGrid& grid) {
+  return (grid.cos_mu * dense) * grid.cos_nv.transpose() +
+         (grid.sin_mu * dense) * grid.sin_nv.transpose();
+}
+
+// Synthesize sum_mn C_mn sin(m theta - n nfp zeta) on the uniform grid.
+Eigen::MatrixXd SynthesizeSin(const Eigen::MatrixXd& dense,
+                              const SurfaceGrid& grid) {
+  return (grid.sin_mu * dense) * grid.cos_nv.transpose() -
+         (grid.cos_mu * dense) * grid.sin_nv.transpose();
+}
+
+// Flatten a (num_theta x num_zeta) matrix to a theta-major vector.
+Eigen::VectorXd Flatten(const Eigen::MatrixXd& values) {
+  const Eigen::MatrixXd transposed = values.transpose();
+  return Eigen::Map<const Eigen::VectorXd>(transposed.data(),
+                                           transposed.size());
+}
+
+}  // namespace
+
+absl::StatusOr<BoozerSpectra> ComputeBoozerTransform(
+    const WOutFileContents& wout, int mboz, int nboz,
+    const std::vector<int>& surfaces, std::optional<int> max_threads) {
+  if (mboz < 1 || nboz < 0) {
+    return absl::InvalidArgumentError(absl::StrCat(
+        "need mboz >= 1 and nboz >= 0, but got mboz=", mboz, ", nboz=", nboz));
+  }
+  if (wout.lasym) {
+    return absl::UnimplementedError(
+        "the Boozer transform of non-stellarator-symmetric equilibria is not "
+        "implemented yet");
+  }
+  const int ns = wout.ns;
+  if (ns < 2) {
+    return absl::InvalidArgumentError(
+        absl::StrCat("need at least 2 flux surfaces, but ns=", ns));
+  }
+  const int mnmax = static_cast<int>(wout.xm.size());
+  const int mnmax_nyq = static_cast<int>(wout.xm_nyq.size());
+  for (const RowMatrixXd* full_grid : {&wout.rmnc, &wout.zmns, &wout.lmns}) {
+    if (full_grid->rows() != mnmax || full_grid->cols() != ns) {
+      return absl::InvalidArgumentError(
+          "shape of rmnc, zmns or lmns does not match (mnmax, ns)");
+    }
+  }
+  for (const RowMatrixXd* nyquist :
+       {&wout.bmnc, &wout.bsubumnc, &wout.bsubvmnc}) {
+    if (nyquist->rows() != mnmax_nyq || nyquist->cols() != ns) {
+      return absl::InvalidArgumentError(
+          "shape of bmnc, bsubumnc or bsubvmnc does not match (mnmax_nyq, ns)");
+    }
+  }
+  if (wout.iotas.size() != ns) {
+    return absl::InvalidArgumentError("size of iotas does not match ns");
+  }
+  int mode_00 = -1;
+  for (int mn = 0; mn < mnmax_nyq; ++mn) {
+    if (wout.xm_nyq[mn] == 0 && wout.xn_nyq[mn] == 0) {
+      mode_00 = mn;
+    }
+  }
+  if (mode_00 < 0) {
+    return absl::InvalidArgumentError("the Nyquist spectrum lacks (0, 0)");
+  }
+
+  std::vector<int> compute_surfs = surfaces;
+  if (compute_surfs.empty()) {
+    for (int j = 0; j < ns - 1; ++j) {
+      compute_surfs.push_back(j);
+    }
+  }
+  for (int j : compute_surfs) {
+    if (j < 0 || j > ns - 2) {
+      return absl::InvalidArgumentError(
+          absl::StrCat("surface index ", j, " out of range [0, ", ns - 2,
+                       "] of the half grid"));
+    }
+  }
+  int num_threads = 1;
+#ifdef _OPENMP
+  num_threads = max_threads.value_or(omp_get_max_threads());
+#endif  // _OPENMP
+  if (num_threads < 1) {
+    return absl::InvalidArgumentError(
+        absl::StrCat("max_threads must be positive, but is ", num_threads));
+  }
+
+  const int nfp = std::max(wout.nfp, 1);
+
+  // uniform grid that resolves both the VMEC and the Boozer spectra
+  SurfaceGrid grid;
+  grid.nfp = nfp;
+  grid.max_m = std::max(wout.xm.maxCoeff(), wout.xm_nyq.maxCoeff());
+  grid.max_n = std::max(wout.xn.cwiseAbs().maxCoeff(),
+                        wout.xn_nyq.cwiseAbs().maxCoeff()) /
+               nfp;
+  grid.num_theta = 2 * (2 * std::max(mboz, grid.max_m) + 1);
+  const int max_n_resolved = std::max(nboz, grid.max_n);
+  grid.num_zeta = (max_n_resolved == 0) ? 1 : 2 * (2 * max_n_resolved + 1);
+  const Eigen::VectorXd theta_1d = Eigen::VectorXd::LinSpaced(
+      grid.num_theta, 0.0, 2.0 * M_PI * (grid.num_theta - 1) / grid.num_theta);
+  const Eigen::VectorXd zeta_1d = Eigen::VectorXd::LinSpaced(
+      grid.num_zeta, 0.0,
+      2.0 * M_PI / nfp * (grid.num_zeta - 1) / grid.num_zeta);
+  PoloidalTables(theta_1d, grid.max_m, grid.cos_mu, grid.sin_mu);
+  ToroidalTables(zeta_1d, grid.max_n, nfp, grid.cos_nv, grid.sin_nv);
+  const int num_points = grid.num_theta * grid.num_zeta;
+  grid.theta.resize(num_points);
+  grid.zeta.resize(num_points);
+  for (int i = 0; i < grid.num_theta; ++i) {
+    for (int k = 0; k < grid.num_zeta; ++k) {
+      grid.theta[i * grid.num_zeta + k] = theta_1d[i];
+      grid.zeta[i * grid.num_zeta + k] = zeta_1d[k];
+    }
+  }
+
+  BoozerSpectra result;
+  result.mboz = mboz;
+  result.nboz = nboz;
+  result.nfp = nfp;
+  const int mnboz = (nboz + 1) + (mboz - 1) * (2 * nboz + 1);
+  result.xm_b.resize(mnboz);
+  result.xn_b.resize(mnboz);
+  {
+    int mn = 0;
+    for (int m = 0; m < mboz; ++m) {
+      for (int n = (m == 0) ? 0 : -nboz; n <= nboz; ++n) {
+        result.xm_b[mn] = m;
+        result.xn_b[mn] = n * nfp;
+        ++mn;
+      }
+    }
+  }
+  const int num_surfaces = static_cast<int>(compute_surfs.size());
+  result.compute_surfs =
+      Eigen::Map<const Eigen::VectorXi>(compute_surfs.data(), num_surfaces);
+  result.s_b = (result.compute_surfs.cast<double>().array() + 0.5) / (ns - 1.0);
+  result.iota_b.resize(num_surfaces);
+  result.bvco_b.resize(num_surfaces);
+  result.buco_b.resize(num_surfaces);
+  result.bmnc_b.resize(mnboz, num_surfaces);
+  result.rmnc_b.resize(mnboz, num_surfaces);
+  result.zmns_b.resize(mnboz, num_surfaces);
+  result.numns_b.resize(mnboz, num_surfaces);
+  result.gmnc_b.resize(mnboz, num_surfaces);
+
+  // scaling of the covariant components to the spectrum of the function w
+  // with dw/dtheta = B_theta - I and dw/dzeta = B_zeta - G
+  const auto w_from_bsubu = [](int m, int /*xn*/) {
+    return (m > 0) ? 1.0 / m : 0.0;
+  };
+  const auto w_from_bsubv = [](int m, int xn) {
+    return (m == 0 && xn != 0) ? -1.0 / xn : 0.0;
+  };
+
+  // the half-grid interpolation of the full-grid geometry
+  RowMatrixXd rmnc_half(mnmax, ns);
+  RowMatrixXd zmns_half(mnmax, ns);
+  rmnc_half.col(0).setZero();
+  zmns_half.col(0).setZero();
+  for (int j = 1; j < ns; ++j) {
+    rmnc_half.col(j) = 0.5 * (wout.rmnc.col(j - 1) + wout.rmnc.col(j));
+    zmns_half.col(j) = 0.5 * (wout.zmns.col(j - 1) + wout.zmns.col(j));
+  }
+
+#ifdef _OPENMP
+#pragma omp parallel for schedule(dynamic, 1) num_threads(num_threads)
+#endif  // _OPENMP
+  for (int surface = 0; surface < num_surfaces; ++surface) {
+    // index on the half grid, where index 0 is unused
+    const int j = compute_surfs[surface] + 1;
+    const double iota = wout.iotas[j];
+    const double boozer_i = wout.bsubumnc(mode_00, j);
+    const double boozer_g = wout.bsubvmnc(mode_00, j);
+    const double g_plus_iota_i = boozer_g + iota * boozer_i;
+
+    // VMEC quantities on the uniform grid
+    const Eigen::MatrixXd lambda_dense =
+        ToDense(wout.lmns, j, wout.xm, wout.xn, grid, Unscaled);
+    const Eigen::MatrixXd w_dense = ToDense(wout.bsubumnc, j, wout.xm_nyq,
+                                            wout.xn_nyq, grid, +w_from_bsubu) +
+                                    ToDense(wout.bsubvmnc, j, wout.xm_nyq,
+                                            wout.xn_nyq, grid, +w_from_bsubv);
+
+    // nu = (w - I lambda) / (G + iota I)
+    const Eigen::MatrixXd nu_dense =
+        (w_dense - boozer_i * lambda_dense) / g_plus_iota_i;
+
+    // spectral derivatives: d/dtheta multiplies by m and d/dzeta by -n nfp,
+    // turning a sin series into a cos series
+    const Eigen::MatrixXd m_weights =
+        Eigen::VectorXd::LinSpaced(grid.max_m + 1, 0, grid.max_m)
+            .replicate(1, 2 * grid.max_n + 1);
+    const Eigen::MatrixXd minus_xn_weights =
+        -nfp * Eigen::RowVectorXd::LinSpaced(2 * grid.max_n + 1, -grid.max_n,
+                                             grid.max_n)
+                   .replicate(grid.max_m + 1, 1);
+
+    const Eigen::VectorXd lambda = Flatten(SynthesizeSin(lambda_dense, grid));
+    const Eigen::VectorXd dlambda_dtheta =
+        Flatten(SynthesizeCos(lambda_dense.cwiseProduct(m_weights), grid));
+    const Eigen::VectorXd dlambda_dzeta = Flatten(
+        SynthesizeCos(lambda_dense.cwiseProduct(minus_xn_weights), grid));
+    const Eigen::VectorXd nu = Flatten(SynthesizeSin(nu_dense, grid));
+    const Eigen::VectorXd dnu_dtheta =
+        Flatten(SynthesizeCos(nu_dense.cwiseProduct(m_weights), grid));
+    const Eigen::VectorXd dnu_dzeta =
+        Flatten(SynthesizeCos(nu_dense.cwiseProduct(minus_xn_weights), grid));
+    const Eigen::VectorXd mod_b = Flatten(SynthesizeCos(
+        ToDense(wout.bmnc, j, wout.xm_nyq, wout.xn_nyq, grid, Unscaled), grid));
+    const Eigen::VectorXd r = Flatten(SynthesizeCos(
+        ToDense(rmnc_half, j, wout.xm, wout.xn, grid, Unscaled), grid));
+    const Eigen::VectorXd z = Flatten(SynthesizeSin(
+        ToDense(zmns_half, j, wout.xm, wout.xn, grid, Unscaled), grid));
+
+    // Boozer angles theta_B = theta + lambda + iota nu, zeta_B = zeta + nu and
+    // the Jacobian d(theta_B, zeta_B) / d(theta, zeta)
+    const Eigen::VectorXd theta_b = grid.theta + lambda + iota * nu;
+    const Eigen::VectorXd zeta_b = grid.zeta + nu;
+    const Eigen::VectorXd jacobian =
+        ((1.0 + dlambda_dtheta.array()) * (1.0 + dnu_dzeta.array()) +
+         (iota - dlambda_dzeta.array()) * dnu_dtheta.array())
+            .matrix();
+
+    Eigen::MatrixXd cos_mub;
+    Eigen::MatrixXd sin_mub;
+    Eigen::MatrixXd cos_nvb;
+    Eigen::MatrixXd sin_nvb;
+    PoloidalTables(theta_b, mboz - 1, cos_mub, sin_mub);
+    ToroidalTables(zeta_b, nboz, nfp, cos_nvb, sin_nvb);
+
+    // projections onto cos/sin(m theta_B - n nfp zeta_B), as dense (m, n)
+    const auto project_cos = [&](const Eigen::VectorXd& weights) {
+      return Eigen::MatrixXd(
+          cos_mub.transpose() * weights.asDiagonal() * cos_nvb +
+          sin_mub.transpose() * weights.asDiagonal() * sin_nvb);
+    };
+    const auto project_sin = [&](const Eigen::VectorXd& weights) {
+      return Eigen::MatrixXd(
+          sin_mub.transpose() * weights.asDiagonal() * cos_nvb -
+          cos_mub.transpose() * weights.asDiagonal() * sin_nvb);
+    };
+    const Eigen::MatrixXd bmnc_dense =
+        project_cos(mod_b.cwiseProduct(jacobian));
+    const Eigen::MatrixXd rmnc_dense = project_cos(r.cwiseProduct(jacobian));
+    const Eigen::MatrixXd zmns_dense = project_sin(z.cwiseProduct(jacobian));
+    const Eigen::MatrixXd numns_dense = project_sin(nu.cwiseProduct(jacobian));
+    const Eigen::MatrixXd gmnc_dense = project_cos(
+        (g_plus_iota_i * jacobian.array() / mod_b.array().square()).matrix());
+
+    for (int mn = 0; mn < mnboz; ++mn) {
+      const int m = result.xm_b[mn];
+      const int n = result.xn_b[mn] / nfp + nboz;
+      const double normalization =
+          ((m == 0 && n == nboz) ? 1.0 : 2.0) / num_points;
+      result.bmnc_b(mn, surface) = normalization * bmnc_dense(m, n);
+      result.rmnc_b(mn, surface) = normalization * rmnc_dense(m, n);
+      result.zmns_b(mn, surface) = normalization * zmns_dense(m, n);
+      result.numns_b(mn, surface) = normalization * numns_dense(m, n);
+      result.gmnc_b(mn, surface) = normalization * gmnc_dense(m, n);
+    }
+    result.iota_b[surface] = iota;
+    result.bvco_b[surface] = boozer_g;
+    result.buco_b[surface] = boozer_i;
+  }  // surface
+
+  return result;
+}
+
+}  // namespace vmecpp
@@ -0,0 +1,69 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#ifndef VMECPP_VMEC_BOOZER_TRANSFORM_BOOZER_TRANSFORM_H_
+#define VMECPP_VMEC_BOOZER_TRANSFORM_BOOZER_TRANSFORM_H_
+
+#include <Eigen/Dense>
+#include <optional>
+#include <vector>
+
+#include "absl/status/statusor.h"
+#include "vmecpp/vmec/output_quantities/output_quantities.h"
+
+namespace vmecpp {
+
+// Fourier spectra of an equilibrium in Boozer coordinates on a set of
+// half-grid flux surfaces, following the conventions of booz_xform:
+// Boozer modes are (m, n) with m = 0, ..., mboz - 1 and n = -nboz, ..., nboz
+// (n >= 0 for m = 0), the kernel is m * theta_B - n * nfp * zeta_B and 2D
+// arrays are (mnboz x number of surfaces).
+struct BoozerSpectra {
+  int mboz;
+  int nboz;
+  int nfp;
+
+  // poloidal and toroidal mode numbers; xn_b includes nfp
+  Eigen::VectorXi xm_b;
+  Eigen::VectorXi xn_b;
+
+  // half-grid indices j = 0, ..., ns - 2 of the transformed surfaces, at the
+  // normalized toroidal flux s = (j + 1/2) / (ns - 1)
+  Eigen::VectorXi compute_surfs;
+  Eigen::VectorXd s_b;
+
+  // rotational transform and the Boozer covariant field components
+  // G = B_zeta (bvco) and I = B_theta (buco) on the transformed surfaces
+  Eigen::VectorXd iota_b;
+  Eigen::VectorXd bvco_b;
+  Eigen::VectorXd buco_b;
+
+  // |B|, R, Z, nu = zeta_B - zeta and the Boozer Jacobian (G + iota I) / B^2
+  RowMatrixXd bmnc_b;
+  RowMatrixXd rmnc_b;
+  RowMatrixXd zmns_b;
+  RowMatrixXd numns_b;
+  RowMatrixXd gmnc_b;
+};
+
+// Transform the equilibrium in `wout` to Boozer coordinates on the half-grid
+// surfaces `surfaces` (all surfaces if empty), using the Nyquist spectra
+// bmnc, bsubumnc, bsubvmnc and the lambda spectrum lmns.
+//
+// Per surface, the VMEC spectra are synthesized on a uniform (theta, zeta)
+// grid and the Boozer spectra are obtained by projecting onto the Boozer
+// angles, weighted with the Jacobian of the angle transformation. Both steps
+// are separable and computed as dense matrix products with cos/sin tables in
+// the poloidal and toroidal directions. The surfaces are distributed over up
+// to `max_threads` OpenMP threads.
+//
+// Only stellarator-symmetric equilibria are supported.
+absl::StatusOr<BoozerSpectra> ComputeBoozerTransform(
+    const WOutFileContents& wout, int mboz, int nboz,
+    const std::vector<int>& surfaces = {},
+    std::optional<int> max_threads = std::nullopt);
+
+}  // namespace vmecpp
+
+#endif  // VMECPP_VMEC_BOOZER_TRANSFORM_BOOZER_TRANSFORM_H_
@@ -0,0 +1,143 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/boozer_transform/boozer_transform.h"
+
+#include <cmath>
+
+#include "gtest/gtest.h"
+
+namespace vmecpp {
+namespace {
+
+constexpr int kNs = 3;
+constexpr int kNfp = 2;
+
+// A stellarator-symmetric wout with modes (m, n) in {0, 1} x {0, 1}, all of
+// them also used as Nyquist modes. With `shifted_angles` the lambda and the
+// non-constant covariant field components vanish, so that VMEC and Boozer
+// angles coincide.
+WOutFileContents MakeWOut(bool shifted_angles) {
+  WOutFileContents wout;
+  wout.ns = kNs;
+  wout.nfp = kNfp;
+  wout.lasym = false;
+  wout.xm = Eigen::VectorXi{{0, 0, 1, 1}};
+  wout.xn = Eigen::VectorXi{{0, kNfp, 0, kNfp}};
+  wout.xm_nyq = wout.xm;
+  wout.xn_nyq = wout.xn;
+  const int mnmax = 4;
+
+  const auto constant = [](const Eigen::VectorXd& values) {
+    return RowMatrixXd(values.replicate(1, kNs));
+  };
+  wout.rmnc = constant(Eigen::VectorXd{{3.0, 0.1, 0.5, 0.05}});
+  wout.zmns = constant(Eigen::VectorXd{{0.0, 0.1, 0.6, 0.05}});
+  wout.bmnc = constant(Eigen::VectorXd{{1.0, 0.05, 0.1, 0.03}});
+  wout.bsubumnc = constant(Eigen::VectorXd{{0.1, 0.0, 0.0, 0.0}});
+  wout.bsubvmnc = constant(Eigen::VectorXd{{2.0, 0.0, 0.0, 0.0}});
+  wout.lmns = RowMatrixXd::Zero(mnmax, kNs);
+  if (shifted_angles) {
+    wout.lmns = constant(Eigen::VectorXd{{0.0, 0.01, 0.05, 0.02}});
+    wout.bsubumnc = constant(Eigen::VectorXd{{0.1, 0.0, 0.01, 0.004}});
+    wout.bsubvmnc = constant(Eigen::VectorXd{{2.0, 0.03, 0.0, 0.02}});
+  }
+  wout.iotas = Eigen::VectorXd::Constant(kNs, 0.4);
+  return wout;
+}
+
+double Series(const RowMatrixXd& coefficients, const Eigen::VectorXi& xm,
+              const Eigen::VectorXi& xn, int j, double theta, double zeta,
+              bool use_sin) {
+  double result = 0.0;
+  for (int mn = 0; mn < xm.size(); ++mn) {
+    const double kernel = xm[mn] * theta - xn[mn] * zeta;
+    result +=
+        coefficients(mn, j) * (use_sin ? std::sin(kernel) : std::cos(kernel));
+  }
+  return result;
+}
+
+TEST(TestBoozerTransform, IdentityWithoutAngleShift) {
+  const WOutFileContents wout = MakeWOut(/*shifted_angles=*/false);
+  const absl::StatusOr<BoozerSpectra> booz =
+      ComputeBoozerTransform(wout, /*mboz=*/4, /*nboz=*/3);
+  ASSERT_TRUE(booz.ok()) << booz.status();
+  ASSERT_EQ(booz->compute_surfs.size(), kNs - 1);
+  EXPECT_EQ(booz->xm_b.size(), 4 + 3 * 7);
+
+  for (int mn_b = 0; mn_b < booz->xm_b.size(); ++mn_b) {
+    double expected_b = 0.0;
+    double expected_r = 0.0;
+    for (int mn = 0; mn < wout.xm.size(); ++mn) {
+      if (wout.xm[mn] == booz->xm_b[mn_b] && wout.xn[mn] == booz->xn_b[mn_b]) {
+        expected_b = wout.bmnc(mn, 1);
+        expected_r = wout.rmnc(mn, 1);
+      }
+    }
+    for (int surface = 0; surface < kNs - 1; ++surface) {
+      EXPECT_NEAR(booz->bmnc_b(mn_b, surface), expected_b, 1.0e-13);
+      EXPECT_NEAR(booz->rmnc_b(mn_b, surface), expected_r, 1.0e-13);
+      EXPECT_NEAR(booz->numns_b(mn_b, surface), 0.0, 1.0e-13);
+    }
+  }
+}  // IdentityWithoutAngleShift
+
+TEST(TestBoozerTransform, ReproducesFieldStrengthInBoozerAngles) {
+  const WOutFileContents wout = MakeWOut(/*shifted_angles=*/true);
+  const absl::StatusOr<BoozerSpectra> booz = ComputeBoozerTransform(
+      wout, /*mboz=*/24, /*nboz=*/16, /*surfaces=*/{1}, /*max_threads=*/1);
+  ASSERT_TRUE(booz.ok()) << booz.status();
+  ASSERT_EQ(booz->compute_surfs.size(), 1);
+  EXPECT_DOUBLE_EQ(booz->s_b[0], 1.5 / (kNs - 1.0));
+
+  // independent evaluation of the Boozer angles of a few VMEC grid points
+  const int j = 2;
+  const double iota = wout.iotas[j];
+  const double boozer_i = wout.bsubumnc(0, j);
+  const double boozer_g = wout.bsubvmnc(0, j);
+  RowMatrixXd w = RowMatrixXd::Zero(wout.xm.size(), kNs);
+  for (int mn = 0; mn < wout.xm.size(); ++mn) {
+    if (wout.xm[mn] > 0) {
+      w(mn, j) = wout.bsubumnc(mn, j) / wout.xm[mn];
+    } else if (wout.xn[mn] != 0) {
+      w(mn, j) = -wout.bsubvmnc(mn, j) / wout.xn[mn];
+    }
+  }
+  for (double theta : {0.0, 0.7, 2.1, 4.0}) {
+    for (double zeta : {0.0, 0.4, 1.3, 2.9}) {
+      const double lambda =
+          Series(wout.lmns, wout.xm, wout.xn, j, theta, zeta, true);
+      const double nu = (Series(w, wout.xm, wout.xn, j, theta, zeta, true) -
+                         boozer_i * lambda) /
+                        (boozer_g + iota * boozer_i);
+      const double theta_b = theta + lambda + iota * nu;
+      const double zeta_b = zeta + nu;
+
+      const double b_vmec =
+          Series(wout.bmnc, wout.xm_nyq, wout.xn_nyq, j, theta, zeta, false);
+      const double b_boozer = Series(booz->bmnc_b, booz->xm_b, booz->xn_b, 0,
+                                     theta_b, zeta_b, false);
+      EXPECT_NEAR(b_boozer, b_vmec, 1.0e-10);
+
+      const double nu_boozer = Series(booz->numns_b, booz->xm_b, booz->xn_b, 0,
+                                      theta_b, zeta_b, true);
+      EXPECT_NEAR(nu_boozer, nu, 1.0e-10);
+    }
+  }
+}  // ReproducesFieldStrengthInBoozerAngles
+
+TEST(TestBoozerTransform, RejectsInvalidArguments) {
+  const WOutFileContents wout = MakeWOut(/*shifted_angles=*/false);
+  EXPECT_FALSE(ComputeBoozerTransform(wout, /*mboz=*/0, /*nboz=*/2).ok());
+  EXPECT_FALSE(
+      ComputeBoozerTransform(wout, /*mboz=*/4, /*nboz=*/2, {kNs - 1}).ok());
+
+  WOutFileContents asymmetric = wout;
+  asymmetric.lasym = true;
+  EXPECT_FALSE(ComputeBoozerTransform(asymmetric, /*mboz=*/4, /*nboz=*/2).ok());
+}  // RejectsInvalidArguments
+
+}  // namespace
+}  // namespace vmecpp
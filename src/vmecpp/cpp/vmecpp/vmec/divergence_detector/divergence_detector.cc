@@ -0,0 +1,79 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/divergence_detector/divergence_detector.h"
+
+#include "absl/log/check.h"
+#include "absl/log/log.h"
+
+namespace vmecpp {
+
+std::string_view ToString(DivergenceReason reason) {
+  switch (reason) {
+    case DivergenceReason::kNone:
+      return "none";
+    case DivergenceReason::kStagnation:
+      return "the force residuals stagnated";
+    case DivergenceReason::kTooManyRestarts:
+      return "the time evolution had to be restarted too often";
+    case DivergenceReason::kTimeStepCollapse:
+      return "the time step collapsed";
+  }
+  LOG(FATAL) << "unknown DivergenceReason";
+  return "";
+}
+
+DivergenceDetector::DivergenceDetector(const EarlyStopCriteria& criteria,
+                                       double reference_time_step)
+    : criteria_(criteria), reference_time_step_(reference_time_step) {
+  CHECK_GE(criteria_.stagnation_window, 0);
+  CHECK_GT(criteria_.stagnation_factor, 0.0);
+  CHECK_LE(criteria_.stagnation_factor, 1.0);
+  CHECK_GE(criteria_.max_restarts, 0);
+  CHECK_GE(criteria_.min_time_step_fraction, 0.0);
+}
+
+bool DivergenceDetector::enabled() const {
+  return criteria_.stagnation_window > 0 || criteria_.max_restarts > 0 ||
+         criteria_.min_time_step_fraction > 0.0;
+}
+
+void DivergenceDetector::Reset() {
+  num_iterations_ = 0;
+  num_restarts_ = 0;
+  reference_fsq_ = -1.0;
+  last_improvement_ = 0;
+}
+
+DivergenceReason DivergenceDetector::Update(double fsq, bool restarted,
+                                            double time_step) {
+  ++num_iterations_;
+
+  if (restarted) {
+    ++num_restarts_;
+    if (criteria_.max_restarts > 0 && num_restarts_ >= criteria_.max_restarts) {
+      return DivergenceReason::kTooManyRestarts;
+    }
+  }
+
+  if (criteria_.min_time_step_fraction > 0.0 &&
+      time_step < criteria_.min_time_step_fraction * reference_time_step_) {
+    return DivergenceReason::kTimeStepCollapse;
+  }
+
+  if (criteria_.stagnation_window > 0) {
+    if (reference_fsq_ < 0.0 ||
+        fsq <= criteria_.stagnation_factor * reference_fsq_) {
+      reference_fsq_ = fsq;
+      last_improvement_ = num_iterations_;
+    } else if (num_iterations_ - last_improvement_ >=
+               criteria_.stagnation_window) {
+      return DivergenceReason::kStagnation;
+    }
+  }
+
+  return DivergenceReason::kNone;
+}
+
+}  // namespace vmecpp
@@ -0,0 +1,83 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#ifndef VMECPP_VMEC_DIVERGENCE_DETECTOR_DIVERGENCE_DETECTOR_H_
+#define VMECPP_VMEC_DIVERGENCE_DETECTOR_DIVERGENCE_DETECTOR_H_
+
+#include <cstdint>
+#include <string_view>
+
+namespace vmecpp {
+
+// Criteria for giving up on a multigrid step that is not going to converge,
+// instead of spending its whole iteration budget.
+// Each criterion is disabled if set to zero; all are disabled by default.
+struct EarlyStopCriteria {
+  // Give up if the best invariant force residual of the multigrid step has not
+  // decreased by at least a factor `stagnation_factor` within the last
+  // `stagnation_window` iterations.
+  int stagnation_window = 0;
+  double stagnation_factor = 0.5;
+
+  // Give up after this many restarts (BAD_JACOBIAN, BAD_PROGRESS, ...) of the
+  // time evolution within one multigrid step.
+  int max_restarts = 0;
+
+  // Give up if the time step drops below this fraction of the user-provided
+  // time step (delt).
+  double min_time_step_fraction = 0.0;
+
+  bool operator==(const EarlyStopCriteria&) const = default;
+};
+
+// The reason why a DivergenceDetector predicts that a run will not converge.
+enum class DivergenceReason : std::uint8_t {
+  kNone,
+  kStagnation,
+  kTooManyRestarts,
+  kTimeStepCollapse
+};
+
+// human-readable description of the given reason
+std::string_view ToString(DivergenceReason reason);
+
+// Tracks the convergence history of one multigrid step and predicts from it
+// whether the step is going to fail, see EarlyStopCriteria.
+class DivergenceDetector {
+ public:
+  // `reference_time_step` is the user-provided time step (delt) that
+  // EarlyStopCriteria::min_time_step_fraction refers to.
+  DivergenceDetector(const EarlyStopCriteria& criteria,
+                     double reference_time_step);
+
+  // True if any of the criteria is enabled.
+  bool enabled() const;
+
+  // Forget the history, e.g. at the start of a new multigrid step.
+  void Reset();
+
+  // Feed the data of one iteration: the invariant force residual
+  // fsqr + fsqz + fsql, whether the iteration triggered a restart and the
+  // time step to be used next. Returns the first criterion that is violated,
+  // or kNone.
+  DivergenceReason Update(double fsq, bool restarted, double time_step);
+
+  int num_iterations() const { return num_iterations_; }
+  int num_restarts() const { return num_restarts_; }
+
+ private:
+  EarlyStopCriteria criteria_;
+  double reference_time_step_;
+
+  int num_iterations_ = 0;
+  int num_restarts_ = 0;
+
+  // residual at the last sufficient improvement, and when that happened
+  double reference_fsq_ = -1.0;
+  int last_improvement_ = 0;
+};
+
+}  // namespace vmecpp
+
+#endif  // VMECPP_VMEC_DIVERGENCE_DETECTOR_DIVERGENCE_DETECTOR_H_
@@ -0,0 +1,91 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/divergence_detector/divergence_detector.h"
+
+#include "gtest/gtest.h"
+
+namespace vmecpp {
+
+TEST(TestDivergenceDetector, DisabledByDefault) {
+  DivergenceDetector detector(EarlyStopCriteria{}, /*reference_time_step=*/1.0);
+  EXPECT_FALSE(detector.enabled());
+  for (int i = 0; i < 1000; ++i) {
+    EXPECT_EQ(detector.Update(1.0, /*restarted=*/true, 1.0e-12),
+              DivergenceReason::kNone);
+  }
+}
+
+TEST(TestDivergenceDetector, ConvergingRunIsNotStopped) {
+  EarlyStopCriteria criteria;
+  criteria.stagnation_window = 10;
+  DivergenceDetector detector(criteria, /*reference_time_step=*/1.0);
+  ASSERT_TRUE(detector.enabled());
+
+  double fsq = 1.0;
+  for (int i = 0; i < 1000; ++i) {
+    fsq *= 0.9;
+    EXPECT_EQ(detector.Update(fsq, /*restarted=*/false, 1.0),
+              DivergenceReason::kNone);
+  }
+}
+
+TEST(TestDivergenceDetector, Stagnation) {
+  EarlyStopCriteria criteria;
+  criteria.stagnation_window = 10;
+  criteria.stagnation_factor = 0.5;
+  DivergenceDetector detector(criteria, /*reference_time_step=*/1.0);
+
+  // improvements by less than the stagnation factor do not count
+  double fsq = 1.0;
+  for (int i = 0; i < 10; ++i) {
+    fsq *= 0.99;
+    EXPECT_EQ(detector.Update(fsq, /*restarted=*/false, 1.0),
+              DivergenceReason::kNone);
+  }
+  EXPECT_EQ(detector.Update(fsq, /*restarted=*/false, 1.0),
+            DivergenceReason::kStagnation);
+
+  // a fresh multigrid step starts over
+  detector.Reset();
+  EXPECT_EQ(detector.num_iterations(), 0);
+  EXPECT_EQ(detector.Update(fsq, /*restarted=*/false, 1.0),
+            DivergenceReason::kNone);
+}
+
+TEST(TestDivergenceDetector, TooManyRestarts) {
+  EarlyStopCriteria criteria;
+  criteria.max_restarts = 3;
+  DivergenceDetector detector(criteria, /*reference_time_step=*/1.0);
+
+  EXPECT_EQ(detector.Update(1.0, /*restarted=*/true, 1.0),
+            DivergenceReason::kNone);
+  EXPECT_EQ(detector.Update(1.0, /*restarted=*/false, 1.0),
+            DivergenceReason::kNone);
+  EXPECT_EQ(detector.Update(1.0, /*restarted=*/true, 1.0),
+            DivergenceReason::kNone);
+  EXPECT_EQ(detector.Update(1.0, /*restarted=*/true, 1.0),
+            DivergenceReason::kTooManyRestarts);
+  EXPECT_EQ(detector.num_restarts(), 3);
+}
+
+TEST(TestDivergenceDetector, TimeStepCollapse) {
+  EarlyStopCriteria criteria;
+  criteria.min_time_step_fraction = 0.1;
+  DivergenceDetector detector(criteria, /*reference_time_step=*/0.5);
+
+  double time_step = 0.5;
+  DivergenceReason reason = DivergenceReason::kNone;
+  int num_iterations = 0;
+  while (reason == DivergenceReason::kNone && num_iterations < 100) {
+    time_step *= 0.9;
+    reason = detector.Update(1.0, /*restarted=*/true, time_step);
+    ++num_iterations;
+  }
+  EXPECT_EQ(reason, DivergenceReason::kTimeStepCollapse);
+  EXPECT_LT(time_step, 0.05);
+  EXPECT_GE(time_step, 0.05 * 0.9);
+}
+
+}  // namespace vmecpp
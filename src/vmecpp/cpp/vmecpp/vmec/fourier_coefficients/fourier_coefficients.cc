@@ -9,7 +9,6 @@
 #include <utility>
 #include <vector>
 
-#include "absl/algorithm/container.h"
 #include "absl/log/log.h"
 
 namespace vmecpp {
@@ -23,102 +22,103 @@ FourierCoeffs::FourierCoeffs(const Sizes* s, const RadialPartitioning* r,
     jMaxIncludingBoundary = ns;
   }
 
-  int num_fc_RZ = (jMaxIncludingBoundary - nsMin) * s_.mpol * (s_.ntor + 1);
-  int num_fc_L = (jMaxIncludingBoundary - nsMin) * s_.mpol * (s_.ntor + 1);
-
-  rcc.resize(num_fc_RZ);
-  rcc.setZero();
-  zsc.resize(num_fc_RZ);
-  zsc.setZero();
-  lsc.resize(num_fc_L);
-  lsc.setZero();
+  // R, Z and lambda each have one component, plus one for lthreed, plus one
+  // (or two, if also lthreed) for lasym
+  int num_components_per_quantity = 1;
   if (s_.lthreed) {
-    rss.resize(num_fc_RZ);
-    rss.setZero();
-    zcs.resize(num_fc_RZ);
-    zcs.setZero();
-    lcs.resize(num_fc_L);
-    lcs.setZero();
+    num_components_per_quantity += 1;
   }
   if (s_.lasym) {
-    rsc.resize(num_fc_RZ);
-    rsc.setZero();
-    zcc.resize(num_fc_RZ);
-    zcc.setZero();
-    lcc.resize(num_fc_L);
-    lcc.setZero();
-    if (s_.lthreed) {
-      rcs.resize(num_fc_RZ);
-      rcs.setZero();
-      zss.resize(num_fc_RZ);
-      zss.setZero();
-      lss.resize(num_fc_L);
-      lss.setZero();
-    }
+    num_components_per_quantity += s_.lthreed ? 2 : 1;
   }
+
+  const int num_fc = (jMaxIncludingBoundary - nsMin) * s_.mpol * (s_.ntor + 1);
+  coefficients_.setZero(3 * num_components_per_quantity * num_fc);
+  BindComponents();
+}
+
+FourierCoeffs::FourierCoeffs(const FourierCoeffs& other)
+    : s_(other.s_),
+      r_(other.r_),
+      nsMin_(other.nsMin_),
+      nsMax_(other.nsMax_),
+      ns(other.ns),
+      coefficients_(other.coefficients_) {
+  BindComponents();
+}
+
+FourierCoeffs::FourierCoeffs(FourierCoeffs&& other) noexcept
+    : s_(other.s_),
+      r_(other.r_),
+      nsMin_(other.nsMin_),
+      nsMax_(other.nsMax_),
+      ns(other.ns),
+      coefficients_(std::move(other.coefficients_)) {
+  BindComponents();
+  other.BindComponents();
 }
 
 FourierCoeffs& FourierCoeffs::operator=(const FourierCoeffs& other) {
   if (this != &other) {
-    rcc = other.rcc;
-    rss = other.rss;
-    rsc = other.rsc;
-    rcs = other.rcs;
-    zsc = other.zsc;
-    zcs = other.zcs;
-    zcc = other.zcc;
-    zss = other.zss;
-    lsc = other.lsc;
-    lcs = other.lcs;
-    lcc = other.lcc;
-    lss = other.lss;
+    // does not re-allocate if the sizes match
+    coefficients_ = other.coefficients_;
+    BindComponents();
   }
   return *this;
 }
 
 FourierCoeffs& FourierCoeffs::operator=(FourierCoeffs&& other) noexcept {
   if (this != &other) {
-    rcc = std::move(other.rcc);
-    rss = std::move(other.rss);
-    rsc = std::move(other.rsc);
-    rcs = std::move(other.rcs);
-    zsc = std::move(other.zsc);
-    zcs = std::move(other.zcs);
-    zcc = std::move(other.zcc);
-    zss = std::move(other.zss);
-    lsc = std::move(other.lsc);
-    lcs = std::move(other.lcs);
-    lcc = std::move(other.lcc);
-    lss = std::move(other.lss);
+    if (coefficients_.size() == other.coefficients_.size()) {
+      // keep the memory of this object, see flatCoefficients()
+      coefficients_ = other.coefficients_;
+    } else {
+      coefficients_ = std::move(other.coefficients_);
+      other.BindComponents();
+    }
+    BindComponents();
   }
   return *this;
 }
 
-int FourierCoeffs::nsMin() const { return nsMin_; }
-
-int FourierCoeffs::nsMax() const { return nsMax_; }
-
-void FourierCoeffs::setZero() {
-  absl::c_fill(rcc, 0);
-  absl::c_fill(zsc, 0);
-  absl::c_fill(lsc, 0);
+void FourierCoeffs::BindComponents() {
+  int num_components_per_quantity = 1;
   if (s_.lthreed) {
-    absl::c_fill(rss, 0);
-    absl::c_fill(zcs, 0);
-    absl::c_fill(lcs, 0);
+    num_components_per_quantity += 1;
   }
   if (s_.lasym) {
-    absl::c_fill(rsc, 0);
-    absl::c_fill(zcc, 0);
-    absl::c_fill(lcc, 0);
-    if (s_.lthreed) {
-      absl::c_fill(rcs, 0);
-      absl::c_fill(zss, 0);
-      absl::c_fill(lss, 0);
-    }
+    num_components_per_quantity += s_.lthreed ? 2 : 1;
   }
+  const std::size_t num_fc =
+      coefficients_.size() / (3 * num_components_per_quantity);
+
+  double* next = coefficients_.data();
+  const auto take = [&](bool active) {
+    const std::size_t size = active ? num_fc : 0;
+    std::span<double> component(next, size);
+    next += size;
+    return component;
+  };
+  rcc = take(true);
+  rss = take(s_.lthreed);
+  rsc = take(s_.lasym);
+  rcs = take(s_.lasym && s_.lthreed);
+  zsc = take(true);
+  zcs = take(s_.lthreed);
+  zcc = take(s_.lasym);
+  zss = take(s_.lasym && s_.lthreed);
+  lsc = take(true);
+  lcs = take(s_.lthreed);
+  lcc = take(s_.lasym);
+  lss = take(s_.lasym && s_.lthreed);
 }
 
+int FourierCoeffs::nsMin() const { return nsMin_; }
+
+int FourierCoeffs::nsMax() const { return nsMax_; }
+
+void FourierCoeffs::setZero() { coefficients_.setZero(); }
+
 /** apply even/odd-m decomposition */
 void FourierCoeffs::decomposeInto(FourierCoeffs& m_x,
                                   const Eigen::VectorXd& scalxc) const {
@@ -8,6 +8,7 @@
 #include <Eigen/Dense>
 #include <cstdio>
 #include <optional>
+#include <span>
 #include <vector>
 
 #include "vmecpp/common/sizes/sizes.h"
@@ -20,8 +21,8 @@ class FourierCoeffs {
  public:
   FourierCoeffs(const Sizes* s, const RadialPartitioning* r, int nsMin,
                 int nsMax, int ns);
-  FourierCoeffs(const FourierCoeffs& other) = default;
-  FourierCoeffs(FourierCoeffs&& other) noexcept = default;
+  FourierCoeffs(const FourierCoeffs& other);
+  FourierCoeffs(FourierCoeffs&& other) noexcept;
   FourierCoeffs& operator=(const FourierCoeffs& other);
   FourierCoeffs& operator=(FourierCoeffs&& other) noexcept;
 
@@ -48,6 +49,20 @@ class FourierCoeffs {
   int nsMin() const;
   int nsMax() const;
 
+  // All active coefficients as one contiguous vector, in the canonical order
+  // rcc, rss, rsc, rcs, zsc, zcs, zcc, zss, lsc, lcs, lcc, lss (components that
+  // are inactive for the given lthreed/lasym are left out).
+  // The memory stays valid for the lifetime of this object, including across
+  // copy- and move-assignments of objects of the same size.
+  std::span<double> flatCoefficients() {
+    return {coefficients_.data(),
+            static_cast<std::size_t>(coefficients_.size())};
+  }
+  std::span<const double> flatCoefficients() const {
+    return {coefficients_.data(),
+            static_cast<std::size_t>(coefficients_.size())};
+  }
+
  protected:
   const Sizes& s_;
   const RadialPartitioning& r_;
@@ -56,45 +71,55 @@ class FourierCoeffs {
   const int nsMax_;
   const int ns;
 
+  // storage for all components below, see flatCoefficients()
+  Eigen::VectorXd coefficients_;
+
+  // The components are views into coefficients_.
+  // Inactive components (e.g. rss if !lthreed) have zero size.
+
   // [ns x numFC] R ~ cos(m*theta)*cos(n*zeta)
-  Eigen::VectorXd rcc;
+  std::span<double> rcc;
 
   // [ns x numFC] R ~ sin(m*theta)*sin(n*zeta)
-  Eigen::VectorXd rss;
+  std::span<double> rss;
 
   // [ns x numFC] R ~ sin(m*theta)*cos(n*zeta)
-  Eigen::VectorXd rsc;
+  std::span<double> rsc;
 
   // [ns x numFC] R ~ cos(m*theta)*sin(n*zeta)
-  Eigen::VectorXd rcs;
+  std::span<double> rcs;
 
   //***************/
 
   // [ns x numFC] Z ~ sin(m*theta)*cos(n*zeta)
-  Eigen::VectorXd zsc;
+  std::span<double> zsc;
 
   // [ns x numFC] Z ~ cos(m*theta)*sin(n*zeta)
-  Eigen::VectorXd zcs;
+  std::span<double> zcs;
 
   // [ns x numFC] Z ~ cos(m*theta)*cos(n*zeta)
-  Eigen::VectorXd zcc;
+  std::span<double> zcc;
 
   // [ns x numFC] Z ~ sin(m*theta)*sin(n*zeta)
-  Eigen::VectorXd zss;
+  std::span<double> zss;
 
   //***************/
 
   // [ns x numFC] lambda ~ sin(m*theta)*cos(n*zeta)
-  Eigen::VectorXd lsc;
+  std::span<double> lsc;
 
   // [ns x numFC] lambda ~ cos(m*theta)*sin(n*zeta)
-  Eigen::VectorXd lcs;
+  std::span<double> lcs;
 
   // [ns x numFC] lambda ~ cos(m*theta)*cos(n*zeta)
-  Eigen::VectorXd lcc;
+  std::span<double> lcc;
 
   // [ns x numFC] lambda ~ sin(m*theta)*sin(n*zeta)
-  Eigen::VectorXd lss;
+  std::span<double> lss;
+
+ private:
+  // point the component spans into coefficients_
+  void BindComponents();
 };
 
 }  // namespace vmecpp
@@ -132,29 +132,25 @@ void HandoverStorage::allocate(const RadialPartitioning& r, int ns) {
     // =========================================================================
     // Tri-diagonal solver storage
     // =========================================================================
-    // Matrix arrays: RowMatrixXd [mn, ns]
-    all_ar.resize(mnsize, ns);
+    // Matrix arrays: RowMatrixXd [ns, mn]
+    all_ar.resize(ns, mnsize);
     all_ar.setZero();
-    all_az.resize(mnsize, ns);
+    all_az.resize(ns, mnsize);
     all_az.setZero();
-    all_dr.resize(mnsize, ns);
+    all_dr.resize(ns, mnsize);
     all_dr.setZero();
-    all_dz.resize(mnsize, ns);
+    all_dz.resize(ns, mnsize);
     all_dz.setZero();
-    all_br.resize(mnsize, ns);
+    all_br.resize(ns, mnsize);
     all_br.setZero();
-    all_bz.resize(mnsize, ns);
+    all_bz.resize(ns, mnsize);
     all_bz.setZero();
 
-    // RHS arrays: vector of RowMatrixXd [mn][num_basis, ns]
-    all_cr.resize(mnsize);
-    all_cz.resize(mnsize);
-    for (int mn = 0; mn < mnsize; ++mn) {
-      all_cr[mn].resize(num_basis_, ns);
-      all_cr[mn].setZero();
-      all_cz[mn].resize(num_basis_, ns);
-      all_cz[mn].setZero();
-    }
+    // RHS arrays: RowMatrixXd [num_basis * ns, mn]
+    all_cr.resize(num_basis_ * ns, mnsize);
+    all_cr.setZero();
+    all_cz.resize(num_basis_ * ns, mnsize);
+    all_cz.setZero();
 
     // =========================================================================
     // Parallel tri-diagonal solver handover storage
@@ -168,6 +164,8 @@ void HandoverStorage::allocate(const RadialPartitioning& r, int ns) {
     // handover_aR/aZ: flat [mnsize]
     handover_aR.setZero(mnsize);
     handover_aZ.setZero(mnsize);
+
+    tridiagonal_interfaces.Resize(num_threads_, mnsize, num_basis_);
   }
 
 }  // allocate
@@ -127,20 +127,20 @@ class HandoverStorage {
   RowMatrixXd lmncc_o;
   RowMatrixXd lmnss_o;
 
-  // Serial tri-diagonal solver storage
-  // Matrix: RowMatrixXd [mn, j], RHS: vector of RowMatrixXd [mn][basis, j]
+  // Mode-parallel tri-diagonal solver storage, mode-contiguous for
+  // TridiagonalSolveBatched: Matrix: RowMatrixXd [j, mn],
+  // RHS: RowMatrixXd [basis * ns + j, mn]
 
   int mnsize;
-  RowMatrixXd all_ar;  // [mnsize, ns]
+  RowMatrixXd all_ar;  // [ns, mnsize]
   RowMatrixXd all_az;
   RowMatrixXd all_dr;
   RowMatrixXd all_dz;
   RowMatrixXd all_br;
   RowMatrixXd all_bz;
 
-  // [mnsize] -> [num_basis, ns]
-  std::vector<RowMatrixXd> all_cr;
-  std::vector<RowMatrixXd> all_cz;
+  RowMatrixXd all_cr;  // [num_basis * ns, mnsize]
+  RowMatrixXd all_cz;
 
   // Parallel tri-diagonal solver storage
   // handover_cR/cZ: RowMatrixXd [num_basis, mnsize], handover_aR/aZ: flat
@@ -150,6 +150,10 @@ class HandoverStorage {
   Eigen::VectorXd handover_aR;  // [mnsize]
   RowMatrixXd handover_cZ;
   Eigen::VectorXd handover_aZ;
+
+  // Partitioned tri-diagonal solver storage, see TridiagonalSolvePartitioned
+  TridiagonalPartitionInterfaces tridiagonal_interfaces;
+
   // magnetic axis geometry for NESTOR
   Eigen::VectorXd rAxis;
   Eigen::VectorXd zAxis;
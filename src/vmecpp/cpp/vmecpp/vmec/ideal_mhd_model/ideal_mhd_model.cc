@@ -572,33 +572,41 @@ absl::StatusOr<bool> IdealMhdModel::update(
     m_decomposed_x.maskGeometryAbove(s_.mpolGeometry, s_.ntorGeometry);
   }
 
-  // preprocess Fourier coefficients of geometry
-  m_decomposed_x.decomposeInto(m_physical_x, m_p_.scalxc);
-  if (checkpoint == VmecCheckpoint::FOURIER_GEOMETRY_TO_START_WITH &&
-      iter2 >= iterations_before_checkpointing) {
-    return true;
-  }
+  {
+    ScopedStageTimer timer(stage_timers_, ModelStage::kGeometryFromFourier);
+
+    // preprocess Fourier coefficients of geometry
+    m_decomposed_x.decomposeInto(m_physical_x, m_p_.scalxc);
+    if (checkpoint == VmecCheckpoint::FOURIER_GEOMETRY_TO_START_WITH &&
+        iter2 >= iterations_before_checkpointing) {
+      return true;
+    }
 
-  // undo m=1 constraint
-  m_physical_x.m1Constraint(1.0);
+    // undo m=1 constraint
+    m_physical_x.m1Constraint(1.0);
 
-  m_physical_x.extrapolateTowardsAxis();
+    m_physical_x.extrapolateTowardsAxis();
 
-  // inv-DFT to get realspace geometric quantities
-  geometryFromFourier(m_physical_x);
+    // inv-DFT to get realspace geometric quantities
+    geometryFromFourier(m_physical_x);
+  }
   if (checkpoint == VmecCheckpoint::INV_DFT_GEOMETRY &&
       iter2 >= iterations_before_checkpointing) {
     return true;
   }
 
-  if (iter2 == iter1 &&
-      (m_vacuum_pressure_state_ == VacuumPressureState::kOff ||
-       m_vacuum_pressure_state_ == VacuumPressureState::kInitializing)) {
-    rzConIntoVolume();
-  }
+  {
+    ScopedStageTimer timer(stage_timers_, ModelStage::kJacobian);
 
-  // sets m_fc_.restart_reason
-  computeJacobian();
+    if (iter2 == iter1 &&
+        (m_vacuum_pressure_state_ == VacuumPressureState::kOff ||
+         m_vacuum_pressure_state_ == VacuumPressureState::kInitializing)) {
+      rzConIntoVolume();
+    }
+
+    // sets m_fc_.restart_reason
+    computeJacobian();
+  }
   if (checkpoint == VmecCheckpoint::JACOBIAN &&
       iter2 >= iterations_before_checkpointing) {
     return true;
@@ -615,41 +623,57 @@ absl::StatusOr<bool> IdealMhdModel::update(
 
   // start of bcovar (ends in updateForces)
 
-  computeMetricElements();
-  if (checkpoint == VmecCheckpoint::METRIC &&
-      iter2 >= iterations_before_checkpointing) {
-    return true;
-  }
+  {
+    ScopedStageTimer timer(stage_timers_, ModelStage::kMetricElements);
 
-  updateDifferentialVolume();
+    computeMetricElements();
+    if (checkpoint == VmecCheckpoint::METRIC &&
+        iter2 >= iterations_before_checkpointing) {
+      return true;
+    }
 
-  if (iter2 == 1) {
-    computeInitialVolume();
+    updateDifferentialVolume();
+
+    if (iter2 == 1) {
+      computeInitialVolume();
+    }
   }
   if (checkpoint == VmecCheckpoint::VOLUME &&
       iter2 >= iterations_before_checkpointing) {
     return true;
   }
 
-  computeBContra();
+  {
+    ScopedStageTimer timer(stage_timers_, ModelStage::kBContra);
+    computeBContra();
+  }
   if (checkpoint == VmecCheckpoint::B_CONTRA &&
       iter2 >= iterations_before_checkpointing) {
     return true;
   }
 
-  computeBCo();
+  {
+    ScopedStageTimer timer(stage_timers_, ModelStage::kBCo);
+    computeBCo();
+  }
   if (checkpoint == VmecCheckpoint::B_CO &&
       iter2 >= iterations_before_checkpointing) {
     return true;
   }
 
-  pressureAndEnergies();
+  {
+    ScopedStageTimer timer(stage_timers_, ModelStage::kPressureAndEnergies);
+    pressureAndEnergies();
+  }
   if (checkpoint == VmecCheckpoint::ENERGY &&
       iter2 >= iterations_before_checkpointing) {
     return true;
   }
 
-  radialForceBalance();
+  {
+    ScopedStageTimer timer(stage_timers_, ModelStage::kRadialForceBalance);
+    radialForceBalance();
+  }
   if (checkpoint == VmecCheckpoint::RADIAL_FORCE_BALANCE &&
       iter2 >= iterations_before_checkpointing) {
     return true;
@@ -681,7 +705,10 @@ absl::StatusOr<bool> IdealMhdModel::update(
                 signOfJacobian * 2.0 * M_PI;
   }
 
-  hybridLambdaForce();
+  {
+    ScopedStageTimer timer(stage_timers_, ModelStage::kHybridLambdaForce);
+    hybridLambdaForce();
+  }
   if (checkpoint == VmecCheckpoint::HYBRID_LAMBDA_FORCE &&
       iter2 >= iterations_before_checkpointing) {
     return true;
@@ -691,6 +718,8 @@ absl::StatusOr<bool> IdealMhdModel::update(
   // since we don't overwrite stuff in-place in VMEC++.
 
   if (shouldUpdateRadialPreconditioner(iter1, iter2)) {
+    ScopedStageTimer timer(stage_timers_, ModelStage::kPreconditionerUpdate);
+
 #ifdef _OPENMP
 #pragma omp single nowait
 #endif  // _OPENMP
@@ -782,6 +811,11 @@ absl::StatusOr<bool> IdealMhdModel::update(
 #pragma omp barrier
 #endif  // _OPENMP
     if (m_vacuum_pressure_state_ != VacuumPressureState::kOff) {
+      ScopedStageTimer timer(stage_timers_,
+                             ivacskip == 0
+                                 ? ModelStage::kFreeBoundaryFullUpdate
+                                 : ModelStage::kFreeBoundaryPartialUpdate);
+
       // IF INITIALLY ON, MUST TURN OFF rcon0, zcon0 SLOWLY
       for (int jF = r_.nsMinF; jF < r_.nsMaxF; ++jF) {
         for (int kl = 0; kl < s_.nZnT; ++kl) {
@@ -969,85 +1003,101 @@ absl::StatusOr<bool> IdealMhdModel::update(
   // NOTE: if (iequi != 1) { ... continue with code below ...
   // -> iequi==1 computations for outputs are done in OutputQuantities
 
-  effectiveConstraintForce();
+  {
+    ScopedStageTimer timer(stage_timers_, ModelStage::kConstraintForce);
+
+    effectiveConstraintForce();
 
-  deAliasConstraintForce();
+    deAliasConstraintForce();
+  }
   if (checkpoint == VmecCheckpoint::ALIAS &&
       iter2 >= iterations_before_checkpointing) {
     return true;
   }
 
-  computeMHDForces();
+  {
+    ScopedStageTimer timer(stage_timers_, ModelStage::kMhdForces);
+
+    computeMHDForces();
 
-  assembleTotalForces();
+    assembleTotalForces();
+  }
   if (checkpoint == VmecCheckpoint::REALSPACE_FORCES &&
       iter2 >= iterations_before_checkpointing) {
     return true;
   }
 
-  forcesToFourier(m_physical_f);
-  if (checkpoint == VmecCheckpoint::FWD_DFT_FORCES &&
-      iter2 >= iterations_before_checkpointing) {
-    return true;
-  }
+  {
+    ScopedStageTimer timer(stage_timers_, ModelStage::kForcesToFourier);
+
+    forcesToFourier(m_physical_f);
+    if (checkpoint == VmecCheckpoint::FWD_DFT_FORCES &&
+        iter2 >= iterations_before_checkpointing) {
+      return true;
+    }
 
-  m_physical_f.decomposeInto(m_decomposed_f, m_p_.scalxc);
+    m_physical_f.decomposeInto(m_decomposed_f, m_p_.scalxc);
+  }
 
   // ----- start of residue
 
-  // re-establish m=1 constraint
-  // TODO(jons): why 1/sqrt(2) and not 1/2 ?
-  m_decomposed_f.m1Constraint(1.0 / std::numbers::sqrt2);
+  {
+    ScopedStageTimer timer(stage_timers_, ModelStage::kResiduals);
+
+    // re-establish m=1 constraint
+    // TODO(jons): why 1/sqrt(2) and not 1/2 ?
+    m_decomposed_f.m1Constraint(1.0 / std::numbers::sqrt2);
+
+    // v8.50: ADD iter2<2 so reset=<WOUT_FILE> works
+    const bool fix_m1_gauge =
+        always_fix_m1_gauge || m_fc.fsqz < 1.0e-6 || iter2 < 2;
+    if (fix_m1_gauge) {
+      // ensure that the m=1 constraint is satisfied exactly
+      // --> the corresponding m=1 coeffs of R,Z are constrained to be zero
+      //     and thus must not be "forced" (by the time evol using gc) away from
+      //     zero
+      m_decomposed_f.zeroZForceForM1();
+    }
 
-  // v8.50: ADD iter2<2 so reset=<WOUT_FILE> works
-  const bool fix_m1_gauge =
-      always_fix_m1_gauge || m_fc.fsqz < 1.0e-6 || iter2 < 2;
-  if (fix_m1_gauge) {
-    // ensure that the m=1 constraint is satisfied exactly
-    // --> the corresponding m=1 coeffs of R,Z are constrained to be zero
-    //     and thus must not be "forced" (by the time evol using gc) away from
-    //     zero
-    m_decomposed_f.zeroZForceForM1();
-  }
+    // Freeze geometry above the reduced resolution before the invariant
+    // residuals (so frozen modes stay out of the convergence test) and before
+    // preconditioning (so they get no update).
+    if (s_.mpolGeometry < s_.mpol || s_.ntorGeometry < s_.ntor) {
+      m_decomposed_f.maskGeometryAbove(s_.mpolGeometry, s_.ntorGeometry);
+    }
 
-  // Freeze geometry above the reduced resolution before the invariant
-  // residuals (so frozen modes stay out of the convergence test) and before
-  // preconditioning (so they get no update).
-  if (s_.mpolGeometry < s_.mpol || s_.ntorGeometry < s_.ntor) {
-    m_decomposed_f.maskGeometryAbove(s_.mpolGeometry, s_.ntorGeometry);
-  }
+    if (checkpoint == VmecCheckpoint::PHYSICAL_FORCES &&
+        iter2 >= iterations_before_checkpointing) {
+      return true;
+    }
 
-  if (checkpoint == VmecCheckpoint::PHYSICAL_FORCES &&
-      iter2 >= iterations_before_checkpointing) {
-    return true;
+    // COMPUTE INVARIANT RESIDUALS
+
+    // include edge contribution if the equilibrium has converged very quickly,
+    // to prevent a strong force-imbalance at the LCFS-vacuum transition, since
+    // the termination criterion based on sum(force residuals) < ftol only
+    // considers the inner flux-surfaces, but not the balance with the magnetic
+    // pressure in vacuum at the LCFS. This special case includes that force
+    // contribution in the first few iterations, preventing termination, to
+    // ensure the free-boundary forces have "enough time" to propagate through
+    // to the inner surfaces.
+    // TODO(jurasic) the hard-coded 50 and 1e-6 are only here for backwards
+    // compatibility, ideally vacuum-pressure should always part of the
+    // force-balance
+    bool almost_converged = (m_fc.fsqr + m_fc.fsqz) < 1.0e-6;
+    // In iter==1, the forces are initialized to 1.0 so includeEdgeRZForces
+    // wouldn't trigger without special handling for the hot-restart case.
+    bool hot_restart = (iter2 == 1 && m_vacuum_pressure_state_ ==
+                                          VacuumPressureState::kInitialized);
+    bool includeEdgeRZForces =
+        ((iter2 - iter1) < 50 && (almost_converged || hot_restart));
+    Eigen::Vector3d localFResInvar;
+    localFResInvar.setZero();
+    m_decomposed_f.residuals(localFResInvar, includeEdgeRZForces);
+
+    evalFResInvar(localFResInvar);
   }
 
-  // COMPUTE INVARIANT RESIDUALS
-
-  // include edge contribution if the equilibrium has converged very quickly,
-  // to prevent a strong force-imbalance at the LCFS-vacuum transition, since
-  // the termination criterion based on sum(force residuals) < ftol only
-  // considers the inner flux-surfaces, but not the balance with the magnetic
-  // pressure in vacuum at the LCFS. This special case includes that force
-  // contribution in the first few iterations, preventing termination, to
-  // ensure the free-boundary forces have "enough time" to propagate through
-  // to the inner surfaces.
-  // TODO(jurasic) the hard-coded 50 and 1e-6 are only here for backwards
-  // compatibility, ideally vacuum-pressure should always part of the
-  // force-balance
-  bool almost_converged = (m_fc.fsqr + m_fc.fsqz) < 1.0e-6;
-  // In iter==1, the forces are initialized to 1.0 so includeEdgeRZForces
-  // wouldn't trigger without special handling for the hot-restart case.
-  bool hot_restart = (iter2 == 1 && m_vacuum_pressure_state_ ==
-                                        VacuumPressureState::kInitialized);
-  bool includeEdgeRZForces =
-      ((iter2 - iter1) < 50 && (almost_converged || hot_restart));
-  Eigen::Vector3d localFResInvar;
-  localFResInvar.setZero();
-  m_decomposed_f.residuals(localFResInvar, includeEdgeRZForces);
-
-  evalFResInvar(localFResInvar);
-
   if (checkpoint == VmecCheckpoint::INVARIANT_RESIDUALS &&
       iter2 >= iterations_before_checkpointing) {
     return true;
@@ -1055,41 +1105,45 @@ absl::StatusOr<bool> IdealMhdModel::update(
 
   // PERFORM PRECONDITIONING AND COMPUTE RESIDUES
 
-  applyM1Preconditioner(m_decomposed_f);
-  if (checkpoint == VmecCheckpoint::APPLY_M1_PRECONDITIONER &&
-      iter2 >= iterations_before_checkpointing) {
-    return true;
-  }
+  {
+    ScopedStageTimer timer(stage_timers_, ModelStage::kApplyPreconditioner);
 
-  assembleRZPreconditioner();
-  if (checkpoint == VmecCheckpoint::ASSEMBLE_RZ_PRECONDITIONER &&
-      iter2 >= iterations_before_checkpointing) {
-    return true;
-  }
+    applyM1Preconditioner(m_decomposed_f);
+    if (checkpoint == VmecCheckpoint::APPLY_M1_PRECONDITIONER &&
+        iter2 >= iterations_before_checkpointing) {
+      return true;
+    }
 
-  absl::Status status = applyRZPreconditioner(m_decomposed_f);
-  if (!status.ok()) {
-    return status;
-  }
+    assembleRZPreconditioner();
+    if (checkpoint == VmecCheckpoint::ASSEMBLE_RZ_PRECONDITIONER &&
+        iter2 >= iterations_before_checkpointing) {
+      return true;
+    }
 
-  applyLambdaPreconditioner(m_decomposed_f);
-  if (checkpoint == VmecCheckpoint::APPLY_RADIAL_PRECONDITIONER &&
-      iter2 >= iterations_before_checkpointing) {
-    return true;
-  }
+    absl::Status status = applyRZPreconditioner(m_decomposed_f);
+    if (!status.ok()) {
+      return status;
+    }
 
-  // Re-freeze after preconditioning. The radial preconditioner is per-mode so
-  // it cannot reintroduce frozen modes; this keeps the preconditioned residual
-  // and the state update clean.
-  if (s_.mpolGeometry < s_.mpol || s_.ntorGeometry < s_.ntor) {
-    m_decomposed_f.maskGeometryAbove(s_.mpolGeometry, s_.ntorGeometry);
-  }
+    applyLambdaPreconditioner(m_decomposed_f);
+    if (checkpoint == VmecCheckpoint::APPLY_RADIAL_PRECONDITIONER &&
+        iter2 >= iterations_before_checkpointing) {
+      return true;
+    }
 
-  Eigen::Vector3d localFResPrecd;
-  localFResPrecd.setZero();
-  m_decomposed_f.residuals(localFResPrecd, true);
+    // Re-freeze after preconditioning. The radial preconditioner is per-mode
+    // so it cannot reintroduce frozen modes; this keeps the preconditioned
+    // residual and the state update clean.
+    if (s_.mpolGeometry < s_.mpol || s_.ntorGeometry < s_.ntor) {
+      m_decomposed_f.maskGeometryAbove(s_.mpolGeometry, s_.ntorGeometry);
+    }
 
-  evalFResPrecd(localFResPrecd);
+    Eigen::Vector3d localFResPrecd;
+    localFResPrecd.setZero();
+    m_decomposed_f.residuals(localFResPrecd, true);
+
+    evalFResPrecd(localFResPrecd);
+  }
 
   if (checkpoint == VmecCheckpoint::PRECONDITIONED_RESIDUALS &&
       iter2 >= iterations_before_checkpointing) {
@@ -3084,71 +3138,98 @@ absl::Status IdealMhdModel::applyRZPreconditioner(
     jMax = m_fc_.ns;
   }
 
-  // gather everything into HandoverStorage (flat layout)
+  if (m_fc_.radial_tridiagonal_solver ==
+      RadialTridiagonalSolver::kPartitioned) {
+    // solve in place on the radial partitions of the threads
+    const int num_local = (r_.nsMaxF - r_.nsMinF) * s_.mnsize;
+    TridiagonalSolvePartitioned(
+        std::span<const double>(ar.data(), num_local),
+        std::span<const double>(dr.data(), num_local),
+        std::span<const double>(br.data(), num_local),
+        std::span<const std::span<double>>(cR.data(), s_.num_basis),
+        std::span<const double>(az.data(), num_local),
+        std::span<const double>(dz.data(), num_local),
+        std::span<const double>(bz.data(), num_local),
+        std::span<const std::span<double>>(cZ.data(), s_.num_basis),
+        std::span<const int>(jMin.data(), jMin.size()), jMax, s_.mnsize,
+        s_.num_basis, r_.get_num_threads(), r_.get_thread_id(), r_.nsMinF,
+        r_.nsMaxF, tridiagonal_workspace_, m_h_.tridiagonal_interfaces);
+    return absl::OkStatus();
+  }
+
+  // gather everything into HandoverStorage (mode-contiguous layout)
+  const int ns = static_cast<int>(m_h_.all_ar.rows());
   for (int jF = r_.nsMinF; jF < r_.nsMaxF; ++jF) {
-    for (int mn = 0; mn < s_.mnsize; ++mn) {
-      int idx_mn = (jF - r_.nsMinF) * s_.mnsize + mn;
-      m_h_.all_ar(mn, jF) = ar[idx_mn];
-      m_h_.all_az(mn, jF) = az[idx_mn];
-      m_h_.all_dr(mn, jF) = dr[idx_mn];
-      m_h_.all_dz(mn, jF) = dz[idx_mn];
-      m_h_.all_br(mn, jF) = br[idx_mn];
-      m_h_.all_bz(mn, jF) = bz[idx_mn];
-      for (int idx_basis = 0; idx_basis < s_.num_basis; ++idx_basis) {
-        m_h_.all_cr[mn](idx_basis, jF) = cR[idx_basis][idx_mn];
-        m_h_.all_cz[mn](idx_basis, jF) = cZ[idx_basis][idx_mn];
-      }  // idx_basis
-    }  // mn
+    const int offset = (jF - r_.nsMinF) * s_.mnsize;
+    std::copy_n(ar.data() + offset, s_.mnsize, m_h_.all_ar.row(jF).data());
+    std::copy_n(az.data() + offset, s_.mnsize, m_h_.all_az.row(jF).data());
+    std::copy_n(dr.data() + offset, s_.mnsize, m_h_.all_dr.row(jF).data());
+    std::copy_n(dz.data() + offset, s_.mnsize, m_h_.all_dz.row(jF).data());
+    std::copy_n(br.data() + offset, s_.mnsize, m_h_.all_br.row(jF).data());
+    std::copy_n(bz.data() + offset, s_.mnsize, m_h_.all_bz.row(jF).data());
+    for (int idx_basis = 0; idx_basis < s_.num_basis; ++idx_basis) {
+      std::copy_n(cR[idx_basis].data() + offset, s_.mnsize,
+                  m_h_.all_cr.row(idx_basis * ns + jF).data());
+      std::copy_n(cZ[idx_basis].data() + offset, s_.mnsize,
+                  m_h_.all_cz.row(idx_basis * ns + jF).data());
+    }  // idx_basis
   }  // jF
 #ifdef _OPENMP
 #pragma omp barrier
 #endif  // _OPENMP
 
-  // split range [0, s_.mnsize) among threads
+  // split range [0, s_.mnsize) among threads, in blocks of 8 modes, so that
+  // only the last thread runs a partial-width remainder of the SIMD loops over
+  // mn in TridiagonalSolveBatched.
+  // Note that the rows of the HandoverStorage systems are s_.mnsize long and
+  // not padded, so the blocks are not aligned to cache lines: two neighboring
+  // threads still share one cache line per row at their common boundary.
+  // If there are fewer blocks than threads, this would leave threads idle, so
+  // then the modes are split evenly one by one instead.
+  static constexpr int kModeBlock = 8;
   const int thread_id = r_.get_thread_id();
   const int num_threads = r_.get_num_threads();
-  const int mnstep = s_.mnsize / num_threads;
-  const int remainder = s_.mnsize % num_threads;
-  int mnmin = thread_id * mnstep;
-  int mnmax = mnmin + mnstep;
-
-  // add 1 more iteration to the first `remainder` threads
-  if (thread_id < remainder) {
-    mnmin += thread_id;
-    mnmax += thread_id + 1;
-  } else {
-    mnmin += remainder;
-    mnmax += remainder;
-  }
-
-  // call serial Thomas solver for every mode number individually
-  // Uses span accessors to pass contiguous radial slices to the solver
-  const int ns = m_h_.all_ar.cols();
-  for (int mn = mnmin; mn < mnmax; ++mn) {
-    TridiagonalSolveSerial(std::span<double>(m_h_.all_ar.row(mn).data(), ns),
-                           std::span<double>(m_h_.all_dr.row(mn).data(), ns),
-                           std::span<double>(m_h_.all_br.row(mn).data(), ns),
-                           m_h_.all_cr[mn].data(), ns, jMin[mn], jMax,
-                           s_.num_basis);
-    TridiagonalSolveSerial(std::span<double>(m_h_.all_az.row(mn).data(), ns),
-                           std::span<double>(m_h_.all_dz.row(mn).data(), ns),
-                           std::span<double>(m_h_.all_bz.row(mn).data(), ns),
-                           m_h_.all_cz[mn].data(), ns, jMin[mn], jMax,
-                           s_.num_basis);
-  }  // mn
+  const int mode_block =
+      (s_.mnsize + kModeBlock - 1) / kModeBlock < num_threads ? 1 : kModeBlock;
+  const int num_blocks = (s_.mnsize + mode_block - 1) / mode_block;
+  const int blockstep = num_blocks / num_threads;
+  const int remainder = num_blocks % num_threads;
+
+  // add 1 more block to the first `remainder` threads
+  const int block_min = thread_id * blockstep + std::min(thread_id, remainder);
+  const int block_max = block_min + blockstep + (thread_id < remainder ? 1 : 0);
+  const int mnmin = std::min(block_min * mode_block, s_.mnsize);
+  const int mnmax = std::min(block_max * mode_block, s_.mnsize);
+
+  // batched Thomas solver for all mode numbers of this thread at once
+  const std::span<const int> jMin_span(jMin.data(), jMin.size());
+  if (mnmin < mnmax) {
+    TridiagonalSolveBatched(
+        std::span<double>(m_h_.all_ar.data(), m_h_.all_ar.size()),
+        std::span<double>(m_h_.all_dr.data(), m_h_.all_dr.size()),
+        std::span<double>(m_h_.all_br.data(), m_h_.all_br.size()),
+        std::span<double>(m_h_.all_cr.data(), m_h_.all_cr.size()), s_.mnsize,
+        ns, mnmin, mnmax, jMin_span, jMax, s_.num_basis);
+    TridiagonalSolveBatched(
+        std::span<double>(m_h_.all_az.data(), m_h_.all_az.size()),
+        std::span<double>(m_h_.all_dz.data(), m_h_.all_dz.size()),
+        std::span<double>(m_h_.all_bz.data(), m_h_.all_bz.size()),
+        std::span<double>(m_h_.all_cz.data(), m_h_.all_cz.size()), s_.mnsize,
+        ns, mnmin, mnmax, jMin_span, jMax, s_.num_basis);
+  }
 #ifdef _OPENMP
 #pragma omp barrier
 #endif  // _OPENMP
 
   // re-distribute solution back into threads
   for (int jF = r_.nsMinF; jF < r_.nsMaxF; ++jF) {
-    for (int mn = 0; mn < s_.mnsize; ++mn) {
-      int idx_mn = (jF - r_.nsMinF) * s_.mnsize + mn;
-      for (int idx_basis = 0; idx_basis < s_.num_basis; ++idx_basis) {
-        cR[idx_basis][idx_mn] = m_h_.all_cr[mn](idx_basis, jF);
-        cZ[idx_basis][idx_mn] = m_h_.all_cz[mn](idx_basis, jF);
-      }  // idx_basis
-    }  // mn
+    const int offset = (jF - r_.nsMinF) * s_.mnsize;
+    for (int idx_basis = 0; idx_basis < s_.num_basis; ++idx_basis) {
+      std::copy_n(m_h_.all_cr.row(idx_basis * ns + jF).data(), s_.mnsize,
+                  cR[idx_basis].data() + offset);
+      std::copy_n(m_h_.all_cz.row(idx_basis * ns + jF).data(), s_.mnsize,
+                  cZ[idx_basis].data() + offset);
+    }  // idx_basis
   }  // jF
 
   return absl::OkStatus();
@@ -3250,4 +3331,8 @@ double IdealMhdModel::get_delbsq() const {
 
 int IdealMhdModel::get_ivacskip() const { return ivacskip; }
 
+int IdealMhdModel::get_nvacskip() const { return nvacskip; }
+
+void IdealMhdModel::set_nvacskip(int nvacskip) { this->nvacskip = nvacskip; }
+
 }  // namespace vmecpp
@@ -31,6 +31,7 @@
 #endif
 #include "vmecpp/vmec/radial_partitioning/radial_partitioning.h"
 #include "vmecpp/vmec/radial_profiles/radial_profiles.h"
+#include "vmecpp/vmec/stage_timers/stage_timers.h"
 #include "vmecpp/vmec/thread_local_storage/thread_local_storage.h"
 #include "vmecpp/vmec/vmec_constants/vmec_constants.h"
 
@@ -79,6 +80,10 @@ class IdealMhdModel {
   std::int64_t forceEvaluationCount() const { return force_evaluation_count_; }
   void resetForceEvaluationCount() { force_evaluation_count_ = 0; }
 
+  // Per-stage timers of this thread; disabled unless profiling was requested.
+  StageTimers& stageTimers() { return stage_timers_; }
+  const StageTimers& stageTimers() const { return stage_timers_; }
+
   // Coordinates which inverse-DFT routine to call for computing
   // the flux surface geometry and lambda on it from the provided Fourier
   // coefficients. Also computes the net dR/dTheta and dZ/dTheta, without the
@@ -239,6 +244,11 @@ class IdealMhdModel {
   // partial update of the Nestor free boundary force contribution is computed.
   int get_ivacskip() const;
 
+  // `nvacskip` is the number of iterations between two full updates of the
+  // Nestor free boundary force contribution; it grows as the run converges.
+  int get_nvacskip() const;
+  void set_nvacskip(int nvacskip);
+
   /**********************************************/
 
   // R on full-grid
@@ -482,6 +492,7 @@ class IdealMhdModel {
   int m_vac_num_threads_;
   VacuumPressureState& m_vacuum_pressure_state_;
   std::int64_t force_evaluation_count_ = 0;
+  StageTimers stage_timers_;
 
 #ifdef VMECPP_USE_FFTX
   // Pre-computed FFTX kernels for the toroidal (zeta) Fourier transforms.
@@ -511,6 +522,9 @@ class IdealMhdModel {
   // preconditioner for R and Z
   Eigen::VectorXi jMin;
 
+  // work arrays of the partitioned radial tri-diagonal solver
+  TridiagonalPartitionWorkspace tridiagonal_workspace_;
+
   // ****** IDENTICAL THREAD LOCALS *******
   // In multi-thread runs, the following data members
   // will take identical values in all instances of
@@ -0,0 +1,54 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/iteration_telemetry/iteration_telemetry.h"
+
+#include "absl/log/check.h"
+
+namespace vmecpp {
+
+IterationTelemetry::IterationTelemetry(int stride, int capacity)
+    : stride_(stride) {
+  CHECK_GE(stride, 1) << "telemetry stride must be positive";
+  CHECK_GE(capacity, 1) << "telemetry capacity must be positive";
+  buffer_.resize(capacity);
+}
+
+void IterationTelemetry::Push(const IterationRecord& record) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  const std::size_t capacity = buffer_.size();
+  if (size_ == capacity) {
+    // full: overwrite the oldest record
+    buffer_[head_] = record;
+    head_ = (head_ + 1) % capacity;
+    ++num_dropped_;
+  } else {
+    buffer_[(head_ + size_) % capacity] = record;
+    ++size_;
+  }
+}
+
+std::vector<IterationRecord> IterationTelemetry::Drain() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  std::vector<IterationRecord> records;
+  records.reserve(size_);
+  for (std::size_t i = 0; i < size_; ++i) {
+    records.push_back(buffer_[(head_ + i) % buffer_.size()]);
+  }
+  head_ = 0;
+  size_ = 0;
+  return records;
+}
+
+std::size_t IterationTelemetry::size() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return size_;
+}
+
+std::int64_t IterationTelemetry::num_dropped() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return num_dropped_;
+}
+
+}  // namespace vmecpp
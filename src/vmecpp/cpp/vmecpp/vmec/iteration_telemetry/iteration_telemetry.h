@@ -0,0 +1,102 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#ifndef VMECPP_VMEC_ITERATION_TELEMETRY_ITERATION_TELEMETRY_H_
+#define VMECPP_VMEC_ITERATION_TELEMETRY_ITERATION_TELEMETRY_H_
+
+#include <cstddef>
+#include <cstdint>
+#include <functional>
+#include <mutex>
+#include <vector>
+
+#include "vmecpp/common/flow_control/flow_control.h"
+
+namespace vmecpp {
+
+// Convergence data of a single force iteration, as recorded by Vmec::Evolve.
+struct IterationRecord {
+  // number of flux surfaces of the current multigrid step
+  int ns = 0;
+
+  // iteration counter, as printed on screen (iter2)
+  int iteration = 0;
+
+  // invariant force residuals
+  double fsqr = 0.0;
+  double fsqz = 0.0;
+  double fsql = 0.0;
+
+  // preconditioned force residuals
+  double fsqr1 = 0.0;
+  double fsqz1 = 0.0;
+  double fsql1 = 0.0;
+
+  // time step used in this iteration
+  double time_step = 0.0;
+
+  // MHD energy, in the same units as FlowControl::mhd_energy
+  double mhd_energy = 0.0;
+
+  // mismatch in |B|^2 at the LCFS; zero for fixed-boundary runs
+  double delbsq = 0.0;
+
+  RestartReason restart_reason = RestartReason::NO_RESTART;
+
+  bool operator==(const IterationRecord&) const = default;
+};
+
+// Receives the iteration records gathered since the last call.
+// Returning true requests the run to stop at the next opportunity.
+using IterationCallback =
+    std::function<bool(const std::vector<IterationRecord>& records)>;
+
+// Fixed-capacity ring buffer of IterationRecords.
+//
+// Records are pushed by the thread that owns the LCFS, every `stride`
+// iterations, and drained by the master thread whenever it checks for
+// interrupts anyway (every nstep iterations), so that consumers that need to
+// take a lock (e.g., the Python GIL) do so at most once per batch. If the
+// consumer drains less often than the buffer fills up, the oldest records are
+// overwritten and counted in num_dropped().
+class IterationTelemetry {
+ public:
+  static constexpr int kDefaultCapacity = 4096;
+
+  explicit IterationTelemetry(int stride = 1, int capacity = kDefaultCapacity);
+
+  int stride() const { return stride_; }
+  int capacity() const { return static_cast<int>(buffer_.size()); }
+
+  // True if `iteration` is one of the iterations to be recorded.
+  bool ShouldRecord(int iteration) const { return iteration % stride_ == 0; }
+
+  // Thread-safe.
+  void Push(const IterationRecord& record);
+
+  // Return the buffered records, oldest first, and empty the buffer.
+  // Thread-safe.
+  std::vector<IterationRecord> Drain();
+
+  // Number of buffered records. Thread-safe.
+  std::size_t size() const;
+
+  // Number of records that were overwritten before being drained.
+  // Thread-safe.
+  std::int64_t num_dropped() const;
+
+ private:
+  const int stride_;
+
+  mutable std::mutex mutex_;
+  std::vector<IterationRecord> buffer_;
+  // index of the oldest record in buffer_
+  std::size_t head_ = 0;
+  std::size_t size_ = 0;
+  std::int64_t num_dropped_ = 0;
+};
+
+}  // namespace vmecpp
+
+#endif  // VMECPP_VMEC_ITERATION_TELEMETRY_ITERATION_TELEMETRY_H_
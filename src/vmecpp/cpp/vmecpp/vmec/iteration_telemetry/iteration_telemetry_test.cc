@@ -0,0 +1,66 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/iteration_telemetry/iteration_telemetry.h"
+
+#include <vector>
+
+#include "gtest/gtest.h"
+
+namespace vmecpp {
+
+namespace {
+IterationRecord MakeRecord(int iteration) {
+  IterationRecord record;
+  record.iteration = iteration;
+  record.fsqr = 1.0 / iteration;
+  return record;
+}
+}  // namespace
+
+TEST(TestIterationTelemetry, DrainReturnsRecordsInOrder) {
+  IterationTelemetry telemetry(/*stride=*/1, /*capacity=*/8);
+  for (int i = 1; i <= 5; ++i) {
+    telemetry.Push(MakeRecord(i));
+  }
+  ASSERT_EQ(telemetry.size(), 5);
+
+  const std::vector<IterationRecord> records = telemetry.Drain();
+  ASSERT_EQ(records.size(), 5);
+  for (int i = 0; i < 5; ++i) {
+    EXPECT_EQ(records[i], MakeRecord(i + 1));
+  }
+  EXPECT_EQ(telemetry.size(), 0);
+  EXPECT_TRUE(telemetry.Drain().empty());
+  EXPECT_EQ(telemetry.num_dropped(), 0);
+}
+
+TEST(TestIterationTelemetry, FullBufferDropsOldestRecords) {
+  IterationTelemetry telemetry(/*stride=*/1, /*capacity=*/3);
+  for (int i = 1; i <= 7; ++i) {
+    telemetry.Push(MakeRecord(i));
+  }
+  EXPECT_EQ(telemetry.num_dropped(), 4);
+
+  const std::vector<IterationRecord> records = telemetry.Drain();
+  ASSERT_EQ(records.size(), 3);
+  EXPECT_EQ(records[0].iteration, 5);
+  EXPECT_EQ(records[1].iteration, 6);
+  EXPECT_EQ(records[2].iteration, 7);
+
+  // the buffer is fully usable again after draining
+  telemetry.Push(MakeRecord(8));
+  ASSERT_EQ(telemetry.Drain(), std::vector<IterationRecord>{MakeRecord(8)});
+}
+
+TEST(TestIterationTelemetry, Stride) {
+  IterationTelemetry telemetry(/*stride=*/10);
+  EXPECT_EQ(telemetry.capacity(), IterationTelemetry::kDefaultCapacity);
+  EXPECT_FALSE(telemetry.ShouldRecord(1));
+  EXPECT_TRUE(telemetry.ShouldRecord(10));
+  EXPECT_FALSE(telemetry.ShouldRecord(15));
+  EXPECT_TRUE(telemetry.ShouldRecord(20));
+}
+
+}  // namespace vmecpp
@@ -33,6 +33,138 @@ VectorXd NonEmptyVectorOr(const Eigen::VectorXd& vec, const double val) {
     return VectorXd::Constant(1, val);
   }
 }  // NonEmptyVectorOr
+
+// Forward transform of realspace quantities on one surface onto the Nyquist
+// spectrum of the wout file, batched over several quantities.
+//
+// The transform is separable: the poloidal sums over the reduced interval
+// [0, nThetaReduced) of all quantities are a single dense product with the
+// weighted (cosmui, sinmui) basis, and the toroidal sums of all of those are
+// one more product with the (cosnv, sinnv) basis. The coefficients of
+// cos(mu - nv) and sin(mu - nv) then follow from the product-basis identities.
+// The factors of 1/2 at the Nyquist frequencies mnyq and nnyq are applied to
+// the copies of the basis held here.
+class NyquistTransform {
+ public:
+  NyquistTransform(const vmecpp::Sizes& s,
+                   const vmecpp::FourierBasisFastPoloidal& t, int num_fields);
+
+  // Transform fields[q], q = 0, ..., num_fields - 1, each pointing to the
+  // realspace values of one surface at (jH * nZeta + k) * nThetaEff + l.
+  // For lasym, every field is split into its even part 0.5 * (F(u, v) +
+  // F(-u, -v)), which determines the cos(mu - nv) coefficients, and its odd
+  // part 0.5 * (F(u, v) - F(-u, -v)), which determines the sin(mu - nv)
+  // coefficients (symoutput).
+  void Transform(const std::vector<const double*>& fields);
+
+  // Un-normalized coefficient of cos(mu - nv) (resp. sin(mu - nv)) of field q
+  // from the last Transform(); n is in units of nfp and may be negative.
+  double CosCoefficient(int q, int m, int n) const;
+  double SinCoefficient(int q, int m, int n) const;
+
+ private:
+  // first column of the poloidal sums of the even/odd part of field q
+  int Column(int q, bool odd) const {
+    return 2 * num_m_ * (lasym_ ? 2 * q + static_cast<int>(odd) : q);
+  }
+
+  int nZeta_;
+  int nThetaEff_;
+  int nThetaReduced_;
+  int num_m_;
+  int num_n_;
+  bool lasym_;
+
+  // [nThetaReduced x 2 * num_m] (cosmui, sinmui)
+  Eigen::MatrixXd poloidal_basis_;
+  // [2 * num_n x nZeta] (cosnv, sinnv)
+  Eigen::MatrixXd toroidal_basis_;
+
+  // [nZeta x nThetaReduced] even or odd part of a field (lasym only)
+  Eigen::MatrixXd parity_part_;
+  // [nZeta x 2 * num_m * num_parts] (Fc, Fs) of every part
+  Eigen::MatrixXd poloidal_sums_;
+  // [2 * num_n x 2 * num_m * num_parts] toroidal sums of poloidal_sums_
+  Eigen::MatrixXd sums_;
+};
+
+NyquistTransform::NyquistTransform(const vmecpp::Sizes& s,
+                                   const vmecpp::FourierBasisFastPoloidal& t,
+                                   int num_fields)
+    : nZeta_(s.nZeta),
+      nThetaEff_(s.nThetaEff),
+      nThetaReduced_(s.nThetaReduced),
+      num_m_(s.mnyq + 1),
+      num_n_(s.nnyq + 1),
+      lasym_(s.lasym),
+      poloidal_basis_(s.nThetaReduced, 2 * num_m_),
+      toroidal_basis_(2 * num_n_, s.nZeta) {
+  // NYQUIST FREQUENCY REQUIRES FACTOR OF 1/2
+  for (int m = 0; m < num_m_; ++m) {
+    const double nyquist_factor = (m == s.mnyq && m != 0) ? 0.5 : 1.0;
+    for (int l = 0; l < nThetaReduced_; ++l) {
+      const int ml = m * nThetaReduced_ + l;
+      poloidal_basis_(l, m) = t.cosmui[ml] * nyquist_factor;
+      poloidal_basis_(l, num_m_ + m) = t.sinmui[ml];
+    }  // l
+  }  // m
+  for (int n = 0; n < num_n_; ++n) {
+    const double nyquist_factor = (n == s.nnyq && n != 0) ? 0.5 : 1.0;
+    for (int k = 0; k < nZeta_; ++k) {
+      const int kn = k * (s.nnyq2 + 1) + n;
+      toroidal_basis_(n, k) = t.cosnv[kn] * nyquist_factor;
+      toroidal_basis_(num_n_ + n, k) = t.sinnv[kn];
+    }  // k
+  }  // n
+
+  const int num_parts = lasym_ ? 2 * num_fields : num_fields;
+  if (lasym_) {
+    parity_part_.resize(nZeta_, nThetaReduced_);
+  }
+  poloidal_sums_.resize(nZeta_, 2 * num_m_ * num_parts);
+  sums_.resize(2 * num_n_, 2 * num_m_ * num_parts);
+}
+
+void NyquistTransform::Transform(const std::vector<const double*>& fields) {
+  for (int q = 0; q < static_cast<int>(fields.size()); ++q) {
+    const Eigen::Map<const vmecpp::RowMatrixXd> field(fields[q], nZeta_,
+                                                      nThetaEff_);
+    if (!lasym_) {
+      poloidal_sums_.middleCols(Column(q, false), 2 * num_m_).noalias() =
+          field.leftCols(nThetaReduced_) * poloidal_basis_;
+      continue;
+    }
+    for (const bool odd : {false, true}) {
+      const double sign = odd ? -1.0 : 1.0;
+      for (int k = 0; k < nZeta_; ++k) {
+        const int k_rev = (nZeta_ - k) % nZeta_;
+        for (int l = 0; l < nThetaReduced_; ++l) {
+          const int l_rev = (nThetaEff_ - l) % nThetaEff_;
+          parity_part_(k, l) = 0.5 * (field(k, l) + sign * field(k_rev, l_rev));
+        }  // l
+      }  // k
+      poloidal_sums_.middleCols(Column(q, odd), 2 * num_m_).noalias() =
+          parity_part_ * poloidal_basis_;
+    }
+  }  // q
+  sums_.noalias() = toroidal_basis_ * poloidal_sums_;
+}
+
+double NyquistTransform::CosCoefficient(int q, int m, int n) const {
+  // cos(mu - nv) = cos(mu) * cos(nv) + sin(mu) * sin(nv)
+  const int col = Column(q, false) + m;
+  const int abs_n = std::abs(n);
+  return sums_(abs_n, col) +
+         vmecpp::signum(n) * sums_(num_n_ + abs_n, num_m_ + col);
+}
+
+double NyquistTransform::SinCoefficient(int q, int m, int n) const {
+  // sin(mu - nv) = sin(mu) * cos(nv) - cos(mu) * sin(nv)
+  const int col = Column(q, true) + m;
+  const int abs_n = std::abs(n);
+  return sums_(abs_n, num_m_ + col) -
+         vmecpp::signum(n) * sums_(num_n_ + abs_n, col);
+}
 }  // namespace
 
 // Shorthands for the calls required to read/write data members from/to HDF5
@@ -4547,30 +4679,6 @@ vmecpp::WOutFileContents vmecpp::ComputeWOutFileContents(
   wout.raxis_cc = threed1_axis.raxis_symm;
   wout.zaxis_cs = threed1_axis.zaxis_symm;
 
-  // NYQUIST FREQUENCY REQUIRES FACTOR OF 1/2
-  std::vector<double> cosmui(s.nThetaReduced * (s.mnyq2 + 1));
-  for (int ml = 0; ml < s.nThetaReduced * (s.mnyq2 + 1); ++ml) {
-    cosmui[ml] = t.cosmui[ml];
-  }
-  if (s.mnyq != 0) {
-    for (int l = 0; l < s.nThetaReduced; ++l) {
-      const int ml = s.mnyq * s.nThetaReduced + l;
-      cosmui[ml] /= 2.0;
-    }
-  }
-
-  std::vector<double> cosnv((s.nnyq2 + 1) * s.nZeta);
-  for (int kn = 0; kn < (s.nnyq2 + 1) * s.nZeta; ++kn) {
-    cosnv[kn] = t.cosnv[kn];
-  }
-  if (s.nnyq != 0) {
-    for (int k = 0; k < s.nZeta; ++k) {
-      // FIXME(eguiraud) slow loop
-      const int kn = k * (s.nnyq2 + 1) + s.nnyq;
-      cosnv[kn] /= 2.0;
-    }
-  }
-
   // MUST CONVERT m=1 MODES... FROM INTERNAL TO PHYSICAL FORM
   // Extrapolation of m=0 Lambda (cs) modes, which are not evolved at j=1, done
   // in CONVERT
@@ -4715,9 +4823,9 @@ vmecpp::WOutFileContents vmecpp::ComputeWOutFileContents(
 
   // The Nyquist-grid forward transform below sums over the reduced poloidal
   // range [0, nThetaReduced) for both parities; the symmetric and antisymmetric
-  // parts are split inline in the loop (symoutput). The 0.5 integration norm is
-  // therefore the same with or without lasym. educational_VMEC doubles it for
-  // lasym because it integrates over the full poloidal range; applying that
+  // parts are split in NyquistTransform (symoutput). The 0.5 integration norm
+  // is therefore the same with or without lasym. educational_VMEC doubles it
+  // for lasym because it integrates over the full poloidal range; applying that
   // doubling here, where the sum is over the reduced range, double-counts and
   // made a symmetric case run in lasym=true mode report these coefficients at
   // twice their value.
@@ -4752,289 +4860,80 @@ vmecpp::WOutFileContents vmecpp::ComputeWOutFileContents(
     wout.bsupumns = RowMatrixXd::Zero(s.mnmax_nyq, fc.ns);
     wout.bsupvmns = RowMatrixXd::Zero(s.mnmax_nyq, fc.ns);
   }
-  // Following is a parallelized, two-phase separable DFT that corresponds to
-  // The original loop:
-  //
-  //   for jH: for mn_nyq: for l: for k:
-  //     accum += kernel(mn_nyq, l, k) * field(jH, k, l)
-  //
-  // just split into
-  //
-  //   Phase 1 (poloidal): for each (m, k),
-  //     Fc[m,k] = sum_l  cosmui[m,l] * field(jH, k, l)
-  //     Fs[m,k] = sum_l sinmui[m,l] * field(jH, k, l)
-  //
-  //   Phase 2 (toroidal): for each mode (mn_nyq = (m,n)),
-  //     result = dmult * sum_k ( cosnv[k,n]*Fc[m,k] + sign_n*sinnv[k,n]*Fs[m,k]
-  //     )
-  const int partial_sum_size = (s.mnyq + 1) * s.nZeta;
+  // The Nyquist spectra follow from a separable forward transform per surface,
+  // batched over all quantities as dense matrix products; see
+  // NyquistTransform above.
+  enum HalfGridField {
+    kGsqrt,
+    kModB,
+    kBSubU,
+    kBSubV,
+    kBSupU,
+    kBSupV,
+    kBSubS,
+    kNumHalfGridFields
+  };
 
 #ifdef _OPENMP
 #pragma omp parallel
   {
 #endif
-    std::vector<double> Fc_gsqrt(partial_sum_size), Fs_gsqrt(partial_sum_size),
-        Fc_bmnc(partial_sum_size), Fs_bmnc(partial_sum_size),
-        Fc_bsubu(partial_sum_size), Fs_bsubu(partial_sum_size),
-        Fc_bsubv(partial_sum_size), Fs_bsubv(partial_sum_size),
-        Fc_bsupu(partial_sum_size), Fs_bsupu(partial_sum_size),
-        Fc_bsupv(partial_sum_size), Fs_bsupv(partial_sum_size),
-        Fc_bsubs(partial_sum_size), Fs_bsubs(partial_sum_size);
-    // Asymmetric partial sums (only populated when lasym=true).
-    std::vector<double> Fc_gsqrt_a, Fs_gsqrt_a;
-    std::vector<double> Fc_bmnc_a, Fs_bmnc_a;
-    std::vector<double> Fc_bsubu_a, Fs_bsubu_a;
-    std::vector<double> Fc_bsubv_a, Fs_bsubv_a;
-    std::vector<double> Fc_bsupu_a, Fs_bsupu_a;
-    std::vector<double> Fc_bsupv_a, Fs_bsupv_a;
-    std::vector<double> Fc_bsubs_a, Fs_bsubs_a;
-    if (s.lasym) {
-      Fc_gsqrt_a.resize(partial_sum_size);
-      Fs_gsqrt_a.resize(partial_sum_size);
-      Fc_bmnc_a.resize(partial_sum_size);
-      Fs_bmnc_a.resize(partial_sum_size);
-      Fc_bsubu_a.resize(partial_sum_size);
-      Fs_bsubu_a.resize(partial_sum_size);
-      Fc_bsubv_a.resize(partial_sum_size);
-      Fs_bsubv_a.resize(partial_sum_size);
-      Fc_bsupu_a.resize(partial_sum_size);
-      Fs_bsupu_a.resize(partial_sum_size);
-      Fc_bsupv_a.resize(partial_sum_size);
-      Fs_bsupv_a.resize(partial_sum_size);
-      Fc_bsubs_a.resize(partial_sum_size);
-      Fs_bsubs_a.resize(partial_sum_size);
-    }
+    NyquistTransform transform(s, t, kNumHalfGridFields);
+    std::vector<const double*> fields(kNumHalfGridFields);
 
 #ifdef _OPENMP
 #pragma omp for
 #endif
     for (int jH = 0; jH < fc.ns - 1; ++jH) {
-      // poloidal partial DFT
-      for (int m = 0; m <= s.mnyq; ++m) {
-        const int m_nzeta_p1 = m * s.nZeta;
-        for (int k = 0; k < s.nZeta; ++k) {
-          double fc_gsqrt = 0.0, fs_gsqrt = 0.0;
-          double fc_bmnc = 0.0, fs_bmnc = 0.0;
-          double fc_bsubu = 0.0, fs_bsubu = 0.0;
-          double fc_bsubv = 0.0, fs_bsubv = 0.0;
-          double fc_bsupu = 0.0, fs_bsupu = 0.0;
-          double fc_bsupv = 0.0, fs_bsupv = 0.0;
-          double fc_bsubs = 0.0, fs_bsubs = 0.0;
-
-          int k_rev = 0;
-          double fc_gsqrt_a = 0.0, fs_gsqrt_a = 0.0;
-          double fc_bmnc_a = 0.0, fs_bmnc_a = 0.0;
-          double fc_bsubu_a = 0.0, fs_bsubu_a = 0.0;
-          double fc_bsubv_a = 0.0, fs_bsubv_a = 0.0;
-          double fc_bsupu_a = 0.0, fs_bsupu_a = 0.0;
-          double fc_bsupv_a = 0.0, fs_bsupv_a = 0.0;
-          double fc_bsubs_a = 0.0, fs_bsubs_a = 0.0;
-          if (s.lasym) {
-            k_rev = (s.nZeta - k) % s.nZeta;
-          }
-
-          for (int l = 0; l < s.nThetaReduced; ++l) {
-            const int ml = m * s.nThetaReduced + l;
-            const int idx_kl = (jH * s.nZeta + k) * s.nThetaEff + l;
-            const double cmu = cosmui[ml];
-            const double smu = t.sinmui[ml];
-
-            double g = m_vmec_internal_results.gsqrt(idx_kl);
-            double mp = magnetic_pressure[idx_kl];
-            double bu = m_vmec_internal_results.bsubu(idx_kl);
-            double bv = m_vmec_internal_results.bsubv(idx_kl);
-            double bpu = m_vmec_internal_results.bsupu(idx_kl);
-            double bpv = m_vmec_internal_results.bsupv(idx_kl);
-            double bs = bsubs_half.bsubs_half(idx_kl);
-
-            if (s.lasym) {
-              // symoutput: on the reduced theta interval, the cos(mu-nv)
-              // coefficients come from the stellarator-symmetric projection
-              // 0.5 * (F(u,v) + F(-u,-v)) and the sin(mu-nv) coefficients
-              // from the antisymmetric projection 0.5 * (F(u,v) - F(-u,-v));
-              // for bsubs the parities are reversed.
-              const int l_rev = (s.nThetaEff - l) % s.nThetaEff;
-              const int idx_kl_rev =
-                  (jH * s.nZeta + k_rev) * s.nThetaEff + l_rev;
-
-              const double g_rev = m_vmec_internal_results.gsqrt(idx_kl_rev);
-              const double mp_rev = magnetic_pressure[idx_kl_rev];
-              const double bu_rev = m_vmec_internal_results.bsubu(idx_kl_rev);
-              const double bv_rev = m_vmec_internal_results.bsubv(idx_kl_rev);
-              const double bpu_rev = m_vmec_internal_results.bsupu(idx_kl_rev);
-              const double bpv_rev = m_vmec_internal_results.bsupv(idx_kl_rev);
-              const double bs_rev = bsubs_half.bsubs_half(idx_kl_rev);
-
-              const double g_a = 0.5 * (g - g_rev);
-              const double mp_a = 0.5 * (mp - mp_rev);
-              const double bu_a = 0.5 * (bu - bu_rev);
-              const double bv_a = 0.5 * (bv - bv_rev);
-              const double bpu_a = 0.5 * (bpu - bpu_rev);
-              const double bpv_a = 0.5 * (bpv - bpv_rev);
-              // bsubs uses + (cos-parity asymmetric part).
-              const double bs_a = 0.5 * (bs + bs_rev);
-
-              g = 0.5 * (g + g_rev);
-              mp = 0.5 * (mp + mp_rev);
-              bu = 0.5 * (bu + bu_rev);
-              bv = 0.5 * (bv + bv_rev);
-              bpu = 0.5 * (bpu + bpu_rev);
-              bpv = 0.5 * (bpv + bpv_rev);
-              // bsubs uses - (sin-parity symmetric part).
-              bs = 0.5 * (bs - bs_rev);
-
-              fc_gsqrt_a += cmu * g_a;
-              fs_gsqrt_a += smu * g_a;
-              fc_bmnc_a += cmu * mp_a;
-              fs_bmnc_a += smu * mp_a;
-              fc_bsubu_a += cmu * bu_a;
-              fs_bsubu_a += smu * bu_a;
-              fc_bsubv_a += cmu * bv_a;
-              fs_bsubv_a += smu * bv_a;
-              fc_bsupu_a += cmu * bpu_a;
-              fs_bsupu_a += smu * bpu_a;
-              fc_bsupv_a += cmu * bpv_a;
-              fs_bsupv_a += smu * bpv_a;
-              fc_bsubs_a += cmu * bs_a;
-              fs_bsubs_a += smu * bs_a;
-            }
+      const int offset_kl = jH * s.nZnT;
+      fields[kGsqrt] = m_vmec_internal_results.gsqrt.data() + offset_kl;
+      fields[kModB] = magnetic_pressure.data() + offset_kl;
+      fields[kBSubU] = m_vmec_internal_results.bsubu.data() + offset_kl;
+      fields[kBSubV] = m_vmec_internal_results.bsubv.data() + offset_kl;
+      fields[kBSupU] = m_vmec_internal_results.bsupu.data() + offset_kl;
+      fields[kBSupV] = m_vmec_internal_results.bsupv.data() + offset_kl;
+      fields[kBSubS] = bsubs_half.bsubs_half.data() + offset_kl;
+      transform.Transform(fields);
 
-            fc_gsqrt += cmu * g;
-            fs_gsqrt += smu * g;
-            fc_bmnc += cmu * mp;
-            fs_bmnc += smu * mp;
-            fc_bsubu += cmu * bu;
-            fs_bsubu += smu * bu;
-            fc_bsubv += cmu * bv;
-            fs_bsubv += smu * bv;
-            fc_bsupu += cmu * bpu;
-            fs_bsupu += smu * bpu;
-            fc_bsupv += cmu * bpv;
-            fs_bsupv += smu * bpv;
-            fc_bsubs += cmu * bs;
-            fs_bsubs += smu * bs;
-          }  // l
-
-          const int idx_mk = m_nzeta_p1 + k;
-          Fc_gsqrt[idx_mk] = fc_gsqrt;
-          Fs_gsqrt[idx_mk] = fs_gsqrt;
-          Fc_bmnc[idx_mk] = fc_bmnc;
-          Fs_bmnc[idx_mk] = fs_bmnc;
-          Fc_bsubu[idx_mk] = fc_bsubu;
-          Fs_bsubu[idx_mk] = fs_bsubu;
-          Fc_bsubv[idx_mk] = fc_bsubv;
-          Fs_bsubv[idx_mk] = fs_bsubv;
-          Fc_bsupu[idx_mk] = fc_bsupu;
-          Fs_bsupu[idx_mk] = fs_bsupu;
-          Fc_bsupv[idx_mk] = fc_bsupv;
-          Fs_bsupv[idx_mk] = fs_bsupv;
-          Fc_bsubs[idx_mk] = fc_bsubs;
-          Fs_bsubs[idx_mk] = fs_bsubs;
-          if (s.lasym) {
-            Fc_gsqrt_a[idx_mk] = fc_gsqrt_a;
-            Fs_gsqrt_a[idx_mk] = fs_gsqrt_a;
-            Fc_bmnc_a[idx_mk] = fc_bmnc_a;
-            Fs_bmnc_a[idx_mk] = fs_bmnc_a;
-            Fc_bsubu_a[idx_mk] = fc_bsubu_a;
-            Fs_bsubu_a[idx_mk] = fs_bsubu_a;
-            Fc_bsubv_a[idx_mk] = fc_bsubv_a;
-            Fs_bsubv_a[idx_mk] = fs_bsubv_a;
-            Fc_bsupu_a[idx_mk] = fc_bsupu_a;
-            Fs_bsupu_a[idx_mk] = fs_bsupu_a;
-            Fc_bsupv_a[idx_mk] = fc_bsupv_a;
-            Fs_bsupv_a[idx_mk] = fs_bsupv_a;
-            Fc_bsubs_a[idx_mk] = fc_bsubs_a;
-            Fs_bsubs_a[idx_mk] = fs_bsubs_a;
-          }
-        }  // k
-      }  // m
-
-      // toroidal DFT
       for (int mn_nyq = 0; mn_nyq < s.mnmax_nyq; ++mn_nyq) {
         const int m = wout.xm_nyq[mn_nyq];
         const int n = wout.xn_nyq[mn_nyq] / wout.nfp;
         const int abs_n = std::abs(n);
-        const int sign_n = signum(n);
         double dmult = t.mscale[m] * t.nscale[abs_n] * tmult;
         if (m == 0 || n == 0) {
           dmult *= 2.0;
         }
-        const int m_nzeta = m * s.nZeta;
 
-        double acc_gmnc = 0.0, acc_bmnc = 0.0, acc_bsubumnc = 0.0,
-               acc_bsubvmnc = 0.0, acc_bsubsmns = 0.0, acc_bsupumnc = 0.0,
-               acc_bsupvmnc = 0.0;
-
-        for (int k = 0; k < s.nZeta; ++k) {
-          const int kn = k * (s.nnyq2 + 1) + abs_n;
-          const double cnv = cosnv[kn];
-          const double snv = t.sinnv[kn];
-          const int idx_mk = m_nzeta + k;
-
-          // cos(mu-nv) kernel: cnv*Fc + sign_n*snv*Fs
-          acc_gmnc += cnv * Fc_gsqrt[idx_mk] + sign_n * snv * Fs_gsqrt[idx_mk];
-          acc_bmnc += cnv * Fc_bmnc[idx_mk] + sign_n * snv * Fs_bmnc[idx_mk];
-          acc_bsubumnc +=
-              cnv * Fc_bsubu[idx_mk] + sign_n * snv * Fs_bsubu[idx_mk];
-          acc_bsubvmnc +=
-              cnv * Fc_bsubv[idx_mk] + sign_n * snv * Fs_bsubv[idx_mk];
-          acc_bsupumnc +=
-              cnv * Fc_bsupu[idx_mk] + sign_n * snv * Fs_bsupu[idx_mk];
-          acc_bsupvmnc +=
-              cnv * Fc_bsupv[idx_mk] + sign_n * snv * Fs_bsupv[idx_mk];
-          // sin(mu-nv) kernel: cnv*Fs - sign_n*snv*Fc
-          acc_bsubsmns +=
-              cnv * Fs_bsubs[idx_mk] - sign_n * snv * Fc_bsubs[idx_mk];
-        }  // k
-
-        wout.gmnc(mn_nyq, jH + 1) = dmult * acc_gmnc;
-        wout.bmnc(mn_nyq, jH + 1) = dmult * acc_bmnc;
-        wout.bsubumnc(mn_nyq, jH + 1) = dmult * acc_bsubumnc;
-        wout.bsubvmnc(mn_nyq, jH + 1) = dmult * acc_bsubvmnc;
-        wout.bsubsmns(mn_nyq, jH + 1) = dmult * acc_bsubsmns;
-        wout.bsupumnc(mn_nyq, jH + 1) = dmult * acc_bsupumnc;
-        wout.bsupvmnc(mn_nyq, jH + 1) = dmult * acc_bsupvmnc;
+        wout.gmnc(mn_nyq, jH + 1) =
+            dmult * transform.CosCoefficient(kGsqrt, m, n);
+        wout.bmnc(mn_nyq, jH + 1) =
+            dmult * transform.CosCoefficient(kModB, m, n);
+        wout.bsubumnc(mn_nyq, jH + 1) =
+            dmult * transform.CosCoefficient(kBSubU, m, n);
+        wout.bsubvmnc(mn_nyq, jH + 1) =
+            dmult * transform.CosCoefficient(kBSubV, m, n);
+        wout.bsubsmns(mn_nyq, jH + 1) =
+            dmult * transform.SinCoefficient(kBSubS, m, n);
+        wout.bsupumnc(mn_nyq, jH + 1) =
+            dmult * transform.CosCoefficient(kBSupU, m, n);
+        wout.bsupvmnc(mn_nyq, jH + 1) =
+            dmult * transform.CosCoefficient(kBSupV, m, n);
 
         if (s.lasym) {
-          double acc_gmns = 0.0;
-          double acc_bmns = 0.0;
-          double acc_bsubumns = 0.0;
-          double acc_bsubvmns = 0.0;
-          double acc_bsubsmnc = 0.0;
-          double acc_bsupumns = 0.0;
-          double acc_bsupvmns = 0.0;
-
-          for (int k = 0; k < s.nZeta; ++k) {
-            const int kn = k * (s.nnyq2 + 1) + abs_n;
-            const double cnv = cosnv[kn];
-            const double snv = t.sinnv[kn];
-            const int idx_mk = m_nzeta + k;
-
-            // sin(mu-nv) kernel for antisymmetric fields
-            acc_gmns +=
-                cnv * Fs_gsqrt_a[idx_mk] - sign_n * snv * Fc_gsqrt_a[idx_mk];
-            acc_bmns +=
-                cnv * Fs_bmnc_a[idx_mk] - sign_n * snv * Fc_bmnc_a[idx_mk];
-            acc_bsubumns +=
-                cnv * Fs_bsubu_a[idx_mk] - sign_n * snv * Fc_bsubu_a[idx_mk];
-            acc_bsubvmns +=
-                cnv * Fs_bsubv_a[idx_mk] - sign_n * snv * Fc_bsubv_a[idx_mk];
-            acc_bsupumns +=
-                cnv * Fs_bsupu_a[idx_mk] - sign_n * snv * Fc_bsupu_a[idx_mk];
-            acc_bsupvmns +=
-                cnv * Fs_bsupv_a[idx_mk] - sign_n * snv * Fc_bsupv_a[idx_mk];
-            // cos(mu-nv) kernel for bsubs_asym (cos-parity)
-            acc_bsubsmnc +=
-                cnv * Fc_bsubs_a[idx_mk] + sign_n * snv * Fs_bsubs_a[idx_mk];
-          }  // k
-
-          wout.gmns(mn_nyq, jH + 1) = dmult * acc_gmns;
-          wout.bmns(mn_nyq, jH + 1) = dmult * acc_bmns;
-          wout.bsubumns(mn_nyq, jH + 1) = dmult * acc_bsubumns;
-          wout.bsubvmns(mn_nyq, jH + 1) = dmult * acc_bsubvmns;
-          wout.bsubsmnc(mn_nyq, jH + 1) = dmult * acc_bsubsmnc;
-          wout.bsupumns(mn_nyq, jH + 1) = dmult * acc_bsupumns;
-          wout.bsupvmns(mn_nyq, jH + 1) = dmult * acc_bsupvmns;
+          wout.gmns(mn_nyq, jH + 1) =
+              dmult * transform.SinCoefficient(kGsqrt, m, n);
+          wout.bmns(mn_nyq, jH + 1) =
+              dmult * transform.SinCoefficient(kModB, m, n);
+          wout.bsubumns(mn_nyq, jH + 1) =
+              dmult * transform.SinCoefficient(kBSubU, m, n);
+          wout.bsubvmns(mn_nyq, jH + 1) =
+              dmult * transform.SinCoefficient(kBSubV, m, n);
+          wout.bsubsmnc(mn_nyq, jH + 1) =
+              dmult * transform.CosCoefficient(kBSubS, m, n);
+          wout.bsupumns(mn_nyq, jH + 1) =
+              dmult * transform.SinCoefficient(kBSupU, m, n);
+          wout.bsupvmns(mn_nyq, jH + 1) =
+              dmult * transform.SinCoefficient(kBSupV, m, n);
         }
       }  // mn_nyq
     }  // jH
@@ -5078,100 +4977,35 @@ vmecpp::WOutFileContents vmecpp::ComputeWOutFileContents(
   if (s.lasym) {
     wout.bsubsmnc_full = RowMatrixXd::Zero(s.mnmax_nyq, fc.ns);
   }
-  // Use the same two-phase separable DFT as the half-grid loop above,
+  // Same separable transform as for the half-grid quantities above,
   // parallelised over full-grid surfaces jF.
 #ifdef _OPENMP
 #pragma omp parallel
   {
 #endif
-    std::vector<double> Fc_bsubs_full(partial_sum_size),
-        Fs_bsubs_full(partial_sum_size);
-    // Asymmetric partial sums (only populated when lasym=true).
-    std::vector<double> Fc_bsubs_full_a, Fs_bsubs_full_a;
-    if (s.lasym) {
-      Fc_bsubs_full_a.resize(partial_sum_size);
-      Fs_bsubs_full_a.resize(partial_sum_size);
-    }
+    NyquistTransform transform(s, t, /*num_fields=*/1);
+    std::vector<const double*> fields(1);
 
 #ifdef _OPENMP
 #pragma omp for
 #endif
     for (int jF = 0; jF < fc.ns; ++jF) {
-      std::fill(Fc_bsubs_full.begin(), Fc_bsubs_full.end(), 0.0);
-      std::fill(Fs_bsubs_full.begin(), Fs_bsubs_full.end(), 0.0);
-      if (s.lasym) {
-        std::fill(Fc_bsubs_full_a.begin(), Fc_bsubs_full_a.end(), 0.0);
-        std::fill(Fs_bsubs_full_a.begin(), Fs_bsubs_full_a.end(), 0.0);
-      }
+      fields[0] = bsubs_full.bsubs_full.data() + jF * s.nZnT;
+      transform.Transform(fields);
 
-      // Phase 1: poloidal partial DFT
-      for (int m = 0; m <= s.mnyq; ++m) {
-        const int m_nzeta = m * s.nZeta;
-        for (int k = 0; k < s.nZeta; ++k) {
-          double fc = 0.0, fs = 0.0;
-          double fc_a = 0.0, fs_a = 0.0;
-          int k_rev = 0;
-          if (s.lasym) {
-            k_rev = (s.nZeta - k) % s.nZeta;
-          }
-          for (int l = 0; l < s.nThetaReduced; ++l) {
-            const int ml = m * s.nThetaReduced + l;
-            const int idx_kl = (jF * s.nZeta + k) * s.nThetaEff + l;
-            double bs = bsubs_full.bsubs_full(idx_kl);
-            if (s.lasym) {
-              // symoutput parity split for B_s: the sin(mu-nv) coefficients
-              // come from 0.5 * (F(u,v) - F(-u,-v)) and the cos(mu-nv)
-              // coefficients from 0.5 * (F(u,v) + F(-u,-v)).
-              const int l_rev = (s.nThetaEff - l) % s.nThetaEff;
-              const int idx_kl_rev =
-                  (jF * s.nZeta + k_rev) * s.nThetaEff + l_rev;
-              const double bs_rev = bsubs_full.bsubs_full(idx_kl_rev);
-              const double bs_a = 0.5 * (bs + bs_rev);
-              bs = 0.5 * (bs - bs_rev);
-              fc_a += cosmui[ml] * bs_a;
-              fs_a += t.sinmui[ml] * bs_a;
-            }
-            fc += cosmui[ml] * bs;
-            fs += t.sinmui[ml] * bs;
-          }  // l
-          Fc_bsubs_full[m_nzeta + k] = fc;
-          Fs_bsubs_full[m_nzeta + k] = fs;
-          if (s.lasym) {
-            Fc_bsubs_full_a[m_nzeta + k] = fc_a;
-            Fs_bsubs_full_a[m_nzeta + k] = fs_a;
-          }
-        }  // k
-      }  // m
-
-      // Phase 2: toroidal DFT
       for (int mn_nyq = 0; mn_nyq < s.mnmax_nyq; ++mn_nyq) {
         const int m = wout.xm_nyq[mn_nyq];
         const int n = wout.xn_nyq[mn_nyq] / wout.nfp;
         const int abs_n = std::abs(n);
-        const int sign_n = signum(n);
         double dmult = t.mscale[m] * t.nscale[abs_n] * tmult;
         if (m == 0 || n == 0) {
           dmult *= 2.0;
         }
-        const int m_nzeta = m * s.nZeta;
-
-        double acc = 0.0;
-        double acc_a = 0.0;
-        for (int k = 0; k < s.nZeta; ++k) {
-          const int kn = k * (s.nnyq2 + 1) + abs_n;
-          const int idx_mk = m_nzeta + k;
-          // sin(mu-nv) kernel: cosnv*Fs - sign_n*sinnv*Fc
-          acc += cosnv[kn] * Fs_bsubs_full[idx_mk] -
-                 sign_n * t.sinnv[kn] * Fc_bsubs_full[idx_mk];
-          if (s.lasym) {
-            // cos(mu-nv) kernel: cosnv*Fc + sign_n*sinnv*Fs
-            acc_a += cosnv[kn] * Fc_bsubs_full_a[idx_mk] +
-                     sign_n * t.sinnv[kn] * Fs_bsubs_full_a[idx_mk];
-          }
-        }  // k
-        wout.bsubsmns_full(mn_nyq, jF) = dmult * acc;
+        wout.bsubsmns_full(mn_nyq, jF) =
+            dmult * transform.SinCoefficient(0, m, n);
         if (s.lasym) {
-          wout.bsubsmnc_full(mn_nyq, jF) = dmult * acc_a;
+          wout.bsubsmnc_full(mn_nyq, jF) =
+              dmult * transform.CosCoefficient(0, m, n);
         }
       }  // mn_nyq
     }  // jF
@@ -5301,7 +5135,8 @@ vmecpp::WOutFileContents vmecpp::ComputeWOutFileContents(
   }  // lasym
 
   // RESTORE nyq ENDPOINT VALUES
-  // --> not needed here, since cosmui and cosnv were duplicated in local scope
+  // --> not needed here, since NyquistTransform applies the endpoint factors
+  // to its own copy of the basis
 
   // -------------------
   // Compute current density Fourier coefficients from covariant B components.
@@ -8,6 +8,7 @@
 #include <Eigen/Dense>  // VectorXd
 #include <filesystem>
 #include <memory>
+#include <optional>
 #include <string>
 #include <vector>
 
@@ -19,6 +20,7 @@
 #include "vmecpp/common/vmec_indata/vmec_indata.h"
 #include "vmecpp/vmec/handover_storage/handover_storage.h"
 #include "vmecpp/vmec/ideal_mhd_model/ideal_mhd_model.h"
+#include "vmecpp/vmec/stage_timers/stage_timers.h"
 #include "vmecpp/vmec/vmec_constants/vmec_constants.h"
 
 namespace vmecpp {
@@ -1348,6 +1350,10 @@ struct OutputQuantities {
   WOutFileContents wout;
   VmecINDATA indata;
 
+  // Per-stage timings of the run, only present if profiling was requested.
+  // Not persisted by Save.
+  std::optional<TimingReport> timings;
+
   bool operator==(const OutputQuantities&) const = default;
   bool operator!=(const OutputQuantities& o) const { return !(*this == o); }
 
@@ -13,10 +13,11 @@
 // answers "how much time do we spend after the actual solve has finished".
 //
 // Setup (untimed): load a small fixed-boundary case, run the solver to
-// convergence via Vmec::run().  Timed loop: re-invoke ComputeOutputQuantities
-// on the converged state.  ComputeOutputQuantities takes all inputs by const
-// reference and returns a fresh OutputQuantities by value, so repeated calls
-// are idempotent.
+// convergence via Vmec::run().  The cases cover both the stellarator-symmetric
+// and the non-symmetric (lasym) branches of the Nyquist spectra transform.
+// Timed loop: re-invoke ComputeOutputQuantities on the converged state.
+// ComputeOutputQuantities takes all inputs by const reference and returns a
+// fresh OutputQuantities by value, so repeated calls are idempotent.
 
 #include <cstdlib>
 #include <iostream>
@@ -33,13 +34,13 @@
 namespace vmecpp {
 namespace {
 
-// Small fixed-boundary stellarator case; converges quickly during setup.
-constexpr char kCase[] = "cma";
-
-void BM_ComputeOutputQuantities(benchmark::State& state) {
+// `test_case` must be a small fixed-boundary case that converges quickly
+// during setup.
+void BM_ComputeOutputQuantities(benchmark::State& state,
+                                const std::string& test_case) {
   // ---- Untimed setup: drive the solver to convergence. ----
   const std::string filename =
-      absl::StrFormat("vmecpp/test_data/%s.json", kCase);
+      absl::StrFormat("vmecpp/test_data/%s.json", test_case);
   absl::StatusOr<std::string> indata_json = file_io::ReadFile(filename);
   if (!indata_json.ok()) {
     state.SkipWithError("failed to read input JSON");
@@ -77,10 +78,16 @@ void BM_ComputeOutputQuantities(benchmark::State& state) {
     benchmark::DoNotOptimize(output_quantities.wout.volume);
     benchmark::ClobberMemory();
   }
-  state.SetLabel(kCase);
+  state.SetLabel(test_case);
 }
 
-BENCHMARK(BM_ComputeOutputQuantities)->Name("ComputeOutputQuantities/cma");
+// stellarator-symmetric stellarator
+BENCHMARK_CAPTURE(BM_ComputeOutputQuantities, cma, std::string("cma"))
+    ->Name("ComputeOutputQuantities/cma");
+// non-stellarator-symmetric (lasym) tokamak
+BENCHMARK_CAPTURE(BM_ComputeOutputQuantities, up_down_asym,
+                  std::string("up_down_asym"))
+    ->Name("ComputeOutputQuantities/up_down_asym");
 
 }  // namespace
 }  // namespace vmecpp
@@ -10,18 +10,29 @@
 #include <pybind11/stl/filesystem.h>
 
 #include <Eigen/Dense>
+#include <algorithm>
 #include <filesystem>
 #include <optional>
 #include <string>
 #include <type_traits>  // std::is_same_v
 #include <utility>      // std::move
+#include <vector>
 
+#ifdef _OPENMP
+#include <omp.h>
+#endif  // _OPENMP
+
+#include "vmecpp/common/fourier_basis_cache/fourier_basis_cache.h"
 #include "vmecpp/common/magnetic_configuration_lib/magnetic_configuration_lib.h"
+#include "vmecpp/common/magnetic_field_provider/magnetic_field_provider_lib.h"
 #include "vmecpp/common/makegrid_lib/makegrid_lib.h"
 #include "vmecpp/common/util/util.h"
 #include "vmecpp/common/vmec_indata/vmec_indata.h"
+#include "vmecpp/vmec/boozer_transform/boozer_transform.h"
 #include "vmecpp/vmec/output_quantities/output_quantities.h"
 #include "vmecpp/vmec/vmec/vmec.h"
+#include "vmecpp/vmec/workspace_pool/workspace_pool.h"
+#include "vmecpp/vmec/wout_evaluator/wout_evaluator.h"
 
 namespace py = pybind11;
 using Eigen::VectorXd;
@@ -72,82 +83,69 @@ T &GetValueOrThrow(absl::StatusOr<T> &s) {
   return s.value();
 }
 
-vmecpp::HotRestartState MakeHotRestartState(vmecpp::WOutFileContents wout,
-                                            const vmecpp::VmecINDATA &indata) {
-  return vmecpp::HotRestartState(std::move(wout), indata);
+// Wrap a Python callable as a vmecpp::IterationCallback.
+// The GIL is only acquired once per batch of records. An exception raised by
+// the callable stops the run and is stored in `error`, so that it can be
+// re-raised once vmecpp::run has returned.
+vmecpp::IterationCallback MakeIterationCallback(
+    const std::optional<py::function> &callback,
+    std::optional<py::error_already_set> &error) {
+  if (!callback.has_value()) {
+    return nullptr;
+  }
+  return [&callback,
+          &error](const std::vector<vmecpp::IterationRecord> &records) -> bool {
+    if (error.has_value()) {
+      return true;
+    }
+    py::gil_scoped_acquire acquire;
+    try {
+      const py::object stop = (*callback)(records);
+      return !stop.is_none() && stop.cast<bool>();
+    } catch (py::error_already_set &e) {
+      error = std::move(e);
+      return true;
+    }
+  };
 }
 
-// The active R/Z/lambda Fourier-component spans of a FourierGeometry, in a
-// fixed canonical order set by (lthreed, lasym). Used to (un)flatten the VMEC++
-// decision vector for Python. FourierForces shares the same underlying
-// FourierCoeffs storage layout, so the same ordering applies.
-std::vector<std::span<double>> ActiveSpans(vmecpp::FourierGeometry &x,
-                                           const vmecpp::Sizes &s) {
-  std::vector<std::span<double>> out = {x.rmncc};
-  if (s.lthreed) out.push_back(x.rmnss);
-  if (s.lasym) out.push_back(x.rmnsc);
-  if (s.lasym && s.lthreed) out.push_back(x.rmncs);
-  out.push_back(x.zmnsc);
-  if (s.lthreed) out.push_back(x.zmncs);
-  if (s.lasym) out.push_back(x.zmncc);
-  if (s.lasym && s.lthreed) out.push_back(x.zmnss);
-  out.push_back(x.lmnsc);
-  if (s.lthreed) out.push_back(x.lmncs);
-  if (s.lasym) out.push_back(x.lmncc);
-  if (s.lasym && s.lthreed) out.push_back(x.lmnss);
-  return out;
+vmecpp::SolverStateOptions MakeSolverStateOptions(
+    const std::optional<std::filesystem::path> &save_state_to,
+    int save_state_every,
+    const std::optional<std::filesystem::path> &resume_from) {
+  vmecpp::SolverStateOptions options;
+  options.save_to = save_state_to.value_or(std::filesystem::path());
+  options.save_every = save_state_every;
+  options.resume_from = resume_from.value_or(std::filesystem::path());
+  return options;
 }
 
-std::vector<std::span<double>> ActiveSpans(vmecpp::FourierForces &x,
-                                           const vmecpp::Sizes &s) {
-  std::vector<std::span<double>> out = {x.frcc};
-  if (s.lthreed) out.push_back(x.frss);
-  if (s.lasym) out.push_back(x.frsc);
-  if (s.lasym && s.lthreed) out.push_back(x.frcs);
-  out.push_back(x.fzsc);
-  if (s.lthreed) out.push_back(x.fzcs);
-  if (s.lasym) out.push_back(x.fzcc);
-  if (s.lasym && s.lthreed) out.push_back(x.fzss);
-  out.push_back(x.flsc);
-  if (s.lthreed) out.push_back(x.flcs);
-  if (s.lasym) out.push_back(x.flcc);
-  if (s.lasym && s.lthreed) out.push_back(x.flss);
-  return out;
+vmecpp::HotRestartState MakeHotRestartState(vmecpp::WOutFileContents wout,
+                                            const vmecpp::VmecINDATA &indata) {
+  return vmecpp::HotRestartState(std::move(wout), indata);
 }
 
-template <typename FourierObject>
-Eigen::VectorXd FlattenActive(FourierObject &x, const vmecpp::Sizes &s) {
-  const std::vector<std::span<double>> spans = ActiveSpans(x, s);
-  Eigen::Index total = 0;
-  for (const auto &sp : spans) total += static_cast<Eigen::Index>(sp.size());
-  Eigen::VectorXd out(total);
-  Eigen::Index offset = 0;
-  for (const auto &sp : spans) {
-    const Eigen::Index n = static_cast<Eigen::Index>(sp.size());
-    out.segment(offset, n) = Eigen::Map<const Eigen::VectorXd>(sp.data(), n);
-    offset += n;
-  }
-  return out;
+// The VMEC++ decision vector for Python is the contiguous storage of the
+// active R/Z/lambda Fourier components of a FourierGeometry, in the canonical
+// order set by (lthreed, lasym), see FourierCoeffs::flatCoefficients.
+// FourierForces shares the same underlying FourierCoeffs storage layout, so
+// the same ordering applies.
+Eigen::Map<Eigen::VectorXd> FlatView(vmecpp::FourierCoeffs &x) {
+  const std::span<double> flat = x.flatCoefficients();
+  return {flat.data(), static_cast<Eigen::Index>(flat.size())};
 }
 
-template <typename FourierObject>
-void UnflattenActive(FourierObject &m_x, const vmecpp::Sizes &s,
-                     const Eigen::VectorXd &flat) {
-  const std::vector<std::span<double>> spans = ActiveSpans(m_x, s);
-  Eigen::Index total = 0;
-  for (const auto &sp : spans) total += static_cast<Eigen::Index>(sp.size());
-  if (flat.size() != total) {
+Eigen::VectorXd FlattenActive(vmecpp::FourierCoeffs &x) { return FlatView(x); }
+
+void UnflattenActive(vmecpp::FourierCoeffs &m_x, const Eigen::VectorXd &flat) {
+  Eigen::Map<Eigen::VectorXd> view = FlatView(m_x);
+  if (flat.size() != view.size()) {
     throw std::runtime_error(
         "VmecModel.set_state: state vector has wrong length (got " +
-        std::to_string(flat.size()) + ", expected " + std::to_string(total) +
-        ")");
-  }
-  Eigen::Index offset = 0;
-  for (auto &sp : spans) {
-    const Eigen::Index n = static_cast<Eigen::Index>(sp.size());
-    Eigen::Map<Eigen::VectorXd>(sp.data(), n) = flat.segment(offset, n);
-    offset += n;
+        std::to_string(flat.size()) + ", expected " +
+        std::to_string(view.size()) + ")");
   }
+  view = flat;
 }
 
 // Single-resolution, single-threaded VMEC++ iteration model.
@@ -274,10 +272,17 @@ class VmecModel {
   // reset. Counts every Evaluate, including those inside hessian_vector_product
   // and preconditioner assembly, for a fair cross-optimizer cost comparison.
   std::int64_t force_eval_count() const {
-    return vmec_->m_[0]->forceEvaluationCount();
+    std::int64_t count = vmec_->m_[0]->forceEvaluationCount();
+    for (const auto &worker : workers_) {
+      count += worker->force_eval_count();
+    }
+    return count;
   }
   void reset_force_eval_count() const {
     vmec_->m_[0]->resetForceEvaluationCount();
+    for (const auto &worker : workers_) {
+      worker->reset_force_eval_count();
+    }
   }
 
   // The Garabedian-style time step (PerformTimeStep): for each Fourier
@@ -288,12 +293,25 @@ class VmecModel {
                            /*thread_id=*/0);
   }
 
+  // The Anderson-mixed time step of IterationStyle::ANDERSON
+  // (Vmec::AndersonTimeStep), with the caller's iteration counters: the mixing
+  // history is cleared whenever (iter2 - iter1) hits a preconditioner update.
+  // Runs inside a single-thread OpenMP parallel region for the same reason as
+  // Evaluate.
+  void AndersonTimeStep(int iter1, int iter2, double time_step) const {
+#ifdef _OPENMP
+#pragma omp parallel num_threads(1)
+#endif
+    vmec_->AndersonTimeStep(time_step, iter1, iter2, /*thread_id=*/0);
+  }
+
   // Restart primitives (decomposed RestartIteration).
   void SaveBackup() const {
     *vmec_->physical_x_backup_[0] = *vmec_->decomposed_x_[0];
   }
   void RestoreBackup() const {
     vmec_->decomposed_v_[0]->setZero();
+    vmec_->anderson_[0]->Reset();
     *vmec_->decomposed_x_[0] = *vmec_->physical_x_backup_[0];
   }
   void ZeroVelocity() const { vmec_->decomposed_v_[0]->setZero(); }
@@ -399,14 +417,26 @@ class VmecModel {
 
   // Flat decision vector (decomposed, i.e. preconditioner-scaled coefficients).
   Eigen::VectorXd GetState() const {
-    return FlattenActive(*vmec_->decomposed_x_[0], vmec_->s_);
+    return FlattenActive(*vmec_->decomposed_x_[0]);
   }
   void SetState(const Eigen::VectorXd &flat) const {
-    UnflattenActive(*vmec_->decomposed_x_[0], vmec_->s_, flat);
+    UnflattenActive(*vmec_->decomposed_x_[0], flat);
   }
   // Flat force vector (decomposed/preconditioned), valid after Evaluate().
   Eigen::VectorXd GetForces() const {
-    return FlattenActive(*vmec_->decomposed_f_[0], vmec_->s_);
+    return FlattenActive(*vmec_->decomposed_f_[0]);
+  }
+
+  // Writable views of the flat decision vector and force vector, without
+  // copies. They alias the internal storage of the model, so they observe
+  // every change of the state (time steps, restarts, set_state) and writes to
+  // the state view change the state. The storage is replaced by reinitialize()
+  // and refine_to(), which invalidates views obtained before.
+  Eigen::Map<Eigen::VectorXd> StateView() const {
+    return FlatView(*vmec_->decomposed_x_[0]);
+  }
+  Eigen::Map<Eigen::VectorXd> ForceView() const {
+    return FlatView(*vmec_->decomposed_f_[0]);
   }
 
   // Hessian-vector product of VMEC's augmented functional, computed inside
@@ -417,23 +447,71 @@ class VmecModel {
   // the directional step is finite-differenced. The current state is restored.
   Eigen::VectorXd HessianVectorProduct(const Eigen::VectorXd &v,
                                        double eps_rel = 1e-7) {
-    const Eigen::VectorXd x =
-        FlattenActive(*vmec_->decomposed_x_[0], vmec_->s_);
-    const double vnorm = v.norm();
-    if (vnorm == 0.0) {
-      return Eigen::VectorXd::Zero(x.size());
+    const Eigen::VectorXd x = FlattenActive(*vmec_->decomposed_x_[0]);
+    const Eigen::VectorXd hv = HessianVectorProductAt(x, v, eps_rel);
+    UnflattenActive(*vmec_->decomposed_x_[0], x);
+    return hv;
+  }
+
+  // Block version of HessianVectorProduct: H V for all columns of the (n, k)
+  // matrix V, at the current state. The 2k forward-model evaluations are
+  // distributed over up to `max_threads` threads (all available if not given),
+  // each of which drives its own worker model at the current resolution, so
+  // the evaluations around the same base point run concurrently. Free-boundary
+  // models evaluate the columns one after another on this model, since the
+  // vacuum state is not replicated to workers. The current state is restored.
+  Eigen::MatrixXd HessianMatrixProduct(
+      const Eigen::MatrixXd &v, double eps_rel = 1e-7,
+      std::optional<int> max_threads = std::nullopt) {
+    const Eigen::VectorXd x = FlattenActive(*vmec_->decomposed_x_[0]);
+    if (v.rows() != x.size()) {
+      throw std::runtime_error(
+          "VmecModel.hessian_matrix_product: V has wrong number of rows (got " +
+          std::to_string(v.rows()) + ", expected " + std::to_string(x.size()) +
+          ")");
     }
-    const double eps = eps_rel * (1.0 + x.norm()) / vnorm;
-    UnflattenActive(*vmec_->decomposed_x_[0], vmec_->s_, x + eps * v);
-    Evaluate(2, 2, /*precondition=*/false);
-    const Eigen::VectorXd fp =
-        FlattenActive(*vmec_->decomposed_f_[0], vmec_->s_);
-    UnflattenActive(*vmec_->decomposed_x_[0], vmec_->s_, x - eps * v);
-    Evaluate(2, 2, /*precondition=*/false);
-    const Eigen::VectorXd fm =
-        FlattenActive(*vmec_->decomposed_f_[0], vmec_->s_);
-    UnflattenActive(*vmec_->decomposed_x_[0], vmec_->s_, x);
-    return (fp - fm) / (2.0 * eps);
+    const int num_columns = static_cast<int>(v.cols());
+    Eigen::MatrixXd hv(x.size(), num_columns);
+
+    int num_workers = 1;
+#ifdef _OPENMP
+    num_workers = max_threads.value_or(omp_get_max_threads());
+#endif  // _OPENMP
+    num_workers = std::min(num_workers, num_columns);
+    if (num_workers <= 1 || vmec_->fc_.lfreeb) {
+      for (int j = 0; j < num_columns; ++j) {
+        hv.col(j) = HessianVectorProductAt(x, v.col(j), eps_rel);
+      }
+      UnflattenActive(*vmec_->decomposed_x_[0], x);
+      return hv;
+    }
+
+    EnsureWorkers(num_workers);
+    std::vector<std::string> error_messages(num_columns);
+    {
+      py::gil_scoped_release release;
+#ifdef _OPENMP
+#pragma omp parallel for num_threads(num_workers) schedule(dynamic)
+#endif  // _OPENMP
+      for (int j = 0; j < num_columns; ++j) {
+        int worker_id = 0;
+#ifdef _OPENMP
+        worker_id = omp_get_thread_num();
+#endif  // _OPENMP
+        try {
+          hv.col(j) =
+              workers_[worker_id]->HessianVectorProductAt(x, v.col(j), eps_rel);
+        } catch (const std::exception &e) {
+          error_messages[j] = e.what();
+        }
+      }
+    }
+    for (const std::string &error_message : error_messages) {
+      if (!error_message.empty()) {
+        throw std::runtime_error(error_message);
+      }
+    }
+    return hv;
   }
 
   // Apply VMEC's preconditioner M^-1 to a vector in the decomposed internal
@@ -447,7 +525,7 @@ class VmecModel {
   Eigen::VectorXd ApplyPreconditioner(const Eigen::VectorXd &v) const {
     vmecpp::FourierForces tmp(&vmec_->s_, vmec_->r_[0].get(), vmec_->fc_.ns);
     tmp.setZero();
-    UnflattenActive(tmp, vmec_->s_, v);
+    UnflattenActive(tmp, v);
     vmecpp::IdealMhdModel &model = *vmec_->m_[0];
     model.applyM1Preconditioner(tmp);
     const absl::Status status = model.applyRZPreconditioner(tmp);
@@ -455,7 +533,7 @@ class VmecModel {
       throw std::runtime_error(std::string(status.message()));
     }
     model.applyLambdaPreconditioner(tmp);
-    return FlattenActive(tmp, vmec_->s_);
+    return FlattenActive(tmp);
   }
 
   // Residuals (set by Evaluate()): invariant {fsqr,fsqz,fsql} and
@@ -514,6 +592,37 @@ class VmecModel {
 
   int ijacob() const { return vmec_->fc_.ijacob; }
   Eigen::VectorXd raxis_c() const { return vmec_->b_.raxis_c; }
+  // H v around the state x, by central differences of the raw force; leaves
+  // the state of this model perturbed.
+  Eigen::VectorXd HessianVectorProductAt(const Eigen::VectorXd &x,
+                                         const Eigen::VectorXd &v,
+                                         double eps_rel) {
+    const double vnorm = v.norm();
+    if (vnorm == 0.0) {
+      return Eigen::VectorXd::Zero(x.size());
+    }
+    const double eps = eps_rel * (1.0 + x.norm()) / vnorm;
+    UnflattenActive(*vmec_->decomposed_x_[0], x + eps * v);
+    Evaluate(2, 2, /*precondition=*/false);
+    const Eigen::VectorXd fp = FlattenActive(*vmec_->decomposed_f_[0]);
+    UnflattenActive(*vmec_->decomposed_x_[0], x - eps * v);
+    Evaluate(2, 2, /*precondition=*/false);
+    const Eigen::VectorXd fm = FlattenActive(*vmec_->decomposed_f_[0]);
+    return (fp - fm) / (2.0 * eps);
+  }
+
+  // Make sure there are at least `num_workers` worker models at the current
+  // resolution. The raw force only depends on the state and on the
+  // (ns-dependent) radial profiles, so freshly created models are equivalent.
+  void EnsureWorkers(int num_workers) {
+    if (!workers_.empty() && workers_.front()->ns() != ns()) {
+      workers_.clear();
+    }
+    while (static_cast<int>(workers_.size()) < num_workers) {
+      workers_.push_back(Create(vmec_->indata_, ns(), std::nullopt));
+    }
+  }
+
   static bool openmp_enabled() {
 #ifdef _OPENMP
     return true;
@@ -524,6 +633,10 @@ class VmecModel {
 
   std::unique_ptr<vmecpp::Vmec> vmec_;
 
+  // Models at the same resolution as this one that evaluate the columns of
+  // HessianMatrixProduct concurrently; created on first use.
+  std::vector<std::unique_ptr<VmecModel>> workers_;
+
   // Preconditioner / Nestor update bookkeeping, mirroring the like-named Vmec
   // members; the Python loop drives the iteration counters via Evaluate, so the
   // wrapper keeps these running values across calls.
@@ -672,6 +785,7 @@ PYBIND11_MODULE(_vmecpp, m) {
   py::native_enum<vmecpp::IterationStyle>(m, "IterationStyle", "enum.Enum")
       .value("VMEC_8_52", vmecpp::IterationStyle::VMEC_8_52)
       .value("PARVMEC", vmecpp::IterationStyle::PARVMEC)
+      .value("ANDERSON", vmecpp::IterationStyle::ANDERSON)
       .export_values()
       .finalize();
 
@@ -1083,6 +1197,95 @@ PYBIND11_MODULE(_vmecpp, m) {
       .def_readwrite("currumns", &vmecpp::WOutFileContents::currumns)
       .def_readwrite("currvmns", &vmecpp::WOutFileContents::currvmns);
 
+  // Vectorized evaluation of the wout Fourier series at arbitrary points,
+  // see vmecpp/vmec/wout_evaluator.
+  m.def(
+      "evaluate_wout",
+      [](const vmecpp::WOutFileContents &wout, const VectorXd &s,
+         const VectorXd &theta, const VectorXd &zeta,
+         const std::vector<std::string> &quantities,
+         std::optional<int> max_threads) {
+        std::vector<vmecpp::WOutQuantity> parsed_quantities;
+        for (const std::string &name : quantities) {
+          auto maybe_quantity = vmecpp::WOutQuantityFromString(name);
+          parsed_quantities.push_back(GetValueOrThrow(maybe_quantity));
+        }
+        absl::StatusOr<std::vector<VectorXd>> ret;
+        {
+          py::gil_scoped_release release;
+          const vmecpp::WOutEvaluator evaluator(wout);
+          ret = evaluator.Evaluate(s, theta, zeta, parsed_quantities,
+                                   max_threads);
+        }
+        const std::vector<VectorXd> &values = GetValueOrThrow(ret);
+        py::dict result;
+        for (std::size_t q = 0; q < quantities.size(); ++q) {
+          result[py::str(quantities[q])] = values[q];
+        }
+        return result;
+      },
+      py::arg("wout"), py::arg("s"), py::arg("theta"), py::arg("zeta"),
+      py::arg("quantities"), py::arg("max_threads") = std::nullopt);
+  m.def(
+      "wout_to_flux_coordinates",
+      [](const vmecpp::WOutFileContents &wout, const VectorXd &r,
+         const VectorXd &phi, const VectorXd &z, double tolerance,
+         int max_iterations, std::optional<int> max_threads) {
+        absl::StatusOr<vmecpp::FluxCoordinates> ret;
+        {
+          py::gil_scoped_release release;
+          const vmecpp::WOutEvaluator evaluator(wout);
+          ret = evaluator.ToFluxCoordinates(r, phi, z, tolerance,
+                                            max_iterations, max_threads);
+        }
+        const vmecpp::FluxCoordinates &flux_coordinates = GetValueOrThrow(ret);
+        return py::make_tuple(flux_coordinates.s, flux_coordinates.theta,
+                              flux_coordinates.inside);
+      },
+      py::arg("wout"), py::arg("r"), py::arg("phi"), py::arg("z"),
+      py::arg("tolerance") = 1.0e-10, py::arg("max_iterations") = 50,
+      py::arg("max_threads") = std::nullopt);
+
+  py::class_<vmecpp::BoozerSpectra>(m, "BoozerSpectra")
+      .def_readonly("mboz", &vmecpp::BoozerSpectra::mboz)
+      .def_readonly("nboz", &vmecpp::BoozerSpectra::nboz)
+      .def_readonly("nfp", &vmecpp::BoozerSpectra::nfp)
+      .def_readonly("xm_b", &vmecpp::BoozerSpectra::xm_b)
+      .def_readonly("xn_b", &vmecpp::BoozerSpectra::xn_b)
+      .def_readonly("compute_surfs", &vmecpp::BoozerSpectra::compute_surfs)
+      .def_readonly("s_b", &vmecpp::BoozerSpectra::s_b)
+      .def_readonly("iota_b", &vmecpp::BoozerSpectra::iota_b)
+      .def_readonly("bvco_b", &vmecpp::BoozerSpectra::bvco_b)
+      .def_readonly("buco_b", &vmecpp::BoozerSpectra::buco_b)
+      .def_readonly("bmnc_b", &vmecpp::BoozerSpectra::bmnc_b)
+      .def_readonly("rmnc_b", &vmecpp::BoozerSpectra::rmnc_b)
+      .def_readonly("zmns_b", &vmecpp::BoozerSpectra::zmns_b)
+      .def_readonly("numns_b", &vmecpp::BoozerSpectra::numns_b)
+      .def_readonly("gmnc_b", &vmecpp::BoozerSpectra::gmnc_b);
+
+  m.def(
+      "boozer_transform",
+      [](const vmecpp::WOutFileContents &wout, int mboz, int nboz,
+         const std::vector<int> &surfaces, std::optional<int> max_threads) {
+        absl::StatusOr<vmecpp::BoozerSpectra> ret;
+        {
+          py::gil_scoped_release release;
+          ret = vmecpp::ComputeBoozerTransform(wout, mboz, nboz, surfaces,
+                                               max_threads);
+        }
+        return GetValueOrThrow(ret);
+      },
+      py::arg("wout"), py::arg("mboz"), py::arg("nboz"),
+      py::arg("surfaces") = std::vector<int>(),
+      py::arg("max_threads") = std::nullopt);
+
+  py::class_<vmecpp::TimingReport>(m, "TimingReport")
+      .def_readonly("stages", &vmecpp::TimingReport::stages)
+      .def_readonly("seconds", &vmecpp::TimingReport::seconds)
+      .def_readonly("thread_seconds", &vmecpp::TimingReport::thread_seconds)
+      .def_readonly("calls", &vmecpp::TimingReport::calls)
+      .def_readonly("total_seconds", &vmecpp::TimingReport::total_seconds);
+
   py::class_<vmecpp::OutputQuantities>(m, "OutputQuantities")
       .def_readonly("jxbout", &vmecpp::OutputQuantities::jxbout)
       .def_readonly("mercier", &vmecpp::OutputQuantities::mercier)
@@ -1098,6 +1301,7 @@ PYBIND11_MODULE(_vmecpp, m) {
                     &vmecpp::OutputQuantities::threed1_shafranov_integrals)
       .def_readonly("wout", &vmecpp::OutputQuantities::wout)
       .def_readonly("indata", &vmecpp::OutputQuantities::indata)
+      .def_readonly("timings", &vmecpp::OutputQuantities::timings)
       .def(
           "save",
           [](const vmecpp::OutputQuantities &oq,
@@ -1129,12 +1333,54 @@ PYBIND11_MODULE(_vmecpp, m) {
       .def_readwrite("wout", &vmecpp::HotRestartState::wout)
       .def_readwrite("indata", &vmecpp::HotRestartState::indata);
 
+  py::class_<vmecpp::EarlyStopCriteria>(m, "EarlyStopCriteria")
+      .def(py::init([](int stagnation_window, double stagnation_factor,
+                       int max_restarts, double min_time_step_fraction) {
+             vmecpp::EarlyStopCriteria criteria;
+             criteria.stagnation_window = stagnation_window;
+             criteria.stagnation_factor = stagnation_factor;
+             criteria.max_restarts = max_restarts;
+             criteria.min_time_step_fraction = min_time_step_fraction;
+             return criteria;
+           }),
+           py::arg("stagnation_window") = 0, py::arg("stagnation_factor") = 0.5,
+           py::arg("max_restarts") = 0, py::arg("min_time_step_fraction") = 0.0)
+      .def_readwrite("stagnation_window",
+                     &vmecpp::EarlyStopCriteria::stagnation_window)
+      .def_readwrite("stagnation_factor",
+                     &vmecpp::EarlyStopCriteria::stagnation_factor)
+      .def_readwrite("max_restarts", &vmecpp::EarlyStopCriteria::max_restarts)
+      .def_readwrite("min_time_step_fraction",
+                     &vmecpp::EarlyStopCriteria::min_time_step_fraction);
+
+  py::class_<vmecpp::IterationRecord>(m, "IterationRecord")
+      .def_readonly("ns", &vmecpp::IterationRecord::ns)
+      .def_readonly("iteration", &vmecpp::IterationRecord::iteration)
+      .def_readonly("fsqr", &vmecpp::IterationRecord::fsqr)
+      .def_readonly("fsqz", &vmecpp::IterationRecord::fsqz)
+      .def_readonly("fsql", &vmecpp::IterationRecord::fsql)
+      .def_readonly("fsqr1", &vmecpp::IterationRecord::fsqr1)
+      .def_readonly("fsqz1", &vmecpp::IterationRecord::fsqz1)
+      .def_readonly("fsql1", &vmecpp::IterationRecord::fsql1)
+      .def_readonly("time_step", &vmecpp::IterationRecord::time_step)
+      .def_readonly("mhd_energy", &vmecpp::IterationRecord::mhd_energy)
+      .def_readonly("delbsq", &vmecpp::IterationRecord::delbsq)
+      .def_property_readonly("restart_reason",
+                             [](const vmecpp::IterationRecord &record) {
+                               return static_cast<int>(record.restart_reason);
+                             });
+
   m.def(
       "run",
       [](const VmecINDATA &indata,
          std::optional<vmecpp::HotRestartState> initial_state,
-         std::optional<int> max_threads,
-         vmecpp::OutputMode verbose) -> vmecpp::OutputQuantities {
+         std::optional<int> max_threads, vmecpp::OutputMode verbose,
+         bool profile, std::optional<py::function> iteration_callback,
+         int iteration_callback_stride,
+         const vmecpp::EarlyStopCriteria &early_stop,
+         std::optional<std::filesystem::path> save_state_to,
+         int save_state_every, std::optional<std::filesystem::path> resume_from)
+          -> vmecpp::OutputQuantities {
         bool was_interrupted = false;
         auto interrupt_check = [&was_interrupted]() -> bool {
           if (was_interrupted) {
@@ -1147,20 +1393,35 @@ PYBIND11_MODULE(_vmecpp, m) {
           }
           return false;
         };
+        std::optional<py::error_already_set> callback_error;
+        auto on_iterations =
+            MakeIterationCallback(iteration_callback, callback_error);
+        const vmecpp::SolverStateOptions solver_state = MakeSolverStateOptions(
+            save_state_to, save_state_every, resume_from);
         absl::StatusOr<vmecpp::OutputQuantities> ret;
         {
           py::gil_scoped_release release;
-          ret = vmecpp::run(indata, std::move(initial_state), max_threads,
-                            verbose, interrupt_check);
+          ret =
+              vmecpp::run(indata, std::move(initial_state), max_threads,
+                          verbose, interrupt_check, profile, on_iterations,
+                          iteration_callback_stride, early_stop, solver_state);
         }
         if (was_interrupted) {
           throw py::error_already_set();
         }
+        if (callback_error.has_value()) {
+          throw *callback_error;
+        }
         return GetValueOrThrow(ret);
       },
       py::arg("indata"), py::arg("initial_state") = std::nullopt,
       py::arg("max_threads") = std::nullopt,
-      py::arg("verbose") = vmecpp::OutputMode::kProgress);
+      py::arg("verbose") = vmecpp::OutputMode::kProgress,
+      py::arg("profile") = false, py::arg("iteration_callback") = std::nullopt,
+      py::arg("iteration_callback_stride") = 1,
+      py::arg("early_stop") = vmecpp::EarlyStopCriteria(),
+      py::arg("save_state_to") = std::nullopt,
+      py::arg("save_state_every") = 100, py::arg("resume_from") = std::nullopt);
 
   py::class_<makegrid::MakegridParameters>(m, "MakegridParameters")
       .def(py::init<bool, bool, int, double, double, int, double, double, int,
@@ -1206,7 +1467,74 @@ PYBIND11_MODULE(_vmecpp, m) {
                 magnetics::ImportMagneticConfigurationFromCoilsFile(file);
             return GetValueOrThrow(maybe_config);
           },
-          py::arg("file"));
+          py::arg("file"))
+      .def_static(
+          "from_arrays",
+          [](const std::vector<Eigen::MatrixX3d> &points_per_coil,
+             const Eigen::VectorXd &currents,
+             const std::vector<int> &circuit_ids, int nfp, bool stellsym) {
+            auto maybe_config =
+                magnetics::ImportMagneticConfigurationFromPolygons(
+                    points_per_coil, currents, circuit_ids, nfp, stellsym);
+            return GetValueOrThrow(maybe_config);
+          },
+          py::arg("points_per_coil"), py::arg("currents"),
+          py::arg("circuit_ids"), py::arg("nfp") = 1,
+          py::arg("stellsym") = false)
+      .def_property_readonly(
+          "num_field_periods",
+          &magnetics::MagneticConfiguration::num_field_periods)
+      .def_property_readonly(
+          "num_serial_circuits",
+          &magnetics::MagneticConfiguration::serial_circuits_size);
+
+  m.def(
+      "magnetic_field",
+      [](const magnetics::MagneticConfiguration &magnetic_configuration,
+         const Eigen::Ref<const magnetics::RowMatrixX3d> &points,
+         std::optional<int> max_threads) {
+        absl::StatusOr<magnetics::RowMatrixX3d> ret;
+        {
+          py::gil_scoped_release release;
+          ret = magnetics::MagneticField(magnetic_configuration, points,
+                                         max_threads);
+        }
+        return GetValueOrThrow(ret);
+      },
+      py::arg("magnetic_configuration"), py::arg("points"),
+      py::arg("max_threads") = std::nullopt);
+  m.def(
+      "magnetic_field_adjoint",
+      [](const magnetics::MagneticConfiguration &magnetic_configuration,
+         const Eigen::Ref<const magnetics::RowMatrixX3d> &points,
+         const Eigen::Ref<const magnetics::RowMatrixX3d> &cotangents,
+         std::optional<int> max_threads) {
+        absl::StatusOr<std::vector<magnetics::RowMatrixX3d>> ret;
+        {
+          py::gil_scoped_release release;
+          ret = magnetics::MagneticFieldAdjoint(magnetic_configuration, points,
+                                                cotangents, max_threads);
+        }
+        return GetValueOrThrow(ret);
+      },
+      py::arg("magnetic_configuration"), py::arg("points"),
+      py::arg("cotangents"), py::arg("max_threads") = std::nullopt);
+  m.def(
+      "vector_potential",
+      [](const magnetics::MagneticConfiguration &magnetic_configuration,
+         const Eigen::Ref<const magnetics::RowMatrixX3d> &points,
+         std::optional<int> max_threads) {
+        absl::StatusOr<magnetics::RowMatrixX3d> ret;
+        {
+          py::gil_scoped_release release;
+          ret = magnetics::VectorPotential(magnetic_configuration, points,
+                                           max_threads);
+        }
+        return GetValueOrThrow(ret);
+      },
+      py::arg("magnetic_configuration"), py::arg("points"),
+      py::arg("max_threads") = std::nullopt);
+
   auto response_table =
       py::class_<makegrid::MagneticFieldResponseTable>(
           m, "MagneticFieldResponseTable")
@@ -1225,6 +1553,49 @@ PYBIND11_MODULE(_vmecpp, m) {
   DefEigenProperty(response_table, "b_z",
                    &makegrid::MagneticFieldResponseTable::b_z);
 
+  // Views reference the memory of their arrays instead of copying it, e.g. of
+  // memory-mapped arrays that are shared between processes; noconvert() turns
+  // arrays that would need a converted copy into an error.
+  py::class_<makegrid::MagneticFieldResponseTableView>(
+      m, "MagneticFieldResponseTableView")
+      .def(py::init<const makegrid::MagneticFieldResponseTable &>(),
+           py::arg("response_table"), py::keep_alive<1, 2>())
+      .def(py::init([](const makegrid::MakegridParameters &parameters,
+                       const Eigen::Ref<const makegrid::RowMatrixXd> &b_r,
+                       const Eigen::Ref<const makegrid::RowMatrixXd> &b_p,
+                       const Eigen::Ref<const makegrid::RowMatrixXd> &b_z) {
+             const Eigen::Index num_grid_points =
+                 static_cast<Eigen::Index>(
+                     parameters.number_of_phi_grid_points) *
+                 parameters.number_of_z_grid_points *
+                 parameters.number_of_r_grid_points;
+             for (const auto *b : {&b_r, &b_p, &b_z}) {
+               if (b->rows() != b_r.rows() || b->cols() != num_grid_points ||
+                   b->outerStride() != b->cols()) {
+                 throw py::value_error(
+                     "b_r, b_p and b_z must be C-contiguous arrays of shape (" +
+                     std::to_string(b_r.rows()) + ", " +
+                     std::to_string(num_grid_points) + ").");
+               }
+             }
+             return makegrid::MagneticFieldResponseTableView(
+                 parameters,
+                 Eigen::Map<const makegrid::RowMatrixXd>(b_r.data(), b_r.rows(),
+                                                         b_r.cols()),
+                 Eigen::Map<const makegrid::RowMatrixXd>(b_p.data(), b_p.rows(),
+                                                         b_p.cols()),
+                 Eigen::Map<const makegrid::RowMatrixXd>(b_z.data(), b_z.rows(),
+                                                         b_z.cols()));
+           }),
+           py::arg("parameters"), py::arg("b_r").noconvert(),
+           py::arg("b_p").noconvert(), py::arg("b_z").noconvert(),
+           py::keep_alive<1, 3>(), py::keep_alive<1, 4>(),
+           py::keep_alive<1, 5>())
+      .def_readonly("parameters",
+                    &makegrid::MagneticFieldResponseTableView::parameters);
+  py::implicitly_convertible<makegrid::MagneticFieldResponseTable,
+                             makegrid::MagneticFieldResponseTableView>();
+
   m.def(
       "compute_magnetic_field_response_table",
       [](const makegrid::MakegridParameters &mgrid_params,
@@ -1234,13 +1605,35 @@ PYBIND11_MODULE(_vmecpp, m) {
         return GetValueOrThrow(ret);
       },
       py::arg("makegrid_parameters"), py::arg("magnetic_configuration"));
+  m.def(
+      "magnetic_field_response_table_adjoint",
+      [](const magnetics::MagneticConfiguration &magnetic_configuration,
+         const makegrid::MagneticFieldResponseTableView &cotangents,
+         std::optional<int> max_threads) {
+        absl::StatusOr<std::vector<magnetics::RowMatrixX3d>> ret;
+        {
+          py::gil_scoped_release release;
+          ret = makegrid::MagneticFieldResponseTableAdjoint(
+              magnetic_configuration, cotangents, max_threads);
+        }
+        return GetValueOrThrow(ret);
+      },
+      py::arg("magnetic_configuration"), py::arg("cotangents"),
+      py::arg("max_threads") = std::nullopt);
 
   m.def(
       "run",
       [](const VmecINDATA &indata,
-         const makegrid::MagneticFieldResponseTable &magnetic_response_table,
+         const makegrid::MagneticFieldResponseTableView
+             &magnetic_response_table,
          std::optional<vmecpp::HotRestartState> initial_state,
-         std::optional<int> max_threads, vmecpp::OutputMode verbose) {
+         std::optional<int> max_threads, vmecpp::OutputMode verbose,
+         bool profile, std::optional<py::function> iteration_callback,
+         int iteration_callback_stride,
+         const vmecpp::EarlyStopCriteria &early_stop,
+         std::optional<std::filesystem::path> save_state_to,
+         int save_state_every,
+         std::optional<std::filesystem::path> resume_from) {
         bool was_interrupted = false;
         auto interrupt_check = [&was_interrupted]() -> bool {
           if (was_interrupted) return true;
@@ -1251,22 +1644,115 @@ PYBIND11_MODULE(_vmecpp, m) {
           }
           return false;
         };
+        std::optional<py::error_already_set> callback_error;
+        auto on_iterations =
+            MakeIterationCallback(iteration_callback, callback_error);
+        const vmecpp::SolverStateOptions solver_state = MakeSolverStateOptions(
+            save_state_to, save_state_every, resume_from);
         absl::StatusOr<vmecpp::OutputQuantities> ret;
         {
           py::gil_scoped_release release;
-          ret = vmecpp::run(indata, magnetic_response_table,
-                            std::move(initial_state), max_threads, verbose,
-                            interrupt_check);
+          ret = vmecpp::run(
+              indata, magnetic_response_table, std::move(initial_state),
+              max_threads, verbose, interrupt_check, profile, on_iterations,
+              iteration_callback_stride, early_stop, solver_state);
         }
         if (was_interrupted) {
           throw py::error_already_set();
         }
+        if (callback_error.has_value()) {
+          throw *callback_error;
+        }
         return GetValueOrThrow(ret);
       },
       py::arg("indata"), py::arg("magnetic_response_table"),
       py::arg("initial_state") = std::nullopt,
       py::arg("max_threads") = std::nullopt,
-      py::arg("verbose") = vmecpp::OutputMode::kProgress);
+      py::arg("verbose") = vmecpp::OutputMode::kProgress,
+      py::arg("profile") = false, py::arg("iteration_callback") = std::nullopt,
+      py::arg("iteration_callback_stride") = 1,
+      py::arg("early_stop") = vmecpp::EarlyStopCriteria(),
+      py::arg("save_state_to") = std::nullopt,
+      py::arg("save_state_every") = 100, py::arg("resume_from") = std::nullopt);
+
+  m.def(
+      "run_extcur_batch",
+      [](const VmecINDATA &indata,
+         const makegrid::MagneticFieldResponseTableView
+             &magnetic_response_table,
+         const makegrid::RowMatrixXd &extcur_batch,
+         std::optional<vmecpp::HotRestartState> initial_state,
+         std::optional<int> max_threads, std::optional<int> max_concurrent_runs,
+         vmecpp::OutputMode verbose) {
+        bool was_interrupted = false;
+        auto interrupt_check = [&was_interrupted]() -> bool {
+          if (was_interrupted) return true;
+          py::gil_scoped_acquire acquire;
+          if (PyErr_CheckSignals() != 0) {
+            was_interrupted = true;
+            return true;
+          }
+          return false;
+        };
+        std::vector<absl::StatusOr<vmecpp::OutputQuantities>> results;
+        {
+          py::gil_scoped_release release;
+          results = vmecpp::run_extcur_batch(
+              indata, magnetic_response_table, extcur_batch, initial_state,
+              max_threads, max_concurrent_runs, verbose, interrupt_check);
+        }
+        if (was_interrupted) {
+          throw py::error_already_set();
+        }
+        // failed runs are returned as their error message, so that one
+        // failure does not discard the results of the other runs
+        py::list ret;
+        for (absl::StatusOr<vmecpp::OutputQuantities> &result : results) {
+          if (result.ok()) {
+            ret.append(py::cast(std::move(result).value()));
+          } else {
+            ret.append(py::str(std::string(result.status().message())));
+          }
+        }
+        return ret;
+      },
+      py::arg("indata"), py::arg("magnetic_response_table"),
+      py::arg("extcur_batch"), py::arg("initial_state") = std::nullopt,
+      py::arg("max_threads") = std::nullopt,
+      py::arg("max_concurrent_runs") = std::nullopt,
+      py::arg("verbose") = vmecpp::OutputMode::kSilent);
+
+  // Per-thread buffers are recycled across consecutive runs with the same
+  // resolution (see vmecpp/vmec/workspace_pool). These give control over the
+  // process-wide pool, e.g. to release its memory or for benchmarking.
+  m.def(
+      "set_workspace_pool_enabled",
+      [](bool enabled) { vmecpp::WorkspacePool::Global().SetEnabled(enabled); },
+      py::arg("enabled"));
+  m.def("clear_workspace_pool",
+        []() { vmecpp::WorkspacePool::Global().Clear(); });
+
+  // Likewise, the Fourier basis tables are shared by all runs with the same
+  // resolution (see vmecpp/common/fourier_basis_cache).
+  m.def(
+      "set_fourier_basis_cache_enabled",
+      [](bool enabled) {
+        vmecpp::FourierBasisCache::Global().SetEnabled(enabled);
+      },
+      py::arg("enabled"));
+  m.def("clear_fourier_basis_cache",
+        []() { vmecpp::FourierBasisCache::Global().Clear(); });
+
+  // Process-wide choice of the radial tri-diagonal solver of the R/Z
+  // preconditioner, picked up by runs that start afterwards.
+  py::native_enum<vmecpp::RadialTridiagonalSolver>(m, "RadialTridiagonalSolver",
+                                                   "enum.Enum")
+      .value("MODE_PARALLEL", vmecpp::RadialTridiagonalSolver::kModeParallel)
+      .value("PARTITIONED", vmecpp::RadialTridiagonalSolver::kPartitioned)
+      .finalize();
+  m.def("set_radial_tridiagonal_solver", &vmecpp::SetRadialTridiagonalSolver,
+        py::arg("solver"));
+  m.def("get_radial_tridiagonal_solver", &vmecpp::GetRadialTridiagonalSolver);
 
   // Single-resolution iteration model: exposes the forward model and the
   // time-step / restart primitives so the equilibrium iteration can be driven
@@ -1281,6 +1767,8 @@ PYBIND11_MODULE(_vmecpp, m) {
       .def("perform_time_step", &VmecModel::PerformTimeStep,
            py::arg("velocity_scale"), py::arg("conjugation_parameter"),
            py::arg("time_step"))
+      .def("anderson_time_step", &VmecModel::AndersonTimeStep, py::arg("iter1"),
+           py::arg("iter2"), py::arg("time_step"))
       .def("save_backup", &VmecModel::SaveBackup)
       .def("restore_backup", &VmecModel::RestoreBackup)
       .def("zero_velocity", &VmecModel::ZeroVelocity)
@@ -1293,10 +1781,17 @@ PYBIND11_MODULE(_vmecpp, m) {
       .def("get_state", &VmecModel::GetState)
       .def("set_state", &VmecModel::SetState, py::arg("state"))
       .def("get_forces", &VmecModel::GetForces)
+      .def_property_readonly("state_view", &VmecModel::StateView,
+                             py::return_value_policy::reference_internal)
+      .def_property_readonly("force_view", &VmecModel::ForceView,
+                             py::return_value_policy::reference_internal)
       .def("apply_preconditioner", &VmecModel::ApplyPreconditioner,
            py::arg("v"))
       .def("hessian_vector_product", &VmecModel::HessianVectorProduct,
            py::arg("v"), py::arg("eps_rel") = 1e-7)
+      .def("hessian_matrix_product", &VmecModel::HessianMatrixProduct,
+           py::arg("V"), py::arg("eps_rel") = 1e-7,
+           py::arg("max_threads") = py::none())
       .def_property_readonly("force_eval_count", &VmecModel::force_eval_count)
       .def("reset_force_eval_count", &VmecModel::reset_force_eval_count)
       .def_property_readonly("fsqr", &VmecModel::fsqr)
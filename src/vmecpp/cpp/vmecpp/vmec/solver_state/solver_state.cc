@@ -0,0 +1,190 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/solver_state/solver_state.h"
+
+#include <string>
+#include <system_error>
+
+#include "absl/strings/str_format.h"
+#include "util/hdf5_io/hdf5_io.h"
+
+using hdf5_io::ReadH5Dataset;
+using hdf5_io::WriteH5Dataset;
+
+// Shorthands for the calls required to read/write data members from/to HDF5
+// files. They assume that `H5key`, `file`, `m_obj` and `from_file` are
+// available in the calling context.
+#define WRITEMEMBER(x) \
+  WriteH5Dataset(x, absl::StrFormat("%s/%s", H5key, #x), file);
+#define READMEMBER(x) \
+  ReadH5Dataset(m_obj.x, absl::StrFormat("%s/%s", H5key, #x), from_file);
+
+absl::Status vmecpp::SolverState::Save(
+    const std::filesystem::path& path) const {
+  std::filesystem::path tmp_path = path;
+  tmp_path += ".tmp";
+
+  try {
+    H5::H5File file(tmp_path, H5F_ACC_TRUNC);
+    absl::Status status = WriteTo(file);
+    if (!status.ok()) {
+      return status;
+    }
+    file.close();
+  } catch (const H5::Exception& e) {
+    return absl::InternalError(
+        absl::StrFormat("Could not write solver state to '%s': %s",
+                        tmp_path.string(), e.getDetailMsg()));
+  }
+
+  std::error_code error;
+  std::filesystem::rename(tmp_path, path, error);
+  if (error) {
+    return absl::InternalError(
+        absl::StrFormat("Could not move solver state from '%s' to '%s': %s",
+                        tmp_path.string(), path.string(), error.message()));
+  }
+
+  return absl::OkStatus();
+}
+
+absl::StatusOr<vmecpp::SolverState> vmecpp::SolverState::Load(
+    const std::filesystem::path& path) {
+  if (!std::filesystem::exists(path)) {
+    return absl::NotFoundError(absl::StrFormat(
+        "Solver state file '%s' does not exist.", path.string()));
+  }
+
+  SolverState state;
+  try {
+    H5::H5File file(path, H5F_ACC_RDONLY);
+    absl::Status status = LoadInto(state, file);
+    if (!status.ok()) {
+      return status;
+    }
+  } catch (const H5::Exception& e) {
+    return absl::InvalidArgumentError(
+        absl::StrFormat("Could not read solver state from '%s': %s",
+                        path.string(), e.getDetailMsg()));
+  }
+
+  return state;
+}
+
+absl::Status vmecpp::SolverState::WriteTo(H5::H5File& file) const {
+  file.createGroup(H5key);
+  WRITEMEMBER(mpol);
+  WRITEMEMBER(ntor);
+  WRITEMEMBER(nfp);
+  WRITEMEMBER(lasym);
+  WRITEMEMBER(lfreeb);
+  WRITEMEMBER(nZeta);
+  WRITEMEMBER(nThetaReduced);
+
+  WRITEMEMBER(jacob_off);
+  WRITEMEMBER(igrid);
+  WRITEMEMBER(ns);
+
+  WRITEMEMBER(iter1);
+  WRITEMEMBER(iter2);
+  WRITEMEMBER(ijacob);
+  WRITEMEMBER(last_preconditioner_update);
+  WRITEMEMBER(last_full_update_nestor);
+
+  WRITEMEMBER(delt0r);
+  WRITEMEMBER(res0);
+  WRITEMEMBER(res1);
+  WRITEMEMBER(fsq);
+  WRITEMEMBER(fsqr);
+  WRITEMEMBER(fsqz);
+  WRITEMEMBER(fsql);
+  WRITEMEMBER(inv_tau);
+
+  WRITEMEMBER(force_residual_r);
+  WRITEMEMBER(force_residual_z);
+  WRITEMEMBER(force_residual_lambda);
+  WRITEMEMBER(mhd_energy);
+  WRITEMEMBER(delbsq);
+  WRITEMEMBER(restart_reasons);
+
+  WRITEMEMBER(decomposed_x);
+  WRITEMEMBER(decomposed_v);
+  WRITEMEMBER(physical_x_backup);
+
+  WRITEMEMBER(voli);
+
+  WRITEMEMBER(raxis_c);
+  WRITEMEMBER(zaxis_s);
+  WRITEMEMBER(raxis_s);
+  WRITEMEMBER(zaxis_c);
+
+  WRITEMEMBER(vacuum_pressure_state);
+  WRITEMEMBER(nvacskip);
+  WRITEMEMBER(rCon0);
+  WRITEMEMBER(zCon0);
+
+  return absl::OkStatus();
+}
+
+absl::Status vmecpp::SolverState::LoadInto(SolverState& m_obj,
+                                           H5::H5File& from_file) {
+  if (!from_file.nameExists(H5key)) {
+    return absl::InvalidArgumentError(
+        absl::StrFormat("'%s' does not contain a VMEC++ solver state.",
+                        from_file.getFileName()));
+  }
+
+  READMEMBER(mpol);
+  READMEMBER(ntor);
+  READMEMBER(nfp);
+  READMEMBER(lasym);
+  READMEMBER(lfreeb);
+  READMEMBER(nZeta);
+  READMEMBER(nThetaReduced);
+
+  READMEMBER(jacob_off);
+  READMEMBER(igrid);
+  READMEMBER(ns);
+
+  READMEMBER(iter1);
+  READMEMBER(iter2);
+  READMEMBER(ijacob);
+  READMEMBER(last_preconditioner_update);
+  READMEMBER(last_full_update_nestor);
+
+  READMEMBER(delt0r);
+  READMEMBER(res0);
+  READMEMBER(res1);
+  READMEMBER(fsq);
+  READMEMBER(fsqr);
+  READMEMBER(fsqz);
+  READMEMBER(fsql);
+  READMEMBER(inv_tau);
+
+  READMEMBER(force_residual_r);
+  READMEMBER(force_residual_z);
+  READMEMBER(force_residual_lambda);
+  READMEMBER(mhd_energy);
+  READMEMBER(delbsq);
+  READMEMBER(restart_reasons);
+
+  READMEMBER(decomposed_x);
+  READMEMBER(decomposed_v);
+  READMEMBER(physical_x_backup);
+
+  READMEMBER(voli);
+
+  READMEMBER(raxis_c);
+  READMEMBER(zaxis_s);
+  READMEMBER(raxis_s);
+  READMEMBER(zaxis_c);
+
+  READMEMBER(vacuum_pressure_state);
+  READMEMBER(nvacskip);
+  READMEMBER(rCon0);
+  READMEMBER(zCon0);
+
+  return absl::OkStatus();
+}
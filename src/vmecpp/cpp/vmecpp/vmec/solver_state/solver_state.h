@@ -0,0 +1,130 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#ifndef VMECPP_VMEC_SOLVER_STATE_SOLVER_STATE_H_
+#define VMECPP_VMEC_SOLVER_STATE_SOLVER_STATE_H_
+
+#include <Eigen/Dense>
+#include <filesystem>
+#include <vector>
+
+#include "H5Cpp.h"
+#include "absl/status/status.h"
+#include "absl/status/statusor.h"
+
+namespace vmecpp {
+
+// Where and how often a run saves its SolverState, and where to resume from.
+// Both are disabled by default.
+struct SolverStateOptions {
+  // File that is overwritten with the latest SolverState while the run
+  // progresses. Nothing is written if empty.
+  std::filesystem::path save_to;
+
+  // Minimum number of iterations between two snapshots. Snapshots are only
+  // taken at iterations after which the solver rebuilds all of its derived
+  // data anyway (radial preconditioner and, in free-boundary runs, the full
+  // NESTOR update), so the actual spacing is rounded up to the next such
+  // iteration.
+  int save_every = 100;
+
+  // Continue the run from the SolverState stored in this file instead of
+  // starting from scratch. Ignored if empty.
+  std::filesystem::path resume_from;
+
+  bool operator==(const SolverStateOptions&) const = default;
+};
+
+// Snapshot of a running VMEC++ solve, from which the run can be resumed as if
+// it had never stopped.
+//
+// All radial arrays cover the full radial grid [0, ns), independently of how
+// the surfaces were distributed over threads, so a run can be resumed with a
+// different number of threads. Fourier coefficients are stored as
+// [component][j][mn], in the component order of
+// FourierCoeffs::flatCoefficients().
+struct SolverState {
+  // resolution the state belongs to; checked when resuming
+  int mpol = 0;
+  int ntor = 0;
+  int nfp = 0;
+  bool lasym = false;
+  bool lfreeb = false;
+  int nZeta = 0;
+  int nThetaReduced = 0;
+
+  // position in the multigrid sequence, see Vmec::run
+  int jacob_off = 0;
+  int igrid = 0;
+  int ns = 0;
+
+  // iteration counters; iter2 is the iteration that comes next
+  int iter1 = 0;
+  int iter2 = 0;
+  int ijacob = 0;
+  int last_preconditioner_update = 0;
+  int last_full_update_nestor = 0;
+
+  // time step control
+  double delt0r = 0.0;
+  double res0 = 0.0;
+  double res1 = 0.0;
+  double fsq = 0.0;
+  double fsqr = 0.0;
+  double fsqz = 0.0;
+  double fsql = 0.0;
+  Eigen::VectorXd inv_tau;
+
+  // convergence history of the whole run so far, see FlowControl
+  std::vector<double> force_residual_r;
+  std::vector<double> force_residual_z;
+  std::vector<double> force_residual_lambda;
+  std::vector<double> mhd_energy;
+  std::vector<double> delbsq;
+  std::vector<int> restart_reasons;
+
+  // state vector, its velocity and the last known good state vector
+  Eigen::VectorXd decomposed_x;
+  Eigen::VectorXd decomposed_v;
+  Eigen::VectorXd physical_x_backup;
+
+  // plasma volume at the start of the multigrid step
+  double voli = 0.0;
+
+  // magnetic axis guess, which may have been recomputed after a bad Jacobian
+  Eigen::VectorXd raxis_c;
+  Eigen::VectorXd zaxis_s;
+  Eigen::VectorXd raxis_s;
+  Eigen::VectorXd zaxis_c;
+
+  // NESTOR vacuum state: initialization state (VacuumPressureState),
+  // iterations between full updates and the [ns x nZnT] constraint forces
+  // that are being faded out as the vacuum pressure is turned on
+  int vacuum_pressure_state = 0;
+  int nvacskip = 0;
+  Eigen::VectorXd rCon0;
+  Eigen::VectorXd zCon0;
+
+  // Write the state to a new HDF5 file at `path`, replacing any existing one.
+  // The file is first written next to `path` and then renamed, so `path`
+  // always holds a complete snapshot even if the process dies while writing.
+  absl::Status Save(const std::filesystem::path& path) const;
+
+  // Load a state written by Save.
+  static absl::StatusOr<SolverState> Load(const std::filesystem::path& path);
+
+  // Write object to the specified HDF5 file, under key this->H5key.
+  absl::Status WriteTo(H5::H5File& file) const;
+
+  // Read object from the specified HDF5 file, from key this->H5key,
+  // into m_obj. The file is expected to have been produced by
+  // WriteTo.
+  static absl::Status LoadInto(SolverState& m_obj, H5::H5File& from_file);
+
+  static constexpr char H5key[] = "/solver_state";
+};
+
+}  // namespace vmecpp
+
+#endif  // VMECPP_VMEC_SOLVER_STATE_SOLVER_STATE_H_
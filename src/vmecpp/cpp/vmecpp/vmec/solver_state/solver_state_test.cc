@@ -0,0 +1,149 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/solver_state/solver_state.h"
+
+#include <filesystem>
+
+#include "H5Cpp.h"
+#include "gtest/gtest.h"
+
+namespace vmecpp {
+namespace {
+
+namespace fs = std::filesystem;
+
+SolverState MakeSolverState() {
+  SolverState state;
+  state.mpol = 5;
+  state.ntor = 4;
+  state.nfp = 5;
+  state.lasym = true;
+  state.lfreeb = true;
+  state.nZeta = 36;
+  state.nThetaReduced = 17;
+  state.jacob_off = 1;
+  state.igrid = 2;
+  state.ns = 25;
+  state.iter1 = 12;
+  state.iter2 = 87;
+  state.ijacob = 3;
+  state.last_preconditioner_update = 62;
+  state.last_full_update_nestor = 80;
+  state.delt0r = 0.81;
+  state.res0 = 1.0e-6;
+  state.res1 = 2.0e-6;
+  state.fsq = 3.0e-6;
+  state.fsqr = 4.0e-7;
+  state.fsqz = 5.0e-7;
+  state.fsql = 6.0e-7;
+  state.inv_tau = Eigen::VectorXd::LinSpaced(10, 0.1, 1.0);
+  state.force_residual_r = {1.0, 0.5, 0.25};
+  state.force_residual_z = {2.0, 1.0, 0.5};
+  state.force_residual_lambda = {3.0, 1.5, 0.75};
+  state.mhd_energy = {4.0, 3.5, 3.25};
+  state.delbsq = {0.0, 0.1, 0.01};
+  state.restart_reasons = {0, 2, 0};
+  state.decomposed_x = Eigen::VectorXd::LinSpaced(30, -1.0, 1.0);
+  state.decomposed_v = Eigen::VectorXd::LinSpaced(30, 1.0, 2.0);
+  state.physical_x_backup = Eigen::VectorXd::LinSpaced(30, -2.0, 0.0);
+  state.voli = 1.25;
+  state.raxis_c = Eigen::VectorXd::LinSpaced(5, 1.0, 0.1);
+  state.zaxis_s = Eigen::VectorXd::LinSpaced(5, 0.0, 0.1);
+  state.raxis_s = Eigen::VectorXd::Zero(5);
+  state.zaxis_c = Eigen::VectorXd::Zero(5);
+  state.vacuum_pressure_state = 2;
+  state.nvacskip = 6;
+  state.rCon0 = Eigen::VectorXd::LinSpaced(12, 0.0, 1.0);
+  state.zCon0 = Eigen::VectorXd::LinSpaced(12, 1.0, 0.0);
+  return state;
+}
+
+TEST(SolverStateTest, SaveAndLoad) {
+  const fs::path path = fs::path(testing::TempDir()) / "solver_state.h5";
+  const SolverState state = MakeSolverState();
+
+  ASSERT_TRUE(state.Save(path).ok());
+  // the temporary file has been moved into place
+  EXPECT_FALSE(fs::exists(fs::path(path.string() + ".tmp")));
+
+  const absl::StatusOr<SolverState> loaded = SolverState::Load(path);
+  ASSERT_TRUE(loaded.ok()) << loaded.status();
+
+  EXPECT_EQ(loaded->mpol, state.mpol);
+  EXPECT_EQ(loaded->ntor, state.ntor);
+  EXPECT_EQ(loaded->nfp, state.nfp);
+  EXPECT_EQ(loaded->lasym, state.lasym);
+  EXPECT_EQ(loaded->lfreeb, state.lfreeb);
+  EXPECT_EQ(loaded->nZeta, state.nZeta);
+  EXPECT_EQ(loaded->nThetaReduced, state.nThetaReduced);
+  EXPECT_EQ(loaded->jacob_off, state.jacob_off);
+  EXPECT_EQ(loaded->igrid, state.igrid);
+  EXPECT_EQ(loaded->ns, state.ns);
+  EXPECT_EQ(loaded->iter1, state.iter1);
+  EXPECT_EQ(loaded->iter2, state.iter2);
+  EXPECT_EQ(loaded->ijacob, state.ijacob);
+  EXPECT_EQ(loaded->last_preconditioner_update,
+            state.last_preconditioner_update);
+  EXPECT_EQ(loaded->last_full_update_nestor, state.last_full_update_nestor);
+  EXPECT_EQ(loaded->delt0r, state.delt0r);
+  EXPECT_EQ(loaded->res0, state.res0);
+  EXPECT_EQ(loaded->res1, state.res1);
+  EXPECT_EQ(loaded->fsq, state.fsq);
+  EXPECT_EQ(loaded->fsqr, state.fsqr);
+  EXPECT_EQ(loaded->fsqz, state.fsqz);
+  EXPECT_EQ(loaded->fsql, state.fsql);
+  EXPECT_EQ(loaded->inv_tau, state.inv_tau);
+  EXPECT_EQ(loaded->force_residual_r, state.force_residual_r);
+  EXPECT_EQ(loaded->force_residual_z, state.force_residual_z);
+  EXPECT_EQ(loaded->force_residual_lambda, state.force_residual_lambda);
+  EXPECT_EQ(loaded->mhd_energy, state.mhd_energy);
+  EXPECT_EQ(loaded->delbsq, state.delbsq);
+  EXPECT_EQ(loaded->restart_reasons, state.restart_reasons);
+  EXPECT_EQ(loaded->decomposed_x, state.decomposed_x);
+  EXPECT_EQ(loaded->decomposed_v, state.decomposed_v);
+  EXPECT_EQ(loaded->physical_x_backup, state.physical_x_backup);
+  EXPECT_EQ(loaded->voli, state.voli);
+  EXPECT_EQ(loaded->raxis_c, state.raxis_c);
+  EXPECT_EQ(loaded->zaxis_s, state.zaxis_s);
+  EXPECT_EQ(loaded->raxis_s, state.raxis_s);
+  EXPECT_EQ(loaded->zaxis_c, state.zaxis_c);
+  EXPECT_EQ(loaded->vacuum_pressure_state, state.vacuum_pressure_state);
+  EXPECT_EQ(loaded->nvacskip, state.nvacskip);
+  EXPECT_EQ(loaded->rCon0, state.rCon0);
+  EXPECT_EQ(loaded->zCon0, state.zCon0);
+}
+
+TEST(SolverStateTest, SaveReplacesPreviousSnapshot) {
+  const fs::path path = fs::path(testing::TempDir()) / "solver_state_twice.h5";
+  SolverState state = MakeSolverState();
+  ASSERT_TRUE(state.Save(path).ok());
+
+  state.iter2 = 112;
+  ASSERT_TRUE(state.Save(path).ok());
+
+  const absl::StatusOr<SolverState> loaded = SolverState::Load(path);
+  ASSERT_TRUE(loaded.ok()) << loaded.status();
+  EXPECT_EQ(loaded->iter2, 112);
+}
+
+TEST(SolverStateTest, LoadFailsForMissingFile) {
+  const absl::StatusOr<SolverState> loaded =
+      SolverState::Load(fs::path(testing::TempDir()) / "does_not_exist.h5");
+  EXPECT_EQ(loaded.status().code(), absl::StatusCode::kNotFound);
+}
+
+TEST(SolverStateTest, LoadFailsForOtherHdf5File) {
+  const fs::path path = fs::path(testing::TempDir()) / "not_a_solver_state.h5";
+  {
+    H5::H5File file(path, H5F_ACC_TRUNC);
+    file.createGroup("/something_else");
+  }
+
+  const absl::StatusOr<SolverState> loaded = SolverState::Load(path);
+  EXPECT_EQ(loaded.status().code(), absl::StatusCode::kInvalidArgument);
+}
+
+}  // namespace
+}  // namespace vmecpp
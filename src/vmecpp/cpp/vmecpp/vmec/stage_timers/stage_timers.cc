@@ -0,0 +1,91 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/stage_timers/stage_timers.h"
+
+#include "absl/log/log.h"
+
+namespace vmecpp {
+
+std::string_view ToString(ModelStage stage) {
+  switch (stage) {
+    case ModelStage::kGeometryFromFourier:
+      return "geometry_from_fourier";
+    case ModelStage::kJacobian:
+      return "jacobian";
+    case ModelStage::kMetricElements:
+      return "metric_elements";
+    case ModelStage::kBContra:
+      return "b_contra";
+    case ModelStage::kBCo:
+      return "b_co";
+    case ModelStage::kPressureAndEnergies:
+      return "pressure_and_energies";
+    case ModelStage::kRadialForceBalance:
+      return "radial_force_balance";
+    case ModelStage::kHybridLambdaForce:
+      return "hybrid_lambda_force";
+    case ModelStage::kPreconditionerUpdate:
+      return "preconditioner_update";
+    case ModelStage::kFreeBoundaryFullUpdate:
+      return "free_boundary_full_update";
+    case ModelStage::kFreeBoundaryPartialUpdate:
+      return "free_boundary_partial_update";
+    case ModelStage::kConstraintForce:
+      return "constraint_force";
+    case ModelStage::kMhdForces:
+      return "mhd_forces";
+    case ModelStage::kForcesToFourier:
+      return "forces_to_fourier";
+    case ModelStage::kResiduals:
+      return "residuals";
+    case ModelStage::kApplyPreconditioner:
+      return "apply_preconditioner";
+    case ModelStage::kTimeStep:
+      return "time_step";
+    case ModelStage::kInitializeRadial:
+      return "initialize_radial";
+    case ModelStage::kOutputQuantities:
+      return "output_quantities";
+    case ModelStage::kNumStages:
+      break;
+  }
+  LOG(FATAL) << "unknown ModelStage " << static_cast<int>(stage);
+  return "";
+}
+
+void StageTimers::Reset() {
+  seconds_.fill(0.0);
+  calls_.fill(0);
+}
+
+TimingReport::TimingReport()
+    : seconds(StageTimers::kNumStages, 0.0),
+      thread_seconds(StageTimers::kNumStages, 0.0),
+      calls(StageTimers::kNumStages, 0) {
+  stages.reserve(StageTimers::kNumStages);
+  for (int i = 0; i < StageTimers::kNumStages; ++i) {
+    stages.emplace_back(ToString(static_cast<ModelStage>(i)));
+  }
+}
+
+void TimingReport::AddStep(
+    const std::vector<const StageTimers*>& thread_timers) {
+  for (int i = 0; i < StageTimers::kNumStages; ++i) {
+    const ModelStage stage = static_cast<ModelStage>(i);
+    double slowest_seconds = 0.0;
+    int64_t slowest_calls = 0;
+    for (const StageTimers* timers : thread_timers) {
+      thread_seconds[i] += timers->seconds(stage);
+      if (timers->seconds(stage) >= slowest_seconds) {
+        slowest_seconds = timers->seconds(stage);
+        slowest_calls = timers->calls(stage);
+      }
+    }
+    seconds[i] += slowest_seconds;
+    calls[i] += slowest_calls;
+  }
+}
+
+}  // namespace vmecpp
@@ -0,0 +1,152 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#ifndef VMECPP_VMEC_STAGE_TIMERS_STAGE_TIMERS_H_
+#define VMECPP_VMEC_STAGE_TIMERS_STAGE_TIMERS_H_
+
+#include <array>
+#include <chrono>
+#include <cstdint>
+#include <string>
+#include <string_view>
+#include <vector>
+
+namespace vmecpp {
+
+// The stages of a VMEC++ run that are timed when profiling is enabled.
+// The stages of the forward model are listed in order of execution within
+// IdealMhdModel::update.
+enum class ModelStage : std::uint8_t {
+  // inverse DFT of the geometry, including the m=1 constraint and the
+  // extrapolation towards the axis
+  kGeometryFromFourier,
+  kJacobian,
+  kMetricElements,
+  kBContra,
+  kBCo,
+  kPressureAndEnergies,
+  kRadialForceBalance,
+  kHybridLambdaForce,
+  // radial preconditioner, force norms and constraint force multiplier;
+  // only run every few iterations
+  kPreconditionerUpdate,
+  // free-boundary contribution with a full (re-)computation of the vacuum
+  // response, i.e., on iterations where ivacskip == 0
+  kFreeBoundaryFullUpdate,
+  // free-boundary contribution reusing the vacuum response of the last full
+  // update (see nvacskip)
+  kFreeBoundaryPartialUpdate,
+  // effective constraint force and its spectral de-aliasing
+  kConstraintForce,
+  kMhdForces,
+  // forward DFT of the forces
+  kForcesToFourier,
+  // invariant force residuals
+  kResiduals,
+  // application of the m=1, radial and lambda preconditioners
+  kApplyPreconditioner,
+  // time step update of the state vector in Vmec::Evolve
+  kTimeStep,
+  // setup of each multigrid step in Vmec::InitializeRadial
+  kInitializeRadial,
+  // ComputeOutputQuantities after the run has converged
+  kOutputQuantities,
+  kNumStages,
+};
+
+// snake_case name of the given stage, e.g. "geometry_from_fourier"
+std::string_view ToString(ModelStage stage);
+
+// Accumulates wall-clock time and number of calls per ModelStage.
+// Not thread-safe: each thread uses its own instance, which are combined into a
+// TimingReport at the end.
+// When disabled (the default), timing a stage costs a single branch.
+class StageTimers {
+ public:
+  static constexpr int kNumStages = static_cast<int>(ModelStage::kNumStages);
+
+  bool enabled() const { return enabled_; }
+  void set_enabled(bool enabled) { enabled_ = enabled; }
+
+  void Add(ModelStage stage, double seconds) {
+    seconds_[static_cast<int>(stage)] += seconds;
+    ++calls_[static_cast<int>(stage)];
+  }
+
+  double seconds(ModelStage stage) const {
+    return seconds_[static_cast<int>(stage)];
+  }
+  int64_t calls(ModelStage stage) const {
+    return calls_[static_cast<int>(stage)];
+  }
+
+  void Reset();
+
+ private:
+  bool enabled_ = false;
+  std::array<double, kNumStages> seconds_ = {};
+  std::array<int64_t, kNumStages> calls_ = {};
+};
+
+// Adds the time between its construction and destruction to the given stage,
+// if the timers are enabled.
+class ScopedStageTimer {
+ public:
+  ScopedStageTimer(StageTimers& timers, ModelStage stage)
+      : timers_(timers.enabled() ? &timers : nullptr), stage_(stage) {
+    if (timers_ != nullptr) {
+      start_ = std::chrono::steady_clock::now();
+    }
+  }
+
+  ~ScopedStageTimer() {
+    if (timers_ != nullptr) {
+      const std::chrono::duration<double> elapsed =
+          std::chrono::steady_clock::now() - start_;
+      timers_->Add(stage_, elapsed.count());
+    }
+  }
+
+  ScopedStageTimer(const ScopedStageTimer&) = delete;
+  ScopedStageTimer& operator=(const ScopedStageTimer&) = delete;
+
+ private:
+  StageTimers* timers_;
+  ModelStage stage_;
+  std::chrono::steady_clock::time_point start_;
+};
+
+// Per-stage timings of a whole VMEC++ run, aggregated over threads and
+// multigrid steps. All vectors are indexed like `stages`.
+struct TimingReport {
+  // names of the stages, see ModelStage
+  std::vector<std::string> stages;
+
+  // Wall-clock time in seconds: per multigrid step, the time of the slowest
+  // thread, summed over all multigrid steps.
+  std::vector<double> seconds;
+
+  // Time in seconds summed over all threads, i.e., the CPU time spent in
+  // each stage. Load imbalance between the threads shows up as
+  // seconds * number of threads being noticeably larger than thread_seconds.
+  std::vector<double> thread_seconds;
+
+  // number of times each stage was executed (by the slowest thread)
+  std::vector<int64_t> calls;
+
+  // wall-clock time of the whole run in seconds
+  double total_seconds = 0.0;
+
+  // A report with all known stages and zero timings.
+  TimingReport();
+
+  // Fold the timers of all threads of one multigrid step into this report.
+  void AddStep(const std::vector<const StageTimers*>& thread_timers);
+
+  bool operator==(const TimingReport&) const = default;
+};
+
+}  // namespace vmecpp
+
+#endif  // VMECPP_VMEC_STAGE_TIMERS_STAGE_TIMERS_H_
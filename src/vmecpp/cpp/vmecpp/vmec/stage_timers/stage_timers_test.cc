@@ -0,0 +1,67 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/stage_timers/stage_timers.h"
+
+#include <set>
+#include <string>
+#include <vector>
+
+#include "gtest/gtest.h"
+
+namespace vmecpp {
+
+TEST(TestStageTimers, DisabledTimersDoNotRecord) {
+  StageTimers timers;
+  ASSERT_FALSE(timers.enabled());
+  {
+    ScopedStageTimer timer(timers, ModelStage::kJacobian);
+  }
+  EXPECT_EQ(timers.calls(ModelStage::kJacobian), 0);
+  EXPECT_EQ(timers.seconds(ModelStage::kJacobian), 0.0);
+}
+
+TEST(TestStageTimers, EnabledTimersRecord) {
+  StageTimers timers;
+  timers.set_enabled(true);
+  for (int i = 0; i < 3; ++i) {
+    ScopedStageTimer timer(timers, ModelStage::kBCo);
+  }
+  EXPECT_EQ(timers.calls(ModelStage::kBCo), 3);
+  EXPECT_GE(timers.seconds(ModelStage::kBCo), 0.0);
+  EXPECT_EQ(timers.calls(ModelStage::kBContra), 0);
+
+  timers.Reset();
+  EXPECT_EQ(timers.calls(ModelStage::kBCo), 0);
+  EXPECT_TRUE(timers.enabled());
+}
+
+TEST(TestStageTimers, StageNamesAreUnique) {
+  const TimingReport report;
+  ASSERT_EQ(static_cast<int>(report.stages.size()), StageTimers::kNumStages);
+  const std::set<std::string> unique_names(report.stages.begin(),
+                                           report.stages.end());
+  EXPECT_EQ(unique_names.size(), report.stages.size());
+  EXPECT_EQ(report.stages[0], "geometry_from_fourier");
+}
+
+TEST(TestStageTimers, ReportTakesSlowestThreadPerStep) {
+  StageTimers thread_0;
+  StageTimers thread_1;
+  thread_0.Add(ModelStage::kMhdForces, 1.0);
+  thread_1.Add(ModelStage::kMhdForces, 2.0);
+  thread_1.Add(ModelStage::kMhdForces, 0.5);
+
+  TimingReport report;
+  report.AddStep({&thread_0, &thread_1});
+  // a second multigrid step with a single thread
+  report.AddStep({&thread_0});
+
+  const int i = static_cast<int>(ModelStage::kMhdForces);
+  EXPECT_DOUBLE_EQ(report.seconds[i], 2.5 + 1.0);
+  EXPECT_DOUBLE_EQ(report.thread_seconds[i], 1.0 + 2.5 + 1.0);
+  EXPECT_EQ(report.calls[i], 2 + 1);
+}
+
+}  // namespace vmecpp
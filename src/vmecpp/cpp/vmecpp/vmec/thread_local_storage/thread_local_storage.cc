@@ -57,4 +57,54 @@ ThreadLocalStorage::ThreadLocalStorage(const Sizes* s) : s_(*s) {
   gbubv_avg.setZero(nZnT);
   gbubv_wavg.setZero(nZnT);
 }
+
+void ThreadLocalStorage::setZero() {
+  r1e_i.setZero();
+  r1o_i.setZero();
+  rue_i.setZero();
+  ruo_i.setZero();
+  rve_i.setZero();
+  rvo_i.setZero();
+  z1e_i.setZero();
+  z1o_i.setZero();
+  zue_i.setZero();
+  zuo_i.setZero();
+  zve_i.setZero();
+  zvo_i.setZero();
+  lue_i.setZero();
+  luo_i.setZero();
+  lve_i.setZero();
+  lvo_i.setZero();
+  bsubu_i.setZero();
+  bsubv_i.setZero();
+  gvv_gsqrt_i.setZero();
+  guv_bsupu_i.setZero();
+  P_i.setZero();
+  rup_i.setZero();
+  zup_i.setZero();
+  rsp_i.setZero();
+  zsp_i.setZero();
+  taup_i.setZero();
+  gbubu_i.setZero();
+  gbubv_i.setZero();
+  gbvbv_i.setZero();
+  P_o.setZero();
+  rup_o.setZero();
+  zup_o.setZero();
+  rsp_o.setZero();
+  zsp_o.setZero();
+  taup_o.setZero();
+  gbubu_o.setZero();
+  gbubv_o.setZero();
+  gbvbv_o.setZero();
+  P_avg.setZero();
+  P_wavg.setZero();
+  gbubu_avg.setZero();
+  gbubu_wavg.setZero();
+  gbvbv_avg.setZero();
+  gbvbv_wavg.setZero();
+  gbubv_avg.setZero();
+  gbubv_wavg.setZero();
+}
+
 }  // namespace vmecpp
@@ -18,6 +18,9 @@ class ThreadLocalStorage {
  public:
   explicit ThreadLocalStorage(const Sizes* s);
 
+  // Reset all buffers to zero without re-allocating them.
+  void setZero();
+
   // inv-DFT of geometry
   Eigen::VectorXd r1e_i;
   Eigen::VectorXd r1o_i;
@@ -6,11 +6,15 @@
 
 #include <algorithm>
 #include <array>
+#include <atomic>
+#include <chrono>
 #include <cmath>
 #include <cstdio>
 #include <iostream>
 #include <memory>
+#include <span>
 #include <string>
+#include <thread>
 #include <utility>
 #include <vector>
 
@@ -91,18 +95,84 @@ absl::Status CheckInitialState(const vmecpp::HotRestartState& initial_state,
 
   return absl::OkStatus();
 }
+
+// The active (geometry, force) pairs of Fourier coefficients that are evolved
+// in the time step, in the same order as in Vmec::performTimeStep.
+std::vector<std::pair<std::span<double>, std::span<double>>>
+ActiveCoefficientPairs(vmecpp::FourierGeometry& m_x, vmecpp::FourierForces& m_f,
+                       const vmecpp::Sizes& s) {
+  std::vector<std::pair<std::span<double>, std::span<double>>> pairs = {
+      {m_x.rmncc, m_f.frcc}, {m_x.zmnsc, m_f.fzsc}, {m_x.lmnsc, m_f.flsc}};
+  if (s.lthreed) {
+    pairs.emplace_back(m_x.rmnss, m_f.frss);
+    pairs.emplace_back(m_x.zmncs, m_f.fzcs);
+    pairs.emplace_back(m_x.lmncs, m_f.flcs);
+  }
+  if (s.lasym) {
+    pairs.emplace_back(m_x.rmnsc, m_f.frsc);
+    pairs.emplace_back(m_x.zmncc, m_f.fzcc);
+    pairs.emplace_back(m_x.lmncc, m_f.flcc);
+    if (s.lthreed) {
+      pairs.emplace_back(m_x.rmncs, m_f.frcs);
+      pairs.emplace_back(m_x.zmnss, m_f.fzss);
+      pairs.emplace_back(m_x.lmnss, m_f.flss);
+    }
+  }
+  return pairs;
+}
+
+// Copy the radial slice held by `x` into `m_state`, which covers the full
+// radial grid in the layout of SolverState: [component][j][mn].
+void GatherRadialSlice(vmecpp::FourierCoeffs& x, int ns, int mnsize,
+                       int num_components, Eigen::VectorXd& m_state) {
+  const std::span<const double> local = x.flatCoefficients();
+  const int num_surfaces =
+      static_cast<int>(local.size()) / (num_components * mnsize);
+  for (int component = 0; component < num_components; ++component) {
+    for (int j = 0; j < num_surfaces; ++j) {
+      std::copy_n(local.data() + (component * num_surfaces + j) * mnsize,
+                  mnsize,
+                  m_state.data() + (component * ns + x.nsMin() + j) * mnsize);
+    }
+  }
+}
+
+// Inverse of GatherRadialSlice: copy the radial slice of `x` from `state`.
+void ScatterRadialSlice(const Eigen::VectorXd& state, int ns, int mnsize,
+                        int num_components, vmecpp::FourierCoeffs& m_x) {
+  const std::span<double> local = m_x.flatCoefficients();
+  const int num_surfaces =
+      static_cast<int>(local.size()) / (num_components * mnsize);
+  for (int component = 0; component < num_components; ++component) {
+    for (int j = 0; j < num_surfaces; ++j) {
+      std::copy_n(state.data() + (component * ns + m_x.nsMin() + j) * mnsize,
+                  mnsize,
+                  local.data() + (component * num_surfaces + j) * mnsize);
+    }
+  }
+}
 }  // namespace
 
 absl::StatusOr<vmecpp::OutputQuantities> vmecpp::run(
     const VmecINDATA& indata, std::optional<HotRestartState> initial_state,
     std::optional<int> max_threads, OutputMode verbose,
-    InterruptCallback interrupt_callback) {
+    InterruptCallback interrupt_callback, bool profile,
+    IterationCallback iteration_callback, int iteration_callback_stride,
+    const EarlyStopCriteria& early_stop,
+    const SolverStateOptions& solver_state) {
   auto maybe_vmec = Vmec::FromIndata(indata, nullptr, max_threads, verbose,
                                      std::move(interrupt_callback));
   if (!maybe_vmec.ok()) {
     return maybe_vmec.status();
   }
   Vmec& v = **maybe_vmec;
+  v.set_profiling_enabled(profile);
+  v.set_early_stop_criteria(early_stop);
+  v.set_solver_state_options(solver_state);
+  if (iteration_callback) {
+    v.set_iteration_callback(std::move(iteration_callback),
+                             iteration_callback_stride);
+  }
 
   // the values of the first three arguments should just be VMEC's defaults
   absl::StatusOr<bool> s =
@@ -117,10 +187,13 @@ absl::StatusOr<vmecpp::OutputQuantities> vmecpp::run(
 
 absl::StatusOr<vmecpp::OutputQuantities> vmecpp::run(
     const VmecINDATA& indata,
-    const makegrid::MagneticFieldResponseTable& magnetic_response_table,
+    const makegrid::MagneticFieldResponseTableView& magnetic_response_table,
     std::optional<HotRestartState> initial_state,
     std::optional<int> max_threads, OutputMode verbose,
-    InterruptCallback interrupt_callback) {
+    InterruptCallback interrupt_callback, bool profile,
+    IterationCallback iteration_callback, int iteration_callback_stride,
+    const EarlyStopCriteria& early_stop,
+    const SolverStateOptions& solver_state) {
   auto maybe_vmec =
       Vmec::FromIndata(indata, &magnetic_response_table, max_threads, verbose,
                        std::move(interrupt_callback));
@@ -128,6 +201,13 @@ absl::StatusOr<vmecpp::OutputQuantities> vmecpp::run(
     return maybe_vmec.status();
   }
   Vmec& v = **maybe_vmec;
+  v.set_profiling_enabled(profile);
+  v.set_early_stop_criteria(early_stop);
+  v.set_solver_state_options(solver_state);
+  if (iteration_callback) {
+    v.set_iteration_callback(std::move(iteration_callback),
+                             iteration_callback_stride);
+  }
 
   // the values of the first three arguments should just be VMEC's defaults
   absl::StatusOr<bool> s =
@@ -140,11 +220,87 @@ absl::StatusOr<vmecpp::OutputQuantities> vmecpp::run(
   return std::move(v.output_quantities_);
 }
 
+std::vector<absl::StatusOr<vmecpp::OutputQuantities>> vmecpp::run_extcur_batch(
+    const VmecINDATA& indata,
+    const makegrid::MagneticFieldResponseTableView& magnetic_response_table,
+    const makegrid::RowMatrixXd& extcur_batch,
+    const std::optional<HotRestartState>& initial_state,
+    std::optional<int> max_threads, std::optional<int> max_concurrent_runs,
+    OutputMode verbose, InterruptCallback interrupt_callback) {
+  const int num_runs = static_cast<int>(extcur_batch.rows());
+  std::vector<absl::StatusOr<OutputQuantities>> results(
+      num_runs, absl::CancelledError("Run was not started."));
+  if (num_runs == 0) {
+    return results;
+  }
+  if (!indata.lfreeb) {
+    results.assign(num_runs,
+                   absl::InvalidArgumentError(
+                       "A batch of coil currents requires a free-boundary "
+                       "input (lfreeb = true)."));
+    return results;
+  }
+  if (max_concurrent_runs.has_value() && max_concurrent_runs.value() < 1) {
+    results.assign(num_runs, absl::InvalidArgumentError(absl::StrFormat(
+                                 "max_concurrent_runs must be >= 1, got %d.",
+                                 max_concurrent_runs.value())));
+    return results;
+  }
+
+  int num_threads = 1;
+#ifdef _OPENMP
+  num_threads = max_threads.value_or(omp_get_max_threads());
+#endif  // _OPENMP
+  num_threads = std::max(num_threads, 1);
+  const int num_workers =
+      std::min(max_concurrent_runs.value_or(num_threads), num_runs);
+  const int threads_per_run = std::max(num_threads / num_workers, 1);
+
+  // Only the calling thread polls the user's interrupt callback (e.g. Python
+  // can only handle signals on its main thread); the other workers observe
+  // the shared flag.
+  const std::thread::id calling_thread = std::this_thread::get_id();
+  std::atomic<bool> interrupted = false;
+  InterruptCallback interrupt_check = [&]() -> bool {
+    if (interrupted.load()) {
+      return true;
+    }
+    if (interrupt_callback && std::this_thread::get_id() == calling_thread &&
+        interrupt_callback()) {
+      interrupted.store(true);
+    }
+    return interrupted.load();
+  };
+
+  std::atomic<int> next_run = 0;
+  auto worker = [&]() {
+    for (int i = next_run++; i < num_runs && !interrupted.load();
+         i = next_run++) {
+      VmecINDATA run_indata = indata;
+      run_indata.extcur = extcur_batch.row(i).transpose();
+      results[i] = run(run_indata, magnetic_response_table, initial_state,
+                       threads_per_run, verbose, interrupt_check);
+    }
+  };
+
+  std::vector<std::thread> threads;
+  threads.reserve(num_workers - 1);
+  for (int w = 1; w < num_workers; ++w) {
+    threads.emplace_back(worker);
+  }
+  worker();
+  for (std::thread& thread : threads) {
+    thread.join();
+  }
+
+  return results;
+}
+
 namespace vmecpp {
 
 absl::StatusOr<std::unique_ptr<Vmec>> Vmec::FromIndata(
     const VmecINDATA& indata,
-    const makegrid::MagneticFieldResponseTable* magnetic_response_table,
+    const makegrid::MagneticFieldResponseTableView* magnetic_response_table,
     std::optional<int> max_threads, OutputMode verbose,
     InterruptCallback interrupt_callback) {
   auto v = std::make_unique<Vmec>(indata, max_threads, verbose,
@@ -157,7 +313,9 @@ absl::StatusOr<std::unique_ptr<Vmec>> Vmec::FromIndata(
     if (magnetic_response_table == nullptr) {
       s = v->mgrid_.LoadFile(indata.mgrid_file, indata.extcur);
     } else {
-      s = v->mgrid_.LoadFields(*magnetic_response_table, indata.extcur);
+      // the per-circuit fields are only referenced, not summed into a copy of
+      // the grid, so that concurrent runs can share one response table
+      s = v->mgrid_.ReferenceFields(*magnetic_response_table, indata.extcur);
     }
     if (!s.ok()) {
       return s;
@@ -171,8 +329,10 @@ absl::StatusOr<std::unique_ptr<Vmec>> Vmec::FromIndata(
 Vmec::Vmec(const VmecINDATA& indata, std::optional<int> max_threads,
            OutputMode verbose, InterruptCallback interrupt_callback)
     : indata_(indata),
-      s_(indata_),
-      t_(&s_),
+      fourier_basis_tables_(
+          FourierBasisCache::Global().Acquire(Sizes(indata_))),
+      s_(fourier_basis_tables_->s),
+      t_(fourier_basis_tables_->fast_poloidal),
       b_(&s_, &t_, kSignOfJacobian),
       h_(&s_),
       fc_(indata_.lfreeb, indata_.delt,
@@ -180,6 +340,7 @@ Vmec::Vmec(const VmecINDATA& indata, std::optional<int> max_threads,
       verbose_(verbose != OutputMode::kSilent),
       logger_(std::cout, verbose),
       interrupt_callback_(std::move(interrupt_callback)),
+      divergence_detector_(EarlyStopCriteria(), indata_.delt),
       vacuum_pressure_state_(VacuumPressureState::kOff),
       status_(VmecStatus::NORMAL_TERMINATION),
       iter2_(1),
@@ -227,6 +388,8 @@ absl::StatusOr<bool> Vmec::run(const VmecCheckpoint& checkpoint,
                                const int iterations_before_checkpointing,
                                const int maximum_multi_grid_step,
                                std::optional<HotRestartState> initial_state) {
+  const auto run_start = std::chrono::steady_clock::now();
+
   if (indata_.lfreeb) {
     if (!mgrid_.IsLoaded()) {
       // Fallback: load mgrid from file if constructed directly via the public
@@ -258,6 +421,21 @@ absl::StatusOr<bool> Vmec::run(const VmecCheckpoint& checkpoint,
     }
   }
 
+  // state to resume from, consumed by the multigrid step it was saved in
+  std::optional<SolverState> resume_state;
+  if (!solver_state_options_.resume_from.empty()) {
+    absl::StatusOr<SolverState> state =
+        SolverState::Load(solver_state_options_.resume_from);
+    if (!state.ok()) {
+      return state.status();
+    }
+    absl::Status status = CheckSolverState(*state);
+    if (!status.ok()) {
+      return status;
+    }
+    resume_state = std::move(*state);
+  }
+
   // !!! THIS must be the ONLY place where this gets set to zero !!!
   num_eqsolve_retries_ = 0;
 
@@ -273,7 +451,8 @@ absl::StatusOr<bool> Vmec::run(const VmecCheckpoint& checkpoint,
   bool giving_up = false;
 
   // retry with ns=3 if immediately fails at lowest radial resolution
-  for (jacob_off_ = 0; jacob_off_ < 2; ++jacob_off_) {
+  for (jacob_off_ = resume_state.has_value() ? resume_state->jacob_off : 0;
+       jacob_off_ < 2; ++jacob_off_) {
     // jacob_off=1 indicates that an initial run with ns=3 shall be inserted
     // before the user-provided ns values from ns_array are processed
     // in the multi-grid run
@@ -329,6 +508,12 @@ absl::StatusOr<bool> Vmec::run(const VmecCheckpoint& checkpoint,
         fc_.niterv = indata_.niter_array[igrid];
       }
 
+      if (resume_state.has_value() && igrid < resume_state->igrid) {
+        // this multigrid step was completed before the state was saved
+        continue;
+      }
+      igrid_ = igrid;
+
       // Reserve the per-iteration convergence-history vectors for this stage so
       // the push_backs in Evolve do not reallocate inside the hot loop.
       {
@@ -354,6 +539,15 @@ absl::StatusOr<bool> Vmec::run(const VmecCheckpoint& checkpoint,
         return true;
       }
 
+      if (resume_state.has_value()) {
+        absl::Status status = RestoreSolverState(*resume_state);
+        if (!status.ok()) {
+          return status;
+        }
+        resume_state.reset();
+      }
+      last_saved_iteration_ = iter2_;
+
       // *HERE* is the *ACTUAL* call to the equilibrium solver !
       const absl::StatusOr<bool> reached_checkpoint =
           SolveEquilibrium(checkpoint, iterations_before_checkpointing);
@@ -365,6 +559,17 @@ absl::StatusOr<bool> Vmec::run(const VmecCheckpoint& checkpoint,
       // not reach convergence
       if (status_ != VmecStatus::NORMAL_TERMINATION &&
           status_ != VmecStatus::SUCCESSFUL_TERMINATION) {
+        if (status_ == VmecStatus::EARLY_TERMINATION &&
+            !indata_.return_outputs_even_if_not_converged) {
+          return absl::AbortedError(absl::StrFormat(
+              "VMEC++ stopped early because %s: gave up after %d iterations "
+              "(%d restarts) at ns = %d; final force residuals were "
+              "fsqr = %.3e, fsqz = %.3e, fsql = %.3e.",
+              ToString(divergence_reason_),
+              divergence_detector_.num_iterations(),
+              divergence_detector_.num_restarts(), fc_.nsval, fc_.fsqr,
+              fc_.fsqz, fc_.fsql));
+        }
         if (!indata_.return_outputs_even_if_not_converged) {
           const auto msg = absl::StrFormat(
               "FATAL ERROR in SolveEquilibrium: %s\n"
@@ -386,13 +591,22 @@ absl::StatusOr<bool> Vmec::run(const VmecCheckpoint& checkpoint,
         break;
       }
 
+      if (stopped_by_callback_) {
+        // do not continue with the next multigrid step; unless this was the
+        // last one, the run as a whole has not converged
+        if (igrid + 1 < max_grids) {
+          status_ = VmecStatus::NORMAL_TERMINATION;
+        }
+        break;
+      }
+
       // TODO(jons): insert lgiveup/fgiveup logic here
 
       // If this point is reached, the current multi-grid step should have
       // properly converged.
     }  // igrid
 
-    if (giving_up) {
+    if (giving_up || stopped_by_callback_) {
       break;
     }
 
@@ -415,6 +629,14 @@ absl::StatusOr<bool> Vmec::run(const VmecCheckpoint& checkpoint,
     // loop above, so status_ is always NORMAL_TERMINATION: the last
     // multigrid stage exhausted its iteration budget without reaching
     // ftol. Diagnostics help distinguish 'almost-converged' runs from 'failing'
+    // (or the iteration callback stopped the run before convergence).
+    if (stopped_by_callback_) {
+      return absl::CancelledError(absl::StrFormat(
+          "VMEC++ run was stopped by the iteration callback after %d "
+          "iterations at ns = %d; final force residuals were "
+          "fsqr = %.3e, fsqz = %.3e, fsql = %.3e.",
+          iter2_ - 1, fc_.nsval, fc_.fsqr, fc_.fsqz, fc_.fsql));
+    }
     const auto msg = absl::StrFormat(
         "VMEC++ did not converge: %s. Completed %d/%d iterations at ns = "
         "%d without meeting ftol = %.3e; final force residuals were "
@@ -426,10 +648,23 @@ absl::StatusOr<bool> Vmec::run(const VmecCheckpoint& checkpoint,
 
   // compute output file quantities, but do not write them to output file yet
   // (for creating the output file, use WriteOutputFile())
-  output_quantities_ = vmecpp::ComputeOutputQuantities(
-      kSignOfJacobian, indata_, s_, fc_, constants_, t_, h_, mgrid_.mgrid_mode,
-      r_, decomposed_x_, m_, p_, checkpoint, vacuum_pressure_state_, status_,
-      iter2_);
+  {
+    ScopedStageTimer timer(run_timers_, ModelStage::kOutputQuantities);
+    output_quantities_ = vmecpp::ComputeOutputQuantities(
+        kSignOfJacobian, indata_, s_, fc_, constants_, t_, h_,
+        mgrid_.mgrid_mode, r_, decomposed_x_, m_, p_, checkpoint,
+        vacuum_pressure_state_, status_, iter2_);
+  }
+
+  if (profiling_enabled_) {
+    CollectStageTimers();
+    timing_report_.AddStep({&run_timers_});
+    run_timers_.Reset();
+    const std::chrono::duration<double> run_duration =
+        std::chrono::steady_clock::now() - run_start;
+    timing_report_.total_seconds += run_duration.count();
+    output_quantities_.timings = timing_report_;
+  }
 
   {
     const auto& w = output_quantities_.wout;
@@ -455,6 +690,274 @@ absl::StatusOr<bool> Vmec::run(const VmecCheckpoint& checkpoint,
   return false;
 }  // run
 
+Vmec::~Vmec() {
+  // The models refer to the ThreadLocalStorage in the workspace,
+  // so they must go before the workspace is handed to another Vmec.
+  m_.clear();
+  ReturnRadialWorkspace();
+}
+
+void Vmec::set_profiling_enabled(bool enabled) {
+  profiling_enabled_ = enabled;
+  run_timers_.set_enabled(enabled);
+  for (const auto& model : m_) {
+    model->stageTimers().set_enabled(enabled);
+  }
+}
+
+void Vmec::set_iteration_callback(IterationCallback callback, int stride) {
+  iteration_callback_ = std::move(callback);
+  if (iteration_callback_) {
+    telemetry_ = std::make_unique<IterationTelemetry>(stride);
+  } else {
+    telemetry_.reset();
+  }
+}
+
+bool Vmec::DeliverIterationRecords() {
+  if (!iteration_callback_ || telemetry_->size() == 0) {
+    return false;
+  }
+  return iteration_callback_(telemetry_->Drain());
+}
+
+void Vmec::set_early_stop_criteria(const EarlyStopCriteria& criteria) {
+  divergence_detector_ = DivergenceDetector(criteria, indata_.delt);
+}
+
+void Vmec::set_solver_state_options(const SolverStateOptions& options) {
+  solver_state_options_ = options;
+}
+
+bool Vmec::ShouldSaveSolverState(int next_iter2, int thread_id) const {
+  if (solver_state_options_.save_to.empty() ||
+      next_iter2 - last_saved_iteration_ < solver_state_options_.save_every) {
+    return false;
+  }
+
+  // Only save the state before iterations that update the radial
+  // preconditioner and, if the vacuum pressure is on, perform a full NESTOR
+  // update: everything these derive from the state is then recomputed from
+  // the SolverState when resuming, so the resumed run takes the same steps.
+  const int iterations_since_restart = next_iter2 - iter1_;
+  if (iterations_since_restart <= 0 ||
+      iterations_since_restart % fc_.kPreconditionerUpdateInterval != 0) {
+    return false;
+  }
+  if (vacuum_pressure_state_ == VacuumPressureState::kOff) {
+    return true;
+  }
+  // not while the vacuum pressure is being turned on
+  return vacuum_pressure_state_ == VacuumPressureState::kActive &&
+         iterations_since_restart % m_[thread_id]->get_nvacskip() == 0;
+}
+
+SolverState Vmec::CaptureSolverState(int next_iter2) const {
+  SolverState state;
+  state.mpol = s_.mpol;
+  state.ntor = s_.ntor;
+  state.nfp = s_.nfp;
+  state.lasym = s_.lasym;
+  state.lfreeb = fc_.lfreeb;
+  state.nZeta = s_.nZeta;
+  state.nThetaReduced = s_.nThetaReduced;
+
+  state.jacob_off = jacob_off_;
+  state.igrid = igrid_;
+  state.ns = fc_.ns;
+
+  state.iter1 = iter1_;
+  state.iter2 = next_iter2;
+  state.ijacob = fc_.ijacob;
+  state.last_preconditioner_update = last_preconditioner_update_;
+  state.last_full_update_nestor = last_full_update_nestor_;
+
+  state.delt0r = fc_.delt0r;
+  state.res0 = fc_.res0;
+  state.res1 = fc_.res1;
+  state.fsq = fc_.fsq;
+  state.fsqr = fc_.fsqr;
+  state.fsqz = fc_.fsqz;
+  state.fsql = fc_.fsql;
+  state.inv_tau = invTau_;
+
+  state.force_residual_r = fc_.force_residual_r;
+  state.force_residual_z = fc_.force_residual_z;
+  state.force_residual_lambda = fc_.force_residual_lambda;
+  state.mhd_energy = fc_.mhd_energy;
+  state.delbsq = fc_.delbsq;
+  state.restart_reasons.reserve(fc_.restart_reasons.size());
+  for (const RestartReason reason : fc_.restart_reasons) {
+    state.restart_reasons.push_back(static_cast<int>(reason));
+  }
+
+  const int num_components = 3 * s_.num_basis;
+  const int state_size = num_components * fc_.ns * s_.mnsize;
+  state.decomposed_x.setZero(state_size);
+  state.decomposed_v.setZero(state_size);
+  state.physical_x_backup.setZero(state_size);
+  state.rCon0.setZero(fc_.ns * s_.nZnT);
+  state.zCon0.setZero(fc_.ns * s_.nZnT);
+  for (int thread_id = 0; thread_id < num_threads_; ++thread_id) {
+    GatherRadialSlice(*decomposed_x_[thread_id], fc_.ns, s_.mnsize,
+                      num_components, state.decomposed_x);
+    GatherRadialSlice(*decomposed_v_[thread_id], fc_.ns, s_.mnsize,
+                      num_components, state.decomposed_v);
+    GatherRadialSlice(*physical_x_backup_[thread_id], fc_.ns, s_.mnsize,
+                      num_components, state.physical_x_backup);
+
+    const RadialPartitioning& r = *r_[thread_id];
+    const int num_points = (r.nsMaxFIncludingLcfs - r.nsMinF) * s_.nZnT;
+    state.rCon0.segment(r.nsMinF * s_.nZnT, num_points) =
+        m_[thread_id]->rCon0.head(num_points);
+    state.zCon0.segment(r.nsMinF * s_.nZnT, num_points) =
+        m_[thread_id]->zCon0.head(num_points);
+  }
+
+  state.voli = h_.voli;
+
+  state.raxis_c = b_.raxis_c;
+  state.zaxis_s = b_.zaxis_s;
+  state.raxis_s = b_.raxis_s;
+  state.zaxis_c = b_.zaxis_c;
+
+  state.vacuum_pressure_state = static_cast<int>(vacuum_pressure_state_);
+  state.nvacskip = m_[0]->get_nvacskip();
+
+  return state;
+}
+
+absl::Status Vmec::CheckSolverState(const SolverState& state) const {
+  if (state.mpol != s_.mpol || state.ntor != s_.ntor || state.nfp != s_.nfp ||
+      state.lasym != s_.lasym || state.lfreeb != fc_.lfreeb ||
+      state.nZeta != s_.nZeta || state.nThetaReduced != s_.nThetaReduced) {
+    return absl::InvalidArgumentError(absl::StrFormat(
+        "The solver state to resume from was saved by a run with mpol = %d, "
+        "ntor = %d, nfp = %d, lasym = %d, lfreeb = %d, nZeta = %d, "
+        "nThetaReduced = %d, but this run has mpol = %d, ntor = %d, nfp = %d, "
+        "lasym = %d, lfreeb = %d, nZeta = %d, nThetaReduced = %d.",
+        state.mpol, state.ntor, state.nfp, state.lasym, state.lfreeb,
+        state.nZeta, state.nThetaReduced, s_.mpol, s_.ntor, s_.nfp, s_.lasym,
+        fc_.lfreeb, s_.nZeta, s_.nThetaReduced));
+  }
+
+  const int num_grids = static_cast<int>(indata_.ns_array.size());
+  const int ns =
+      state.igrid < 0
+          ? 3
+          : (state.igrid < num_grids ? indata_.ns_array[state.igrid] : -1);
+  if (state.jacob_off < 0 || state.jacob_off > 1 ||
+      state.igrid < -state.jacob_off || ns != state.ns) {
+    return absl::InvalidArgumentError(absl::StrFormat(
+        "The solver state to resume from was saved at ns = %d in multigrid "
+        "step %d, which does not match ns_array of this run.",
+        state.ns, state.igrid));
+  }
+
+  return absl::OkStatus();
+}
+
+absl::Status Vmec::RestoreSolverState(const SolverState& state) {
+  const int num_components = 3 * s_.num_basis;
+  const int state_size = num_components * fc_.ns * s_.mnsize;
+  const int num_points = fc_.ns * s_.nZnT;
+  if (state.ns != fc_.ns || state.decomposed_x.size() != state_size ||
+      state.decomposed_v.size() != state_size ||
+      state.physical_x_backup.size() != state_size ||
+      state.rCon0.size() != num_points || state.zCon0.size() != num_points ||
+      state.inv_tau.size() != kNDamp || state.raxis_c.size() != s_.ntor + 1) {
+    return absl::InvalidArgumentError(
+        "The solver state to resume from has inconsistent array sizes.");
+  }
+
+  for (int thread_id = 0; thread_id < num_threads_; ++thread_id) {
+    ScatterRadialSlice(state.decomposed_x, fc_.ns, s_.mnsize, num_components,
+                       *decomposed_x_[thread_id]);
+    ScatterRadialSlice(state.decomposed_v, fc_.ns, s_.mnsize, num_components,
+                       *decomposed_v_[thread_id]);
+    ScatterRadialSlice(state.physical_x_backup, fc_.ns, s_.mnsize,
+                       num_components, *physical_x_backup_[thread_id]);
+
+    const RadialPartitioning& r = *r_[thread_id];
+    const int num_local_points = (r.nsMaxFIncludingLcfs - r.nsMinF) * s_.nZnT;
+    m_[thread_id]->rCon0.head(num_local_points) =
+        state.rCon0.segment(r.nsMinF * s_.nZnT, num_local_points);
+    m_[thread_id]->zCon0.head(num_local_points) =
+        state.zCon0.segment(r.nsMinF * s_.nZnT, num_local_points);
+    m_[thread_id]->set_nvacskip(state.nvacskip);
+  }
+
+  iter1_ = state.iter1;
+  iter2_ = state.iter2;
+  fc_.ijacob = state.ijacob;
+  last_preconditioner_update_ = state.last_preconditioner_update;
+  last_full_update_nestor_ = state.last_full_update_nestor;
+
+  fc_.delt0r = state.delt0r;
+  fc_.res0 = state.res0;
+  fc_.res1 = state.res1;
+  fc_.fsq = state.fsq;
+  fc_.fsqr = state.fsqr;
+  fc_.fsqz = state.fsqz;
+  fc_.fsql = state.fsql;
+  invTau_ = state.inv_tau;
+
+  // assign() keeps the capacity reserved for this multigrid step in run()
+  fc_.force_residual_r.assign(state.force_residual_r.begin(),
+                              state.force_residual_r.end());
+  fc_.force_residual_z.assign(state.force_residual_z.begin(),
+                              state.force_residual_z.end());
+  fc_.force_residual_lambda.assign(state.force_residual_lambda.begin(),
+                                   state.force_residual_lambda.end());
+  fc_.mhd_energy.assign(state.mhd_energy.begin(), state.mhd_energy.end());
+  fc_.delbsq.assign(state.delbsq.begin(), state.delbsq.end());
+  fc_.restart_reasons.clear();
+  for (const int reason : state.restart_reasons) {
+    fc_.restart_reasons.push_back(static_cast<RestartReason>(reason));
+  }
+
+  h_.voli = state.voli;
+
+  b_.raxis_c = state.raxis_c;
+  b_.zaxis_s = state.zaxis_s;
+  b_.raxis_s = state.raxis_s;
+  b_.zaxis_c = state.zaxis_c;
+
+  vacuum_pressure_state_ =
+      static_cast<VacuumPressureState>(state.vacuum_pressure_state);
+
+  return absl::OkStatus();
+}
+
+void Vmec::CollectStageTimers() {
+  if (!profiling_enabled_ || m_.empty()) {
+    return;
+  }
+  std::vector<const StageTimers*> thread_timers;
+  thread_timers.reserve(m_.size());
+  for (const auto& model : m_) {
+    thread_timers.push_back(&model->stageTimers());
+  }
+  timing_report_.AddStep(thread_timers);
+  for (const auto& model : m_) {
+    model->stageTimers().Reset();
+  }
+}
+
+void Vmec::ReturnRadialWorkspace() {
+  if (workspace_ == nullptr) {
+    return;
+  }
+  workspace_->ls = std::move(ls_);
+  workspace_->decomposed_x = std::move(decomposed_x_);
+  workspace_->physical_x_backup = std::move(physical_x_backup_);
+  workspace_->physical_x = std::move(physical_x_);
+  workspace_->decomposed_f = std::move(decomposed_f_);
+  workspace_->physical_f = std::move(physical_f_);
+  workspace_->decomposed_v = std::move(decomposed_v_);
+  WorkspacePool::Global().Release(std::move(workspace_));
+}
+
 void Vmec::SetupVacuumSolvers() {
   // Compute the vacuum thread count once; it is ns-independent (depends only on
   // the tangential grid size nZnT and the thread budget).
@@ -480,7 +983,8 @@ void Vmec::SetupVacuumSolvers() {
 
     if (indata_.free_boundary_method == FreeBoundaryMethod::NESTOR) {
       fb_vac_[vac_thread_id] = std::make_unique<Nestor>(
-          &s_, tp_vac_[vac_thread_id].get(), &mgrid_,
+          &s_, &fourier_basis_tables_->fast_toroidal,
+          tp_vac_[vac_thread_id].get(), &mgrid_,
           std::span<double>(matrixShare.data(), matrixShare.size()),
           std::span<double>(bvecShare.data(), bvecShare.size()),
           std::span<double>(h_.vacuum_magnetic_pressure.data(),
@@ -491,7 +995,8 @@ void Vmec::SetupVacuumSolvers() {
           std::span<double>(h_.vacuum_b_z.data(), h_.vacuum_b_z.size()));
     } else if (indata_.free_boundary_method == FreeBoundaryMethod::ONLY_COILS) {
       fb_vac_[vac_thread_id] = std::make_unique<OnlyCoils>(
-          &s_, tp_vac_[vac_thread_id].get(), &mgrid_,
+          &s_, &fourier_basis_tables_->fast_toroidal,
+          tp_vac_[vac_thread_id].get(), &mgrid_,
           std::span<double>(h_.vacuum_magnetic_pressure.data(),
                             h_.vacuum_magnetic_pressure.size()),
           std::span<double>(h_.vacuum_b_r.data(), h_.vacuum_b_r.size()),
@@ -511,6 +1016,8 @@ bool Vmec::InitializeRadial(
     int ns_old, double& m_delt0,
     const std::optional<HotRestartState>& initial_state,
     std::optional<MultigridInterpolationScheme> interpolation_scheme) {
+  ScopedStageTimer timer(run_timers_, ModelStage::kInitializeRadial);
+
   // Stage info output is now handled by logger_.BeginStage() in run().
 
   // Set timestep control parameters
@@ -603,16 +1110,28 @@ bool Vmec::InitializeRadial(
       SetupVacuumSolvers();
     }
 
+    // the models of the previous multigrid step are about to be replaced
+    CollectStageTimers();
+
     r_.resize(num_threads_);
-    ls_.resize(num_threads_);
     p_.resize(num_threads_);
     m_.resize(num_threads_);
-    decomposed_x_.resize(num_threads_);
-    physical_x_backup_.resize(num_threads_);
-    physical_x_.resize(num_threads_);
-    decomposed_f_.resize(num_threads_);
-    physical_f_.resize(num_threads_);
-    decomposed_v_.resize(num_threads_);
+    anderson_.resize(num_threads_);
+
+    // Hand the per-thread buffers of the previous multigrid step back to the
+    // process-wide pool and lease the ones for the current step. These are
+    // recycled if a previous run used the same resolution, and are allocated
+    // and zero-initialized by their respective OpenMP threads otherwise.
+    ReturnRadialWorkspace();
+    workspace_ =
+        WorkspacePool::Global().Acquire(s_, nsval, num_threads_, fc_.lfreeb);
+    ls_ = std::move(workspace_->ls);
+    decomposed_x_ = std::move(workspace_->decomposed_x);
+    physical_x_backup_ = std::move(workspace_->physical_x_backup);
+    physical_x_ = std::move(workspace_->physical_x);
+    decomposed_f_ = std::move(workspace_->decomposed_f);
+    physical_f_ = std::move(workspace_->physical_f);
+    decomposed_v_ = std::move(workspace_->decomposed_v);
 
     // single-threaded creation of objects used in parallel threads
     for (int thread_id = 0; thread_id < num_threads_; ++thread_id) {
@@ -628,8 +1147,6 @@ bool Vmec::InitializeRadial(
 
       h_.allocate(*r_[thread_id], fc_.ns);
 
-      ls_[thread_id] = std::make_unique<ThreadLocalStorage>(&s_);
-
       p_[thread_id] = std::make_unique<RadialProfiles>(
           r_[thread_id].get(), &h_, &indata_, &fc_, kSignOfJacobian, kPDamp);
 
@@ -645,6 +1162,9 @@ bool Vmec::InitializeRadial(
           vac_num_threads_, kSignOfJacobian, indata_.nvacskip,
           &vacuum_pressure_state_);
       m_[thread_id]->setFromINDATA(indata_.ncurr, indata_.gamma, indata_.tcon0);
+      m_[thread_id]->stageTimers().set_enabled(profiling_enabled_);
+
+      anderson_[thread_id] = std::make_unique<AndersonMixing>();
     }  // thread_id
 
     if (checkpoint == VmecCheckpoint::SPECTRAL_CONSTRAINT &&
@@ -655,35 +1175,6 @@ bool Vmec::InitializeRadial(
       return true;
     }
 
-    // single-threaded creation of objects used in parallel threads
-    for (int thread_id = 0; thread_id < num_threads_; ++thread_id) {
-      // vector of free parameters
-
-      // physically-correct coefficients
-      decomposed_x_[thread_id] =
-          std::make_unique<FourierGeometry>(&s_, r_[thread_id].get(), fc_.ns);
-
-      // even/odd-m decomposed coefficients
-      physical_x_[thread_id] =
-          std::make_unique<FourierGeometry>(&s_, r_[thread_id].get(), fc_.ns);
-
-      // physically-correct coefficients
-      physical_x_backup_[thread_id] =
-          std::make_unique<FourierGeometry>(&s_, r_[thread_id].get(), fc_.ns);
-
-      // even/odd-m decomposed coefficients
-      physical_f_[thread_id] =
-          std::make_unique<FourierForces>(&s_, r_[thread_id].get(), fc_.ns);
-
-      // physically-correct coefficients
-      decomposed_f_[thread_id] =
-          std::make_unique<FourierForces>(&s_, r_[thread_id].get(), fc_.ns);
-
-      // physically-correct coefficients
-      decomposed_v_[thread_id] =
-          std::make_unique<FourierVelocity>(&s_, r_[thread_id].get(), fc_.ns);
-    }
-
     for (int thread_id = 0; thread_id < num_threads_; ++thread_id) {
       decomposed_v_[thread_id]->setZero();
       decomposed_x_[thread_id]->setZero();
@@ -788,6 +1279,9 @@ absl::StatusOr<bool> Vmec::SolveEquilibrium(
   // of the main iteration loop.
   bool liter_flag = true;
 
+  // the early-stopping criteria apply to each multigrid step separately
+  divergence_detector_.Reset();
+
 // NOTE: *THIS* is the main parallel region for the equilibrium solver
 #ifdef _OPENMP
 #pragma omp parallel
@@ -847,6 +1341,11 @@ absl::StatusOr<bool> Vmec::SolveEquilibrium(
     return absl::CancelledError("Run interrupted by user");
   }
 
+  // hand over the records of the last iterations of this multigrid step
+  if (DeliverIterationRecords()) {
+    stopped_by_callback_ = true;
+  }
+
   if (!status_of_all_threads.ok()) {
     if (indata_.return_outputs_even_if_not_converged &&
         all_errors_are_recoverable) {
@@ -886,6 +1385,7 @@ absl::StatusOr<Vmec::SolveEqLoopStatus> Vmec::SolveEquilibriumLoop(
   // RESTART FROM INITIAL PROFILE, BUT WITH A SMALLER TIME-STEP
   if (fc_.restart_reason == RestartReason::BAD_JACOBIAN) {
     decomposed_x_[thread_id]->setZero();
+    anderson_[thread_id]->Reset();
     if (m_lreset_internal) {
       decomposed_x_[thread_id]->interpFromBoundaryAndAxis(t_, b_,
                                                           *p_[thread_id]);
@@ -1187,6 +1687,10 @@ absl::StatusOr<Vmec::SolveEqLoopStatus> Vmec::SolveEquilibriumLoop(
             interrupted_ = true;
             std::cout << "Received interrupt signal from Python thread.\n";
           }
+          if (DeliverIterationRecords()) {
+            m_liter_flag = false;
+            stopped_by_callback_ = true;
+          }
         }
 
         if (checkpoint == VmecCheckpoint::PRINTOUT &&
@@ -1202,6 +1706,32 @@ absl::StatusOr<Vmec::SolveEqLoopStatus> Vmec::SolveEquilibriumLoop(
 #pragma omp barrier
 #endif  // _OPENMP
 
+    // EARLY STOPPING CRITERION: give up if this multigrid step is predicted
+    // not to converge anyway
+    if (divergence_detector_.enabled()) {
+#ifdef _OPENMP
+#pragma omp single
+#endif  // _OPENMP
+      {
+        DivergenceReason reason = DivergenceReason::kNone;
+        if (m_liter_flag && status_ == VmecStatus::NORMAL_TERMINATION) {
+          reason = divergence_detector_.Update(
+              fc_.fsqr + fc_.fsqz + fc_.fsql,
+              restart_reason != RestartReason::NO_RESTART, fc_.delt0r);
+        }
+        if (reason != DivergenceReason::kNone) {
+          divergence_reason_ = reason;
+          status_ = VmecStatus::EARLY_TERMINATION;
+          m_liter_flag = false;
+          if (verbose_) {
+            std::cout << absl::StrFormat(
+                "STOPPING EARLY at iteration %d: %s.\n", iter2,
+                ToString(reason));
+          }
+        }
+      }  // #pragma omp single (there is an implicit omp barrier here)
+    }
+
 // don't use nowait here, since need implicit barrier to protect read of iter2_
 // from write below in potentially different thread
 #ifdef _OPENMP
@@ -1230,6 +1760,34 @@ absl::StatusOr<Vmec::SolveEqLoopStatus> Vmec::SolveEquilibriumLoop(
     // bad resets didn't increment, iter2 in VMEC 8.52, so we need to compute
     // the backwards compatible iteration count
     iter2_ = (force_iteration - bad_resets) + 1;  // equivalent to iter2++
+
+    // SAVE SOLVER STATE to be able to resume from the next iteration
+    if (restart_reason == RestartReason::NO_RESTART && m_liter_flag &&
+        status_ == VmecStatus::NORMAL_TERMINATION &&
+        ShouldSaveSolverState(force_iteration - bad_resets + 1, thread_id)) {
+// wait for all threads to finish the time step before gathering the state
+#ifdef _OPENMP
+#pragma omp barrier
+#endif  // _OPENMP
+
+#ifdef _OPENMP
+#pragma omp master
+#endif  // _OPENMP
+      {
+        last_saved_iteration_ = force_iteration - bad_resets + 1;
+        save_solver_state_status_ = CaptureSolverState(last_saved_iteration_)
+                                        .Save(solver_state_options_.save_to);
+      }
+
+// protect the read of save_solver_state_status_ below from the write above
+#ifdef _OPENMP
+#pragma omp barrier
+#endif  // _OPENMP
+
+      if (!save_solver_state_status_.ok()) {
+        return save_solver_state_status_;
+      }
+    }
   }  // while m_liter_flag
 
   return SolveEqLoopStatus::NORMAL_TERMINATION;
@@ -1246,6 +1804,7 @@ void Vmec::RestartIteration(double& m_delt0r, int thread_id) {
 
     // zero velocity
     decomposed_v_[thread_id]->setZero();
+    anderson_[thread_id]->Reset();
 
     // restore state from backup
     *decomposed_x_[thread_id] = *physical_x_backup_[thread_id];
@@ -1275,6 +1834,7 @@ void Vmec::RestartIteration(double& m_delt0r, int thread_id) {
 
     // zero velocity
     decomposed_v_[thread_id]->setZero();
+    anderson_[thread_id]->Reset();
 
     // restore state from backup
     *decomposed_x_[thread_id] = *physical_x_backup_[thread_id];
@@ -1408,6 +1968,23 @@ absl::StatusOr<bool> Vmec::Evolve(VmecCheckpoint checkpoint,
     }
     fc_.restart_reasons.push_back(fc_.restart_reason);
     fc_.mhd_energy.push_back(h_.mhdEnergy);
+
+    if (telemetry_ != nullptr && telemetry_->ShouldRecord(iter2_)) {
+      IterationRecord record;
+      record.ns = fc_.ns;
+      record.iteration = iter2_;
+      record.fsqr = fc_.fsqr;
+      record.fsqz = fc_.fsqz;
+      record.fsql = fc_.fsql;
+      record.fsqr1 = fc_.fsqr1;
+      record.fsqz1 = fc_.fsqz1;
+      record.fsql1 = fc_.fsql1;
+      record.time_step = time_step;
+      record.mhd_energy = h_.mhdEnergy;
+      record.delbsq = fc_.delbsq.back();
+      record.restart_reason = fc_.restart_reason;
+      telemetry_->Push(record);
+    }
   }
 
   // averaging over ndamp entries : 1/ndamp*sum(invTau)
@@ -1420,7 +1997,14 @@ absl::StatusOr<bool> Vmec::Evolve(VmecCheckpoint checkpoint,
   // THIS IS THE TIME-STEP ALGORITHM. IT IS ESSENTIALLY A CONJUGATE
   // GRADIENT METHOD, WITHOUT THE LINE SEARCHES (FLETCHER-REEVES),
   // BASED ON A METHOD GIVEN BY P. GARABEDIAN
-  PerformTimeStep(fac, b1, time_step, thread_id);
+  {
+    ScopedStageTimer timer(m_[thread_id]->stageTimers(), ModelStage::kTimeStep);
+    if (indata_.iteration_style == IterationStyle::ANDERSON) {
+      AndersonTimeStep(time_step, iter1_, iter2_, thread_id);
+    } else {
+      PerformTimeStep(fac, b1, time_step, thread_id);
+    }
+  }
 
   return false;
 }
@@ -1514,6 +2098,81 @@ void Vmec::PerformTimeStep(double fac, double b1, double time_step,
 #endif  // _OPENMP
 }
 
+void Vmec::AndersonTimeStep(double time_step, int iter1, int iter2,
+                            int thread_id) {
+  const RadialPartitioning& r = *r_[thread_id];
+  const int num_modes = s_.mpol * (s_.ntor + 1);
+  const int num_surfaces = r.nsMaxFIncludingLcfs - r.nsMinF;
+  const auto pairs = ActiveCoefficientPairs(*decomposed_x_[thread_id],
+                                            *decomposed_f_[thread_id], s_);
+
+  // gather the slice of state and forces evolved by this thread
+  Eigen::VectorXd x(pairs.size() * num_surfaces * num_modes);
+  Eigen::VectorXd f(x.size());
+  int index = 0;
+  for (const auto& [x_component, f_component] : pairs) {
+    for (int jF = r.nsMinF; jF < r.nsMaxFIncludingLcfs; ++jF) {
+      for (int mn = 0; mn < num_modes; ++mn) {
+        x[index] = x_component[(jF - r.nsMinF1) * num_modes + mn];
+        f[index] = f_component[(jF - r.nsMinF) * num_modes + mn];
+        ++index;
+      }  // mn
+    }  // jF
+  }
+
+  AndersonMixing& mixing = *anderson_[thread_id];
+  if ((iter2 - iter1) % fc_.kPreconditionerUpdateInterval == 0) {
+    // the preconditioner was just updated, which changes the forces that the
+    // previous iterates were mixed with
+    mixing.Reset();
+  }
+  mixing.Update(x, f);
+
+  // all threads have the same history size
+#ifdef _OPENMP
+#pragma omp single
+#endif  // _OPENMP
+  {
+    anderson_gram_.setZero(mixing.history_size(), mixing.history_size());
+    anderson_rhs_.setZero(mixing.history_size());
+  }
+  // implicit barrier after omp single
+
+#ifdef _OPENMP
+#pragma omp critical
+#endif  // _OPENMP
+  mixing.AccumulateNormalEquations(anderson_gram_, anderson_rhs_);
+
+#ifdef _OPENMP
+#pragma omp barrier
+#endif  // _OPENMP
+
+#ifdef _OPENMP
+#pragma omp single
+#endif  // _OPENMP
+  anderson_coefficients_ =
+      AndersonMixing::SolveNormalEquations(anderson_gram_, anderson_rhs_);
+  // implicit barrier after omp single
+
+  const double beta = time_step * time_step;
+  mixing.MixForces(anderson_coefficients_, beta, f);
+
+  // scatter the mixed forces back
+  index = 0;
+  for (const auto& [x_component, f_component] : pairs) {
+    for (int jF = r.nsMinF; jF < r.nsMaxFIncludingLcfs; ++jF) {
+      for (int mn = 0; mn < num_modes; ++mn) {
+        f_component[(jF - r.nsMinF) * num_modes + mn] = f[index];
+        ++index;
+      }  // mn
+    }  // jF
+  }
+
+  // Without damping and conjugation, the velocity step advances the state by
+  // time_step^2 times the (mixed) forces.
+  PerformTimeStep(/*fac=*/1.0, /*b1=*/0.0, time_step, thread_id);
+}
+
 // velocity_scale == fac
 // conjugation_parameter == b1
 void Vmec::performTimeStep(const Sizes& s, const FlowControl& fc,
@@ -12,6 +12,7 @@
 #include <utility>
 #include <vector>
 
+#include "vmecpp/common/fourier_basis_cache/fourier_basis_cache.h"
 #include "vmecpp/common/makegrid_lib/makegrid_lib.h"
 #include "vmecpp/common/sizes/sizes.h"
 #include "vmecpp/common/util/util.h"
@@ -19,17 +20,23 @@
 #include "vmecpp/free_boundary/free_boundary_base/free_boundary_base.h"
 #include "vmecpp/free_boundary/nestor/nestor.h"
 #include "vmecpp/free_boundary/tangential_partitioning/tangential_partitioning.h"
+#include "vmecpp/vmec/anderson_mixing/anderson_mixing.h"
 #include "vmecpp/vmec/boundaries/boundaries.h"
+#include "vmecpp/vmec/divergence_detector/divergence_detector.h"
 #include "vmecpp/vmec/fourier_forces/fourier_forces.h"
 #include "vmecpp/vmec/fourier_geometry/fourier_geometry.h"
 #include "vmecpp/vmec/fourier_velocity/fourier_velocity.h"
 #include "vmecpp/vmec/handover_storage/handover_storage.h"
 #include "vmecpp/vmec/ideal_mhd_model/ideal_mhd_model.h"
 #include "vmecpp/vmec/iteration_logger/iteration_logger.h"
+#include "vmecpp/vmec/iteration_telemetry/iteration_telemetry.h"
 #include "vmecpp/vmec/output_quantities/output_quantities.h"
 #include "vmecpp/vmec/radial_partitioning/radial_partitioning.h"
 #include "vmecpp/vmec/radial_profiles/radial_profiles.h"
+#include "vmecpp/vmec/solver_state/solver_state.h"
+#include "vmecpp/vmec/stage_timers/stage_timers.h"
 #include "vmecpp/vmec/vmec_constants/vmec_constants.h"
+#include "vmecpp/vmec/workspace_pool/workspace_pool.h"
 
 namespace vmecpp {
 
@@ -64,23 +71,62 @@ struct HotRestartState {
 using InterruptCallback = std::function<bool()>;
 
 // This is the preferred way to run VMEC++.
+// If `profile` is true, the time spent in the individual stages of the run is
+// reported in OutputQuantities::timings.
+// If `iteration_callback` is set, it receives the convergence data of every
+// `iteration_callback_stride`-th iteration, in batches, from the calling
+// thread; see Vmec::set_iteration_callback.
+// `early_stop` configures when to give up on a run that is not going to
+// converge; see Vmec::set_early_stop_criteria.
+// `solver_state` configures periodic snapshots of the solver state to disk and
+// resuming from them; see Vmec::set_solver_state_options.
 absl::StatusOr<OutputQuantities> run(
     const VmecINDATA& indata,
     std::optional<HotRestartState> initial_state = std::nullopt,
     std::optional<int> max_threads = std::nullopt,
     OutputMode verbose = OutputMode::kLegacy,
-    InterruptCallback interrupt_callback = nullptr);
+    InterruptCallback interrupt_callback = nullptr, bool profile = false,
+    IterationCallback iteration_callback = nullptr,
+    int iteration_callback_stride = 1,
+    const EarlyStopCriteria& early_stop = EarlyStopCriteria(),
+    const SolverStateOptions& solver_state = SolverStateOptions());
 
 // This overload enables free-boundary runs with an in-memory mgrid file.
 // The mgrid_file entry in `indata` will be ignored.
 // This is useful e.g. to perform free-boundary hot-restarted runs where
 // the coil geometry can be modified in-memory.
+// The per-circuit fields are read in place, so they can also live in memory
+// that is shared between processes.
 absl::StatusOr<OutputQuantities> run(
     const VmecINDATA& indata,
-    const makegrid::MagneticFieldResponseTable& magnetic_response_table,
+    const makegrid::MagneticFieldResponseTableView& magnetic_response_table,
     std::optional<HotRestartState> initial_state = std::nullopt,
     std::optional<int> max_threads = std::nullopt,
     OutputMode verbose = OutputMode::kLegacy,
+    InterruptCallback interrupt_callback = nullptr, bool profile = false,
+    IterationCallback iteration_callback = nullptr,
+    int iteration_callback_stride = 1,
+    const EarlyStopCriteria& early_stop = EarlyStopCriteria(),
+    const SolverStateOptions& solver_state = SolverStateOptions());
+
+// Free-boundary runs of `indata` for each row of `extcur_batch`, a
+// [num_runs x nextcur] matrix of coil currents that replace indata.extcur.
+// All runs share `magnetic_response_table`: the per-circuit fields are
+// combined with the currents of each run at the plasma boundary only, so the
+// table is neither copied nor summed over the whole grid per run.
+// Up to `max_concurrent_runs` runs (by default, as many as there are threads)
+// are executed concurrently and the `max_threads` threads (by default, all
+// available) are split evenly among them. The calling thread takes part in the
+// work; `interrupt_callback` is only called from it and stops all runs.
+// The i-th entry of the result holds the outcome of the i-th row.
+std::vector<absl::StatusOr<OutputQuantities>> run_extcur_batch(
+    const VmecINDATA& indata,
+    const makegrid::MagneticFieldResponseTableView& magnetic_response_table,
+    const makegrid::RowMatrixXd& extcur_batch,
+    const std::optional<HotRestartState>& initial_state = std::nullopt,
+    std::optional<int> max_threads = std::nullopt,
+    std::optional<int> max_concurrent_runs = std::nullopt,
+    OutputMode verbose = OutputMode::kSilent,
     InterruptCallback interrupt_callback = nullptr);
 
 class Vmec {
@@ -101,6 +147,10 @@ class Vmec {
   Vmec(Vmec&&) = delete;
   Vmec& operator=(Vmec&&) = delete;
 
+  // Returns the per-thread buffers to the WorkspacePool for reuse by
+  // subsequent runs.
+  ~Vmec();
+
   // sign of Jacobian between cylindrical and flux coordinates
   // This is called `signgs` in Fortran VMEC.
   static constexpr int kSignOfJacobian = -1;
@@ -111,14 +161,42 @@ class Vmec {
   // Factory method for creating a Vmec instance.
   // Handles mgrid loading for free-boundary runs with proper error handling.
   // Returns a unique_ptr because Vmec is non-movable.
+  // If `magnetic_response_table` is set, the memory it views must outlive the
+  // returned Vmec: its per-circuit fields are referenced rather than copied.
   static absl::StatusOr<std::unique_ptr<Vmec>> FromIndata(
       const VmecINDATA& indata,
-      const makegrid::MagneticFieldResponseTable* magnetic_response_table =
+      const makegrid::MagneticFieldResponseTableView* magnetic_response_table =
           nullptr,
       std::optional<int> max_threads = std::nullopt,
       OutputMode verbose = OutputMode::kLegacy,
       InterruptCallback interrupt_callback = nullptr);
 
+  // Enable or disable the per-stage timers (see ModelStage). If enabled, the
+  // aggregated timings are reported in OutputQuantities::timings by run().
+  void set_profiling_enabled(bool enabled);
+
+  // Stream the convergence data of every `stride`-th iteration to `callback`.
+  // The records are buffered (see IterationTelemetry) and handed over in
+  // batches by the thread that called run(), at the points where it also
+  // checks for interrupts (every nstep iterations) and at the end of each
+  // multigrid step. If the callback returns true, the run stops as if the
+  // iteration budget had been exhausted.
+  void set_iteration_callback(IterationCallback callback, int stride = 1);
+
+  // Give up on a multigrid step as soon as it violates one of the given
+  // criteria, instead of iterating until niter is exhausted. The run then
+  // terminates with VmecStatus::EARLY_TERMINATION.
+  void set_early_stop_criteria(const EarlyStopCriteria& criteria);
+
+  // Periodically save the SolverState to `options.save_to` while running, and
+  // resume from the one in `options.resume_from` instead of starting from
+  // scratch. A resumed run skips the multigrid steps that were completed
+  // before the state was saved and continues from the saved iteration. Apart
+  // from the history of IterationStyle::ANDERSON, which starts over, it takes
+  // the same steps as the run that saved the state would have taken.
+  // `initial_state` of run() is ignored when resuming.
+  void set_solver_state_options(const SolverStateOptions& options);
+
   absl::StatusOr<bool> run(
       const VmecCheckpoint& checkpoint = VmecCheckpoint::NONE,
       int iterations_before_checkpointing = INT_MAX,
@@ -150,6 +228,12 @@ class Vmec {
                                           int maximum_iterations,
                                           int thread_id);
   void PerformTimeStep(double fac, double b1, double time_step, int thread_id);
+  // Time step of IterationStyle::ANDERSON: mix the preconditioned forces with
+  // those of the previous iterations since the last preconditioner update and
+  // take a step of size time_step^2 along the mixed forces. The iteration
+  // counters locate the preconditioner updates (see
+  // IdealMhdModel::shouldUpdateRadialPreconditioner).
+  void AndersonTimeStep(double time_step, int iter1, int iter2, int thread_id);
   void InterpolateToNextMultigridStep(
       int ns_new, int ns_old,
       const std::vector<std::unique_ptr<RadialProfiles>>& p,
@@ -194,8 +278,12 @@ class Vmec {
   // -------------------
 
   VmecINDATA indata_;
-  Sizes s_;
-  FourierBasisFastPoloidal t_;
+  // s_ and t_ refer into these tables, which are shared with all other Vmec
+  // instances of the same resolution (see FourierBasisCache). The vacuum
+  // solvers in fb_vac_ use their toroidal basis.
+  std::shared_ptr<const FourierBasisTables> fourier_basis_tables_;
+  const Sizes& s_;
+  const FourierBasisFastPoloidal& t_;
   Boundaries b_;
   VmecConstants constants_;
   HandoverStorage h_;
@@ -220,6 +308,13 @@ class Vmec {
   std::vector<std::unique_ptr<FourierForces>> physical_f_;
   std::vector<std::unique_ptr<FourierVelocity>> decomposed_v_;
 
+  // per-thread history of IterationStyle::ANDERSON
+  std::vector<std::unique_ptr<AndersonMixing>> anderson_;
+  // Anderson normal equations summed over all threads and their solution
+  Eigen::MatrixXd anderson_gram_;
+  Eigen::VectorXd anderson_rhs_;
+  Eigen::VectorXd anderson_coefficients_;
+
   std::vector<std::unique_ptr<FourierGeometry>> old_xc_scaled_;
   std::vector<std::unique_ptr<RadialPartitioning>> old_r_;
 
@@ -234,11 +329,49 @@ class Vmec {
     MUST_RETRY
   };
 
+  // Fold the stage timers of the current models (m_) into timing_report_ and
+  // reset them. No-op if profiling is disabled.
+  void CollectStageTimers();
+
+  // Hand the buffered iteration records over to iteration_callback_, if any.
+  // Returns true if the callback requested the run to stop.
+  // Must be called from the thread that called run().
+  bool DeliverIterationRecords();
+
+  // Move the leased per-thread buffers (ls_, decomposed_x_, ...) back into
+  // workspace_ and return it to the WorkspacePool.
+  void ReturnRadialWorkspace();
+
+  // Whether to save the SolverState at the end of the current iteration, from
+  // which the run resumes at iteration `next_iter2`. Evaluates to the same
+  // value on all threads.
+  bool ShouldSaveSolverState(int next_iter2, int thread_id) const;
+
+  // Gather the SolverState from all threads. Must not run concurrently with
+  // an iteration.
+  SolverState CaptureSolverState(int next_iter2) const;
+
+  // Check that `state` was saved by a run with the same resolution.
+  absl::Status CheckSolverState(const SolverState& state) const;
+
+  // Distribute `state` over the threads of the current multigrid step, which
+  // must have been set up by InitializeRadial with ns = state.ns.
+  absl::Status RestoreSolverState(const SolverState& state);
+
   // Inner multi-thread loop logic for SolveEquilibrium
   absl::StatusOr<SolveEqLoopStatus> SolveEquilibriumLoop(
       int thread_id, int maximum_iterations, VmecCheckpoint checkpoint,
       bool& m_lreset_internal, bool& m_liter_flag);
 
+  // The workspace the per-thread buffers of the current multigrid step were
+  // leased from; owns the Sizes and RadialPartitioning they refer to.
+  std::unique_ptr<RadialWorkspace> workspace_;
+
+  bool profiling_enabled_ = false;
+  // timers for the parts of the run outside of the parallel region
+  StageTimers run_timers_;
+  TimingReport timing_report_;
+
   // flag to enable or disable ALL screen output from VMEC++
   bool verbose_;
 
@@ -251,6 +384,31 @@ class Vmec {
   // set to true when the interrupt callback signals an interrupt
   bool interrupted_ = false;
 
+  // optional consumer of the per-iteration convergence data
+  IterationCallback iteration_callback_;
+  // buffer between the LCFS thread and iteration_callback_;
+  // only allocated if iteration_callback_ is set
+  std::unique_ptr<IterationTelemetry> telemetry_;
+
+  // set to true when the iteration callback requests the run to stop
+  bool stopped_by_callback_ = false;
+
+  // predicts failing multigrid steps, see set_early_stop_criteria
+  DivergenceDetector divergence_detector_;
+  // why the run was terminated early, if status_ is EARLY_TERMINATION
+  DivergenceReason divergence_reason_ = DivergenceReason::kNone;
+
+  // where to save the SolverState to and resume from
+  SolverStateOptions solver_state_options_;
+  // index of the current multigrid step into ns_array, see run()
+  int igrid_ = 0;
+  // iter2 at which the SolverState was saved last, or at which the current
+  // multigrid step started
+  int last_saved_iteration_ = 0;
+  // outcome of the last attempt to save the SolverState, shared by all
+  // threads
+  absl::Status save_solver_state_status_;
+
   // initialization state counter for Nestor. Called ivac in Fortran VMEC.
   VacuumPressureState vacuum_pressure_state_;
 
@@ -131,3 +131,70 @@ TEST(TestVmec, SolovevFreeBoundaryAxisymmetric) {
                       /*tolerance=*/1e-7, /*check_equal_niter=*/true,
                       /*current_density_tolerance=*/2e-7);
 }
+
+TEST(TestVmec, ExtcurBatchMatchesIndividualRuns) {
+  absl::StatusOr<std::string> indata_json =
+      ReadFile("vmecpp/test_data/cth_like_free_bdy.json");
+  ASSERT_TRUE(indata_json.ok());
+  absl::StatusOr<VmecINDATA> maybe_indata = VmecINDATA::FromJson(*indata_json);
+  ASSERT_TRUE(maybe_indata.ok());
+  const VmecINDATA& indata = maybe_indata.value();
+
+  const auto maybe_magnetic_configuration =
+      magnetics::ImportMagneticConfigurationFromCoilsFile(
+          "vmecpp/test_data/coils.cth_like");
+  ASSERT_TRUE(maybe_magnetic_configuration.ok());
+  const auto maybe_makegrid_params = makegrid::ImportMakegridParametersFromFile(
+      "vmecpp/test_data/makegrid_parameters_cth_like.json");
+  ASSERT_TRUE(maybe_makegrid_params.ok());
+  const auto maybe_magnetic_response_table =
+      makegrid::ComputeMagneticFieldResponseTable(
+          *maybe_makegrid_params, *maybe_magnetic_configuration);
+  ASSERT_TRUE(maybe_magnetic_response_table.ok());
+  const auto& magnetic_response_table = *maybe_magnetic_response_table;
+
+  // three sets of coil currents around the nominal ones
+  makegrid::RowMatrixXd extcur_batch(3, indata.extcur.size());
+  extcur_batch.row(0) = indata.extcur.transpose();
+  extcur_batch.row(1) = 1.01 * indata.extcur.transpose();
+  extcur_batch.row(2) = 0.99 * indata.extcur.transpose();
+
+  const auto batch_outputs = vmecpp::run_extcur_batch(
+      indata, magnetic_response_table, extcur_batch,
+      /*initial_state=*/std::nullopt, /*max_threads=*/2,
+      /*max_concurrent_runs=*/2);
+  ASSERT_EQ(batch_outputs.size(), 3);
+
+  for (int i = 0; i < extcur_batch.rows(); ++i) {
+    ASSERT_TRUE(batch_outputs[i].ok()) << batch_outputs[i].status();
+
+    VmecINDATA single_indata = indata;
+    single_indata.extcur = extcur_batch.row(i).transpose();
+    const auto single_output =
+        vmecpp::run(single_indata, magnetic_response_table,
+                    /*initial_state=*/std::nullopt, /*max_threads=*/1,
+                    vmecpp::OutputMode::kSilent);
+    ASSERT_TRUE(single_output.ok());
+
+    // each run of the batch uses a single thread as well
+    vmecpp::CompareWOut(batch_outputs[i]->wout, single_output->wout,
+                        /*tolerance=*/1e-12, /*check_equal_niter=*/true);
+  }
+}
+
+TEST(TestVmec, ExtcurBatchRejectsFixedBoundaryInput) {
+  absl::StatusOr<std::string> indata_json =
+      ReadFile("vmecpp/test_data/solovev.json");
+  ASSERT_TRUE(indata_json.ok());
+  absl::StatusOr<VmecINDATA> maybe_indata = VmecINDATA::FromJson(*indata_json);
+  ASSERT_TRUE(maybe_indata.ok());
+
+  const makegrid::MagneticFieldResponseTable magnetic_response_table{};
+  const makegrid::RowMatrixXd extcur_batch = makegrid::RowMatrixXd::Zero(2, 1);
+  const auto outputs = vmecpp::run_extcur_batch(
+      *maybe_indata, magnetic_response_table, extcur_batch);
+  ASSERT_EQ(outputs.size(), 2);
+  for (const auto& output : outputs) {
+    EXPECT_EQ(output.status().code(), absl::StatusCode::kInvalidArgument);
+  }
+}
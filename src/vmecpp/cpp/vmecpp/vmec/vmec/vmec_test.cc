@@ -33,6 +33,7 @@ using nlohmann::json;
 
 using file_io::ReadFile;
 using testing::IsCloseRelAbs;
+using testing::IsVectorCloseRelAbs;
 
 using ::testing::DoubleNear;
 using ::testing::ElementsAreArray;
@@ -538,3 +539,242 @@ TEST(TestVmec, MultiGridFreeBoundary) {
   // second stage enters force-balanced instead of kicking the boundary).
   EXPECT_EQ(output->wout.niter, 321);
 }  // MultiGridFreeBoundary
+
+// Consecutive runs at the same resolution recycle the per-thread buffers of
+// their predecessors through the WorkspacePool. A recycled workspace must not
+// leak any state from the previous run into the next one.
+TEST(TestVmec, ConsecutiveRunsRecycleWorkspaces) {
+  const std::string filename = "vmecpp/test_data/solovev.json";
+  const absl::StatusOr<std::string> indata_json = ReadFile(filename);
+  ASSERT_TRUE(indata_json.ok());
+
+  const absl::StatusOr<VmecINDATA> indata = VmecINDATA::FromJson(*indata_json);
+  ASSERT_TRUE(indata.ok());
+
+  vmecpp::WorkspacePool& pool = vmecpp::WorkspacePool::Global();
+  pool.Clear();
+
+  const auto first_output = vmecpp::run(*indata, std::nullopt, 1);
+  ASSERT_TRUE(first_output.ok());
+  const int64_t hits_after_first_run = pool.NumHits();
+  // one workspace per multigrid step is returned to the pool
+  EXPECT_EQ(pool.NumIdle(), static_cast<int>(indata->ns_array.size()));
+
+  const auto second_output = vmecpp::run(*indata, std::nullopt, 1);
+  ASSERT_TRUE(second_output.ok());
+  EXPECT_EQ(pool.NumHits() - hits_after_first_run,
+            static_cast<int64_t>(indata->ns_array.size()));
+
+  // bit-for-bit identical results
+  const auto& first = first_output->wout;
+  const auto& second = second_output->wout;
+  EXPECT_EQ(first.niter, second.niter);
+  EXPECT_EQ(first.volume, second.volume);
+  EXPECT_EQ(first.fsqr, second.fsqr);
+  EXPECT_TRUE(second.rmnc == first.rmnc) << "rmnc";
+  EXPECT_TRUE(second.zmns == first.zmns) << "zmns";
+  EXPECT_TRUE(second.lmns == first.lmns) << "lmns";
+}  // ConsecutiveRunsRecycleWorkspaces
+
+// The iteration callback sees the same residuals as the convergence traces in
+// FlowControl, at the requested stride, and can stop the run.
+TEST(TestVmec, IterationCallbackStreamsResiduals) {
+  const std::string filename = "vmecpp/test_data/solovev.json";
+  const absl::StatusOr<std::string> indata_json = ReadFile(filename);
+  ASSERT_TRUE(indata_json.ok());
+
+  const absl::StatusOr<VmecINDATA> indata = VmecINDATA::FromJson(*indata_json);
+  ASSERT_TRUE(indata.ok());
+
+  constexpr int kStride = 3;
+  std::vector<vmecpp::IterationRecord> records;
+  int num_batches = 0;
+  const auto collect = [&](const std::vector<vmecpp::IterationRecord>& batch) {
+    records.insert(records.end(), batch.begin(), batch.end());
+    ++num_batches;
+    return false;
+  };
+
+  const auto output =
+      vmecpp::run(*indata, std::nullopt, 2, vmecpp::OutputMode::kSilent,
+                  nullptr, false, collect, kStride);
+  ASSERT_TRUE(output.ok()) << output.status();
+  ASSERT_FALSE(records.empty());
+  // records are delivered in batches, not one by one
+  EXPECT_LT(num_batches, static_cast<int>(records.size()));
+  EXPECT_EQ(records.back().ns, indata->ns_array[indata->ns_array.size() - 1]);
+
+  const auto& wout = output->wout;
+  for (const vmecpp::IterationRecord& record : records) {
+    EXPECT_EQ(record.iteration % kStride, 0);
+    EXPECT_GT(record.time_step, 0.0);
+
+    // each record corresponds to an entry of the residual traces
+    bool found_in_trace = false;
+    for (int i = 0; i < wout.force_residual_r.size(); ++i) {
+      found_in_trace |= (wout.force_residual_r[i] == record.fsqr &&
+                         wout.force_residual_z[i] == record.fsqz &&
+                         wout.force_residual_lambda[i] == record.fsql);
+    }
+    EXPECT_TRUE(found_in_trace) << "iteration " << record.iteration;
+  }
+
+  // stop as soon as the first batch arrives
+  const auto stop = [](const std::vector<vmecpp::IterationRecord>&) {
+    return true;
+  };
+  const auto stopped =
+      vmecpp::run(*indata, std::nullopt, 2, vmecpp::OutputMode::kSilent,
+                  nullptr, false, stop, kStride);
+  ASSERT_FALSE(stopped.ok());
+  EXPECT_TRUE(absl::IsCancelled(stopped.status())) << stopped.status();
+}  // IterationCallbackStreamsResiduals
+
+// With early stopping enabled, a run that does not make progress fast enough
+// is abandoned with a distinct status instead of exhausting niter.
+TEST(TestVmec, EarlyStopOnStagnation) {
+  const std::string filename = "vmecpp/test_data/solovev.json";
+  const absl::StatusOr<std::string> indata_json = ReadFile(filename);
+  ASSERT_TRUE(indata_json.ok());
+
+  absl::StatusOr<VmecINDATA> indata = VmecINDATA::FromJson(*indata_json);
+  ASSERT_TRUE(indata.ok());
+
+  // lenient criteria do not interfere with a converging run
+  vmecpp::EarlyStopCriteria lenient;
+  lenient.stagnation_window = 500;
+  lenient.max_restarts = 40;
+  lenient.min_time_step_fraction = 0.05;
+  const auto converged =
+      vmecpp::run(*indata, std::nullopt, 1, vmecpp::OutputMode::kSilent,
+                  nullptr, false, nullptr, 1, lenient);
+  ASSERT_TRUE(converged.ok()) << converged.status();
+
+  // the residuals never drop by 100x within 5 iterations
+  vmecpp::EarlyStopCriteria impatient;
+  impatient.stagnation_window = 5;
+  impatient.stagnation_factor = 0.01;
+  const auto stopped =
+      vmecpp::run(*indata, std::nullopt, 1, vmecpp::OutputMode::kSilent,
+                  nullptr, false, nullptr, 1, impatient);
+  ASSERT_FALSE(stopped.ok());
+  EXPECT_TRUE(absl::IsAborted(stopped.status())) << stopped.status();
+
+  indata->return_outputs_even_if_not_converged = true;
+  const auto best_effort =
+      vmecpp::run(*indata, std::nullopt, 1, vmecpp::OutputMode::kSilent,
+                  nullptr, false, nullptr, 1, impatient);
+  ASSERT_TRUE(best_effort.ok()) << best_effort.status();
+  EXPECT_EQ(best_effort->wout.ier_flag,
+            vmecpp::VmecStatusCode(vmecpp::VmecStatus::EARLY_TERMINATION));
+  EXPECT_LT(best_effort->wout.force_residual_r.size(), 20);
+}  // EarlyStopOnStagnation
+
+// A free-boundary multigrid run that is stopped in its last multigrid step,
+// after the vacuum pressure has been turned on, continues from its last
+// SolverState as if it had never stopped: the NESTOR state (vacuum pressure
+// state, nvacskip, rCon0/zCon0, last full update) is restored with the rest.
+// The surfaces can be distributed over a different number of threads.
+TEST(TestVmec, SaveAndResumeFreeBoundaryMultigrid) {
+  const std::string filename =
+      "vmecpp/test_data/cth_like_free_bdy_multigrid.json";
+  const absl::StatusOr<std::string> indata_json = ReadFile(filename);
+  ASSERT_TRUE(indata_json.ok());
+
+  absl::StatusOr<VmecINDATA> indata = VmecINDATA::FromJson(*indata_json);
+  ASSERT_TRUE(indata.ok());
+  ASSERT_TRUE(indata->lfreeb);
+  ASSERT_EQ(indata->ns_array.size(), 2u);
+  const int final_ns = indata->ns_array[indata->ns_array.size() - 1];
+  // full NESTOR updates every 5 iterations, so snapshots can be taken at every
+  // preconditioner update once the vacuum pressure is on
+  indata->nvacskip = 5;
+  // deliver iteration records, and thus check for a new snapshot, often
+  indata->nstep = 10;
+
+  const auto reference =
+      vmecpp::run(*indata, std::nullopt, 1, vmecpp::OutputMode::kSilent);
+  ASSERT_TRUE(reference.ok()) << reference.status();
+
+  vmecpp::SolverStateOptions save_options;
+  save_options.save_to =
+      fs::path(testing::TempDir()) / "free_boundary_solver_state.h5";
+  save_options.save_every = 1;
+  fs::remove(save_options.save_to);
+
+  // stop as soon as a snapshot of the last multigrid step with the vacuum
+  // pressure fully turned on has been written
+  const auto stop_when_vacuum_is_active =
+      [&](const std::vector<vmecpp::IterationRecord>&) {
+        const absl::StatusOr<vmecpp::SolverState> state =
+            vmecpp::SolverState::Load(save_options.save_to);
+        return state.ok() && state->ns == final_ns &&
+               state->vacuum_pressure_state ==
+                   static_cast<int>(vmecpp::VacuumPressureState::kActive);
+      };
+  const auto stopped = vmecpp::run(
+      *indata, std::nullopt, 1, vmecpp::OutputMode::kSilent, nullptr, false,
+      stop_when_vacuum_is_active, 1, vmecpp::EarlyStopCriteria(), save_options);
+  ASSERT_FALSE(stopped.ok());
+  ASSERT_TRUE(absl::IsCancelled(stopped.status())) << stopped.status();
+
+  const absl::StatusOr<vmecpp::SolverState> state =
+      vmecpp::SolverState::Load(save_options.save_to);
+  ASSERT_TRUE(state.ok()) << state.status();
+  EXPECT_TRUE(state->lfreeb);
+  EXPECT_EQ(state->igrid, static_cast<int>(indata->ns_array.size()) - 1);
+  EXPECT_EQ(state->vacuum_pressure_state,
+            static_cast<int>(vmecpp::VacuumPressureState::kActive));
+  EXPECT_GE(state->nvacskip, indata->nvacskip);
+  EXPECT_GT(state->last_full_update_nestor, 0);
+  EXPECT_EQ(state->rCon0.size(),
+            final_ns * state->nZeta * state->nThetaReduced);
+  EXPECT_EQ(state->zCon0.size(), state->rCon0.size());
+  const int num_saved_iterations =
+      static_cast<int>(state->force_residual_r.size());
+  ASSERT_LT(num_saved_iterations, reference->wout.force_residual_r.size());
+
+  vmecpp::SolverStateOptions resume_options;
+  resume_options.resume_from = save_options.save_to;
+  const auto& expected = reference->wout;
+
+  // same number of threads: the resumed run takes the very same iterations
+  const auto resumed = vmecpp::run(
+      *indata, std::nullopt, 1, vmecpp::OutputMode::kSilent, nullptr, false,
+      nullptr, 1, vmecpp::EarlyStopCriteria(), resume_options);
+  ASSERT_TRUE(resumed.ok()) << resumed.status();
+  EXPECT_EQ(resumed->wout.niter, expected.niter);
+  EXPECT_TRUE(IsVectorCloseRelAbs(expected.force_residual_r,
+                                  resumed->wout.force_residual_r, 1.0e-10));
+  ASSERT_EQ(resumed->wout.rmnc.rows(), expected.rmnc.rows());
+  ASSERT_EQ(resumed->wout.rmnc.cols(), expected.rmnc.cols());
+  for (int j = 0; j < expected.rmnc.rows(); ++j) {
+    for (int mn = 0; mn < expected.rmnc.cols(); ++mn) {
+      EXPECT_TRUE(IsCloseRelAbs(expected.rmnc(j, mn), resumed->wout.rmnc(j, mn),
+                                1.0e-10))
+          << "rmnc at j=" << j << " mn=" << mn;
+    }
+  }
+
+  // different number of threads: the snapshot part of the history is the same,
+  // the rest only differs by the order of the reductions over the surfaces
+  const auto resumed_on_two_threads = vmecpp::run(
+      *indata, std::nullopt, 2, vmecpp::OutputMode::kSilent, nullptr, false,
+      nullptr, 1, vmecpp::EarlyStopCriteria(), resume_options);
+  ASSERT_TRUE(resumed_on_two_threads.ok()) << resumed_on_two_threads.status();
+  const auto& actual = resumed_on_two_threads->wout;
+  ASSERT_GE(actual.force_residual_r.size(), num_saved_iterations);
+  EXPECT_TRUE(IsVectorCloseRelAbs(
+      expected.force_residual_r.head(num_saved_iterations),
+      actual.force_residual_r.head(num_saved_iterations), 1.0e-10));
+  EXPECT_LE(actual.fsqr, indata->ftol_array[indata->ftol_array.size() - 1]);
+  ASSERT_EQ(actual.rmnc.rows(), expected.rmnc.rows());
+  ASSERT_EQ(actual.rmnc.cols(), expected.rmnc.cols());
+  const double rmnc_scale = expected.rmnc.cwiseAbs().maxCoeff();
+  for (int j = 0; j < expected.rmnc.rows(); ++j) {
+    for (int mn = 0; mn < expected.rmnc.cols(); ++mn) {
+      EXPECT_NEAR(actual.rmnc(j, mn), expected.rmnc(j, mn), 1.0e-9 * rmnc_scale)
+          << "rmnc at j=" << j << " mn=" << mn;
+    }
+  }
+}  // SaveAndResumeFreeBoundaryMultigrid
@@ -0,0 +1,193 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/workspace_pool/workspace_pool.h"
+
+#include <utility>
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif  // _OPENMP
+
+namespace vmecpp {
+
+RadialWorkspace::RadialWorkspace(const Sizes& sizes, int ns, int num_threads,
+                                 bool lfreeb)
+    : s(sizes), ns(ns), num_threads(num_threads), lfreeb(lfreeb) {
+  r.resize(num_threads);
+  ls.resize(num_threads);
+  decomposed_x.resize(num_threads);
+  physical_x.resize(num_threads);
+  physical_x_backup.resize(num_threads);
+  decomposed_f.resize(num_threads);
+  physical_f.resize(num_threads);
+  decomposed_v.resize(num_threads);
+
+  // The OpenMP runtime might grant fewer threads than requested,
+  // so the remaining thread ids are distributed round-robin.
+#ifdef _OPENMP
+#pragma omp parallel num_threads(num_threads)
+#endif  // _OPENMP
+  {
+#ifdef _OPENMP
+    const int first_thread_id = omp_get_thread_num();
+    const int thread_id_stride = omp_get_num_threads();
+#else
+    const int first_thread_id = 0;
+    const int thread_id_stride = 1;
+#endif  // _OPENMP
+    for (int thread_id = first_thread_id; thread_id < num_threads;
+         thread_id += thread_id_stride) {
+      r[thread_id] = std::make_unique<RadialPartitioning>();
+      r[thread_id]->adjustRadialPartitioning(num_threads, thread_id, ns, lfreeb,
+                                             /*printout=*/false);
+
+      ls[thread_id] = std::make_unique<ThreadLocalStorage>(&s);
+
+      decomposed_x[thread_id] =
+          std::make_unique<FourierGeometry>(&s, r[thread_id].get(), ns);
+      physical_x[thread_id] =
+          std::make_unique<FourierGeometry>(&s, r[thread_id].get(), ns);
+      physical_x_backup[thread_id] =
+          std::make_unique<FourierGeometry>(&s, r[thread_id].get(), ns);
+      decomposed_f[thread_id] =
+          std::make_unique<FourierForces>(&s, r[thread_id].get(), ns);
+      physical_f[thread_id] =
+          std::make_unique<FourierForces>(&s, r[thread_id].get(), ns);
+      decomposed_v[thread_id] =
+          std::make_unique<FourierVelocity>(&s, r[thread_id].get(), ns);
+    }  // thread_id
+  }
+}
+
+bool RadialWorkspace::Matches(const Sizes& sizes, int ns, int num_threads,
+                              bool lfreeb) const {
+  return this->ns == ns && this->num_threads == num_threads &&
+         this->lfreeb == lfreeb && s.lasym == sizes.lasym &&
+         s.nfp == sizes.nfp && s.mpol == sizes.mpol && s.ntor == sizes.ntor &&
+         s.mpolGeometry == sizes.mpolGeometry &&
+         s.ntorGeometry == sizes.ntorGeometry && s.ntheta == sizes.ntheta &&
+         s.nZeta == sizes.nZeta;
+}
+
+void RadialWorkspace::SetZero() {
+#ifdef _OPENMP
+#pragma omp parallel num_threads(num_threads)
+#endif  // _OPENMP
+  {
+#ifdef _OPENMP
+    const int first_thread_id = omp_get_thread_num();
+    const int thread_id_stride = omp_get_num_threads();
+#else
+    const int first_thread_id = 0;
+    const int thread_id_stride = 1;
+#endif  // _OPENMP
+    for (int thread_id = first_thread_id; thread_id < num_threads;
+         thread_id += thread_id_stride) {
+      ls[thread_id]->setZero();
+      decomposed_x[thread_id]->setZero();
+      physical_x[thread_id]->setZero();
+      physical_x_backup[thread_id]->setZero();
+      decomposed_f[thread_id]->setZero();
+      physical_f[thread_id]->setZero();
+      decomposed_v[thread_id]->setZero();
+    }  // thread_id
+  }
+}
+
+WorkspacePool& WorkspacePool::Global() {
+  // intentionally leaked to avoid destruction-order issues at process exit
+  static WorkspacePool* const pool = new WorkspacePool();
+  return *pool;
+}
+
+std::unique_ptr<RadialWorkspace> WorkspacePool::Acquire(const Sizes& sizes,
+                                                        int ns, int num_threads,
+                                                        bool lfreeb) {
+  std::unique_ptr<RadialWorkspace> workspace;
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    // search most recently released workspaces first
+    for (auto it = idle_.rbegin(); it != idle_.rend(); ++it) {
+      if ((*it)->Matches(sizes, ns, num_threads, lfreeb)) {
+        workspace = std::move(*it);
+        idle_.erase(std::next(it).base());
+        break;
+      }
+    }
+    if (workspace != nullptr) {
+      ++num_hits_;
+    } else {
+      ++num_misses_;
+    }
+  }
+
+  // allocation and zeroing happen outside of the lock
+  if (workspace != nullptr) {
+    workspace->SetZero();
+    return workspace;
+  }
+  return std::make_unique<RadialWorkspace>(sizes, ns, num_threads, lfreeb);
+}
+
+void WorkspacePool::Release(std::unique_ptr<RadialWorkspace> workspace) {
+  if (workspace == nullptr) {
+    return;
+  }
+
+  std::unique_ptr<RadialWorkspace> evicted;
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    if (!enabled_) {
+      // freed when going out of scope, outside of the lock
+      evicted = std::move(workspace);
+    } else {
+      idle_.push_back(std::move(workspace));
+      if (static_cast<int>(idle_.size()) > kMaxIdleWorkspaces) {
+        evicted = std::move(idle_.front());
+        idle_.pop_front();
+      }
+    }
+  }
+}
+
+void WorkspacePool::Clear() {
+  std::deque<std::unique_ptr<RadialWorkspace>> to_free;
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    to_free.swap(idle_);
+  }
+}
+
+void WorkspacePool::SetEnabled(bool enabled) {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    enabled_ = enabled;
+  }
+  if (!enabled) {
+    Clear();
+  }
+}
+
+bool WorkspacePool::IsEnabled() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return enabled_;
+}
+
+int WorkspacePool::NumIdle() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return static_cast<int>(idle_.size());
+}
+
+int64_t WorkspacePool::NumHits() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return num_hits_;
+}
+
+int64_t WorkspacePool::NumMisses() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return num_misses_;
+}
+
+}  // namespace vmecpp
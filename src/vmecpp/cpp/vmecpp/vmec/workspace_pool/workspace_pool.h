@@ -0,0 +1,113 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#ifndef VMECPP_VMEC_WORKSPACE_POOL_WORKSPACE_POOL_H_
+#define VMECPP_VMEC_WORKSPACE_POOL_WORKSPACE_POOL_H_
+
+#include <cstdint>
+#include <deque>
+#include <memory>
+#include <mutex>
+#include <vector>
+
+#include "vmecpp/common/sizes/sizes.h"
+#include "vmecpp/vmec/fourier_forces/fourier_forces.h"
+#include "vmecpp/vmec/fourier_geometry/fourier_geometry.h"
+#include "vmecpp/vmec/fourier_velocity/fourier_velocity.h"
+#include "vmecpp/vmec/radial_partitioning/radial_partitioning.h"
+#include "vmecpp/vmec/thread_local_storage/thread_local_storage.h"
+
+namespace vmecpp {
+
+// The per-thread Fourier-space state vectors and real-space scratch buffers
+// that Vmec needs for one radial resolution (one multigrid step).
+//
+// A RadialWorkspace owns the Sizes and RadialPartitioning objects its buffers
+// were allocated for, since the buffers keep references to them. This makes a
+// workspace self-contained, so that it can outlive the Vmec instance that
+// leased it and be handed to the next run with the same resolution.
+// Workspaces must not be moved, as that would invalidate these references.
+struct RadialWorkspace {
+  // Allocates all buffers. Each thread's buffers are allocated (and
+  // zero-initialized, i.e., first touched) by the OpenMP thread with the same
+  // thread id, so that their pages end up on that thread's NUMA node.
+  RadialWorkspace(const Sizes& sizes, int ns, int num_threads, bool lfreeb);
+
+  RadialWorkspace(const RadialWorkspace&) = delete;
+  RadialWorkspace& operator=(const RadialWorkspace&) = delete;
+  RadialWorkspace(RadialWorkspace&&) = delete;
+  RadialWorkspace& operator=(RadialWorkspace&&) = delete;
+
+  // Returns true if this workspace was allocated for the given resolution.
+  bool Matches(const Sizes& sizes, int ns, int num_threads, bool lfreeb) const;
+
+  // Reset all buffers to zero, bringing a recycled workspace into the same
+  // state as a freshly allocated one. Each thread resets its own buffers.
+  void SetZero();
+
+  const Sizes s;
+  const int ns;
+  const int num_threads;
+  const bool lfreeb;
+
+  std::vector<std::unique_ptr<RadialPartitioning>> r;
+  std::vector<std::unique_ptr<ThreadLocalStorage>> ls;
+  std::vector<std::unique_ptr<FourierGeometry>> decomposed_x;
+  std::vector<std::unique_ptr<FourierGeometry>> physical_x;
+  std::vector<std::unique_ptr<FourierGeometry>> physical_x_backup;
+  std::vector<std::unique_ptr<FourierForces>> decomposed_f;
+  std::vector<std::unique_ptr<FourierForces>> physical_f;
+  std::vector<std::unique_ptr<FourierVelocity>> decomposed_v;
+};
+
+// A process-wide pool of idle RadialWorkspaces.
+//
+// Consecutive runs at the same resolution (e.g., a sequence of hot-restarted
+// runs in an optimization loop) would otherwise allocate and first-touch the
+// same per-thread buffers over and over again. Vmec instead leases its
+// workspaces from this pool and returns them when it is done with them.
+// The pool holds at most kMaxIdleWorkspaces idle workspaces; when full, the
+// least recently returned one is freed. All methods are thread-safe.
+class WorkspacePool {
+ public:
+  static constexpr int kMaxIdleWorkspaces = 16;
+
+  // The pool shared by all Vmec instances in this process.
+  static WorkspacePool& Global();
+
+  // Returns a zeroed workspace for the given resolution: a recycled one if
+  // available, otherwise a newly allocated one.
+  std::unique_ptr<RadialWorkspace> Acquire(const Sizes& sizes, int ns,
+                                           int num_threads, bool lfreeb);
+
+  // Hands a workspace back to the pool. No-op for nullptr or if the pool is
+  // disabled.
+  void Release(std::unique_ptr<RadialWorkspace> workspace);
+
+  // Free all idle workspaces.
+  void Clear();
+
+  // If disabled, Acquire always allocates and Release frees its argument.
+  // Disabling the pool also frees all idle workspaces.
+  void SetEnabled(bool enabled);
+  bool IsEnabled() const;
+
+  int NumIdle() const;
+
+  // Number of Acquire calls served from the pool/by a fresh allocation.
+  int64_t NumHits() const;
+  int64_t NumMisses() const;
+
+ private:
+  mutable std::mutex mutex_;
+  bool enabled_ = true;
+  // least recently released workspace at the front
+  std::deque<std::unique_ptr<RadialWorkspace>> idle_;
+  int64_t num_hits_ = 0;
+  int64_t num_misses_ = 0;
+};
+
+}  // namespace vmecpp
+
+#endif  // VMECPP_VMEC_WORKSPACE_POOL_WORKSPACE_POOL_H_
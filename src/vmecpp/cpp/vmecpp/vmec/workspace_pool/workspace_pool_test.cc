@@ -0,0 +1,134 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/workspace_pool/workspace_pool.h"
+
+#include <memory>
+#include <utility>
+#include <vector>
+
+#include "gtest/gtest.h"
+
+namespace vmecpp {
+
+namespace {
+// Small 3D configuration; the actual values do not matter here.
+Sizes MakeSizes(int mpol = 4, int ntor = 2) {
+  return Sizes(/*lasym=*/false, /*nfp=*/5, mpol, ntor, /*ntheta=*/16,
+               /*nzeta=*/12);
+}
+}  // namespace
+
+TEST(TestWorkspacePool, AllocatesZeroedBuffersForAllThreads) {
+  const Sizes s = MakeSizes();
+  const int ns = 11;
+  const int num_threads = 2;
+
+  const RadialWorkspace workspace(s, ns, num_threads, /*lfreeb=*/false);
+
+  ASSERT_EQ(static_cast<int>(workspace.r.size()), num_threads);
+  for (int thread_id = 0; thread_id < num_threads; ++thread_id) {
+    ASSERT_NE(workspace.r[thread_id], nullptr);
+    EXPECT_EQ(workspace.r[thread_id]->get_thread_id(), thread_id);
+    EXPECT_EQ(workspace.r[thread_id]->get_num_threads(), num_threads);
+    ASSERT_NE(workspace.ls[thread_id], nullptr);
+    ASSERT_NE(workspace.decomposed_x[thread_id], nullptr);
+    ASSERT_NE(workspace.physical_x[thread_id], nullptr);
+    ASSERT_NE(workspace.physical_x_backup[thread_id], nullptr);
+    ASSERT_NE(workspace.decomposed_f[thread_id], nullptr);
+    ASSERT_NE(workspace.physical_f[thread_id], nullptr);
+    ASSERT_NE(workspace.decomposed_v[thread_id], nullptr);
+    EXPECT_EQ(workspace.ls[thread_id]->r1e_i.size(), s.nZnT);
+  }
+}
+
+TEST(TestWorkspacePool, RecyclesMatchingWorkspace) {
+  WorkspacePool pool;
+  const Sizes s = MakeSizes();
+
+  std::unique_ptr<RadialWorkspace> workspace =
+      pool.Acquire(s, /*ns=*/11, /*num_threads=*/1, /*lfreeb=*/false);
+  EXPECT_EQ(pool.NumMisses(), 1);
+  EXPECT_EQ(pool.NumHits(), 0);
+
+  // dirty the buffers to check that a recycled workspace comes back zeroed
+  workspace->decomposed_x[0]->rmncc[0] = 1.0;
+  workspace->ls[0]->r1e_i[0] = 1.0;
+  const RadialWorkspace* const address = workspace.get();
+
+  pool.Release(std::move(workspace));
+  EXPECT_EQ(pool.NumIdle(), 1);
+
+  workspace = pool.Acquire(s, /*ns=*/11, /*num_threads=*/1, /*lfreeb=*/false);
+  EXPECT_EQ(workspace.get(), address);
+  EXPECT_EQ(pool.NumHits(), 1);
+  EXPECT_EQ(pool.NumIdle(), 0);
+  EXPECT_EQ(workspace->decomposed_x[0]->rmncc[0], 0.0);
+  EXPECT_EQ(workspace->ls[0]->r1e_i[0], 0.0);
+}
+
+TEST(TestWorkspacePool, DoesNotRecycleMismatchingWorkspace) {
+  WorkspacePool pool;
+
+  pool.Release(pool.Acquire(MakeSizes(), /*ns=*/11, /*num_threads=*/1,
+                            /*lfreeb=*/false));
+
+  // different ns, thread count, boundary mode and spectral resolution
+  pool.Release(pool.Acquire(MakeSizes(), /*ns=*/21, /*num_threads=*/1,
+                            /*lfreeb=*/false));
+  pool.Release(pool.Acquire(MakeSizes(), /*ns=*/11, /*num_threads=*/2,
+                            /*lfreeb=*/false));
+  pool.Release(pool.Acquire(MakeSizes(), /*ns=*/11, /*num_threads=*/1,
+                            /*lfreeb=*/true));
+  pool.Release(pool.Acquire(MakeSizes(/*mpol=*/5), /*ns=*/11,
+                            /*num_threads=*/1, /*lfreeb=*/false));
+
+  EXPECT_EQ(pool.NumHits(), 0);
+  EXPECT_EQ(pool.NumMisses(), 5);
+  EXPECT_EQ(pool.NumIdle(), 5);
+}
+
+TEST(TestWorkspacePool, EvictsLeastRecentlyReleased) {
+  WorkspacePool pool;
+  const Sizes s = MakeSizes();
+
+  std::vector<std::unique_ptr<RadialWorkspace>> workspaces;
+  for (int i = 0; i <= WorkspacePool::kMaxIdleWorkspaces; ++i) {
+    workspaces.push_back(
+        pool.Acquire(s, /*ns=*/5 + i, /*num_threads=*/1, /*lfreeb=*/false));
+  }
+  for (auto& workspace : workspaces) {
+    pool.Release(std::move(workspace));
+  }
+  EXPECT_EQ(pool.NumIdle(), WorkspacePool::kMaxIdleWorkspaces);
+
+  // the first one was evicted, the last one is still there
+  pool.Release(pool.Acquire(s, /*ns=*/5, /*num_threads=*/1, /*lfreeb=*/false));
+  EXPECT_EQ(pool.NumHits(), 0);
+  pool.Release(pool.Acquire(s, /*ns=*/5 + WorkspacePool::kMaxIdleWorkspaces,
+                            /*num_threads=*/1, /*lfreeb=*/false));
+  EXPECT_EQ(pool.NumHits(), 1);
+}
+
+TEST(TestWorkspacePool, ClearAndDisable) {
+  WorkspacePool pool;
+  const Sizes s = MakeSizes();
+
+  pool.Release(pool.Acquire(s, /*ns=*/11, /*num_threads=*/1, /*lfreeb=*/false));
+  EXPECT_EQ(pool.NumIdle(), 1);
+  pool.Clear();
+  EXPECT_EQ(pool.NumIdle(), 0);
+
+  pool.Release(pool.Acquire(s, /*ns=*/11, /*num_threads=*/1, /*lfreeb=*/false));
+  EXPECT_EQ(pool.NumIdle(), 1);
+  pool.SetEnabled(false);
+  EXPECT_FALSE(pool.IsEnabled());
+  EXPECT_EQ(pool.NumIdle(), 0);
+
+  // a disabled pool does not retain released workspaces
+  pool.Release(pool.Acquire(s, /*ns=*/11, /*num_threads=*/1, /*lfreeb=*/false));
+  EXPECT_EQ(pool.NumIdle(), 0);
+}
+
+}  // namespace vmecpp
@@ -0,0 +1,686 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/wout_evaluator/wout_evaluator.h"
+
+#include <algorithm>
+#include <array>
+#include <cmath>
+#include <cstdlib>
+#include <limits>
+
+#include "absl/log/check.h"
+#include "absl/log/log.h"
+#include "absl/status/status.h"
+#include "absl/strings/str_cat.h"
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif  // _OPENMP
+
+namespace vmecpp {
+
+namespace {
+
+constexpr int kNumQuantities = static_cast<int>(WOutQuantity::CURRV) + 1;
+
+// Build the spline of the wout coefficients `values` if they are populated.
+// Full-grid quantities are stored at s_j = j / (ns - 1) for j = 0, ..., ns - 1;
+// half-grid quantities at s_j = (j - 1/2) / (ns - 1) for j = 1, ..., ns - 1.
+WOutEvaluator::RadialSpline MakeSpline(const RowMatrixXd& values, int ns,
+                                       bool on_half_grid) {
+  if (ns < 2 || values.cols() != ns || values.rows() == 0) {
+    return WOutEvaluator::RadialSpline();
+  }
+  const double spacing = 1.0 / (ns - 1.0);
+  if (on_half_grid) {
+    return WOutEvaluator::RadialSpline(values, /*first_column=*/1,
+                                       /*s_first=*/0.5 * spacing, spacing);
+  }
+  return WOutEvaluator::RadialSpline(values, /*first_column=*/0,
+                                     /*s_first=*/0.0, spacing);
+}
+
+}  // namespace
+
+absl::StatusOr<WOutQuantity> WOutQuantityFromString(
+    const std::string& quantity_string) {
+  for (int i = 0; i < kNumQuantities; ++i) {
+    const WOutQuantity quantity = static_cast<WOutQuantity>(i);
+    if (quantity_string == ToString(quantity)) {
+      return quantity;
+    }
+  }
+  return absl::NotFoundError(
+      absl::StrCat("wout quantity named '", quantity_string, "' not known"));
+}  // WOutQuantityFromString
+
+std::string ToString(WOutQuantity quantity) {
+  switch (quantity) {
+    case WOutQuantity::R:
+      return "r";
+    case WOutQuantity::Z:
+      return "z";
+    case WOutQuantity::LAMBDA:
+      return "lambda";
+    case WOutQuantity::DR_DS:
+      return "dr_ds";
+    case WOutQuantity::DR_DTHETA:
+      return "dr_dtheta";
+    case WOutQuantity::DR_DZETA:
+      return "dr_dzeta";
+    case WOutQuantity::DZ_DS:
+      return "dz_ds";
+    case WOutQuantity::DZ_DTHETA:
+      return "dz_dtheta";
+    case WOutQuantity::DZ_DZETA:
+      return "dz_dzeta";
+    case WOutQuantity::MODB:
+      return "modb";
+    case WOutQuantity::BSUPU:
+      return "bsupu";
+    case WOutQuantity::BSUPV:
+      return "bsupv";
+    case WOutQuantity::SQRTG:
+      return "sqrtg";
+    case WOutQuantity::CURRU:
+      return "curru";
+    case WOutQuantity::CURRV:
+      return "currv";
+    default:
+      LOG(FATAL) << "no string conversion implemented yet for WOutQuantity "
+                 << static_cast<int>(quantity);
+  }
+}  // ToString
+
+WOutEvaluator::RadialSpline::RadialSpline(const RowMatrixXd& values,
+                                          int first_column, double s_first,
+                                          double spacing)
+    : s_first_(s_first), spacing_(spacing) {
+  CHECK_GE(first_column, 0);
+  CHECK_LT(first_column, values.cols());
+  CHECK_GT(spacing, 0.0);
+
+  const int num_knots = static_cast<int>(values.cols()) - first_column;
+  const int mnmax = static_cast<int>(values.rows());
+  if (num_knots == 1) {
+    // a single knot: duplicate it, which yields a constant interpolant
+    values_.resize(2, mnmax);
+    values_.row(0) = values.col(first_column).transpose();
+    values_.row(1) = values.col(first_column).transpose();
+    second_derivatives_ = RowMatrixXd::Zero(2, mnmax);
+    return;
+  }
+  values_ = values.rightCols(num_knots).transpose();
+
+  // Natural spline: M_0 = M_{n-1} = 0 and, on the interior knots,
+  //   M_{j-1} + 4 M_j + M_{j+1} = 6 / h^2 (y_{j+1} - 2 y_j + y_{j-1}).
+  // The tridiagonal system is the same for all modes, so the Thomas algorithm
+  // sweeps over the rows of all modes at once.
+  second_derivatives_ = RowMatrixXd::Zero(num_knots, mnmax);
+  const int num_interior = num_knots - 2;
+  if (num_interior == 0) {
+    return;
+  }
+  const double rhs_factor = 6.0 / (spacing * spacing);
+  std::vector<double> c_prime(num_interior);
+  RowMatrixXd d_prime(num_interior, mnmax);
+  for (int i = 0; i < num_interior; ++i) {
+    const int j = i + 1;
+    const Eigen::RowVectorXd rhs =
+        rhs_factor *
+        (values_.row(j + 1) - 2.0 * values_.row(j) + values_.row(j - 1));
+    if (i == 0) {
+      c_prime[i] = 1.0 / 4.0;
+      d_prime.row(i) = rhs / 4.0;
+    } else {
+      const double denominator = 4.0 - c_prime[i - 1];
+      c_prime[i] = 1.0 / denominator;
+      d_prime.row(i) = (rhs - d_prime.row(i - 1)) / denominator;
+    }
+  }
+  second_derivatives_.row(num_interior) = d_prime.row(num_interior - 1);
+  for (int i = num_interior - 2; i >= 0; --i) {
+    second_derivatives_.row(i + 1) =
+        d_prime.row(i) - c_prime[i] * second_derivatives_.row(i + 2);
+  }
+}
+
+WOutEvaluator::RadialSpline::Weights
+WOutEvaluator::RadialSpline::ComputeWeights(double s) const {
+  const int num_intervals = static_cast<int>(values_.rows()) - 1;
+  const double x = (s - s_first_) / spacing_;
+  const int index =
+      std::clamp(static_cast<int>(std::floor(x)), 0, num_intervals - 1);
+  // Outside of the knots, the spline is continued linearly, which is the C2
+  // continuation of a natural spline (zero curvature at the end knots).
+  const double b = std::clamp(x - index, 0.0, 1.0);
+  const double a = 1.0 - b;
+  const double h = spacing_;
+
+  Weights weights;
+  weights.index = index;
+  weights.derivative[0] = -1.0 / h;
+  weights.derivative[1] = 1.0 / h;
+  weights.derivative[2] = -(3.0 * a * a - 1.0) * h / 6.0;
+  weights.derivative[3] = (3.0 * b * b - 1.0) * h / 6.0;
+  const double extrapolation = (x - index - b) * h;
+  weights.value[0] = a + extrapolation * weights.derivative[0];
+  weights.value[1] = b + extrapolation * weights.derivative[1];
+  weights.value[2] =
+      (a * a * a - a) * h * h / 6.0 + extrapolation * weights.derivative[2];
+  weights.value[3] =
+      (b * b * b - b) * h * h / 6.0 + extrapolation * weights.derivative[3];
+  return weights;
+}
+
+void WOutEvaluator::RadialSpline::Interpolate(const Weights& weights,
+                                              Eigen::VectorXd& m_values) const {
+  const int j = weights.index;
+  m_values = weights.value[0] * values_.row(j).transpose() +
+             weights.value[1] * values_.row(j + 1).transpose() +
+             weights.value[2] * second_derivatives_.row(j).transpose() +
+             weights.value[3] * second_derivatives_.row(j + 1).transpose();
+}
+
+void WOutEvaluator::RadialSpline::InterpolateDerivative(
+    const Weights& weights, Eigen::VectorXd& m_derivatives) const {
+  const int j = weights.index;
+  m_derivatives =
+      weights.derivative[0] * values_.row(j).transpose() +
+      weights.derivative[1] * values_.row(j + 1).transpose() +
+      weights.derivative[2] * second_derivatives_.row(j).transpose() +
+      weights.derivative[3] * second_derivatives_.row(j + 1).transpose();
+}
+
+WOutEvaluator::ModeSet::ModeSet(const Eigen::VectorXi& xm_in,
+                                const Eigen::VectorXi& xn_in, int nfp)
+    : m(xm_in),
+      n(xn_in / nfp),
+      xm(xm_in.cast<double>()),
+      xn(xn_in.cast<double>()) {}
+
+WOutEvaluator::AngularBasis::AngularBasis(int max_m, int max_n, int nfp)
+    : nfp_(nfp),
+      max_n_(max_n),
+      cos_mu_(max_m + 1),
+      sin_mu_(max_m + 1),
+      cos_nv_(2 * max_n + 1),
+      sin_nv_(2 * max_n + 1) {}
+
+void WOutEvaluator::AngularBasis::Fill(double theta, double zeta) {
+  const double cos_u = std::cos(theta);
+  const double sin_u = std::sin(theta);
+  cos_mu_[0] = 1.0;
+  sin_mu_[0] = 0.0;
+  for (std::size_t m = 1; m < cos_mu_.size(); ++m) {
+    cos_mu_[m] = cos_mu_[m - 1] * cos_u - sin_mu_[m - 1] * sin_u;
+    sin_mu_[m] = sin_mu_[m - 1] * cos_u + cos_mu_[m - 1] * sin_u;
+  }
+  const double cos_v = std::cos(nfp_ * zeta);
+  const double sin_v = std::sin(nfp_ * zeta);
+  cos_nv_[max_n_] = 1.0;
+  sin_nv_[max_n_] = 0.0;
+  for (int n = 1; n <= max_n_; ++n) {
+    const double cos_nv =
+        cos_nv_[max_n_ + n - 1] * cos_v - sin_nv_[max_n_ + n - 1] * sin_v;
+    const double sin_nv =
+        sin_nv_[max_n_ + n - 1] * cos_v + cos_nv_[max_n_ + n - 1] * sin_v;
+    cos_nv_[max_n_ + n] = cos_nv;
+    sin_nv_[max_n_ + n] = sin_nv;
+    cos_nv_[max_n_ - n] = cos_nv;
+    sin_nv_[max_n_ - n] = -sin_nv;
+  }
+}
+
+void WOutEvaluator::AngularBasis::Kernels(const ModeSet& modes,
+                                          Eigen::VectorXd& m_cos_k,
+                                          Eigen::VectorXd& m_sin_k) const {
+  for (int mn = 0; mn < modes.size(); ++mn) {
+    const int m = modes.m[mn];
+    const int n = modes.n[mn] + max_n_;
+    m_cos_k[mn] = cos_mu_[m] * cos_nv_[n] + sin_mu_[m] * sin_nv_[n];
+    m_sin_k[mn] = sin_mu_[m] * cos_nv_[n] - cos_mu_[m] * sin_nv_[n];
+  }
+}
+
+WOutEvaluator::Workspace::Workspace(int max_m, int max_n, int nfp, int mnmax,
+                                    int mnmax_nyq)
+    : basis(max_m, max_n, nfp),
+      cos_k(mnmax),
+      sin_k(mnmax),
+      cos_k_nyq(mnmax_nyq),
+      sin_k_nyq(mnmax_nyq),
+      coefficients(std::max(mnmax, mnmax_nyq)),
+      derivatives(std::max(mnmax, mnmax_nyq)) {}
+
+WOutEvaluator::WOutEvaluator(const WOutFileContents& wout)
+    : wout_(wout),
+      nfp_(std::max(wout.nfp, 1)),
+      max_m_(0),
+      max_n_(0),
+      modes_(wout.xm, wout.xn, nfp_),
+      modes_nyq_(wout.xm_nyq, wout.xn_nyq, nfp_) {
+  for (const ModeSet* modes : {&modes_, &modes_nyq_}) {
+    if (modes->size() > 0) {
+      max_m_ = std::max(max_m_, modes->m.maxCoeff());
+      max_n_ = std::max(max_n_, modes->n.cwiseAbs().maxCoeff());
+    }
+  }
+  const int ns = wout.ns;
+  rmnc_ = MakeSpline(wout.rmnc, ns, /*on_half_grid=*/false);
+  zmns_ = MakeSpline(wout.zmns, ns, /*on_half_grid=*/false);
+  lmns_ = MakeSpline(wout.lmns, ns, /*on_half_grid=*/true);
+  bmnc_ = MakeSpline(wout.bmnc, ns, /*on_half_grid=*/true);
+  bsupumnc_ = MakeSpline(wout.bsupumnc, ns, /*on_half_grid=*/true);
+  bsupvmnc_ = MakeSpline(wout.bsupvmnc, ns, /*on_half_grid=*/true);
+  gmnc_ = MakeSpline(wout.gmnc, ns, /*on_half_grid=*/true);
+  currumnc_ = MakeSpline(wout.currumnc, ns, /*on_half_grid=*/false);
+  currvmnc_ = MakeSpline(wout.currvmnc, ns, /*on_half_grid=*/false);
+  if (wout.lasym) {
+    rmns_ = MakeSpline(wout.rmns, ns, /*on_half_grid=*/false);
+    zmnc_ = MakeSpline(wout.zmnc, ns, /*on_half_grid=*/false);
+    lmnc_ = MakeSpline(wout.lmnc, ns, /*on_half_grid=*/true);
+    bmns_ = MakeSpline(wout.bmns, ns, /*on_half_grid=*/true);
+    bsupumns_ = MakeSpline(wout.bsupumns, ns, /*on_half_grid=*/true);
+    bsupvmns_ = MakeSpline(wout.bsupvmns, ns, /*on_half_grid=*/true);
+    gmns_ = MakeSpline(wout.gmns, ns, /*on_half_grid=*/true);
+    currumns_ = MakeSpline(wout.currumns, ns, /*on_half_grid=*/false);
+    currvmns_ = MakeSpline(wout.currvmns, ns, /*on_half_grid=*/false);
+  }
+}
+
+absl::StatusOr<std::vector<Eigen::VectorXd>> WOutEvaluator::Evaluate(
+    const Eigen::VectorXd& s, const Eigen::VectorXd& theta,
+    const Eigen::VectorXd& zeta, const std::vector<WOutQuantity>& quantities,
+    std::optional<int> max_threads) const {
+  if (theta.size() != s.size() || zeta.size() != s.size()) {
+    return absl::InvalidArgumentError(absl::StrCat(
+        "s, theta and zeta must have the same size, but have sizes ", s.size(),
+        ", ", theta.size(), " and ", zeta.size()));
+  }
+  if (wout_.ns < 2) {
+    return absl::InvalidArgumentError(
+        absl::StrCat("need at least 2 flux surfaces, but ns=", wout_.ns));
+  }
+  for (Eigen::Index i = 0; i < s.size(); ++i) {
+    if (!(s[i] >= 0.0 && s[i] <= 1.0)) {
+      return absl::InvalidArgumentError(
+          absl::StrCat("s must be in [0, 1], but s[", i, "]=", s[i]));
+    }
+  }
+  int num_threads = 1;
+#ifdef _OPENMP
+  num_threads = max_threads.value_or(omp_get_max_threads());
+#endif  // _OPENMP
+  if (num_threads < 1) {
+    return absl::InvalidArgumentError(
+        absl::StrCat("max_threads must be positive, but is ", num_threads));
+  }
+
+  // slot of each quantity in the output, or -1 if not requested
+  std::array<int, kNumQuantities> slot;
+  slot.fill(-1);
+  for (std::size_t q = 0; q < quantities.size(); ++q) {
+    slot[static_cast<int>(quantities[q])] = static_cast<int>(q);
+  }
+  const auto requested = [&slot](WOutQuantity quantity) {
+    return slot[static_cast<int>(quantity)] >= 0;
+  };
+  const bool need_geometry =
+      requested(WOutQuantity::R) || requested(WOutQuantity::Z) ||
+      requested(WOutQuantity::DR_DS) || requested(WOutQuantity::DR_DTHETA) ||
+      requested(WOutQuantity::DR_DZETA) || requested(WOutQuantity::DZ_DS) ||
+      requested(WOutQuantity::DZ_DTHETA) || requested(WOutQuantity::DZ_DZETA);
+  const bool need_lambda = requested(WOutQuantity::LAMBDA);
+  const bool need_current =
+      requested(WOutQuantity::CURRU) || requested(WOutQuantity::CURRV);
+  const bool need_nyquist = requested(WOutQuantity::MODB) ||
+                            requested(WOutQuantity::BSUPU) ||
+                            requested(WOutQuantity::BSUPV) ||
+                            requested(WOutQuantity::SQRTG) || need_current;
+
+  if ((need_geometry && (rmnc_.empty() || zmns_.empty())) ||
+      (need_lambda && lmns_.empty()) ||
+      (need_nyquist && (bmnc_.empty() || bsupumnc_.empty() ||
+                        bsupvmnc_.empty() || gmnc_.empty())) ||
+      (need_current && (currumnc_.empty() || currvmnc_.empty()))) {
+    return absl::InvalidArgumentError(
+        "the wout contents lack the Fourier coefficients of a requested "
+        "quantity, or their shape does not match ns");
+  }
+  const int num_points = static_cast<int>(s.size());
+  std::vector<Eigen::VectorXd> result(quantities.size(),
+                                      Eigen::VectorXd(num_points));
+
+  const int mnmax = modes_.size();
+  const int mnmax_nyq = modes_nyq_.size();
+
+#ifdef _OPENMP
+#pragma omp parallel num_threads(num_threads)
+#endif  // _OPENMP
+  {
+    Workspace workspace(max_m_, max_n_, nfp_, mnmax, mnmax_nyq);
+    std::array<double, kNumQuantities> values;
+
+#ifdef _OPENMP
+#pragma omp for schedule(static)
+#endif  // _OPENMP
+    for (int p = 0; p < num_points; ++p) {
+      workspace.basis.Fill(theta[p], zeta[p]);
+      values.fill(0.0);
+
+      if (need_geometry || need_lambda) {
+        workspace.basis.Kernels(modes_, workspace.cos_k, workspace.sin_k);
+      }
+
+      if (need_geometry) {
+        const Geometry geometry = EvaluateGeometry(s[p], workspace);
+        values[static_cast<int>(WOutQuantity::R)] = geometry.r;
+        values[static_cast<int>(WOutQuantity::Z)] = geometry.z;
+        values[static_cast<int>(WOutQuantity::DR_DS)] = geometry.dr_ds;
+        values[static_cast<int>(WOutQuantity::DR_DTHETA)] = geometry.dr_dtheta;
+        values[static_cast<int>(WOutQuantity::DR_DZETA)] = geometry.dr_dzeta;
+        values[static_cast<int>(WOutQuantity::DZ_DS)] = geometry.dz_ds;
+        values[static_cast<int>(WOutQuantity::DZ_DTHETA)] = geometry.dz_dtheta;
+        values[static_cast<int>(WOutQuantity::DZ_DZETA)] = geometry.dz_dzeta;
+      }
+
+      if (need_lambda) {
+        const RadialSpline::Weights half = lmns_.ComputeWeights(s[p]);
+        values[static_cast<int>(WOutQuantity::LAMBDA)] =
+            SumSeries(lmns_, half, workspace.sin_k, workspace.coefficients) +
+            SumSeries(lmnc_, half, workspace.cos_k, workspace.coefficients);
+      }
+
+      if (need_nyquist) {
+        workspace.basis.Kernels(modes_nyq_, workspace.cos_k_nyq,
+                                workspace.sin_k_nyq);
+        const Eigen::VectorXd& cos_k = workspace.cos_k_nyq;
+        const Eigen::VectorXd& sin_k = workspace.sin_k_nyq;
+        Eigen::VectorXd& scratch = workspace.coefficients;
+        const RadialSpline::Weights half = gmnc_.ComputeWeights(s[p]);
+        const double sqrtg = SumSeries(gmnc_, half, cos_k, scratch) +
+                             SumSeries(gmns_, half, sin_k, scratch);
+        values[static_cast<int>(WOutQuantity::SQRTG)] = sqrtg;
+        values[static_cast<int>(WOutQuantity::MODB)] =
+            SumSeries(bmnc_, half, cos_k, scratch) +
+            SumSeries(bmns_, half, sin_k, scratch);
+        values[static_cast<int>(WOutQuantity::BSUPU)] =
+            SumSeries(bsupumnc_, half, cos_k, scratch) +
+            SumSeries(bsupumns_, half, sin_k, scratch);
+        values[static_cast<int>(WOutQuantity::BSUPV)] =
+            SumSeries(bsupvmnc_, half, cos_k, scratch) +
+            SumSeries(bsupvmns_, half, sin_k, scratch);
+        if (need_current) {
+          const RadialSpline::Weights full = currumnc_.ComputeWeights(s[p]);
+          values[static_cast<int>(WOutQuantity::CURRU)] =
+              (SumSeries(currumnc_, full, cos_k, scratch) +
+               SumSeries(currumns_, full, sin_k, scratch)) /
+              sqrtg;
+          values[static_cast<int>(WOutQuantity::CURRV)] =
+              (SumSeries(currvmnc_, full, cos_k, scratch) +
+               SumSeries(currvmns_, full, sin_k, scratch)) /
+              sqrtg;
+        }
+      }
+
+      for (std::size_t q = 0; q < quantities.size(); ++q) {
+        result[q][p] = values[static_cast<int>(quantities[q])];
+      }
+    }  // p
+  }  // omp parallel
+
+  return result;
+}
+
+absl::StatusOr<FluxCoordinates> WOutEvaluator::ToFluxCoordinates(
+    const Eigen::VectorXd& r, const Eigen::VectorXd& phi,
+    const Eigen::VectorXd& z, double tolerance, int max_iterations,
+    std::optional<int> max_threads) const {
+  if (phi.size() != r.size() || z.size() != r.size()) {
+    return absl::InvalidArgumentError(
+        absl::StrCat("r, phi and z must have the same size, but have sizes ",
+                     r.size(), ", ", phi.size(), " and ", z.size()));
+  }
+  if (wout_.ns < 2 || rmnc_.empty() || zmns_.empty()) {
+    return absl::InvalidArgumentError(
+        "need the geometry on at least 2 flux surfaces");
+  }
+  if (!(tolerance > 0.0) || max_iterations < 1) {
+    return absl::InvalidArgumentError(
+        "tolerance and max_iterations must be positive");
+  }
+  int num_threads = 1;
+#ifdef _OPENMP
+  num_threads = max_threads.value_or(omp_get_max_threads());
+#endif  // _OPENMP
+  if (num_threads < 1) {
+    return absl::InvalidArgumentError(
+        absl::StrCat("max_threads must be positive, but is ", num_threads));
+  }
+
+  // Lookup table for the initial guess: the magnetic axis and the last closed
+  // flux surface on equidistant toroidal planes of one field period. From the
+  // axis, the boundary is sampled on a set of poloidal angles, which serve as
+  // candidates for the initial guess of theta.
+  const int num_planes = 4 * max_n_ + 1;
+  const int num_theta = std::max(64, 8 * max_m_);
+  const double plane_spacing = 2.0 * M_PI / (nfp_ * num_planes);
+  Eigen::VectorXd axis_r(num_planes);
+  Eigen::VectorXd axis_z(num_planes);
+  RowMatrixXd direction_r(num_planes, num_theta);
+  RowMatrixXd direction_z(num_planes, num_theta);
+  RowMatrixXd boundary_distance(num_planes, num_theta);
+  {
+    Workspace workspace(max_m_, max_n_, nfp_, modes_.size(),
+                        /*mnmax_nyq=*/0);
+    for (int k = 0; k < num_planes; ++k) {
+      const Geometry axis =
+          EvaluateGeometry(0.0, 0.0, k * plane_spacing, workspace);
+      axis_r[k] = axis.r;
+      axis_z[k] = axis.z;
+      for (int l = 0; l < num_theta; ++l) {
+        const Geometry boundary = EvaluateGeometry(
+            1.0, 2.0 * M_PI * l / num_theta, k * plane_spacing, workspace);
+        const double delta_r = boundary.r - axis.r;
+        const double delta_z = boundary.z - axis.z;
+        const double distance = std::hypot(delta_r, delta_z);
+        boundary_distance(k, l) = distance;
+        direction_r(k, l) = delta_r / distance;
+        direction_z(k, l) = delta_z / distance;
+      }
+    }
+  }
+  const double major_radius = axis_r.mean();
+  const double absolute_tolerance = tolerance * major_radius;
+
+  // Newton's method runs in rho = sqrt(s), in which the geometry is regular at
+  // the magnetic axis; rho is capped to keep the linear continuation of the
+  // geometry from running away for points far outside of the plasma.
+  constexpr double kMaxRho = 2.0;
+  constexpr int kMaxBacktrackingSteps = 10;
+  // points on the boundary up to round-off still count as inside
+  constexpr double kBoundaryTolerance = 1.0e-8;
+
+  const int num_points = static_cast<int>(r.size());
+  FluxCoordinates result;
+  result.s.resize(num_points);
+  result.theta.resize(num_points);
+  result.inside.resize(num_points);
+
+#ifdef _OPENMP
+#pragma omp parallel num_threads(num_threads)
+#endif  // _OPENMP
+  {
+    Workspace workspace(max_m_, max_n_, nfp_, modes_.size(),
+                        /*mnmax_nyq=*/0);
+
+#ifdef _OPENMP
+#pragma omp for schedule(dynamic, 256)
+#endif  // _OPENMP
+    for (int p = 0; p < num_points; ++p) {
+      // initial guess from the nearest plane of the lookup table
+      const double period = 2.0 * M_PI / nfp_;
+      const double phi_in_period =
+          phi[p] - period * std::floor(phi[p] / period);
+      const int k =
+          static_cast<int>(std::lround(phi_in_period / plane_spacing)) %
+          num_planes;
+      const double delta_r = r[p] - axis_r[k];
+      const double delta_z = z[p] - axis_z[k];
+      int best_l = 0;
+      double best_alignment = -2.0;
+      for (int l = 0; l < num_theta; ++l) {
+        const double alignment =
+            delta_r * direction_r(k, l) + delta_z * direction_z(k, l);
+        if (alignment > best_alignment) {
+          best_alignment = alignment;
+          best_l = l;
+        }
+      }
+      double rho = std::min(
+          std::hypot(delta_r, delta_z) / boundary_distance(k, best_l), kMaxRho);
+      // start slightly off the axis, where the Jacobian in rho is singular
+      rho = std::max(rho, 1.0e-3);
+      double theta = 2.0 * M_PI * best_l / num_theta;
+
+      const auto residual_at = [&](double rho_trial, double theta_trial,
+                                   Geometry& m_geometry) {
+        m_geometry = EvaluateGeometry(rho_trial * rho_trial, theta_trial,
+                                      phi[p], workspace);
+        return std::hypot(m_geometry.r - r[p], m_geometry.z - z[p]);
+      };
+
+      Geometry geometry;
+      double residual = residual_at(rho, theta, geometry);
+      bool converged = residual <= absolute_tolerance;
+      for (int iteration = 0; iteration < max_iterations && !converged;
+           ++iteration) {
+        // Jacobian of (R, Z) with respect to (rho, theta)
+        const double dr_drho = 2.0 * rho * geometry.dr_ds;
+        const double dz_drho = 2.0 * rho * geometry.dz_ds;
+        const double determinant =
+            dr_drho * geometry.dz_dtheta - geometry.dr_dtheta * dz_drho;
+        if (determinant == 0.0) {
+          rho += 1.0e-3;
+          residual = residual_at(rho, theta, geometry);
+          continue;
+        }
+        const double f_r = geometry.r - r[p];
+        const double f_z = geometry.z - z[p];
+        const double step_rho =
+            -(geometry.dz_dtheta * f_r - geometry.dr_dtheta * f_z) /
+            determinant;
+        const double step_theta =
+            -(-dz_drho * f_r + dr_drho * f_z) / determinant;
+
+        // backtracking until the distance to the target decreases
+        double step_length = 1.0;
+        for (int backtrack = 0; backtrack < kMaxBacktrackingSteps;
+             ++backtrack) {
+          double rho_trial = rho + step_length * step_rho;
+          double theta_trial = theta + step_length * step_theta;
+          if (rho_trial < 0.0) {
+            // crossing the magnetic axis
+            rho_trial = -rho_trial;
+            theta_trial += M_PI;
+          }
+          rho_trial = std::min(rho_trial, kMaxRho);
+          Geometry trial_geometry;
+          const double trial_residual =
+              residual_at(rho_trial, theta_trial, trial_geometry);
+          if (trial_residual < residual ||
+              backtrack == kMaxBacktrackingSteps - 1) {
+            rho = rho_trial;
+            theta = theta_trial;
+            geometry = trial_geometry;
+            residual = trial_residual;
+            break;
+          }
+          step_length *= 0.5;
+        }
+        converged = residual <= absolute_tolerance;
+      }  // iteration
+
+      if (converged) {
+        result.s[p] = rho * rho;
+        result.theta[p] = theta - 2.0 * M_PI * std::floor(theta / (2.0 * M_PI));
+        result.inside[p] = (rho * rho <= 1.0 + kBoundaryTolerance) ? 1 : 0;
+      } else {
+        result.s[p] = std::numeric_limits<double>::quiet_NaN();
+        result.theta[p] = std::numeric_limits<double>::quiet_NaN();
+        result.inside[p] = 0;
+      }
+    }  // p
+  }  // omp parallel
+
+  return result;
+}
+
+WOutEvaluator::Geometry WOutEvaluator::EvaluateGeometry(
+    double s, double theta, double zeta, Workspace& m_workspace) const {
+  m_workspace.basis.Fill(theta, zeta);
+  m_workspace.basis.Kernels(modes_, m_workspace.cos_k, m_workspace.sin_k);
+  return EvaluateGeometry(s, m_workspace);
+}
+
+WOutEvaluator::Geometry WOutEvaluator::EvaluateGeometry(
+    double s, Workspace& m_workspace) const {
+  const int mnmax = modes_.size();
+  const auto cos_k = m_workspace.cos_k.head(mnmax).array();
+  const auto sin_k = m_workspace.sin_k.head(mnmax).array();
+  const auto xm = modes_.xm.array();
+  const auto xn = modes_.xn.array();
+  Eigen::VectorXd& c = m_workspace.coefficients;
+  Eigen::VectorXd& dc = m_workspace.derivatives;
+
+  const RadialSpline::Weights full = rmnc_.ComputeWeights(s);
+  Geometry g;
+
+  rmnc_.Interpolate(full, c);
+  rmnc_.InterpolateDerivative(full, dc);
+  g.r = (c.array() * cos_k).sum();
+  g.dr_ds = (dc.array() * cos_k).sum();
+  g.dr_dtheta = -(c.array() * xm * sin_k).sum();
+  g.dr_dzeta = (c.array() * xn * sin_k).sum();
+
+  zmns_.Interpolate(full, c);
+  zmns_.InterpolateDerivative(full, dc);
+  g.z = (c.array() * sin_k).sum();
+  g.dz_ds = (dc.array() * sin_k).sum();
+  g.dz_dtheta = (c.array() * xm * cos_k).sum();
+  g.dz_dzeta = -(c.array() * xn * cos_k).sum();
+
+  if (!rmns_.empty()) {
+    rmns_.Interpolate(full, c);
+    rmns_.InterpolateDerivative(full, dc);
+    g.r += (c.array() * sin_k).sum();
+    g.dr_ds += (dc.array() * sin_k).sum();
+    g.dr_dtheta += (c.array() * xm * cos_k).sum();
+    g.dr_dzeta -= (c.array() * xn * cos_k).sum();
+  }
+  if (!zmnc_.empty()) {
+    zmnc_.Interpolate(full, c);
+    zmnc_.InterpolateDerivative(full, dc);
+    g.z += (c.array() * cos_k).sum();
+    g.dz_ds += (dc.array() * cos_k).sum();
+    g.dz_dtheta -= (c.array() * xm * sin_k).sum();
+    g.dz_dzeta += (c.array() * xn * sin_k).sum();
+  }
+  return g;
+}
+
+double WOutEvaluator::SumSeries(const RadialSpline& spline,
+                                const RadialSpline::Weights& weights,
+                                const Eigen::VectorXd& basis,
+                                Eigen::VectorXd& m_coefficients) {
+  if (spline.empty()) {
+    return 0.0;
+  }
+  spline.Interpolate(weights, m_coefficients);
+  return m_coefficients.dot(basis);
+}
+
+}  // namespace vmecpp
@@ -0,0 +1,258 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#ifndef VMECPP_VMEC_WOUT_EVALUATOR_WOUT_EVALUATOR_H_
+#define VMECPP_VMEC_WOUT_EVALUATOR_WOUT_EVALUATOR_H_
+
+#include <Eigen/Dense>
+#include <cstdint>
+#include <optional>
+#include <string>
+#include <vector>
+
+#include "absl/status/statusor.h"
+#include "vmecpp/vmec/output_quantities/output_quantities.h"
+
+namespace vmecpp {
+
+// Real-space quantities that can be reconstructed from the Fourier
+// coefficients in a wout file.
+enum class WOutQuantity : std::uint8_t {
+  // cylindrical coordinates R and Z of the point (full-grid rmnc, zmns)
+  R,
+  Z,
+
+  // lambda stream function (half-grid lmns)
+  LAMBDA,
+
+  // derivatives of R and Z with respect to s, theta and zeta
+  DR_DS,
+  DR_DTHETA,
+  DR_DZETA,
+  DZ_DS,
+  DZ_DTHETA,
+  DZ_DZETA,
+
+  // magnetic field strength |B| (half-grid bmnc)
+  MODB,
+
+  // contravariant components B^theta, B^zeta (half-grid bsupumnc, bsupvmnc)
+  BSUPU,
+  BSUPV,
+
+  // Jacobian sqrt(g) (half-grid gmnc)
+  SQRTG,
+
+  // contravariant current density components J^theta, J^zeta
+  // (full-grid currumnc, currvmnc, divided by sqrt(g))
+  CURRU,
+  CURRV
+};
+
+absl::StatusOr<WOutQuantity> WOutQuantityFromString(
+    const std::string& quantity_string);
+std::string ToString(WOutQuantity quantity);
+
+// Result of WOutEvaluator::ToFluxCoordinates.
+struct FluxCoordinates {
+  // normalized toroidal flux; NaN where Newton's method did not converge
+  Eigen::VectorXd s;
+
+  // VMEC poloidal angle in [0, 2 pi); NaN where Newton's method did not
+  // converge
+  Eigen::VectorXd theta;
+
+  // 1 if the point lies inside of the last closed flux surface, else 0
+  Eigen::VectorXi inside;
+};
+
+// Evaluates the Fourier series stored in a wout file at arbitrary points
+// (s, theta, zeta), where s is the normalized toroidal flux, theta is the
+// VMEC poloidal angle and zeta is the geometric toroidal angle (over the full
+// torus, not one field period).
+//
+// Every Fourier coefficient is interpolated radially with a natural cubic
+// spline through the radial grid it is stored on (full or half grid); outside
+// of the outermost half-grid points the splines are continued linearly. The
+// angular dependence is computed from separable cos/sin tables in m*theta and
+// n*nfp*zeta, built by recurrence once per point.
+class WOutEvaluator {
+ public:
+  // The evaluator keeps a reference to `wout`, which must outlive it.
+  explicit WOutEvaluator(const WOutFileContents& wout);
+
+  // Evaluate `quantities` at the points (s[i], theta[i], zeta[i]).
+  // Returns one vector of the size of `s` per requested quantity, in the order
+  // of `quantities`. The points are distributed over up to `max_threads`
+  // OpenMP threads (all available threads if not specified).
+  absl::StatusOr<std::vector<Eigen::VectorXd>> Evaluate(
+      const Eigen::VectorXd& s, const Eigen::VectorXd& theta,
+      const Eigen::VectorXd& zeta, const std::vector<WOutQuantity>& quantities,
+      std::optional<int> max_threads = std::nullopt) const;
+
+  // Locate the points (r[i], phi[i], z[i]) given in cylindrical coordinates
+  // in flux coordinates.
+  // An initial guess is taken from a lookup table of the magnetic axis and the
+  // last closed flux surface on a set of toroidal planes, which is then
+  // refined by Newton's method in (sqrt(s), theta) at the exact phi.
+  // Newton's method continues the geometry linearly beyond s = 1, so that
+  // points slightly outside of the plasma get an extrapolated s > 1.
+  // `tolerance` is the convergence criterion on the distance to the target
+  // point, relative to the major radius.
+  absl::StatusOr<FluxCoordinates> ToFluxCoordinates(
+      const Eigen::VectorXd& r, const Eigen::VectorXd& phi,
+      const Eigen::VectorXd& z, double tolerance = 1.0e-10,
+      int max_iterations = 50,
+      std::optional<int> max_threads = std::nullopt) const;
+
+  // Natural cubic spline interpolation of the rows of a matrix of Fourier
+  // coefficients (mnmax x number of radial points) on a uniform radial grid.
+  class RadialSpline {
+   public:
+    RadialSpline() = default;
+
+    // `values` are the coefficients at s_j = s_first + j * spacing for the
+    // columns j = first_column, ..., values.cols() - 1.
+    RadialSpline(const RowMatrixXd& values, int first_column, double s_first,
+                 double spacing);
+
+    bool empty() const { return values_.size() == 0; }
+
+    // Interval index and weights for the evaluation at `s`, shared by all
+    // modes.
+    struct Weights {
+      int index;
+      double value[4];
+      double derivative[4];
+    };
+    Weights ComputeWeights(double s) const;
+
+    // Values of all modes using precomputed `weights`.
+    void Interpolate(const Weights& weights, Eigen::VectorXd& m_values) const;
+
+    // Derivatives with respect to s of all modes using precomputed `weights`.
+    void InterpolateDerivative(const Weights& weights,
+                               Eigen::VectorXd& m_derivatives) const;
+
+   private:
+    double s_first_ = 0.0;
+    double spacing_ = 1.0;
+
+    // knot values and second derivatives, (number of knots x mnmax), so that
+    // the coefficients of all modes at one knot are contiguous
+    RowMatrixXd values_;
+    RowMatrixXd second_derivatives_;
+  };
+
+ private:
+  // Poloidal and toroidal mode numbers of a Fourier basis.
+  struct ModeSet {
+    explicit ModeSet(const Eigen::VectorXi& xm, const Eigen::VectorXi& xn,
+                     int nfp);
+
+    int size() const { return static_cast<int>(m.size()); }
+
+    Eigen::VectorXi m;
+    // toroidal mode number per field period, n = xn / nfp
+    Eigen::VectorXi n;
+    Eigen::VectorXd xm;
+    Eigen::VectorXd xn;
+  };
+
+  // Separable trigonometric tables cos(m * theta), sin(m * theta),
+  // cos(n * nfp * zeta), sin(n * nfp * zeta) at a single point, from which the
+  // kernels of all modes are assembled.
+  class AngularBasis {
+   public:
+    AngularBasis(int max_m, int max_n, int nfp);
+
+    void Fill(double theta, double zeta);
+
+    // cos and sin of the kernels m * theta - xn * zeta of all `modes`
+    void Kernels(const ModeSet& modes, Eigen::VectorXd& m_cos_k,
+                 Eigen::VectorXd& m_sin_k) const;
+
+   private:
+    int nfp_;
+    int max_n_;
+    std::vector<double> cos_mu_;
+    std::vector<double> sin_mu_;
+    // indexed by n + max_n for n = -max_n, ..., max_n
+    std::vector<double> cos_nv_;
+    std::vector<double> sin_nv_;
+  };
+
+  // Per-thread scratch space for the evaluation at a single point.
+  struct Workspace {
+    Workspace(int max_m, int max_n, int nfp, int mnmax, int mnmax_nyq);
+
+    AngularBasis basis;
+    Eigen::VectorXd cos_k;
+    Eigen::VectorXd sin_k;
+    Eigen::VectorXd cos_k_nyq;
+    Eigen::VectorXd sin_k_nyq;
+    // interpolated Fourier coefficients
+    Eigen::VectorXd coefficients;
+    Eigen::VectorXd derivatives;
+  };
+
+  // R, Z and their derivatives at a single point
+  struct Geometry {
+    double r = 0.0;
+    double dr_ds = 0.0;
+    double dr_dtheta = 0.0;
+    double dr_dzeta = 0.0;
+    double z = 0.0;
+    double dz_ds = 0.0;
+    double dz_dtheta = 0.0;
+    double dz_dzeta = 0.0;
+  };
+
+  // Evaluate the geometry at `s`, using the kernels in `m_workspace`.
+  Geometry EvaluateGeometry(double s, Workspace& m_workspace) const;
+
+  // Evaluate the geometry at (s, theta, zeta).
+  Geometry EvaluateGeometry(double s, double theta, double zeta,
+                            Workspace& m_workspace) const;
+
+  // sum_mn c_mn(s) * basis_mn for the spline of c_mn, if it is not empty
+  static double SumSeries(const RadialSpline& spline,
+                          const RadialSpline::Weights& weights,
+                          const Eigen::VectorXd& basis,
+                          Eigen::VectorXd& m_coefficients);
+
+  const WOutFileContents& wout_;
+  int nfp_;
+
+  int max_m_;
+  int max_n_;
+  ModeSet modes_;
+  ModeSet modes_nyq_;
+
+  // geometry and lambda on the VMEC mode set (xm, xn)
+  RadialSpline rmnc_;
+  RadialSpline zmns_;
+  RadialSpline lmns_;
+  RadialSpline rmns_;
+  RadialSpline zmnc_;
+  RadialSpline lmnc_;
+
+  // Nyquist-extended quantities (xm_nyq, xn_nyq)
+  RadialSpline bmnc_;
+  RadialSpline bsupumnc_;
+  RadialSpline bsupvmnc_;
+  RadialSpline gmnc_;
+  RadialSpline currumnc_;
+  RadialSpline currvmnc_;
+  RadialSpline bmns_;
+  RadialSpline bsupumns_;
+  RadialSpline bsupvmns_;
+  RadialSpline gmns_;
+  RadialSpline currumns_;
+  RadialSpline currvmns_;
+};
+
+}  // namespace vmecpp
+
+#endif  // VMECPP_VMEC_WOUT_EVALUATOR_WOUT_EVALUATOR_H_
@@ -0,0 +1,254 @@
+// SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH
+// <info@proximafusion.com>
+//
+// SPDX-License-Identifier: MIT
+#include "vmecpp/vmec/wout_evaluator/wout_evaluator.h"
+
+#include <cmath>
+#include <vector>
+
+#include "gtest/gtest.h"
+
+namespace vmecpp {
+namespace {
+
+constexpr int kNs = 7;
+constexpr int kNfp = 3;
+
+// Coefficients that are linear in s are interpolated exactly by a natural
+// cubic spline, also when extrapolated beyond the outermost half-grid points.
+double Linear(double s, double offset, double slope) {
+  return offset + slope * s;
+}
+
+// A stellarator-symmetric wout with the modes (m, n) = (0, 0), (1, 0), (1, 1)
+// and coefficients that are linear in s.
+WOutFileContents MakeWOut() {
+  WOutFileContents wout;
+  wout.ns = kNs;
+  wout.nfp = kNfp;
+  wout.lasym = false;
+  wout.xm = Eigen::VectorXi{{0, 1, 1}};
+  wout.xn = Eigen::VectorXi{{0, 0, kNfp}};
+  wout.xm_nyq = wout.xm;
+  wout.xn_nyq = wout.xn;
+
+  const int mnmax = 3;
+  const auto fill = [&](RowMatrixXd& m_coefficients, bool on_half_grid,
+                        double scale) {
+    m_coefficients = RowMatrixXd::Zero(mnmax, kNs);
+    for (int j = on_half_grid ? 1 : 0; j < kNs; ++j) {
+      const double s = on_half_grid ? (j - 0.5) / (kNs - 1.0) : j / (kNs - 1.0);
+      for (int mn = 0; mn < mnmax; ++mn) {
+        m_coefficients(mn, j) = scale * Linear(s, 1.0 + mn, 0.5 - mn);
+      }
+    }
+  };
+  fill(wout.rmnc, /*on_half_grid=*/false, 1.0);
+  fill(wout.zmns, /*on_half_grid=*/false, 0.7);
+  fill(wout.lmns, /*on_half_grid=*/true, 0.1);
+  fill(wout.bmnc, /*on_half_grid=*/true, 2.0);
+  fill(wout.bsupumnc, /*on_half_grid=*/true, 0.3);
+  fill(wout.bsupvmnc, /*on_half_grid=*/true, 0.4);
+  fill(wout.gmnc, /*on_half_grid=*/true, -1.5);
+  fill(wout.currumnc, /*on_half_grid=*/false, 0.2);
+  fill(wout.currvmnc, /*on_half_grid=*/false, 0.6);
+  return wout;
+}
+
+// Direct evaluation of sum_mn scale * c_mn(s) * cos/sin(m theta - n zeta).
+double Reference(const WOutFileContents& wout, double scale, bool use_sin,
+                 double s, double theta, double zeta) {
+  double result = 0.0;
+  for (int mn = 0; mn < wout.xm.size(); ++mn) {
+    const double kernel = wout.xm[mn] * theta - wout.xn[mn] * zeta;
+    const double basis = use_sin ? std::sin(kernel) : std::cos(kernel);
+    result += scale * Linear(s, 1.0 + mn, 0.5 - mn) * basis;
+  }
+  return result;
+}
+
+TEST(TestWOutEvaluator, ReproducesFourierSeries) {
+  const WOutFileContents wout = MakeWOut();
+  const WOutEvaluator evaluator(wout);
+
+  const Eigen::VectorXd s{{0.0, 0.01, 0.37, 0.5, 0.99, 1.0}};
+  const Eigen::VectorXd theta{{0.0, 1.2, -0.4, 3.0, 5.9, 2.2}};
+  const Eigen::VectorXd zeta{{0.0, 0.3, 2.5, -1.0, 4.0, 6.1}};
+  const std::vector<WOutQuantity> quantities = {
+      WOutQuantity::R,     WOutQuantity::Z,     WOutQuantity::LAMBDA,
+      WOutQuantity::MODB,  WOutQuantity::BSUPU, WOutQuantity::BSUPV,
+      WOutQuantity::SQRTG, WOutQuantity::CURRU, WOutQuantity::CURRV};
+  const absl::StatusOr<std::vector<Eigen::VectorXd>> result =
+      evaluator.Evaluate(s, theta, zeta, quantities, /*max_threads=*/2);
+  ASSERT_TRUE(result.ok()) << result.status();
+
+  constexpr double kTolerance = 1.0e-12;
+  for (int p = 0; p < s.size(); ++p) {
+    const auto reference = [&](double scale, bool use_sin) {
+      return Reference(wout, scale, use_sin, s[p], theta[p], zeta[p]);
+    };
+    EXPECT_NEAR((*result)[0][p], reference(1.0, false), kTolerance);
+    EXPECT_NEAR((*result)[1][p], reference(0.7, true), kTolerance);
+    EXPECT_NEAR((*result)[2][p], reference(0.1, true), kTolerance);
+    EXPECT_NEAR((*result)[3][p], reference(2.0, false), kTolerance);
+    EXPECT_NEAR((*result)[4][p], reference(0.3, false), kTolerance);
+    EXPECT_NEAR((*result)[5][p], reference(0.4, false), kTolerance);
+    EXPECT_NEAR((*result)[6][p], reference(-1.5, false), kTolerance);
+    EXPECT_NEAR((*result)[7][p], reference(0.2, false) / reference(-1.5, false),
+                kTolerance);
+    EXPECT_NEAR((*result)[8][p], reference(0.6, false) / reference(-1.5, false),
+                kTolerance);
+  }
+}  // ReproducesFourierSeries
+
+TEST(TestWOutEvaluator, DerivativesMatchFiniteDifferences) {
+  const WOutFileContents wout = MakeWOut();
+  const WOutEvaluator evaluator(wout);
+
+  const double s = 0.43;
+  const double theta = 0.8;
+  const double zeta = 0.25;
+  const double h = 1.0e-6;
+  const Eigen::VectorXd s_points{{s, s + h, s - h, s, s, s, s}};
+  const Eigen::VectorXd theta_points{
+      {theta, theta, theta, theta + h, theta - h, theta, theta}};
+  const Eigen::VectorXd zeta_points{
+      {zeta, zeta, zeta, zeta, zeta, zeta + h, zeta - h}};
+  const absl::StatusOr<std::vector<Eigen::VectorXd>> result =
+      evaluator.Evaluate(
+          s_points, theta_points, zeta_points,
+          {WOutQuantity::R, WOutQuantity::Z, WOutQuantity::DR_DS,
+           WOutQuantity::DR_DTHETA, WOutQuantity::DR_DZETA, WOutQuantity::DZ_DS,
+           WOutQuantity::DZ_DTHETA, WOutQuantity::DZ_DZETA});
+  ASSERT_TRUE(result.ok()) << result.status();
+
+  const Eigen::VectorXd& r = (*result)[0];
+  const Eigen::VectorXd& z = (*result)[1];
+  constexpr double kTolerance = 1.0e-7;
+  EXPECT_NEAR((*result)[2][0], (r[1] - r[2]) / (2 * h), kTolerance);
+  EXPECT_NEAR((*result)[3][0], (r[3] - r[4]) / (2 * h), kTolerance);
+  EXPECT_NEAR((*result)[4][0], (r[5] - r[6]) / (2 * h), kTolerance);
+  EXPECT_NEAR((*result)[5][0], (z[1] - z[2]) / (2 * h), kTolerance);
+  EXPECT_NEAR((*result)[6][0], (z[3] - z[4]) / (2 * h), kTolerance);
+  EXPECT_NEAR((*result)[7][0], (z[5] - z[6]) / (2 * h), kTolerance);
+}  // DerivativesMatchFiniteDifferences
+
+TEST(TestWOutEvaluator, SplineInterpolatesSmoothProfile) {
+  const int num_knots = 21;
+  const double spacing = 1.0 / (num_knots - 1.0);
+  RowMatrixXd values(1, num_knots);
+  for (int j = 0; j < num_knots; ++j) {
+    values(0, j) = std::sin(2.0 * j * spacing);
+  }
+  const WOutEvaluator::RadialSpline spline(values, /*first_column=*/0,
+                                           /*s_first=*/0.0, spacing);
+  // away from the ends, where the natural boundary condition is inexact
+  for (double s = 0.2; s < 0.8; s += 0.0731) {
+    const WOutEvaluator::RadialSpline::Weights weights =
+        spline.ComputeWeights(s);
+    Eigen::VectorXd value;
+    Eigen::VectorXd derivative;
+    spline.Interpolate(weights, value);
+    spline.InterpolateDerivative(weights, derivative);
+    EXPECT_NEAR(value[0], std::sin(2.0 * s), 1.0e-5);
+    EXPECT_NEAR(derivative[0], 2.0 * std::cos(2.0 * s), 1.0e-3);
+  }
+}  // SplineInterpolatesSmoothProfile
+
+TEST(TestWOutEvaluator, RejectsInvalidInputs) {
+  const WOutFileContents wout = MakeWOut();
+  const WOutEvaluator evaluator(wout);
+
+  const Eigen::VectorXd two{{0.1, 0.2}};
+  const Eigen::VectorXd three{{0.1, 0.2, 0.3}};
+  EXPECT_FALSE(evaluator.Evaluate(two, three, three, {WOutQuantity::R}).ok());
+
+  const Eigen::VectorXd outside{{0.5, 1.5}};
+  EXPECT_FALSE(evaluator.Evaluate(outside, two, two, {WOutQuantity::R}).ok());
+}  // RejectsInvalidInputs
+
+// Nested, shaped flux surfaces around a magnetic axis at R = 3:
+// R = 3 + s (0.5 cos(theta) + 0.05 cos(theta - nfp zeta)),
+// Z = s (0.6 sin(theta) + 0.05 sin(theta - nfp zeta)).
+WOutFileContents MakeNestedWOut() {
+  WOutFileContents wout = MakeWOut();
+  wout.rmnc.setZero();
+  wout.zmns.setZero();
+  for (int j = 0; j < kNs; ++j) {
+    const double s = j / (kNs - 1.0);
+    wout.rmnc(0, j) = 3.0;
+    wout.rmnc(1, j) = 0.5 * s;
+    wout.zmns(1, j) = 0.6 * s;
+    wout.rmnc(2, j) = 0.05 * s;
+    wout.zmns(2, j) = 0.05 * s;
+  }
+  return wout;
+}
+
+TEST(TestWOutEvaluator, ToFluxCoordinatesInvertsEvaluate) {
+  const WOutFileContents wout = MakeNestedWOut();
+  const WOutEvaluator evaluator(wout);
+
+  std::vector<double> s_values;
+  std::vector<double> theta_values;
+  std::vector<double> zeta_values;
+  for (double s : {0.05, 0.3, 0.7, 0.95, 1.0}) {
+    for (double theta : {0.1, 1.7, 3.0, 4.4, 6.0}) {
+      for (double zeta : {0.0, 0.4, 2.9, 5.5}) {
+        s_values.push_back(s);
+        theta_values.push_back(theta);
+        zeta_values.push_back(zeta);
+      }
+    }
+  }
+  const Eigen::Map<Eigen::VectorXd> s(s_values.data(), s_values.size());
+  const Eigen::Map<Eigen::VectorXd> theta(theta_values.data(),
+                                          theta_values.size());
+  const Eigen::Map<Eigen::VectorXd> zeta(zeta_values.data(),
+                                         zeta_values.size());
+  const absl::StatusOr<std::vector<Eigen::VectorXd>> position =
+      evaluator.Evaluate(s, theta, zeta, {WOutQuantity::R, WOutQuantity::Z});
+  ASSERT_TRUE(position.ok()) << position.status();
+
+  const absl::StatusOr<FluxCoordinates> flux_coordinates =
+      evaluator.ToFluxCoordinates((*position)[0], zeta, (*position)[1]);
+  ASSERT_TRUE(flux_coordinates.ok()) << flux_coordinates.status();
+  for (int p = 0; p < s.size(); ++p) {
+    EXPECT_NEAR(flux_coordinates->s[p], s[p], 1.0e-8) << "point " << p;
+    EXPECT_NEAR(flux_coordinates->theta[p], theta[p], 1.0e-8) << "point " << p;
+    EXPECT_EQ(flux_coordinates->inside[p], 1) << "point " << p;
+  }
+}  // ToFluxCoordinatesInvertsEvaluate
+
+TEST(TestWOutEvaluator, ToFluxCoordinatesFlagsOutsidePoints) {
+  const WOutFileContents wout = MakeNestedWOut();
+  const WOutEvaluator evaluator(wout);
+
+  // R = 3 + 1.2 * 0.55 on the outboard midplane at zeta = 0 lies outside of
+  // the boundary, at an extrapolated s = 1.2
+  const Eigen::VectorXd r{{3.0 + 1.2 * 0.55, 3.0 + 0.9 * 0.55}};
+  const Eigen::VectorXd phi{{0.0, 0.0}};
+  const Eigen::VectorXd z{{0.0, 0.0}};
+  const absl::StatusOr<FluxCoordinates> flux_coordinates =
+      evaluator.ToFluxCoordinates(r, phi, z);
+  ASSERT_TRUE(flux_coordinates.ok()) << flux_coordinates.status();
+  EXPECT_EQ(flux_coordinates->inside[0], 0);
+  EXPECT_NEAR(flux_coordinates->s[0], 1.2, 1.0e-8);
+  EXPECT_EQ(flux_coordinates->inside[1], 1);
+  EXPECT_NEAR(flux_coordinates->s[1], 0.9, 1.0e-8);
+}  // ToFluxCoordinatesFlagsOutsidePoints
+
+TEST(TestWOutEvaluator, QuantityNamesRoundTrip) {
+  for (WOutQuantity quantity : {WOutQuantity::R, WOutQuantity::DZ_DZETA,
+                                WOutQuantity::MODB, WOutQuantity::CURRV}) {
+    const absl::StatusOr<WOutQuantity> parsed =
+        WOutQuantityFromString(ToString(quantity));
+    ASSERT_TRUE(parsed.ok());
+    EXPECT_EQ(*parsed, quantity);
+  }
+  EXPECT_FALSE(WOutQuantityFromString("not_a_quantity").ok());
+}  // QuantityNamesRoundTrip
+
+}  // namespace
+}  // namespace vmecpp
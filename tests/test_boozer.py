@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH <info@proximafusion.com>
+#
+# SPDX-License-Identifier: MIT
+"""Tests for the in-memory Boozer coordinate transform."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import vmecpp
+
+REPO_ROOT = Path(__file__).parent.parent
+TEST_DATA_DIR = REPO_ROOT / "src" / "vmecpp" / "cpp" / "vmecpp" / "test_data"
+
+
+@pytest.fixture(scope="module")
+def cma_output() -> vmecpp.VmecOutput:
+    vmec_input = vmecpp.VmecInput.from_file(TEST_DATA_DIR / "cma.json")
+    return vmecpp.run(vmec_input, verbose=False)
+
+
+def test_boozer_transform_shapes(cma_output: vmecpp.VmecOutput):
+    wout = cma_output.wout
+    booz = vmecpp.boozer_transform(cma_output, mboz=8, nboz=6)
+
+    n_modes = 7 + 7 * 13
+    n_surfaces = wout.ns - 1
+    assert booz.xm_b.shape == (n_modes,)
+    assert np.all(booz.xn_b % wout.nfp == 0)
+    assert booz.bmnc_b.shape == (n_modes, n_surfaces)
+    np.testing.assert_array_equal(booz.compute_surfs, np.arange(n_surfaces))
+    np.testing.assert_allclose(booz.iota_b, wout.iotas[1:])
+    np.testing.assert_allclose(booz.buco_b, wout.bsubumnc[0, 1:])
+    np.testing.assert_allclose(booz.bvco_b, wout.bsubvmnc[0, 1:])
+
+    # The Boozer angles have the Jacobian B^2 sqrt(g) / (G + iota I) with respect to
+    # the VMEC angles, so the (0, 0) mode of |B| is the <B^3 sqrt(g)> / <B^2 sqrt(g)>
+    # average over the VMEC angles. This holds up to the force residual of the
+    # discrete equilibrium, from ~5e-7 at the axis to ~3e-5 at the boundary,
+    # independently of mboz and nboz.
+    np.testing.assert_allclose(
+        booz.bmnc_b[0], _jacobian_weighted_mod_b_average(wout), rtol=5e-5
+    )
+
+
+def _jacobian_weighted_mod_b_average(wout: vmecpp.VmecWOut) -> np.ndarray:
+    """<B^3 sqrt(g)> / <B^2 sqrt(g)> on the half-grid surfaces, evaluated on a VMEC
+    angle grid that integrates the fifth powers of the Nyquist harmonics exactly."""
+    num_theta = 5 * int(np.max(wout.xm_nyq)) + 2
+    num_zeta = 5 * int(np.max(np.abs(wout.xn_nyq))) // wout.nfp + 2
+    theta = np.linspace(0.0, 2.0 * np.pi, num_theta, endpoint=False)
+    zeta = np.linspace(0.0, 2.0 * np.pi / wout.nfp, num_zeta, endpoint=False)
+    theta_grid, zeta_grid = np.meshgrid(theta, zeta, indexing="ij")
+    cos_mn = np.cos(
+        np.multiply.outer(wout.xm_nyq, theta_grid)
+        - np.multiply.outer(wout.xn_nyq, zeta_grid)
+    )
+    mod_b = np.einsum("mj,mtz->jtz", wout.bmnc[:, 1:], cos_mn)
+    sqrt_g = np.einsum("mj,mtz->jtz", wout.gmnc[:, 1:], cos_mn)
+    return np.sum(mod_b**3 * sqrt_g, axis=(1, 2)) / np.sum(
+        mod_b**2 * sqrt_g, axis=(1, 2)
+    )
+
+
+def test_boozer_transform_surfaces_and_threads(cma_output: vmecpp.VmecOutput):
+    all_surfaces = vmecpp.boozer_transform(cma_output.wout, mboz=8, nboz=6)
+    some_surfaces = vmecpp.boozer_transform(
+        cma_output.wout, mboz=8, nboz=6, surfaces=[3, 10], max_threads=1
+    )
+    np.testing.assert_array_equal(some_surfaces.compute_surfs, [3, 10])
+    np.testing.assert_allclose(
+        some_surfaces.bmnc_b, all_surfaces.bmnc_b[:, [3, 10]], rtol=0, atol=1e-14
+    )
+
+    with pytest.raises(ValueError, match="half grid"):
+        vmecpp.boozer_transform(cma_output, mboz=8, nboz=6, surfaces=[1000])
+
+
+def test_boozer_transform_matches_booz_xform(cma_output: vmecpp.VmecOutput, tmp_path):
+    booz_xform = pytest.importorskip("booz_xform")
+
+    wout_path = tmp_path / "wout_cma.nc"
+    cma_output.wout.save(wout_path)
+    reference = booz_xform.Booz_xform()
+    reference.read_wout(str(wout_path))
+    reference.mboz = 12
+    reference.nboz = 8
+    reference.run()
+
+    booz = vmecpp.boozer_transform(cma_output, mboz=12, nboz=8)
+    np.testing.assert_array_equal(booz.xm_b, reference.xm_b)
+    np.testing.assert_array_equal(booz.xn_b, reference.xn_b)
+    np.testing.assert_allclose(booz.bmnc_b, reference.bmnc_b, rtol=0, atol=1e-5)
+    np.testing.assert_allclose(booz.rmnc_b, reference.rmnc_b, rtol=0, atol=1e-5)
+    np.testing.assert_allclose(booz.zmns_b, reference.zmns_b, rtol=0, atol=1e-5)
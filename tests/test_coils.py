@@ -0,0 +1,452 @@
+# SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH <info@proximafusion.com>
+#
+# SPDX-License-Identifier: MIT
+from pathlib import Path
+
+import numpy as np
+import pytest
+from simsopt.field import BiotSavart, Current, coils_via_symmetries
+from simsopt.geo import create_equally_spaced_curves
+
+import vmecpp
+from vmecpp.cpp import _vmecpp  # type: ignore
+
+REPO_ROOT = Path(__file__).parent.parent
+TEST_DATA_DIR = REPO_ROOT / "src" / "vmecpp" / "cpp" / "vmecpp" / "test_data"
+
+VACUUM_PERMEABILITY = 4.0e-7 * np.pi
+
+
+def _circle(radius: float, num_points: int = 2000) -> np.ndarray:
+    phi = np.linspace(0.0, 2.0 * np.pi, num_points, endpoint=False)
+    return np.column_stack(
+        [radius * np.cos(phi), radius * np.sin(phi), np.zeros_like(phi)]
+    )
+
+
+def _toroidal_field_coils(
+    num_coils: int, major_radius: float, minor_radius: float, current: float
+) -> _vmecpp.MagneticConfiguration:
+    """Circular coils in the planes of constant toroidal angle phi = 2 pi k / N, which
+    drive a field along +phi for a positive current."""
+    theta = np.linspace(0.0, 2.0 * np.pi, 200, endpoint=False)
+    base_coil = np.column_stack(
+        [
+            major_radius + minor_radius * np.cos(theta),
+            np.zeros_like(theta),
+            -minor_radius * np.sin(theta),
+        ]
+    )
+    return _vmecpp.MagneticConfiguration.from_arrays(
+        [base_coil], np.array([current]), [1], nfp=num_coils
+    )
+
+
+def test_magnetic_field_on_axis_of_circular_coil():
+    radius = 1.3
+    current = 1.0e4
+    loop = _vmecpp.MagneticConfiguration.from_arrays(
+        [_circle(radius)], np.array([current]), [1]
+    )
+    z = np.linspace(-2.0, 2.0, 11)
+    points = np.column_stack([np.zeros_like(z), np.zeros_like(z), z])
+
+    b_field = vmecpp.coils.magnetic_field(loop, points)
+
+    assert b_field.shape == (11, 3)
+    expected_b_z = (
+        VACUUM_PERMEABILITY * current * radius**2 / (2.0 * (radius**2 + z**2) ** 1.5)
+    )
+    np.testing.assert_allclose(b_field[:, 2], expected_b_z, rtol=1e-5)
+    np.testing.assert_allclose(b_field[:, :2], 0.0, atol=1e-12)
+
+
+def test_vector_potential_is_consistent_with_magnetic_field():
+    """The curl of the vector potential is the magnetic field."""
+    coils = _toroidal_field_coils(5, 1.0, 0.5, 1.0e5)
+    point = np.array([1.1, 0.2, -0.1])
+    h = 1.0e-5
+    shifted = point + h * np.vstack([np.eye(3), -np.eye(3)])
+
+    a_field = vmecpp.coils.vector_potential(coils, shifted)
+    # jacobian[i, j] = d A_i / d x_j
+    jacobian = ((a_field[:3] - a_field[3:]) / (2.0 * h)).T
+    curl = np.array(
+        [
+            jacobian[2, 1] - jacobian[1, 2],
+            jacobian[0, 2] - jacobian[2, 0],
+            jacobian[1, 0] - jacobian[0, 1],
+        ]
+    )
+
+    b_field = vmecpp.coils.magnetic_field(coils, point[np.newaxis, :])[0]
+    np.testing.assert_allclose(
+        curl, b_field, rtol=1e-6, atol=1e-8 * np.linalg.norm(b_field)
+    )
+
+
+def test_results_do_not_depend_on_number_of_threads():
+    magnetic_configuration = _vmecpp.MagneticConfiguration.from_file(
+        TEST_DATA_DIR / "coils.cth_like"
+    )
+    rng = np.random.default_rng(42)
+    points = rng.uniform([0.5, -0.5, -0.3], [1.0, 0.5, 0.3], size=(1001, 3))
+
+    serial = vmecpp.coils.magnetic_field(magnetic_configuration, points, max_threads=1)
+    parallel = vmecpp.coils.magnetic_field(
+        magnetic_configuration, points, max_threads=4
+    )
+    np.testing.assert_array_equal(serial, parallel)
+
+    # non-contiguous input and the path to the coils file are accepted as well
+    np.testing.assert_array_equal(
+        vmecpp.coils.magnetic_field(
+            TEST_DATA_DIR / "coils.cth_like", np.asfortranarray(points)
+        ),
+        serial,
+    )
+
+
+def test_invalid_points():
+    loop = _vmecpp.MagneticConfiguration.from_arrays(
+        [_circle(1.0)], np.array([1.0]), [1]
+    )
+    with pytest.raises(ValueError, match="shape"):
+        vmecpp.coils.magnetic_field(loop, np.zeros((4, 2)))
+    with pytest.raises(AttributeError, match="max_threads"):
+        vmecpp.coils.magnetic_field(loop, np.zeros((4, 3)), max_threads=0)
+
+
+def test_from_simsopt_coils_matches_simsopt_biot_savart():
+    nfp = 2
+    curves = create_equally_spaced_curves(
+        3, nfp, stellsym=True, R0=0.55, R1=0.2, order=2, numquadpoints=64
+    )
+    currents = [Current(1.0e4), Current(-2.0e4), Current(3.0e4)]
+    base_coils = coils_via_symmetries(curves, currents, 1, False)
+    all_coils = coils_via_symmetries(curves, currents, nfp, True)
+    rng = np.random.default_rng(42)
+    points = rng.uniform([0.4, -0.1, -0.1], [0.7, 0.1, 0.1], size=(101, 3))
+
+    biot_savart = BiotSavart(all_coils)
+    biot_savart.set_points(points)
+    expected = biot_savart.B()
+    # symmetric copies generated by VMEC++ or passed in explicitly
+    for magnetic_configuration in [
+        vmecpp.coils.from_simsopt_coils(base_coils, nfp=nfp, stellsym=True),
+        vmecpp.coils.from_simsopt_coils(all_coils),
+    ]:
+        # SIMSOPT integrates along the quadrature points of the curves, VMEC++ along
+        # the polygon through them
+        np.testing.assert_allclose(
+            vmecpp.coils.magnetic_field(magnetic_configuration, points),
+            expected,
+            rtol=0,
+            atol=2e-3 * np.max(np.abs(expected)),
+        )
+
+
+@pytest.mark.parametrize("poloidal_orientation", [1.0, -1.0])
+def test_enclosed_toroidal_flux(poloidal_orientation):
+    num_coils, current = 24, 1.0e5
+    coils = _toroidal_field_coils(num_coils, 1.0, 0.6, current)
+    major_radius, minor_radius = 1.0, 0.2
+    vmec_input = vmecpp.VmecInput(
+        nfp=num_coils,
+        mpol=2,
+        ntor=0,
+        rbc=np.array([[major_radius], [minor_radius]]),
+        zbs=np.array([[0.0], [poloidal_orientation * minor_radius]]),
+    )
+
+    # half-way between two coils
+    phi = np.pi / num_coils
+    flux = vmecpp.coils.enclosed_toroidal_flux(coils, vmec_input, phi=phi)
+
+    # Integrate the toroidal field over the cross-section directly.
+    rho = np.linspace(0.0, minor_radius, 201)[1:] - 0.5 * minor_radius / 200
+    theta = np.linspace(0.0, 2.0 * np.pi, 64, endpoint=False)
+    rho_grid, theta_grid = (grid.ravel() for grid in np.meshgrid(rho, theta))
+    r = major_radius + rho_grid * np.cos(theta_grid)
+    z = rho_grid * np.sin(theta_grid)
+    points = np.column_stack([r * np.cos(phi), r * np.sin(phi), z])
+    b_field = vmecpp.coils.magnetic_field(coils, points)
+    b_phi = -b_field[:, 0] * np.sin(phi) + b_field[:, 1] * np.cos(phi)
+    area_element = rho_grid * (minor_radius / 200) * (2.0 * np.pi / 64)
+    expected_flux = np.sum(b_phi * area_element)
+
+    assert flux > 0.0
+    np.testing.assert_allclose(flux, expected_flux, rtol=1e-4)
+    # close to the flux of an ideal toroidal field mu_0 N I / (2 pi R)
+    ideal_flux = (
+        VACUUM_PERMEABILITY
+        * num_coils
+        * current
+        * (major_radius - np.sqrt(major_radius**2 - minor_radius**2))
+    )
+    np.testing.assert_allclose(flux, ideal_flux, rtol=1e-2)
+
+
+def _tilted_coils(num_coils: int) -> list[np.ndarray]:
+    """Planar coils around the torus with some tilt, so that the field has no
+    symmetry that could hide errors in the derivatives."""
+    theta = np.linspace(0.0, 2.0 * np.pi, 40, endpoint=False)
+    points_per_coil = []
+    for k in range(num_coils):
+        phi = 2.0 * np.pi * k / num_coils + 0.1 * np.sin(k)
+        r = 0.82 + 0.4 * np.cos(theta)
+        z = 0.4 * np.sin(theta) + 0.05 * np.cos(theta + k)
+        points_per_coil.append(np.column_stack([r * np.cos(phi), r * np.sin(phi), z]))
+    return points_per_coil
+
+
+def test_magnetic_field_adjoint_matches_finite_differences():
+    points_per_coil = _tilted_coils(3)
+    currents = np.array([1.0e4, -2.0e4, 3.0e4])
+
+    def configuration(points):
+        return _vmecpp.MagneticConfiguration.from_arrays(points, currents, [1, 2, 3])
+
+    rng = np.random.default_rng(42)
+    points = rng.uniform([0.6, -0.3, -0.2], [1.0, 0.3, 0.2], size=(50, 3))
+    cotangents = rng.normal(size=(50, 3))
+
+    gradients = vmecpp.coils.magnetic_field_adjoint(
+        configuration(points_per_coil), points, cotangents
+    )
+
+    # one entry per coil, closed by repeating the first vertex
+    assert len(gradients) == 3
+    assert all(gradient.shape == (41, 3) for gradient in gradients)
+
+    h = 1.0e-6
+    for coil, vertex in [(0, 0), (1, 17), (2, 39)]:
+        expected = gradients[coil][vertex].copy()
+        if vertex == 0:
+            expected += gradients[coil][-1]
+        for k in range(3):
+            objectives = []
+            for sign in [1.0, -1.0]:
+                perturbed = [p.copy() for p in points_per_coil]
+                perturbed[coil][vertex, k] += sign * h
+                b_field = vmecpp.coils.magnetic_field(configuration(perturbed), points)
+                objectives.append(np.sum(b_field * cotangents))
+            finite_difference = (objectives[0] - objectives[1]) / (2.0 * h)
+            np.testing.assert_allclose(expected[k], finite_difference, rtol=1e-5)
+
+    with pytest.raises(ValueError, match="shape"):
+        vmecpp.coils.magnetic_field_adjoint(
+            configuration(points_per_coil), points, cotangents[:, :2]
+        )
+    with pytest.raises(AttributeError, match="cotangents"):
+        vmecpp.coils.magnetic_field_adjoint(
+            configuration(points_per_coil), points, cotangents[:10]
+        )
+
+
+def test_lcfs_surface():
+    wout = vmecpp.VmecWOut.from_wout_file(TEST_DATA_DIR / "wout_cth_like_free_bdy.nc")
+    points, normals, area_elements = vmecpp.coils.lcfs_surface(
+        wout, num_theta=32, num_phi=16
+    )
+
+    assert points.shape == (wout.nfp * 16 * 32, 3)
+    np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1.0)
+    # the normals point outwards: divergence theorem for the enclosed volume
+    volume = np.sum(np.sum(points * normals, axis=1) * area_elements) / 3.0
+    np.testing.assert_allclose(volume, wout.volume_p, rtol=1e-8)
+
+
+def test_lcfs_normal_field_adjoint_matches_finite_differences():
+    wout = vmecpp.VmecWOut.from_wout_file(TEST_DATA_DIR / "wout_cth_like_free_bdy.nc")
+    resolution = {"num_theta": 16, "num_phi": 4}
+    points_per_coil = _tilted_coils(6)
+    currents = np.full(6, 1.0e5)
+
+    def squared_normal_field(points):
+        magnetic_configuration = _vmecpp.MagneticConfiguration.from_arrays(
+            points, currents, [1] * 6
+        )
+        b_n = vmecpp.coils.lcfs_normal_field(magnetic_configuration, wout, **resolution)
+        return magnetic_configuration, b_n
+
+    _, _, area_elements = vmecpp.coils.lcfs_surface(wout, **resolution)
+    magnetic_configuration, b_n = squared_normal_field(points_per_coil)
+    gradients = vmecpp.coils.lcfs_normal_field_adjoint(
+        magnetic_configuration, wout, b_n * area_elements, **resolution
+    )
+
+    h = 1.0e-6
+    for k in range(3):
+        objectives = []
+        for sign in [1.0, -1.0]:
+            perturbed = [p.copy() for p in points_per_coil]
+            perturbed[4][11, k] += sign * h
+            _, perturbed_b_n = squared_normal_field(perturbed)
+            objectives.append(0.5 * np.sum(perturbed_b_n**2 * area_elements))
+        finite_difference = (objectives[0] - objectives[1]) / (2.0 * h)
+        np.testing.assert_allclose(gradients[4][11, k], finite_difference, rtol=1e-5)
+
+
+def _small_grid(**parameters) -> vmecpp.MakegridParameters:
+    """A coarse grid around the cth_like equilibrium."""
+    return vmecpp.MakegridParameters(
+        **{
+            "normalize_by_currents": False,
+            "assume_stellarator_symmetry": False,
+            "number_of_field_periods": 5,
+            "r_grid_minimum": 0.45,
+            "r_grid_maximum": 1.05,
+            "number_of_r_grid_points": 13,
+            "z_grid_minimum": -0.3,
+            "z_grid_maximum": 0.3,
+            "number_of_z_grid_points": 11,
+            "number_of_phi_grid_points": 4,
+            **parameters,
+        }
+    )
+
+
+@pytest.mark.parametrize("normalize_by_currents", [False, True])
+@pytest.mark.parametrize("assume_stellarator_symmetry", [False, True])
+def test_magnetic_field_response_table_adjoint_matches_finite_differences(
+    normalize_by_currents, assume_stellarator_symmetry
+):
+    points_per_coil = _tilted_coils(3)
+    currents = np.array([1.0e4, -2.0e4, 3.0e4])
+    makegrid_parameters = _small_grid(
+        normalize_by_currents=normalize_by_currents,
+        assume_stellarator_symmetry=assume_stellarator_symmetry,
+    )
+
+    def response_table(points):
+        magnetic_configuration = _vmecpp.MagneticConfiguration.from_arrays(
+            points, currents, [1, 1, 2]
+        )
+        return magnetic_configuration, (
+            vmecpp.MagneticFieldResponseTable.from_magnetic_configuration(
+                magnetic_configuration, makegrid_parameters
+            )
+        )
+
+    magnetic_configuration, table = response_table(points_per_coil)
+    rng = np.random.default_rng(42)
+    cotangents = vmecpp.MagneticFieldResponseTable(
+        parameters=makegrid_parameters,
+        b_r=rng.normal(size=table.b_r.shape),
+        b_p=rng.normal(size=table.b_p.shape),
+        b_z=rng.normal(size=table.b_z.shape),
+    )
+    gradients = vmecpp.coils.magnetic_field_response_table_adjoint(
+        magnetic_configuration, cotangents
+    )
+    assert len(gradients) == 3
+
+    h = 1.0e-6
+    for coil, vertex in [(1, 5), (2, 23)]:
+        for k in range(3):
+            objectives = []
+            for sign in [1.0, -1.0]:
+                perturbed = [p.copy() for p in points_per_coil]
+                perturbed[coil][vertex, k] += sign * h
+                _, perturbed_table = response_table(perturbed)
+                objectives.append(
+                    np.sum(perturbed_table.b_r * cotangents.b_r)
+                    + np.sum(perturbed_table.b_p * cotangents.b_p)
+                    + np.sum(perturbed_table.b_z * cotangents.b_z)
+                )
+            finite_difference = (objectives[0] - objectives[1]) / (2.0 * h)
+            np.testing.assert_allclose(
+                gradients[coil][vertex, k], finite_difference, rtol=1e-5
+            )
+
+
+def test_lcfs_interpolated_field():
+    wout = vmecpp.VmecWOut.from_wout_file(TEST_DATA_DIR / "wout_cth_like_free_bdy.nc")
+    makegrid_parameters = _small_grid(
+        assume_stellarator_symmetry=True,
+        number_of_r_grid_points=61,
+        number_of_z_grid_points=61,
+        number_of_phi_grid_points=8,
+    )
+    coils = _toroidal_field_coils(10, 0.75, 0.5, 1.0e5)
+    response_table = vmecpp.MagneticFieldResponseTable.from_magnetic_configuration(
+        coils, makegrid_parameters
+    )
+
+    b_field = vmecpp.coils.lcfs_interpolated_field(
+        response_table, wout, extcur=np.array([2.0]), num_theta=32
+    )
+
+    # close to the field of the coils, scaled by extcur
+    points, _, _ = vmecpp.coils.lcfs_surface(wout, num_theta=32, num_phi=8)
+    assert b_field.shape == points.shape
+    expected = 2.0 * vmecpp.coils.magnetic_field(coils, points)
+    np.testing.assert_allclose(
+        b_field, expected, atol=1e-3 * np.max(np.linalg.norm(expected, axis=1))
+    )
+
+    with pytest.raises(ValueError, match="field periods"):
+        vmecpp.coils.lcfs_interpolated_field(
+            vmecpp.MagneticFieldResponseTable(
+                parameters=_small_grid(number_of_field_periods=2),
+                b_r=response_table.b_r,
+                b_p=response_table.b_p,
+                b_z=response_table.b_z,
+            ),
+            wout,
+        )
+
+
+def test_lcfs_interpolated_field_adjoint_matches_finite_differences():
+    wout = vmecpp.VmecWOut.from_wout_file(TEST_DATA_DIR / "wout_cth_like_free_bdy.nc")
+    makegrid_parameters = _small_grid(assume_stellarator_symmetry=True)
+    points_per_coil = _tilted_coils(4)
+    currents = np.array([1.0e4, -2.0e4, 3.0e4, 1.0e4])
+    extcur = np.array([1.5, -0.5])
+
+    def configuration(points):
+        return _vmecpp.MagneticConfiguration.from_arrays(points, currents, [1, 1, 2, 2])
+
+    rng = np.random.default_rng(42)
+    points, _, _ = vmecpp.coils.lcfs_surface(wout, num_theta=16, num_phi=4)
+    cotangents = rng.normal(size=points.shape)
+    gradients = vmecpp.coils.lcfs_interpolated_field_adjoint(
+        configuration(points_per_coil),
+        makegrid_parameters,
+        wout,
+        cotangents,
+        extcur=extcur,
+        num_theta=16,
+    )
+
+    h = 1.0e-6
+    for coil, vertex in [(0, 3), (3, 30)]:
+        for k in range(3):
+            objectives = []
+            for sign in [1.0, -1.0]:
+                perturbed = [p.copy() for p in points_per_coil]
+                perturbed[coil][vertex, k] += sign * h
+                response_table = (
+                    vmecpp.MagneticFieldResponseTable.from_magnetic_configuration(
+                        configuration(perturbed), makegrid_parameters
+                    )
+                )
+                b_field = vmecpp.coils.lcfs_interpolated_field(
+                    response_table, wout, extcur=extcur, num_theta=16
+                )
+                objectives.append(np.sum(b_field * cotangents))
+            finite_difference = (objectives[0] - objectives[1]) / (2.0 * h)
+            np.testing.assert_allclose(
+                gradients[coil][vertex, k], finite_difference, rtol=1e-5
+            )
+
+    with pytest.raises(ValueError, match="extcur"):
+        vmecpp.coils.lcfs_interpolated_field_adjoint(
+            configuration(points_per_coil),
+            makegrid_parameters,
+            wout,
+            cotangents,
+            extcur=np.ones(3),
+            num_theta=16,
+        )
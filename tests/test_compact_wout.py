@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH <info@proximafusion.com>
+#
+# SPDX-License-Identifier: MIT
+"""Tests for the compact in-memory representation of VmecWOut."""
+
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import vmecpp
+
+REPO_ROOT = Path(__file__).parent.parent
+TEST_DATA_DIR = REPO_ROOT / "src" / "vmecpp" / "cpp" / "vmecpp" / "test_data"
+
+
+@pytest.fixture(scope="module")
+def cma_wout() -> vmecpp.VmecWOut:
+    return vmecpp.VmecWOut.from_wout_file(TEST_DATA_DIR / "wout_cma.nc")
+
+
+@pytest.fixture(scope="module")
+def up_down_asym_wout() -> vmecpp.VmecWOut:
+    vmec_input = vmecpp.VmecInput.from_file(TEST_DATA_DIR / "up_down_asym.json")
+    return vmecpp.run(vmec_input, verbose=False, max_threads=1).wout
+
+
+def _fourier_arrays(wout: vmecpp.VmecWOut) -> list[str]:
+    return [
+        name
+        for name in type(wout).model_fields
+        if isinstance(getattr(wout, name), np.ndarray) and getattr(wout, name).ndim == 2
+    ]
+
+
+def _assert_wouts_close(
+    actual: vmecpp.VmecWOut, expected: vmecpp.VmecWOut, rtol: float
+) -> None:
+    for name in type(expected).model_fields:
+        expected_value = getattr(expected, name)
+        actual_value = getattr(actual, name)
+        if isinstance(expected_value, np.ndarray) and expected_value.size > 0:
+            atol = rtol * np.abs(expected_value).max()
+            np.testing.assert_allclose(
+                actual_value, expected_value, rtol=rtol, atol=atol, err_msg=name
+            )
+        elif isinstance(expected_value, np.ndarray):
+            assert actual_value.shape == expected_value.shape, name
+        else:
+            assert actual_value == expected_value, name
+
+
+@pytest.mark.parametrize("wout_name", ["cma_wout", "up_down_asym_wout"])
+def test_compact_round_trip(request, wout_name):
+    wout = request.getfixturevalue(wout_name)
+    compact = wout.compact()
+
+    # the lambda half-grid and current density arrays are recomputed on access
+    expected_derived = ["fsqt", "lmns", "currumnc", "currvmnc"]
+    if wout.lasym:
+        expected_derived += ["lmnc", "currumns", "currvmns"]
+    assert sorted(compact.derived_fields) == sorted(expected_derived)
+    for name in expected_derived:
+        assert name not in compact._fields
+
+    _assert_wouts_close(compact.to_wout(), wout, rtol=1e-13)
+    assert compact.rmnc.dtype == np.float64
+    np.testing.assert_array_equal(compact.rmnc, wout.rmnc)
+    assert compact.nbytes < sum(
+        getattr(wout, name).nbytes
+        for name in type(wout).model_fields
+        if isinstance(getattr(wout, name), np.ndarray)
+    )
+
+
+def test_compact_float32(cma_wout):
+    compact64 = cma_wout.compact(np.float64)
+    compact32 = cma_wout.compact(np.float32)
+    assert compact32.dtype == np.float32
+    assert compact32._fields["rmnc"].dtype == np.float32
+
+    # the Fourier coefficients take half of the memory, except for the current
+    # densities, which are stored in float32 instead of being omitted
+    fourier_bytes_64 = sum(
+        value.nbytes
+        for value in compact64._fields.values()
+        if isinstance(value, np.ndarray) and value.ndim == 2
+    )
+    fourier_bytes_32 = sum(
+        value.nbytes
+        for value in compact32._fields.values()
+        if isinstance(value, np.ndarray) and value.ndim == 2
+    )
+    ns, mnmax_nyq = cma_wout.ns, cma_wout.mnmax_nyq
+    assert fourier_bytes_32 == fourier_bytes_64 // 2 + 2 * 4 * ns * mnmax_nyq
+    assert compact32.nbytes < compact64.nbytes
+
+    # values are returned in float64 and match to single precision
+    assert compact32.bmnc.dtype == np.float64
+    _assert_wouts_close(compact32.to_wout(), cma_wout, rtol=1e-6)
+
+
+def test_compact_omits_zero_filled_arrays(cma_wout):
+    # wout files of stellarator-symmetric equilibria with lasym=True have all the
+    # non-stellarator-symmetric arrays filled with zeros
+    zero_filled = {
+        name: np.zeros_like(getattr(cma_wout, symmetric_name))
+        for name, symmetric_name in [
+            ("rmns", "rmnc"),
+            ("zmnc", "zmns"),
+            ("lmnc", "lmns"),
+            ("lmnc_full", "lmns_full"),
+            ("gmns", "gmnc"),
+            ("bmns", "bmnc"),
+            ("bsubumns", "bsubumnc"),
+            ("bsubvmns", "bsubvmnc"),
+            ("bsubsmnc", "bsubsmns"),
+            ("bsupumns", "bsupumnc"),
+            ("bsupvmns", "bsupvmnc"),
+            ("currumns", "currumnc"),
+            ("currvmns", "currvmnc"),
+        ]
+    }
+    asym_wout = cma_wout.model_copy(update={"lasym": True, **zero_filled})
+
+    compact = asym_wout.compact()
+    assert compact.nbytes == cma_wout.compact().nbytes
+    for name, value in zero_filled.items():
+        assert name not in compact._fields
+        np.testing.assert_array_equal(getattr(compact, name), value)
+    _assert_wouts_close(compact.to_wout(), asym_wout, rtol=0.0)
+
+
+def test_compact_keeps_arrays_it_cannot_reproduce(cma_wout):
+    # e.g. wout files of other VMEC versions, which compute lmns differently
+    lmns = cma_wout.lmns.copy()
+    lmns[:, 1:] *= 1.0 + 1e-9
+    other_wout = cma_wout.model_copy(update={"lmns": lmns})
+
+    compact = other_wout.compact()
+    assert "lmns" not in compact.derived_fields
+    np.testing.assert_array_equal(compact.lmns, lmns)
+
+
+def test_compact_pickle(cma_wout):
+    compact = cma_wout.compact(np.float32)
+    unpickled = pickle.loads(pickle.dumps(compact))
+    assert unpickled.derived_fields == compact.derived_fields
+    for name in _fourier_arrays(cma_wout):
+        np.testing.assert_array_equal(getattr(unpickled, name), getattr(compact, name))
+
+
+def test_compact_errors(cma_wout):
+    with pytest.raises(ValueError, match="dtype must be float32 or float64"):
+        cma_wout.compact(np.int32)
+    with pytest.raises(AttributeError, match="no_such_field"):
+        _ = cma_wout.compact().no_such_field
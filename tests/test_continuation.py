@@ -9,7 +9,7 @@ import numpy as np
 import pytest
 
 import vmecpp
-from vmecpp._continuation import _state_mode_table, _step_input
+from vmecpp._continuation import _lagrange_weights, _state_mode_table, _step_input
 
 REPO_ROOT = Path(__file__).parent.parent
 TEST_DATA_DIR = REPO_ROOT / "src" / "vmecpp" / "cpp" / "vmecpp" / "test_data"
@@ -293,3 +293,51 @@ def test_fourier_continuation_hot_restarts_first_step_from_restart_from(
 
     assert int(continued.wout.mpol) == mpol_final
     assert _final_force_residual(continued) < 1e-5
+
+
+# --- continuation along a parameter ----------------------------------------
+
+
+def test_lagrange_weights_reproduce_quadratics():
+    nodes = [0.0, 0.5, 2.0]
+    weights = _lagrange_weights(nodes, 3.0)
+    np.testing.assert_allclose(weights.sum(), 1.0)
+    quadratic = np.array([1.0 - x + 2.0 * x**2 for x in nodes])
+    assert weights @ quadratic == pytest.approx(1.0 - 3.0 + 2.0 * 9.0)
+
+
+def test_continuation_path_along_pressure(solovev_output: vmecpp.VmecOutput):
+    vmec_input = solovev_output.input
+    values = [1.0, 1.1, 1.2, 1.3]
+    path = vmecpp.continuation_path(
+        vmec_input,
+        "pres_scale",
+        values,
+        max_threads=1,
+        compare_to_hot_restart=True,
+    )
+
+    assert path.values == values
+    assert path.predictor_orders == [-1, 0, 1, 2]
+    assert path.hot_restart_iterations[:2] == [None, None]
+    assert all(output.wout.ier_flag == 0 for output in path.outputs)
+    # the extrapolated guess is closer than the previous solution
+    assert path.iterations[-1] <= path.hot_restart_iterations[-1]
+    assert path.iterations_saved == sum(
+        path.hot_restart_iterations[i] - path.iterations[i] for i in (2, 3)
+    )
+
+    # the end of the path is the same equilibrium as a direct solve
+    direct_input = vmec_input.model_copy(deep=True)
+    direct_input.pres_scale = values[-1]
+    direct = vmecpp.run(direct_input, verbose=False, max_threads=1)
+    np.testing.assert_allclose(
+        np.asarray(path.outputs[-1].wout.rmnc),
+        np.asarray(direct.wout.rmnc),
+        atol=1e-6,
+    )
+
+
+def test_continuation_path_rejects_repeated_values(cma_input: vmecpp.VmecInput):
+    with pytest.raises(ValueError, match="distinct"):
+        vmecpp.continuation_path(cma_input, ("extcur", 0), [1.0, 2.0, 1.0])
@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH <info@proximafusion.com>
+#
+# SPDX-License-Identifier: MIT
+"""Tests for the nearest-neighbour store of hot-restart equilibria."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import vmecpp
+
+REPO_ROOT = Path(__file__).parent.parent
+TEST_DATA_DIR = REPO_ROOT / "src" / "vmecpp" / "cpp" / "vmecpp" / "test_data"
+
+
+@pytest.fixture(scope="module")
+def solovev_input() -> vmecpp.VmecInput:
+    vmec_input = vmecpp.VmecInput.from_file(TEST_DATA_DIR / "solovev.json")
+    # single multigrid step, so that hot restarts are possible
+    vmec_input.ns_array = vmec_input.ns_array[:1]
+    vmec_input.ftol_array = vmec_input.ftol_array[:1]
+    vmec_input.niter_array = vmec_input.niter_array[:1]
+    return vmec_input
+
+
+def _with_pressure(vmec_input: vmecpp.VmecInput, scale: float) -> vmecpp.VmecInput:
+    perturbed = vmec_input.model_copy(deep=True)
+    perturbed.pres_scale *= scale
+    return perturbed
+
+
+@pytest.fixture(scope="module")
+def solovev_outputs(solovev_input: vmecpp.VmecInput) -> list[vmecpp.VmecOutput]:
+    return [
+        vmecpp.run(_with_pressure(solovev_input, scale), verbose=False, max_threads=1)
+        for scale in (1.0, 1.5)
+    ]
+
+
+def test_nearest_picks_closest_entry(solovev_input, solovev_outputs):
+    cache = vmecpp.EquilibriumCache()
+    assert cache.nearest(solovev_input) is None
+
+    for output in solovev_outputs:
+        assert cache.add(output)
+    assert len(cache) == 2
+
+    nearest = cache.nearest(_with_pressure(solovev_input, 1.1))
+    assert nearest is solovev_outputs[0]
+    nearest = cache.nearest(_with_pressure(solovev_input, 1.4))
+    assert nearest is solovev_outputs[1]
+
+    # entries of a different kind are never returned
+    other_nfp = solovev_input.model_copy(update={"nfp": solovev_input.nfp + 1})
+    assert cache.nearest(other_nfp) is None
+
+
+def test_unconverged_outputs_are_not_added(solovev_outputs):
+    cache = vmecpp.EquilibriumCache()
+    output = solovev_outputs[0]
+    unconverged = output.model_copy(
+        update={"wout": output.wout.model_copy(update={"fsqr": 1.0})}
+    )
+    assert not cache.add(unconverged)
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted(solovev_input, solovev_outputs):
+    cache = vmecpp.EquilibriumCache(max_entries=2)
+    cache.add(solovev_outputs[0])
+    cache.add(solovev_outputs[1])
+    # using the first entry makes the second one the least recently used
+    assert cache.nearest(solovev_input) is solovev_outputs[0]
+
+    third = solovev_outputs[1].model_copy(
+        update={"input": _with_pressure(solovev_input, 2.0)}
+    )
+    cache.add(third)
+    assert len(cache) == 2
+    assert cache.nearest(_with_pressure(solovev_input, 1.5)) is not solovev_outputs[1]
+
+
+def test_entries_are_shared_through_directory(tmp_path, solovev_input, solovev_outputs):
+    writer = vmecpp.EquilibriumCache(tmp_path)
+    writer.add(solovev_outputs[1])
+
+    reader = vmecpp.EquilibriumCache(tmp_path)
+    assert len(reader) == 1
+    nearest = reader.nearest(solovev_input)
+    assert nearest is not None
+    np.testing.assert_array_equal(nearest.wout.rmnc, solovev_outputs[1].wout.rmnc)
+
+    # entries added later by another cache are picked up as well
+    writer.add(solovev_outputs[0])
+    assert len(reader) == 2
+
+    reader.clear()
+    assert len(writer) == 0
+    assert not list(tmp_path.iterdir())
+
+
+def test_nearest_interpolates_to_the_resolution_of_the_query(
+    solovev_input, solovev_outputs
+):
+    cache = vmecpp.EquilibriumCache()
+    cache.add(solovev_outputs[0])
+
+    finer = solovev_input.model_copy(deep=True)
+    finer.ns_array = np.asarray([solovev_input.ns_array[0] + 10])
+    nearest = cache.nearest(finer)
+    assert nearest is not None
+    assert nearest.wout.ns == finer.ns_array[0]
+
+    strict = vmecpp.EquilibriumCache(interpolate=False)
+    strict.add(solovev_outputs[0])
+    assert strict.nearest(finer) is None
+
+
+def test_run_restarts_from_cache(solovev_input, solovev_outputs):
+    cache = vmecpp.EquilibriumCache()
+
+    # the first run starts from scratch and fills the cache
+    output = vmecpp.run(solovev_input, verbose=False, max_threads=1, restart_from=cache)
+    assert len(cache) == 1
+    np.testing.assert_allclose(output.wout.rmnc, solovev_outputs[0].wout.rmnc)
+
+    # a nearby configuration then needs far fewer iterations
+    perturbed = _with_pressure(solovev_input, 1.05)
+    cold = vmecpp.run(perturbed, verbose=False, max_threads=1)
+    warm = vmecpp.run(perturbed, verbose=False, max_threads=1, restart_from=cache)
+    assert warm.wout.niter < cold.wout.niter
+    assert len(cache) == 2
@@ -122,3 +122,23 @@ def test_cma_cold_start_exercises_non_axisymmetric_paths():
     hv = np.asarray(model.hessian_vector_product(np.ascontiguousarray(v)), float)
     assert np.all(np.isfinite(hv))
     assert np.linalg.norm(hv) > 0.0
+
+
+def test_state_and_force_views_alias_model_storage():
+    """state_view / force_view are writable zero-copy views of the model's flat state
+    and force vectors, in the same order as get_state / get_forces."""
+    model = make_model(SOLOVEV, ns=11)
+    state = model.state_view
+    forces = model.force_view
+
+    np.testing.assert_array_equal(state, model.get_state())
+    assert state.flags.writeable
+    assert not state.flags.owndata
+
+    x = model.get_state()
+    x[1] += 1.0e-3
+    state[:] = x
+    np.testing.assert_array_equal(model.get_state(), x)
+
+    model.evaluate(2, 2, False)
+    np.testing.assert_array_equal(forces, model.get_forces())
@@ -1,10 +1,15 @@
 # SPDX-FileCopyrightText: 2024-present Proxima Fusion GmbH <info@proximafusion.com>
 #
 # SPDX-License-Identifier: MIT
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import numpy as np
 import pytest
+from simsopt.field import Current, coils_to_makegrid, coils_via_symmetries
+from simsopt.geo import create_equally_spaced_curves
 
 import vmecpp
 
@@ -68,6 +73,101 @@ def test_run_free_boundary_from_response_table():
     )
 
 
+def test_run_extcur_batch_matches_individual_runs():
+    makegrid_params = vmecpp.MakegridParameters.from_file(
+        TEST_DATA_DIR / "makegrid_parameters_cth_like.json"
+    )
+    makegrid_params.number_of_r_grid_points = 31
+    makegrid_params.number_of_phi_grid_points = 36
+    makegrid_params.number_of_z_grid_points = 20
+    response = vmecpp.MagneticFieldResponseTable.from_coils_file(
+        TEST_DATA_DIR / "coils.cth_like", makegrid_params
+    )
+    vmec_input = vmecpp.VmecInput.from_file(TEST_DATA_DIR / "cth_like_free_bdy.json")
+    extcur = np.stack([vmec_input.extcur, 1.01 * vmec_input.extcur])
+
+    outputs = vmecpp.run_extcur_batch(
+        vmec_input, response, extcur, max_threads=2, max_concurrent_runs=2
+    )
+    assert len(outputs) == 2
+    for row, output in zip(extcur, outputs, strict=True):
+        np.testing.assert_array_equal(output.input.extcur, row)
+        single_input = vmec_input.model_copy(update={"extcur": row})
+        single = vmecpp.run(single_input, response, verbose=False, max_threads=1)
+        np.testing.assert_allclose(
+            output.wout.rmnc, single.wout.rmnc, rtol=1e-10, atol=1e-12
+        )
+        np.testing.assert_allclose(
+            output.wout.zmns, single.wout.zmns, rtol=1e-10, atol=1e-12
+        )
+
+    with pytest.raises(ValueError, match="extcur must have shape"):
+        vmecpp.run_extcur_batch(vmec_input, response, extcur[:, :-1])
+
+
+def _shared_memory_run_volume(
+    vmec_input: vmecpp.VmecInput, response: vmecpp.MagneticFieldResponseTable
+) -> float:
+    assert response.shared_memory_path is not None
+    return vmecpp.run(vmec_input, response, verbose=False, max_threads=1).wout.volume
+
+
+def test_response_table_in_shared_memory(tmp_path):
+    makegrid_params = vmecpp.MakegridParameters.from_file(
+        TEST_DATA_DIR / "makegrid_parameters_cth_like.json"
+    )
+    makegrid_params.number_of_r_grid_points = 31
+    makegrid_params.number_of_phi_grid_points = 36
+    makegrid_params.number_of_z_grid_points = 20
+    response = vmecpp.MagneticFieldResponseTable.from_coils_file(
+        TEST_DATA_DIR / "coils.cth_like", makegrid_params
+    )
+    shared = response.to_shared_memory(tmp_path / "response_table.npy")
+
+    assert response.shared_memory_path is None
+    assert shared.shared_memory_path == tmp_path / "response_table.npy"
+    assert not shared.b_r.flags["WRITEABLE"]
+    np.testing.assert_array_equal(shared.b_r, response.b_r)
+    np.testing.assert_array_equal(shared.b_p, response.b_p)
+    np.testing.assert_array_equal(shared.b_z, response.b_z)
+
+    # only a handle to the file is pickled, not the fields
+    pickled = pickle.dumps(shared)
+    assert len(pickled) < 0.01 * response.b_r.nbytes
+    unpickled = pickle.loads(pickled)
+    assert unpickled.shared_memory_path == shared.shared_memory_path
+    np.testing.assert_array_equal(unpickled.b_z, response.b_z)
+
+    vmec_input = vmecpp.VmecInput.from_file(TEST_DATA_DIR / "cth_like_free_bdy.json")
+    expected = vmecpp.run(vmec_input, response, verbose=False, max_threads=1)
+    with ProcessPoolExecutor(
+        max_workers=2, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        volumes = list(
+            executor.map(_shared_memory_run_volume, [vmec_input] * 2, [shared] * 2)
+        )
+    np.testing.assert_allclose(volumes, expected.wout.volume, rtol=1e-12)
+
+
+def test_response_table_view_does_not_convert(makegrid_params):
+    num_cells = 10 * 20 * 20
+    b = np.linspace(0, 1, num_cells).reshape((1, num_cells))
+    cpp_params = makegrid_params._to_cpp_makegrid_parameters()
+
+    # the view references, and keeps alive, arrays in the right layout
+    view = vmecpp._vmecpp.MagneticFieldResponseTableView(cpp_params, b, b, b)
+    assert view.parameters.number_of_r_grid_points == 10
+    # arrays that would have to be copied are rejected
+    with pytest.raises(TypeError):
+        vmecpp._vmecpp.MagneticFieldResponseTableView(
+            cpp_params, b.astype(np.float32), b, b
+        )
+    with pytest.raises(ValueError, match="shape"):
+        vmecpp._vmecpp.MagneticFieldResponseTableView(
+            cpp_params, b[:, :-1], b[:, :-1], b[:, :-1]
+        )
+
+
 def test_raise_invalid_nzeta():
     makegrid_params = vmecpp.MakegridParameters.from_file(
         TEST_DATA_DIR / "makegrid_parameters_cth_like.json"
@@ -205,3 +305,61 @@ def test_magnetic_field_response_table_scaled_raw(makegrid_params):
             atol=1e-14,
             rtol=0.0,
         )
+
+
+def test_response_table_from_simsopt_coils_matches_coils_file(
+    makegrid_params, tmp_path
+):
+    """The in-memory route must reproduce the coils file written by SIMSOPT."""
+    nfp = makegrid_params.number_of_field_periods
+    curves = create_equally_spaced_curves(
+        3, nfp, stellsym=True, R0=0.55, R1=0.2, order=2, numquadpoints=64
+    )
+    currents = [Current(1.0e4), Current(-2.0e4), Current(3.0e4)]
+    base_coils = coils_via_symmetries(curves, currents, 1, False)
+    circuit_ids = [1, 2, 1]
+
+    coils_file = tmp_path / "coils.simsopt"
+    coils_to_makegrid(
+        coils_file,
+        curves,
+        currents,
+        groups=circuit_ids * (2 * nfp),
+        nfp=nfp,
+        stellsym=True,
+    )
+    from_file = vmecpp.MagneticFieldResponseTable.from_coils_file(
+        coils_file, makegrid_params
+    )
+    from_coils = vmecpp.MagneticFieldResponseTable.from_simsopt_coils(
+        base_coils, makegrid_params, stellsym=True, circuit_ids=circuit_ids
+    )
+
+    assert from_coils.b_r.shape == from_file.b_r.shape == (2, 10 * 20 * 20)
+    # The coils file stores the coordinates with a limited number of digits.
+    for component in ["b_r", "b_p", "b_z"]:
+        np.testing.assert_allclose(
+            getattr(from_coils, component),
+            getattr(from_file, component),
+            rtol=1e-7,
+            atol=1e-12,
+        )
+
+
+def test_magnetic_configuration_from_arrays_invalid_input():
+    polygon = np.array([[1.0, 0.0, 0.0], [1.0, 0.0, 1.0], [2.0, 0.0, 1.0]])
+    from_arrays = vmecpp._vmecpp.MagneticConfiguration.from_arrays
+
+    config = from_arrays([polygon, polygon], np.array([1.0, 2.0]), [7, 7], nfp=3)
+    assert config.num_field_periods == 3
+    assert config.num_serial_circuits == 1
+
+    # one current per coil
+    with pytest.raises(AttributeError):
+        from_arrays([polygon, polygon], np.array([1.0]), [1, 1])
+    # at least two points per coil
+    with pytest.raises(AttributeError):
+        from_arrays([polygon[:1]], np.array([1.0]), [1])
+    # at least one field period
+    with pytest.raises(AttributeError):
+        from_arrays([polygon], np.array([1.0]), [1], nfp=0)
@@ -18,9 +18,10 @@ for the VMEC++ free-boundary solver:
 * the coils provide the external magnetic field. The mgrid magnetic-field
   response table is computed by VMEC++ itself
   (``vmecpp.MagneticFieldResponseTable``); SIMSOPT is used only to load the
-  configuration and to evaluate the vacuum field for ``phiedge``,
-* ``phiedge`` is the enclosed vacuum toroidal flux, computed exactly as the
-  line integral of the coil vector potential around the boundary.
+  configuration,
+* ``phiedge`` is the enclosed vacuum toroidal flux, computed by
+  ``vmecpp.coils.enclosed_toroidal_flux`` as the line integral of the coil vector
+  potential around the boundary.
 
 For every configuration three physics regimes are exercised:
 
@@ -61,7 +62,6 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pytest
 from simsopt._core import load as simsopt_load
-from simsopt.field import BiotSavart, coils_to_makegrid
 from simsopt.geo import SurfaceRZFourier
 
 import vmecpp
@@ -191,21 +191,23 @@ def _boundary_extent(surface) -> tuple[float, float, float, float]:
     return float(r.min()), float(r.max()), float(z.min()), float(z.max())
 
 
-def _enclosed_toroidal_flux(coils, surface, n_theta: int = 1000) -> tuple[float, float]:
+def _enclosed_toroidal_flux(
+    base_coils, nfp: int, surface, n_theta: int = 1000
+) -> tuple[float, float]:
     """Enclosed vacuum toroidal flux (phiedge) and a characteristic |B|."""
-    biot_savart = BiotSavart(coils)
-    loop = surface.cross_section(0.0, thetas=n_theta)  # phi = 0 (the y = 0 plane)
-
-    biot_savart.set_points(loop)
-    a_field = biot_savart.A()
-    b_char = float(np.mean(np.linalg.norm(biot_savart.B(), axis=1)))
-    dl = np.roll(loop, -1, axis=0) - loop
-    flux = float(np.sum(0.5 * (a_field + np.roll(a_field, -1, axis=0)) * dl))
+    magnetic_configuration = vmecpp.coils.from_simsopt_coils(
+        base_coils, nfp=nfp, stellsym=True
+    )
+    rbc, zbs, _ = _boundary_coefficients(surface, MPOL, NTOR)
+    boundary = vmecpp.VmecInput(nfp=nfp, mpol=MPOL, ntor=NTOR, rbc=rbc, zbs=zbs)
+    flux = vmecpp.coils.enclosed_toroidal_flux(
+        magnetic_configuration, boundary, num_theta=n_theta
+    )
 
-    r_axis_guess = float(np.hypot(*loop[:, :2].mean(axis=0)))
-    biot_savart.set_points(np.array([[r_axis_guess, 0.0, 0.0]]))
-    sign = float(np.sign(biot_savart.B()[0, 1])) or 1.0
-    return abs(flux) * sign, b_char
+    loop = surface.cross_section(0.0, thetas=n_theta)  # phi = 0 (the y = 0 plane)
+    b_field = vmecpp.coils.magnetic_field(magnetic_configuration, loop)
+    b_char = float(np.mean(np.linalg.norm(b_field, axis=1)))
+    return flux, b_char
 
 
 def _boundary_coefficients(
@@ -222,7 +224,7 @@ def _boundary_coefficients(
 
 
 def _build_response_table(
-    boundary, coils_file: Path, nfp: int
+    boundary, base_coils, nfp: int
 ) -> vmecpp.MagneticFieldResponseTable:
     r_min, r_max, z_min, z_max = _boundary_extent(boundary)
     # A tight, high-resolution grid hugging the boundary (extent + MGRID_MARGIN
@@ -241,9 +243,15 @@ def _build_response_table(
         number_of_z_grid_points=MGRID_POINTS,
         number_of_phi_grid_points=NZETA,
     )
-    # VMEC++ computes the mgrid response table from the coils file.
-    return vmecpp.MagneticFieldResponseTable.from_coils_file(
-        coils_file, makegrid_parameters
+    # VMEC++ computes the mgrid response table directly from the SIMSOPT coils.
+    # A single circuit for all coils: VMEC++'s mgrid response table stores one
+    # field evaluation per circuit, so a single circuit -- rather than one per
+    # coil -- keeps the (expensive) response table to a single entry.
+    return vmecpp.MagneticFieldResponseTable.from_simsopt_coils(
+        base_coils,
+        makegrid_parameters,
+        stellsym=True,
+        circuit_ids=[1] * len(base_coils),
     )
 
 
@@ -256,27 +264,15 @@ def _load_config(config_id: int) -> QuasrConfig:
     n_base = len(coils) // (2 * nfp)
     base_coils = coils[:n_base]
 
-    coils_file = LOCAL_DATA_DIR / f"coils.quasr{config_id:07d}"
-    # A single current group for all coils: VMEC++'s mgrid response table
-    # stores one field evaluation per group, so a single group -- rather than
-    # one per coil -- keeps the (expensive) response table to a single entry.
-    coils_to_makegrid(
-        coils_file,
-        [coil.curve for coil in base_coils],
-        [coil.current for coil in base_coils],
-        groups=[1] * len(coils),
-        nfp=nfp,
-        stellsym=True,
-    )
     # VMEC++ normalizes a multi-coil circuit's response by its first coil's
     # current (see NumWindingsToCircuitCurrents), so extcur must restore that
     # same reference current -- not 1.0 -- to recover the physical field.
     extcur = np.array([float(coils[0].current.get_value())])
 
-    phiedge, b_char = _enclosed_toroidal_flux(coils, boundary)
+    phiedge, b_char = _enclosed_toroidal_flux(base_coils, nfp, boundary)
     rbc, _, _ = _boundary_coefficients(boundary, MPOL, NTOR)
     # Built once here and reused for every profile of this configuration.
-    response = _build_response_table(boundary, coils_file, nfp)
+    response = _build_response_table(boundary, base_coils, nfp)
     return QuasrConfig(
         config_id=config_id,
         nfp=nfp,
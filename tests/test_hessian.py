@@ -8,6 +8,7 @@ The Hessian-vector product is a central directional derivative of the analytic
 force (the gradient of VMEC's augmented functional), computed inside VMEC++:
 H v = (F(x + eps v) - F(x - eps v)) / (2 eps). It must be linear in v and agree
 with an independent finite difference of the force, and it restores the state.
+The block version hessian_matrix_product must agree with it column by column.
 """
 
 from pathlib import Path
@@ -62,3 +63,23 @@ def test_hvp_restores_state():
     v = rng.standard_normal(x0.size)
     m.hessian_vector_product(np.ascontiguousarray(v))
     assert np.allclose(np.asarray(m.get_state(), float), x0)
+
+
+def test_hessian_matrix_product_matches_columnwise_products():
+    m = _model()
+    m.evaluate(2, 2, False)
+    x0 = np.asarray(m.get_state(), float).copy()
+    rng = np.random.default_rng(3)
+    V = rng.standard_normal((x0.size, 4))
+
+    m.reset_force_eval_count()
+    HV = np.asarray(m.hessian_matrix_product(V), float)
+    assert HV.shape == V.shape
+    assert m.force_eval_count == 2 * V.shape[1]
+    assert np.allclose(np.asarray(m.get_state(), float), x0)
+
+    HV_serial = np.asarray(m.hessian_matrix_product(V, max_threads=1), float)
+    for j in range(V.shape[1]):
+        hv = np.asarray(m.hessian_vector_product(np.ascontiguousarray(V[:, j])))
+        assert np.linalg.norm(HV[:, j] - hv) < 1e-12 * np.linalg.norm(hv)
+        assert np.linalg.norm(HV_serial[:, j] - hv) < 1e-12 * np.linalg.norm(hv)
@@ -105,6 +105,185 @@ def test_run_with_hot_restart():
     assert vmec_output_hot_restarted.wout.niter == 2
 
 
+def test_run_with_iteration_callback():
+    vmec_input = vmecpp.VmecInput.from_file(TEST_DATA_DIR / "solovev.json")
+
+    batches: list[list[vmecpp.IterationRecord]] = []
+    vmec_output = vmecpp.run(
+        vmec_input,
+        verbose=False,
+        iteration_callback=batches.append,
+        iteration_callback_stride=5,
+    )
+
+    records = [record for batch in batches for record in batch]
+    assert len(batches) < len(records)
+    assert all(record.iteration % 5 == 0 for record in records)
+    assert records[-1].ns == vmec_input.ns_array[-1]
+    assert np.isin(
+        [record.fsqr for record in records], vmec_output.wout.force_residual_r
+    ).all()
+
+    # returning True stops the run
+    with pytest.raises(RuntimeError, match="stopped by the iteration callback"):
+        vmecpp.run(vmec_input, verbose=False, iteration_callback=lambda _: True)
+
+    # exceptions raised in the callback propagate
+    def failing_callback(_records):
+        msg = "stop here"
+        raise ValueError(msg)
+
+    with pytest.raises(ValueError, match="stop here"):
+        vmecpp.run(vmec_input, verbose=False, iteration_callback=failing_callback)
+
+
+def test_run_with_early_stop():
+    vmec_input = vmecpp.VmecInput.from_file(TEST_DATA_DIR / "solovev.json")
+
+    # the default criteria do not interfere with a healthy run
+    vmec_output = vmecpp.run(vmec_input, verbose=False, early_stop=True)
+    assert vmec_output.wout.ier_flag == 0
+
+    # residuals never drop by 100x within 5 iterations: give up immediately
+    impatient = vmecpp.EarlyStopCriteria(stagnation_window=5, stagnation_factor=0.01)
+    with pytest.raises(RuntimeError, match="stopped early"):
+        vmecpp.run(vmec_input, verbose=False, early_stop=impatient)
+
+    vmec_input.return_outputs_even_if_not_converged = True
+    vmec_output = vmecpp.run(vmec_input, verbose=False, early_stop=impatient)
+    assert vmec_output.wout.ier_flag == 12
+    assert "stopped early" in vmec_output.wout.reason
+    assert len(vmec_output.wout.force_residual_r) < 20
+
+
+def test_run_save_and_resume_solver_state(tmp_path):
+    vmec_input = vmecpp.VmecInput.from_file(TEST_DATA_DIR / "solovev.json")
+    state_file = tmp_path / "solver_state.h5"
+
+    reference = vmecpp.run(vmec_input, verbose=False, max_threads=1)
+    num_iterations = len(reference.wout.force_residual_r)
+
+    # stop half-way through, after at least one snapshot has been written
+    seen: list[vmecpp.IterationRecord] = []
+
+    def stop_half_way(records):
+        seen.extend(records)
+        return len(seen) > num_iterations // 2
+
+    with pytest.raises(RuntimeError, match="stopped by the iteration callback"):
+        vmecpp.run(
+            vmec_input,
+            verbose=False,
+            max_threads=1,
+            iteration_callback=stop_half_way,
+            save_state_to=state_file,
+            save_state_every=10,
+        )
+    assert state_file.exists()
+
+    resumed = vmecpp.run(
+        vmec_input, verbose=False, max_threads=1, resume_from=state_file
+    )
+    np.testing.assert_allclose(
+        resumed.wout.force_residual_r, reference.wout.force_residual_r, rtol=1e-10
+    )
+    np.testing.assert_allclose(resumed.wout.rmnc, reference.wout.rmnc, rtol=1e-10)
+    np.testing.assert_allclose(resumed.wout.zmns, reference.wout.zmns, rtol=1e-10)
+
+    with pytest.raises(ValueError, match="save_state_every"):
+        vmecpp.run(
+            vmec_input, verbose=False, save_state_to=state_file, save_state_every=0
+        )
+
+
+def test_run_save_and_resume_free_boundary_solver_state(tmp_path):
+    vmec_input = vmecpp.VmecInput.from_file(
+        TEST_DATA_DIR / "cth_like_free_bdy_multigrid.json"
+    )
+    vmec_input.mgrid_file = str(
+        REPO_ROOT / "src" / "vmecpp" / "cpp" / vmec_input.mgrid_file
+    )
+    # full NESTOR updates every 5 iterations, so that snapshots can be taken at
+    # every preconditioner update once the vacuum pressure is on
+    vmec_input.nvacskip = 5
+    # deliver the iteration records in small batches
+    vmec_input.nstep = 10
+    final_ns = vmec_input.ns_array[-1]
+    state_file = tmp_path / "solver_state.h5"
+
+    reference_records: list[vmecpp.IterationRecord] = []
+    reference = vmecpp.run(
+        vmec_input,
+        verbose=False,
+        max_threads=1,
+        iteration_callback=reference_records.extend,
+    )
+    num_final_step_iterations = sum(
+        record.ns == final_ns for record in reference_records
+    )
+
+    # stop late in the last multigrid step, where the vacuum pressure is on and
+    # snapshots hold the NESTOR state
+    seen_in_final_step = 0
+
+    def stop_in_final_step(records):
+        nonlocal seen_in_final_step
+        seen_in_final_step += sum(record.ns == final_ns for record in records)
+        return seen_in_final_step > 0.8 * num_final_step_iterations
+
+    with pytest.raises(RuntimeError, match="stopped by the iteration callback"):
+        vmecpp.run(
+            vmec_input,
+            verbose=False,
+            max_threads=1,
+            iteration_callback=stop_in_final_step,
+            save_state_to=state_file,
+            save_state_every=1,
+        )
+    assert state_file.exists()
+
+    resumed = vmecpp.run(
+        vmec_input, verbose=False, max_threads=1, resume_from=state_file
+    )
+    np.testing.assert_allclose(
+        resumed.wout.force_residual_r, reference.wout.force_residual_r, rtol=1e-10
+    )
+    np.testing.assert_allclose(resumed.wout.rmnc, reference.wout.rmnc, rtol=1e-10)
+
+    # the surfaces of the resumed run can be distributed over more threads; only
+    # the order of the reductions over the surfaces changes
+    resumed_on_two_threads = vmecpp.run(
+        vmec_input, verbose=False, max_threads=2, resume_from=state_file
+    )
+    assert resumed_on_two_threads.wout.fsqr <= vmec_input.ftol_array[-1]
+    np.testing.assert_allclose(
+        resumed_on_two_threads.wout.rmnc,
+        reference.wout.rmnc,
+        rtol=0,
+        atol=1e-9 * np.max(np.abs(reference.wout.rmnc)),
+    )
+
+
+def test_run_with_profiling():
+    vmec_input = vmecpp.VmecInput.from_file(TEST_DATA_DIR / "solovev.json")
+
+    vmec_output = vmecpp.run(vmec_input, verbose=False, max_threads=1)
+    assert vmec_output.timings is None
+
+    vmec_output = vmecpp.run(vmec_input, verbose=False, max_threads=1, profile=True)
+    timings = vmec_output.timings
+    assert timings is not None
+    assert "geometry_from_fourier" in timings.stages
+    assert "time_step" in timings.stages
+    assert len(timings.seconds) == len(timings.stages)
+    assert np.all(timings.seconds >= 0.0)
+    assert np.all(timings.thread_seconds >= timings.seconds)
+    assert timings.calls[timings.stages.index("time_step")] > 0
+    assert timings.total_seconds > 0.0
+    assert timings.seconds.sum() <= timings.total_seconds * 1.01
+    assert "time_step" in timings.table()
+
+
 @pytest.fixture(scope="module")
 def cma_output() -> vmecpp.VmecOutput:
     vmec_input = vmecpp.VmecInput.from_file(TEST_DATA_DIR / "cma.json")
@@ -390,6 +569,58 @@ def test_vmecwout_extra_fields_io(cma_output: vmecpp.VmecOutput):
             )
 
 
+def test_vmecwout_evaluate(cma_output: vmecpp.VmecOutput):
+    wout = cma_output.wout
+    j = wout.ns // 2
+    s = j / (wout.ns - 1)
+    theta = np.linspace(0.0, 2.0 * np.pi, 7)[:, None]
+    zeta = np.linspace(0.0, 2.0 * np.pi, 5)[None, :]
+
+    values = wout.evaluate(s, theta, zeta, ["r", "z", "dr_dtheta", "modb", "curru"])
+    assert values["r"].shape == (7, 5)
+
+    # on a full-grid surface the radial interpolation is exact
+    kernel = wout.xm[:, None, None] * theta - wout.xn[:, None, None] * zeta
+    expected_r = np.tensordot(wout.rmnc[:, j], np.cos(kernel), axes=1)
+    expected_z = np.tensordot(wout.zmns[:, j], np.sin(kernel), axes=1)
+    expected_dr_dtheta = np.tensordot(
+        wout.rmnc[:, j] * -wout.xm, np.sin(kernel), axes=1
+    )
+    np.testing.assert_allclose(values["r"], expected_r, rtol=1e-12)
+    np.testing.assert_allclose(values["z"], expected_z, atol=1e-12)
+    np.testing.assert_allclose(values["dr_dtheta"], expected_dr_dtheta, atol=1e-12)
+    assert np.all(values["modb"] > 0.0)
+    assert np.all(np.isfinite(values["curru"]))
+
+    with pytest.raises(ValueError, match="Unknown quantities"):
+        wout.evaluate(s, theta, zeta, ["not_a_quantity"])
+    with pytest.raises(ValueError, match=r"\[0, 1\]"):
+        wout.evaluate(1.5, theta, zeta)
+
+
+def test_vmecwout_to_flux_coordinates(cma_output: vmecpp.VmecOutput):
+    wout = cma_output.wout
+    rng = np.random.default_rng(seed=42)
+    s = rng.uniform(0.05, 1.0, size=200)
+    theta = rng.uniform(0.0, 2.0 * np.pi, size=200)
+    phi = rng.uniform(0.0, 2.0 * np.pi, size=200)
+    position = wout.evaluate(s, theta, phi, ["r", "z"])
+
+    s_found, theta_found, inside = wout.to_flux_coordinates(
+        position["r"], phi, position["z"]
+    )
+    assert inside.dtype == bool
+    assert np.all(inside)
+    np.testing.assert_allclose(s_found, s, atol=1e-7)
+    np.testing.assert_allclose(
+        np.angle(np.exp(1j * (theta_found - theta))), 0.0, atol=1e-7
+    )
+
+    # a point far outside of the plasma boundary
+    _, _, inside_far = wout.to_flux_coordinates(10.0 * wout.Rmajor_p, 0.0, 0.0)
+    assert not inside_far
+
+
 def test_jxbout_bindings(cma_output: vmecpp.VmecOutput):
     for varname in [
         "itheta",
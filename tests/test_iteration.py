@@ -615,3 +615,74 @@ def test_near_axis_iota_profile():
         )
     for i in range(1, len(error_arrays)):
         assert np.linalg.norm(error_arrays[i]) < np.linalg.norm(error_arrays[i - 1])
+
+
+def test_anderson_style_converges_with_fewer_force_evaluations():
+    """The Anderson-mixed time step converges to the same equilibrium as the VMEC 8.52
+    velocity step, with fewer force evaluations."""
+    cpp_indata = _single_resolution_indata("cth_like_fixed_bdy", 25, 1.0e-10, 3000)
+    results = {}
+    states = {}
+    energies = {}
+    force_evals = {}
+    for style in ("vmec_8_52", "anderson"):
+        model = _vmecpp.VmecModel.create(cpp_indata, 25)
+        model.reset_force_eval_count()
+        results[style] = vmecpp.solve_equilibrium(model, style=style)
+        force_evals[style] = model.force_eval_count
+        states[style] = np.asarray(model.get_state())
+        energies[style] = model.mhd_energy
+
+    for style, result in results.items():
+        assert result.converged, style
+        assert not result.failed, style
+    assert force_evals["anderson"] < force_evals["vmec_8_52"]
+    assert energies["anderson"] == pytest.approx(energies["vmec_8_52"], rel=1.0e-6)
+    # Only R and Z (the first two thirds of the state) are compared: the m=0
+    # lambda coefficients are so weakly constrained that the VMEC 8.52 style
+    # alone moves them by ~4e-4 between ftol=1e-10 and ftol=1e-14.
+    num_geometry = 2 * states["vmec_8_52"].size // 3
+    np.testing.assert_allclose(
+        states["anderson"][:num_geometry],
+        states["vmec_8_52"][:num_geometry],
+        rtol=0,
+        atol=1.0e-4,
+    )
+
+
+def test_native_anderson_matches_python_anderson():
+    """The Python loop takes the native Anderson-mixed step, so with the same restart
+    control it reproduces the C++ ANDERSON inner solve step for step."""
+    cpp_indata = _single_resolution_indata("cth_like_fixed_bdy", 25, 1.0e-16, 200)
+    cpp_indata.iteration_style = _vmecpp.IterationStyle.ANDERSON
+
+    reference = _vmecpp.VmecModel.create(cpp_indata, 25)
+    reference.solve()
+
+    model = _vmecpp.VmecModel.create(cpp_indata, 25)
+    result = vmecpp.solve_equilibrium(model, style="anderson")
+
+    assert not result.failed
+    np.testing.assert_array_equal(
+        np.asarray(result.restart_reasons), np.asarray(reference.restart_reasons)
+    )
+    np.testing.assert_allclose(
+        np.asarray(result.force_residual_r),
+        np.asarray(reference.force_residual_r),
+        rtol=1.0e-8,
+        atol=1e-12,
+    )
+
+
+def test_native_anderson_style_converges():
+    """vmecpp.run() with iteration_style="anderson" takes the native Anderson-mixed
+    time step and reaches the same equilibrium as the default style."""
+    base = vmecpp.VmecInput.from_file(TEST_DATA / "cma.json")
+    reference = vmecpp.run(base, max_threads=1, verbose=False)
+    anderson_input = base.model_copy(update={"iteration_style": "anderson"})
+    assert anderson_input.iteration_style == vmecpp.IterationStyle.ANDERSON
+    anderson = vmecpp.run(anderson_input, max_threads=1, verbose=False)
+
+    assert anderson.wout.ier_flag == 0
+    assert anderson.wout.volume_p == pytest.approx(reference.wout.volume_p, rel=1e-6)
+    assert anderson.wout.betatotal == pytest.approx(reference.wout.betatotal, rel=1e-6)
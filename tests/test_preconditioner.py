@@ -15,13 +15,18 @@ Krylov/quasi-Newton solvers.
 from pathlib import Path
 
 import numpy as np
+import pytest
+
+import vmecpp
 
 try:
     from vmecpp.cpp import _vmecpp
 except ImportError:
     import _vmecpp
 
-SOLOVEV = Path(__file__).resolve().parents[1] / "examples" / "data" / "solovev.json"
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SOLOVEV = REPO_ROOT / "examples" / "data" / "solovev.json"
+CMA = REPO_ROOT / "src" / "vmecpp" / "cpp" / "vmecpp" / "test_data" / "cma.json"
 
 
 def _model(ns: int = 11):
@@ -61,3 +66,33 @@ def test_preconditioner_state_invariant_after_assembly():
     m.evaluate(2, 2, False)
     mv1 = np.asarray(m.apply_preconditioner(v), float)
     assert np.linalg.norm(mv1 - mv0) <= 1e-12 * np.linalg.norm(mv0)
+
+
+def test_partitioned_radial_solver_reproduces_mode_parallel_wout():
+    # A full multi-grid solve on several threads, so that the partitioned solver
+    # splits the radial systems across threads at every resolution.
+    vmec_input = vmecpp.VmecInput.from_file(CMA)
+    wouts = {}
+    try:
+        for solver in (
+            _vmecpp.RadialTridiagonalSolver.MODE_PARALLEL,
+            _vmecpp.RadialTridiagonalSolver.PARTITIONED,
+        ):
+            _vmecpp.set_radial_tridiagonal_solver(solver)
+            wouts[solver] = vmecpp.run(vmec_input, max_threads=4, verbose=False).wout
+    finally:
+        _vmecpp.set_radial_tridiagonal_solver(
+            _vmecpp.RadialTridiagonalSolver.MODE_PARALLEL
+        )
+    reference, partitioned = wouts.values()
+
+    assert partitioned.volume_p == pytest.approx(reference.volume_p, rel=1e-12)
+    for name in ("rmnc", "zmns", "lmns", "bmnc", "iotaf"):
+        expected = np.asarray(getattr(reference, name))
+        np.testing.assert_allclose(
+            getattr(partitioned, name),
+            expected,
+            rtol=0,
+            atol=1e-9 * np.max(np.abs(expected)),
+            err_msg=name,
+        )